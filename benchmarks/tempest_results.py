@@ -0,0 +1,149 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+Compares the two ways of reading the tempest results stored on
+Elasticsearch builds: binding the whole document with xsdata and then
+filtering, against streaming it and filtering while reading.
+
+Usage: python -m benchmarks.tempest_results [--cases N] [--failures N]
+"""
+import argparse
+import timeit
+from dataclasses import dataclass, field
+from typing import List
+
+from xsdata.formats.dataclass.parsers import XmlParser
+
+from cibyl.sources.zuul.utils.tests.tempest.parser import (
+    XMLTempestTestCase, XMLTempestTestCaseReader)
+
+
+@dataclass
+class XMLTempestTestSuite:
+    """Representation of a test suite as seen on the test results XML. Used
+    to unmarshall such document.
+    """
+    errors: int = field(
+        metadata={
+            'type': 'Attribute'
+        }
+    )
+    """Number of test cases that resulted in an error."""
+    failures: int = field(
+        metadata={
+            'type': 'Attribute'
+        }
+    )
+    """Number of test cases that resulted in a failure."""
+    name: str = field(
+        metadata={
+            'type': 'Attribute'
+        }
+    )
+    """Name of the suite."""
+    tests: int = field(
+        metadata={
+            'type': 'Attribute'
+        }
+    )
+    """Number of tests that were executed."""
+    time: float = field(
+        metadata={
+            'type': 'Attribute'
+        }
+    )
+    """Amount of seconds the suite took to complete."""
+    testcase: List[XMLTempestTestCase] = field(
+        default_factory=list,
+        metadata={
+            'type': 'Element'
+        }
+    )
+    """Collection will all the test cases that were run."""
+
+
+def generate_suite(cases: int, failures: int) -> str:
+    """
+    :param cases: Number of test cases on the suite.
+    :param failures: How many of them failed, spread across the suite.
+    :return: The suite, as a test results XML document.
+    """
+    step = max(1, cases // max(1, failures))
+    body = []
+
+    for index in range(cases):
+        case = (
+            f'<testcase classname="tempest.api.Class{index % 50}" '
+            f'name="test_{index}" time="{index % 30}.5"'
+        )
+
+        if failures and index % step == 0 and index // step < failures:
+            body.append(
+                f'{case}><failure type="Exception">Traceback {index}'
+                '</failure></testcase>'
+            )
+        else:
+            body.append(f'{case}/>')
+
+    return (
+        f'<testsuite errors="0" failures="{failures}" name="tempest" '
+        f'tests="{cases}" time="{cases}.0">{"".join(body)}</testsuite>'
+    )
+
+
+def bind_and_filter(xml: str) -> list:
+    """Reads the failed cases by binding the whole document first.
+    """
+    suite = XmlParser().from_string(xml, XMLTempestTestSuite)
+
+    return [case for case in suite.testcase if case.failure]
+
+
+def stream_and_filter(xml: str) -> list:
+    """Reads the failed cases while streaming the document.
+    """
+    return list(
+        XMLTempestTestCaseReader().read_string(xml, lambda case: case.failure)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--cases', type=int, default=2000)
+    parser.add_argument('--failures', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    xml = generate_suite(args.cases, args.failures)
+
+    if len(bind_and_filter(xml)) != len(stream_and_filter(xml)):
+        raise RuntimeError('Both readers must find the same cases.')
+
+    print(f'Suite of {args.cases} cases, {args.failures} failures, '
+          'filtering by result:')
+
+    for name, function in (
+        ('xsdata binding', bind_and_filter),
+        ('streaming reader', stream_and_filter)
+    ):
+        best = min(
+            timeit.repeat(lambda: function(xml), number=1, repeat=args.repeat)
+        )
+
+        print(f'  {name}: {best * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+Compares the ways of reading a zuul.d directory: checking its files on the
+current process, on a new pool of processes for each read and on a pool
+shared by all reads.
+
+Usage: python -m benchmarks.zuuld_files [--files N] [--jobs N] [--workers N]
+"""
+import argparse
+import json
+import os
+import timeit
+from tempfile import TemporaryDirectory
+
+from cibyl.sources.zuuld.tools.yaml import (YAMLSearch, ZuulDFile,
+                                            ZuulDFileFactory)
+from kernel.tools.fs import Dir
+from kernel.tools.json import Draft7Validator, Draft7ValidatorFactory
+
+SCHEMA = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'job': {
+                'type': 'object',
+                'required': ['name'],
+                'properties': {
+                    'name': {'type': 'string'},
+                    'parent': {'type': 'string'},
+                    'branches': {
+                        'anyOf': [
+                            {'type': 'string'},
+                            {'type': 'array', 'items': {'type': 'string'}}
+                        ]
+                    },
+                    'vars': {'type': 'object'}
+                }
+            }
+        }
+    }
+}
+"""Stand-in for the Zuul.D schema, so that the benchmark runs offline."""
+
+
+def generate_zuuld(directory: str, files: int, jobs: int) -> None:
+    """Fills a directory with Zuul.D files.
+
+    :param directory: Where to write the files.
+    :param files: Number of files to write.
+    :param jobs: Number of jobs on each file.
+    """
+    for file in range(files):
+        entries = []
+
+        for job in range(jobs):
+            entries.append(
+                f'- job:\n'
+                f'    name: job-{file}-{job}\n'
+                f'    parent: job-{file}-{max(0, job - 1)}\n'
+                f'    branches: ^(master|stable/.*)$\n'
+                f'    vars:\n'
+                f'      featureset: "{job % 60:03}"\n'
+                f'      release: release-{job % 5}\n'
+                f'      nodes: 1ctlr_{job % 3}comp\n'
+            )
+
+        path = os.path.join(directory, f'jobs-{file}.yaml')
+
+        with open(path, 'w', encoding='utf-8') as buffer:
+            buffer.write(''.join(entries))
+
+
+def new_search(schema: dict, workers: int) -> YAMLSearch:
+    """
+    :param schema: Schema the files are checked against.
+    :param workers: Number of processes used to check the files.
+    :return: A search that does not need to download the schema.
+    """
+    validators = Draft7ValidatorFactory()
+    validators.caches.remotes.put(ZuulDFile.SCHEMA, Draft7Validator(schema))
+
+    return YAMLSearch(
+        tools=YAMLSearch.Tools(
+            files=ZuulDFileFactory(
+                tools=ZuulDFileFactory.Tools(
+                    validators=validators
+                )
+            )
+        ),
+        workers=workers
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--files', type=int, default=400)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--schema',
+        help='Path to the Zuul.D schema to check the files against.'
+    )
+    args = parser.parse_args()
+
+    schema = SCHEMA
+
+    if args.schema:
+        with open(args.schema, 'r', encoding='utf-8') as buffer:
+            schema = json.load(buffer)
+
+    with TemporaryDirectory() as directory:
+        generate_zuuld(directory, args.files, args.jobs)
+
+        path = Dir(directory)
+        shared = new_search(schema, args.workers)
+
+        # Start the shared pool beforehand, as a long session would have
+        expected = len(shared.search(path))
+
+        if expected != args.files:
+            raise RuntimeError('All generated files must be read.')
+
+        print(f'{args.files} files of {args.jobs} jobs, '
+              f'{args.workers} workers:')
+
+        for name, function in (
+            ('current process',
+             lambda: new_search(schema, 1).search(path)),
+            ('new pool per read',
+             lambda: new_search(schema, args.workers).search(path)),
+            ('shared pool',
+             lambda: shared.search(path))
+        ):
+            best = min(
+                timeit.repeat(function, number=1, repeat=args.repeat)
+            )
+
+            print(f'  {name}: {best * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -25,6 +25,8 @@ class OutputStyle(Enum):
     """Same as :attr:`TEXT` but colored for easier read."""
     JSON = 2
     """A machine-readable text based format."""
+    TEST_HISTORY = 3
+    """A summary of how tests behaved across all queried builds."""
 
     @staticmethod
     def from_key(key: str) -> 'OutputStyle':
@@ -34,6 +36,7 @@ class OutputStyle(Enum):
             * 'text' -> OutputStyle.TEXT
             * 'colorized' -> OutputStyle.COLORIZED
             * 'json' -> OutputStyle.JSON
+            * 'test-history' -> OutputStyle.TEST_HISTORY
 
         :param key: The key to get the style for.
         :return: The correspondent style.
@@ -46,5 +49,7 @@ class OutputStyle(Enum):
             return OutputStyle.COLORIZED
         elif key == 'json':
             return OutputStyle.JSON
+        elif key == 'test-history':
+            return OutputStyle.TEST_HISTORY
         else:
             raise NotImplementedError(f'Unknown format: {key}')
@@ -95,10 +95,21 @@ class Parser:
             help='Write output into <OUTPUT_FILE_PATH>.'
         )
         app_args_group.add_argument(
-            '--output-format', '-f', choices=("text", "colorized", "json"),
+            '--output-format', '-f',
+            choices=("text", "colorized", "json", "test-history"),
             dest="output_style", default="colorized",
             help="Sets the output format."
         )
+        app_args_group.add_argument(
+            '--min-failure-rate', dest="min_failure_rate", type=float,
+            help="With the test-history format, only report tests that "
+                 "failed on at least this percentage of their runs."
+        )
+        app_args_group.add_argument(
+            '--history-builds', dest="history_builds", type=int,
+            help="With the test-history format, only take into account "
+                 "this number of the most recent builds of each job."
+        )
         app_args_group.add_argument(
             '--plugin', '-p', dest="plugin", default="openstack")
         app_args_group.add_argument(
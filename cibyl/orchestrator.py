@@ -44,6 +44,7 @@ from cibyl.sources.source import (Source, get_source_instance_from_method,
                                   select_source_method,
                                   source_information_from_method)
 from cibyl.sources.source_factory import SourceFactory
+from cibyl.utils.history import TestStats
 from cibyl.utils.status_bar import StatusBar
 from kernel.tools.dicts import intersect_models
 from kernel.tools.fs import File
@@ -315,6 +316,37 @@ class Orchestrator:
             # if no source could be called, there is nothing to add
             system.populate(query_result)
 
+    def run_tests_stats(self, system: System) -> List[TestStats]:
+        """Let a source of the system that can summarize the runs of the
+        tests by itself, like Elasticsearch with an index of test runs, do
+        so, instead of going through all of them on the client.
+
+        :param system: The system to summarize the tests of.
+        :return: The statistics of the tests. Empty if no source of the
+            system could calculate them.
+        """
+        if not system.is_enabled():
+            return []
+        debug = self.parser.app_args.get("debug", False)
+        for source in system.sources:
+            if not source.enabled or not getattr(source, 'tests_index', None):
+                continue
+            try:
+                source.ensure_source_setup()
+                with StatusBar(f"Summarizing tests ({system.name})"):
+                    return source.get_tests_stats(
+                        last_builds=self.parser.app_args.get(
+                            'history_builds'
+                        ),
+                        **self.parser.ci_args
+                    )
+            except SourceException as exception:
+                LOG.error("Error summarizing tests with source '%s' under "
+                          "system: '%s'. Reason: '%s'.",
+                          source.name, system.name.value,
+                          exception, exc_info=debug)
+        return []
+
     def extend_parser(self, attributes: dict, group_name: str = 'Environment',
                       level: int = 0,
                       parent_queries: Optional[Set[str]] = None) -> None:
@@ -393,6 +425,10 @@ class Orchestrator:
                     self.run_features(system, features)
                 else:
                     self.run_query(system)
+                    if output_style == OutputStyle.TEST_HISTORY:
+                        publisher.add_tests_stats(
+                            system, self.run_tests_stats(system)
+                        )
                 for source in system.sources:
                     source.ensure_teardown()
 
@@ -414,7 +450,11 @@ class Orchestrator:
                 style=output_style,
                 query=query_type,
                 verbosity=self.parser.app_args.get('verbosity', 0),
-                output_file=file)
+                output_file=file,
+                min_failure_rate=self.parser.app_args.get(
+                    'min_failure_rate', 0.0
+                ),
+                last_builds=self.parser.app_args.get('history_builds'))
 
         for env in self.environments:
             query()
@@ -0,0 +1,124 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from cibyl.utils.colors import ClearText, ColorPalette
+from cibyl.utils.history import TestHistory, TestStats
+from kernel.tools.text import IndentedTextBuilder
+
+SLOWEST_TESTS = 10
+"""Number of tests listed as the slowest ones."""
+
+
+def print_test_history(history: TestHistory,
+                       palette: ColorPalette = ClearText(),
+                       verbosity: int = 0,
+                       min_failure_rate: float = 0.0) -> str:
+    """
+        Generate string representation of the history of some tests.
+
+        By default, only the tests that do not always end the same way and
+        the slowest ones are printed. Higher verbosity prints all of them.
+
+        :param history: The history.
+        :param palette: The palette of colors to follow.
+        :param verbosity: The verbosity level to use.
+        :param min_failure_rate: Tests that fail less often than this, from
+            0 to 1, are left out of the list of tests.
+        :return: Textual representation of the history.
+    """
+    printer = IndentedTextBuilder()
+
+    printer.add(palette.blue('Tests history across '), 0)
+    printer[-1].append(f'{history.builds} builds')
+
+    if history.summaries:
+        printer.add(palette.blue('Tests summarized by the sources: '), 0)
+        printer[-1].append(str(len(history.summaries)))
+
+    if verbosity > 0:
+        printer.add(palette.blue('Tests: '), 0)
+        tests = sorted(
+            (
+                stats
+                for stats in history.stats()
+                if stats.failure_rate >= min_failure_rate
+            ),
+            key=lambda stats: stats.failure_rate,
+            reverse=True
+        )
+    else:
+        printer.add(palette.blue('Flaky tests: '), 0)
+        tests = history.flaky(min_failure_rate=min_failure_rate)
+
+    if not tests:
+        printer[-1].append('None')
+
+    for stats in tests:
+        printer.add(print_test_stats(stats, palette), 1)
+
+    printer.add(palette.blue('Slowest tests: '), 0)
+
+    slowest = history.slowest(count=SLOWEST_TESTS)
+
+    if not slowest:
+        printer[-1].append('None')
+
+    for stats in slowest:
+        printer.add(palette.blue('- '), 1)
+        printer[-1].append(f'{stats.job}: {stats.name}')
+        printer.add(palette.blue('Duration (p90): '), 2)
+        printer[-1].append(f'{stats.durations[90]:.2f}s')
+
+    return printer.build()
+
+
+def print_test_stats(stats: TestStats,
+                     palette: ColorPalette = ClearText()) -> str:
+    """
+        Generate string representation of the statistics of a test.
+
+        :param stats: The statistics.
+        :param palette: The palette of colors to follow.
+        :return: Textual representation of the statistics.
+    """
+    printer = IndentedTextBuilder()
+
+    printer.add(palette.blue('- '), 0)
+    printer[-1].append(f'{stats.job}: {stats.name}')
+
+    printer.add(palette.blue('Failure rate: '), 1)
+    printer[-1].append(
+        f'{stats.failure_rate * 100:.2f}% '
+        f'({stats.failures} of {stats.runs - stats.skips} runs)'
+    )
+
+    if stats.skips:
+        printer.add(palette.blue('Skipped: '), 1)
+        printer[-1].append(f'{stats.skips} times')
+
+    if stats.flips is not None:
+        printer.add(palette.blue('Flips: '), 1)
+        printer[-1].append(str(stats.flips))
+
+    if stats.durations:
+        printer.add(palette.blue('Duration: '), 1)
+        printer[-1].append(
+            ', '.join(
+                f'p{percentile} {duration:.2f}s'
+                for percentile, duration in stats.durations.items()
+            )
+        )
+
+    return printer.build()
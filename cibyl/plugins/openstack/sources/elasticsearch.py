@@ -24,6 +24,7 @@ from cibyl.plugins.openstack.network import Network
 from cibyl.plugins.openstack.storage import Storage
 from cibyl.plugins.openstack.test_collection import TestCollection
 from cibyl.sources.elasticsearch.api import filter_jobs
+from cibyl.sources.elasticsearch.query import build_query, get_jobs_clauses
 from cibyl.sources.plugins import SourceExtension
 from cibyl.sources.source import speed_index
 from cibyl.utils.filtering import IP_PATTERN
@@ -117,22 +118,22 @@ class ElasticSearch(SourceExtension):
             overcloud_templates_argument = set(overcloud_templates_argument)
             fields_to_request.add('overcloud_templates')
 
-        # Empty query for all hits or elements
+        # Narrow down the hits on the server, they are filtered again on
+        # the client to cover what could not be translated
         query_body = {
-            "query": {
-                "match_all": {}
-                },
+            "query": build_query(get_jobs_clauses(**kwargs)),
             "_source": ["job_name", "job_url",
                         "build_num"]+list(fields_to_request)
         }
 
         hits = self.__query_get_hits(
             query=query_body,
-            index='logstash_jenkins_jobs_cibyl'
+            index='logstash_jenkins_jobs_cibyl',
+            last_build_only=True
         )
-        # make the hits list a flat list of dicts with the job information for
+        # make the hits a flat stream of dicts with the job information for
         # easier filtering
-        hits = [hit['_source'] for hit in hits]
+        hits = (hit['_source'] for hit in hits)
         hits = filter_jobs(hits, **kwargs)
         hits = keep_only_last_build_hit(hits)
         self.check_jobs_for_spec(hits, **kwargs)
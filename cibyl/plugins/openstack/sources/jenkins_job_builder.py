@@ -13,11 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import hashlib
+import json
 import logging
+import os
 import re
 import xml.etree.ElementTree as ET
 from io import StringIO
-from typing import Iterable, List
+from typing import IO, Dict, Iterable, List, Union
 
 from cibyl.models.attribute import AttributeDictValue
 from cibyl.models.ci.base.job import Job
@@ -25,6 +28,7 @@ from cibyl.plugins.openstack.deployment import Deployment
 from cibyl.plugins.openstack.network import Network
 from cibyl.plugins.openstack.node import Node
 from cibyl.plugins.openstack.storage import Storage
+from cibyl.sources.jenkins_job_builder import XML_DIR, map_files
 from cibyl.sources.plugins import SourceExtension
 from cibyl.sources.source import speed_index
 
@@ -44,6 +48,27 @@ ML2_DRIVER = r'.*network-ovs yes.*|.*network-ovs True.*|.*network-ovn yes.*|.*ne
 ML2_DRIVER_NAME = r'ovn|ovs'
 DEPLOYMENT = r'--deployment-files \w+\b'
 
+XML_INDEX_FILE = ".cibyl-index.json"
+"""File, inside the xml directory, where the deployment fields read from the
+xml files are indexed."""
+EXTRACTION_REVISION = 1
+"""Revision of :func:`read_deployment_fields`. Bump it whenever the fields
+it extracts, or the way it does so, change."""
+XML_INDEX_VERSION = hashlib.sha1(
+    "\n".join([
+        str(EXTRACTION_REVISION),
+        TOPOLOGY, NODE_NAME_COUNTER, IP_VERSION, IP_VERSION_NUMBER,
+        RELEASE, RELEASE_NUMBER, CINDER_BACKEND, CINDER_BACKEND_NAME,
+        NETWORK_BACKEND, NETWORK_BACKEND_NAME, ML2_DRIVER, ML2_DRIVER_NAME,
+        DEPLOYMENT
+    ]).encode('utf-8')
+).hexdigest()
+"""Version of the extraction logic the xml index was built with. Indexes
+built with any other are discarded."""
+
+DeploymentFields = Dict[str, List[str]]
+"""Raw values found for each deployment field on a xml file."""
+
 
 def args_are_in_list(arg_list: List[str], list: Iterable[str]) -> bool:
     """
@@ -57,39 +82,250 @@ def args_are_in_list(arg_list: List[str], list: Iterable[str]) -> bool:
     return (len([el for el in list if " ".join(map(str, arg_list)) in el]) > 0)
 
 
-def parse_xml(path: str) -> StringIO:
+def parse_xml(source: Union[str, IO]) -> StringIO:
     """
     Parse xml file generated by the jenkins job builder and get all
     groovy script sections found in the file.
 
-    param: str path: the path to the xml file
+    The file is read in a single pass, discarding each element as soon as it
+    has been visited, so that the whole tree is never held in memory.
+
+    param: source: the path to the xml file or a file-like object with its
+                   contents
     return: the StringIO instance (in memory file like instance) containing
             the groovy scripts found in the generated xml file.
     rtype: StringIO
     """
-    root = ET.parse(path).getroot()
-    result = ""
-    for script in root.iter("script"):
-        result = result + "\n" + script.text
-    for dv in root.iter("defaultValue"):
-        result = result + "\n" + str(dv.text)
+    scripts = []
+    default_values = []
+    for _, element in ET.iterparse(source):
+        if element.tag == "script" and element.text is not None:
+            scripts.append(element.text)
+        elif element.tag == "defaultValue":
+            default_values.append(str(element.text))
+        element.clear()
+    result = "".join("\n" + text for text in scripts + default_values)
     return StringIO(result)
 
 
+def read_deployment_fields(in_mem_file: Iterable[str]) -> DeploymentFields:
+    """
+    Extract, in a single pass over the scripts of a job, the raw values of
+    all the deployment fields this source knows about.
+
+    param: in_mem_file: the lines of the scripts, as returned by
+                        :func:`parse_xml`
+    return: dictionary with the sorted list of values found for each field
+    rtype: dict
+    """
+    topology = set()
+    ip_version = set()
+    release = set()
+    cinder_backend = set()
+    network_backend = set()
+    ml2_driver = set()
+    infra_type = set()
+
+    for line in in_mem_file:
+        line = line.rstrip()
+        if "TOPOLOGY=" in line or "TOPOLOGY =" in line:
+            for el in re.findall(TOPOLOGY, line):
+                topology.update(re.findall(NODE_NAME_COUNTER, el))
+        if "--network-protocol" in line:
+            for el in re.findall(IP_VERSION, line):
+                ip_version.update(re.findall(IP_VERSION_NUMBER, el))
+        # avoid outputting 10.0 and 10 as "10.0,10", only the first line
+        # with a release is taken into account
+        if not release and ("rhos" in line or "send_results_to_umb" in line):
+            for el in re.findall(RELEASE, line):
+                release.update(re.findall(RELEASE_NUMBER, el))
+        for el in re.findall(CINDER_BACKEND, line):
+            cinder_backend.update(re.findall(CINDER_BACKEND_NAME, el))
+        for el in re.findall(NETWORK_BACKEND, line):
+            network_backend.update(re.findall(NETWORK_BACKEND_NAME, el))
+        for el in re.findall(ML2_DRIVER, line):
+            ml2_driver.update(re.findall(ML2_DRIVER_NAME, el))
+        if "--deployment-files" in line:
+            for el in re.findall(DEPLOYMENT, line):
+                if "virt" in el or "composable_roles" in el:
+                    infra_type.add("virt")
+                elif "ovb" in el:
+                    infra_type.add("ovb")
+                else:
+                    # assume that any deployment that does not use ovb or
+                    # virt is a baremetal one
+                    infra_type.add("baremetal")
+
+    return {
+        "topology": sorted(topology),
+        "ip_version": sorted(ip_version),
+        "release": sorted(release),
+        "cinder_backend": sorted(cinder_backend),
+        "network_backend": sorted(network_backend),
+        "ml2_driver": sorted(ml2_driver),
+        "infra_type": sorted(infra_type)
+    }
+
+
+def read_xml_deployment_fields(
+    path: Union[str, os.PathLike]
+) -> DeploymentFields:
+    """
+    Parse xml file generated by the jenkins job builder and extract the
+    deployment fields from it.
+
+    param: path: the path to the xml file
+    return: dictionary with the sorted list of values found for each field
+    rtype: dict
+    """
+    return read_deployment_fields(parse_xml(path))
+
+
+class XmlIndex:
+    """Persistent index of the deployment fields found on the xml files
+    generated by the jenkins job builder.
+
+    Entries are keyed by the path to each file and the hash of its contents,
+    so a file is only parsed again once its contents change. The whole index
+    is discarded if it was built by a different version of the extraction
+    logic, see :data:`XML_INDEX_VERSION`.
+    """
+
+    def __init__(self, path: str):
+        """Constructor.
+
+        :param path: Path to the file the index is persisted at. The
+            directory it is in is also the one the indexed paths are
+            relative to.
+        """
+        self._path = path
+        self._entries = self._load()
+        self._modified = False
+
+    def _load(self) -> Dict[str, dict]:
+        """Read the entries persisted on a previous run.
+
+        :return: The entries. Empty if there were none or they could not be
+            read.
+        """
+        if not os.path.isfile(self._path):
+            return {}
+
+        try:
+            with open(self._path, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            LOG.debug("Discarding unreadable xml index at %s.", self._path)
+            return {}
+
+        if not isinstance(index, dict):
+            return {}
+
+        if index.get('version') != XML_INDEX_VERSION:
+            LOG.debug("Discarding outdated xml index at %s.", self._path)
+            return {}
+
+        entries = index.get('entries')
+
+        if not isinstance(entries, dict):
+            return {}
+
+        return entries
+
+    def get(self, xml_path: Union[str, os.PathLike]) -> DeploymentFields:
+        """Get the deployment fields of a xml file, parsing it only if it is
+        not indexed yet or its contents changed since it was.
+
+        :param xml_path: Path to the xml file.
+        :return: The deployment fields found on the file.
+        """
+        return self.get_all([xml_path])[0]
+
+    def get_all(self, xml_paths: List[Union[str, os.PathLike]],
+                workers: int = 1) -> List[DeploymentFields]:
+        """Get the deployment fields of many xml files at once, parsing only
+        those that are not indexed yet or whose contents changed since they
+        were.
+
+        :param xml_paths: Paths to the xml files.
+        :param workers: Maximum number of processes to parse the files with.
+        :return: The deployment fields found on each file, in the same order
+            as the files.
+        """
+        keys = []
+        digests = []
+        for xml_path in xml_paths:
+            with open(xml_path, 'rb') as file:
+                digests.append(hashlib.sha1(file.read()).hexdigest())
+            keys.append(
+                os.path.relpath(xml_path, os.path.dirname(self._path))
+            )
+
+        misses = [
+            index for index, (key, digest) in enumerate(zip(keys, digests))
+            if self._entries.get(key, {}).get('digest') != digest
+        ]
+
+        parsed = map_files(
+            read_xml_deployment_fields,
+            [xml_paths[index] for index in misses],
+            workers
+        )
+
+        for index, fields in zip(misses, parsed):
+            self._entries[keys[index]] = {
+                'digest': digests[index],
+                'fields': fields
+            }
+            self._modified = True
+
+        return [self._entries[key]['fields'] for key in keys]
+
+    def save(self) -> None:
+        """Persist the index, if anything was added to it since it was
+        loaded. Failures to write it are not fatal, the index will just be
+        built again next time.
+        """
+        if not self._modified:
+            return
+
+        try:
+            with open(self._path, 'w', encoding='utf-8') as file:
+                json.dump(
+                    {'version': XML_INDEX_VERSION, 'entries': self._entries},
+                    file
+                )
+        except OSError:
+            LOG.debug("Could not write xml index at %s.", self._path)
+            return
+
+        self._modified = False
+
+
 class JenkinsJobBuilder(SourceExtension):
-    def _get_nodes(self, path, **kwargs):
+    def _get_xml_index(self, repo: dict) -> XmlIndex:
+        """
+        get the index of the xml files generated for a repository
+
+        :param repo: the repository to get the index for
+
+        :return: the index
+        """
+        return XmlIndex(os.path.join(repo['dest'], XML_DIR, XML_INDEX_FILE))
+
+    def _get_nodes(self, fields, **kwargs):
         """
         extract topology from the JJB xml file and
         represent as a Nodes dictionary
 
         Note: this function is not used to support filtering
 
-        :param path: to JJB xml file
+        :param fields: deployment fields read from the JJB xml file
         :param **kwargs: cibyl command line
 
         :return: dictionary of Nodes
         """
-        topology = self._get_topology(path, **kwargs)
+        topology = self._get_topology(fields, **kwargs)
         nodes = {}
         for component in topology.split(","):
             try:
@@ -101,7 +337,7 @@ class JenkinsJobBuilder(SourceExtension):
                 nodes[node_name] = Node(node_name, role=role)
         return nodes
 
-    def _get_topology(self, path, **kwargs):
+    def _get_topology(self, fields, **kwargs):
         """
         extract topology from the JJB xml file and
         represent it in the form of string, e.g
@@ -109,23 +345,14 @@ class JenkinsJobBuilder(SourceExtension):
 
         Note: this function is used to support filtering
             e.g. --topology cont, --topology controller:3
-        :param path: to JJB xml file
+        :param fields: deployment fields read from the JJB xml file
         :param **kwargs: cibyl command line
 
         :return: topology string
         """
         topology_str = ""
         if "topology" in kwargs:
-            in_mem_file = parse_xml(path)
-            result = set([])
-
-            lines = [line.rstrip() for line in in_mem_file if
-                     "TOPOLOGY=" in line or "TOPOLOGY =" in line]
-            for line in lines:
-                topology_lst = re.findall(TOPOLOGY, line)
-                for el in topology_lst:
-                    nodeSet = set(re.findall(NODE_NAME_COUNTER, el))
-                    result = result.union(nodeSet)
+            result = set(fields["topology"])
 
             topology_str = ",".join(sorted(result))
             # filtering support e.g. --topology cont, --topology controller:3
@@ -138,7 +365,7 @@ class JenkinsJobBuilder(SourceExtension):
 
         return topology_str
 
-    def _get_ip_version(self, path, **kwargs):
+    def _get_ip_version(self, fields, **kwargs):
         """
         extract ip_version from the JJB xml file and
         represent it in the form of string, e.g
@@ -146,24 +373,16 @@ class JenkinsJobBuilder(SourceExtension):
 
         Note: this function is used to support filtering
             e.g. --ip_version 4
-        :param path: to JJB xml file
+        :param fields: deployment fields read from the JJB xml file
         :param **kwargs: cibyl command line
 
         :return: ip version string
         """
         ip_version_str = ""
         if "ip_version" in kwargs:
-            in_mem_file = parse_xml(path)
-            result = set([])
-
-            lines = [line.rstrip() for line in in_mem_file if
-                     "--network-protocol" in line]
-            for line in lines:
-                ip_version_lst = re.findall(IP_VERSION, line)
-                for el in ip_version_lst:
-                    nodeSet = set(re.findall(IP_VERSION_NUMBER, el))
-                    result = result.union(nodeSet)
-            ip_version_str = ",".join(result)
+            result = set(fields["ip_version"])
+
+            ip_version_str = ",".join(sorted(result))
             # filtering support e.g. --ip-version 4
             if kwargs['ip_version'].value and len(
                     list(filter(lambda x: len(
@@ -173,7 +392,7 @@ class JenkinsJobBuilder(SourceExtension):
                 return None
         return ip_version_str
 
-    def _get_release(self, path, **kwargs):
+    def _get_release(self, fields, **kwargs):
         """
         extract release from the JJB xml file and
         represent it in the form of string, e.g
@@ -181,7 +400,7 @@ class JenkinsJobBuilder(SourceExtension):
 
         Note: this function is used to support filtering
             e.g. --release 17.0
-        :param path: to JJB xml file
+        :param fields: deployment fields read from the JJB xml file
         :param **kwargs: cibyl command line
 
         :return: release string
@@ -189,19 +408,8 @@ class JenkinsJobBuilder(SourceExtension):
         """
         release_str = ""
         if "release" in kwargs:
-            in_mem_file = parse_xml(path)
-            result = set([])
-
-            lines = [line.rstrip() for line in in_mem_file if
-                     "rhos" in line or "send_results_to_umb" in line]
-            for line in lines:
-                release_lst = re.findall(RELEASE, line)
-                for el in release_lst:
-                    releases = set(re.findall(RELEASE_NUMBER, el))
-                    result = result.union(releases)
-                # avoid outputting 10.0 and 10 as "10.0,10"
-                if len(result) > 0:
-                    break
+            result = fields["release"]
+
             release_str = ",".join(result)
             # filtering support e.g. --release 18
             if kwargs['release'].value:
@@ -209,7 +417,7 @@ class JenkinsJobBuilder(SourceExtension):
                     return None
         return release_str
 
-    def _get_cinder_backend(self, path, **kwargs):
+    def _get_cinder_backend(self, fields, **kwargs):
         """
         extract cinder_backend from the JJB xml file and
         represent it in the form of string, e.g
@@ -217,7 +425,7 @@ class JenkinsJobBuilder(SourceExtension):
 
         Note: this function is used to support filtering
             e.g. --cinder-backend swift
-        :param path: to JJB xml file
+        :param fields: deployment fields read from the JJB xml file
         :param **kwargs: cibyl command line
 
         :return: cinder_backend string
@@ -225,15 +433,7 @@ class JenkinsJobBuilder(SourceExtension):
         """
         cinder_backends_str = ""
         if "cinder_backend" in kwargs:
-            in_mem_file = parse_xml(path)
-            result = set([])
-
-            lines = [line.rstrip() for line in in_mem_file]
-            for line in lines:
-                cinder_backend_lst = re.findall(CINDER_BACKEND, line)
-                for el in cinder_backend_lst:
-                    cinder_backends = set(re.findall(CINDER_BACKEND_NAME, el))
-                    result = result.union(cinder_backends)
+            result = fields["cinder_backend"]
 
             cinder_backends_str = ",".join(result)
             # filtering support e.g. --cinder-backend swift
@@ -243,7 +443,7 @@ class JenkinsJobBuilder(SourceExtension):
                     return None
         return cinder_backends_str
 
-    def _get_network_backend(self, path, **kwargs):
+    def _get_network_backend(self, fields, **kwargs):
         """
         extract network_backend from the JJB xml file and
         represent it in the form of string, e.g
@@ -251,7 +451,7 @@ class JenkinsJobBuilder(SourceExtension):
 
         Note: this function is used to support filtering
             e.g. --network-backend vxlan
-        :param path: to JJB xml file
+        :param fields: deployment fields read from the JJB xml file
         :param **kwargs: cibyl command line
 
         :return: network_backend string
@@ -259,16 +459,7 @@ class JenkinsJobBuilder(SourceExtension):
         """
         network_backends_str = ""
         if "network_backend" in kwargs:
-            in_mem_file = parse_xml(path)
-            result = set([])
-
-            lines = [line.rstrip() for line in in_mem_file]
-            for line in lines:
-                network_backend_lst = re.findall(NETWORK_BACKEND, line)
-                for el in network_backend_lst:
-                    network_backends = set(
-                        re.findall(NETWORK_BACKEND_NAME, el))
-                    result = result.union(network_backends)
+            result = fields["network_backend"]
 
             network_backends_str = ",".join(result)
             # filtering support e.g. --network-backend vxlan
@@ -278,7 +469,7 @@ class JenkinsJobBuilder(SourceExtension):
                     return None
         return network_backends_str
 
-    def _get_ml2_driver(self, path, **kwargs):
+    def _get_ml2_driver(self, fields, **kwargs):
         """
         extract ml2_driver from the JJB xml file and
         represent it in the form of string, e.g
@@ -286,7 +477,7 @@ class JenkinsJobBuilder(SourceExtension):
 
         Note: this function is used to support filtering
             e.g. --ml2-driver ovn
-        :param path: to JJB xml file
+        :param fields: deployment fields read from the JJB xml file
         :param **kwargs: cibyl command line
 
         :return: ml2_driver string
@@ -294,16 +485,7 @@ class JenkinsJobBuilder(SourceExtension):
         """
         ml2_driver_str = ""
         if "ml2_driver" in kwargs:
-            in_mem_file = parse_xml(path)
-            result = set([])
-
-            lines = [line.rstrip() for line in in_mem_file]
-            for line in lines:
-                ml2_driver_lst = re.findall(ML2_DRIVER, line)
-                for el in ml2_driver_lst:
-                    ml2_driver = set(
-                        re.findall(ML2_DRIVER_NAME, el))
-                    result = result.union(ml2_driver)
+            result = fields["ml2_driver"]
 
             ml2_driver_str = ",".join(result)
             # filtering support e.g. --ml2_driver ovn
@@ -313,7 +495,7 @@ class JenkinsJobBuilder(SourceExtension):
                     return None
         return ml2_driver_str
 
-    def _get_infra_type(self, path, **kwargs):
+    def _get_infra_type(self, fields, **kwargs):
         """
         extract infra_type from the JJB xml file and
         represent it in the form of string, e.g
@@ -321,28 +503,14 @@ class JenkinsJobBuilder(SourceExtension):
 
         Note: this function is used to support filtering
             e.g. --infra_type virt
-        :param path: to JJB xml file
+        :param fields: deployment fields read from the JJB xml file
         :param **kwargs: cibyl command line
 
         :return: infra type string
         """
         infra_type_str = ""
         if "infra_type" in kwargs:
-            in_mem_file = parse_xml(path)
-            result = set([])
-            lines = [line.rstrip() for line in in_mem_file if
-                     "--deployment-files" in line]
-            for line in lines:
-                infra_lst = re.findall(DEPLOYMENT, line)
-                for el in infra_lst:
-                    if "virt" in el or "composable_roles" in el:
-                        result.add("virt")
-                    elif "ovb" in el:
-                        result.add("ovb")
-                    else:
-                        # assume that any deployment that does not use ovb or
-                        # virt is a baremetal one
-                        result.add("baremetal")
+            result = fields["infra_type"]
             if not result:
                 # if no interesting line was found, return None
                 return None
@@ -375,23 +543,31 @@ class JenkinsJobBuilder(SourceExtension):
         """
         filterted_out = []
         jobs = {}
+        fields = {}
         for repo in self.repos:
             # filter according to jobs parameter if specified by kwargs
-            jobs.update(
-                self.get_jobs_from_repo(repo, **kwargs))
+            repo_jobs = self.get_jobs_from_repo(repo, **kwargs)
+            xml_index = self._get_xml_index(repo)
+            repo_fields = xml_index.get_all(
+                [self._xml_files[job_name] for job_name in repo_jobs],
+                self.workers
+            )
+            fields.update(zip(repo_jobs, repo_fields))
+            xml_index.save()
+            jobs.update(repo_jobs)
 
         for job_name in jobs:
-            path = self._xml_files[job_name]
+            job_fields = fields[job_name]
 
             # ------------------------------                  topology
-            topology = self._get_topology(path, **kwargs)
+            topology = self._get_topology(job_fields, **kwargs)
 
             # compute what is filtered out according to topology filter
             if topology is None and kwargs['topology'].value is not None:
                 filterted_out += [job_name]
                 continue
             # ------------------------------                  ip version
-            ipv = self._get_ip_version(path, **kwargs)
+            ipv = self._get_ip_version(job_fields, **kwargs)
 
             # compute what is filtered out according to ip version filter
             if ipv is None and kwargs['ip_version'].value is not None:
@@ -399,14 +575,14 @@ class JenkinsJobBuilder(SourceExtension):
                 continue
 
             # ------------------------------                  release
-            release = self._get_release(path, **kwargs)
+            release = self._get_release(job_fields, **kwargs)
             # compute what is filtered out according to release filter
             if release is None and kwargs['release'].value is not None:
                 filterted_out += [job_name]
                 continue
 
             # ------------------------------            cinder_backend
-            cinder_backend = self._get_cinder_backend(path, **kwargs)
+            cinder_backend = self._get_cinder_backend(job_fields, **kwargs)
             # compute what is filtered out according to cinder_backend
             if cinder_backend is None and \
                     kwargs['cinder_backend'].value is not None:
@@ -414,7 +590,7 @@ class JenkinsJobBuilder(SourceExtension):
                 continue
 
             # ------------------------------            network_backend
-            network_backend = self._get_network_backend(path, **kwargs)
+            network_backend = self._get_network_backend(job_fields, **kwargs)
             # compute what is filtered out according to network_backend
             if network_backend is None and \
                     kwargs['network_backend'].value is not None:
@@ -422,7 +598,7 @@ class JenkinsJobBuilder(SourceExtension):
                 continue
 
             # ------------------------------            ml2_driver
-            ml2_driver = self._get_ml2_driver(path, **kwargs)
+            ml2_driver = self._get_ml2_driver(job_fields, **kwargs)
             # compute what is filtered out according to ml2_driver
             if ml2_driver is None and \
                     kwargs['ml2_driver'].value is not None:
@@ -430,7 +606,7 @@ class JenkinsJobBuilder(SourceExtension):
                 continue
 
             # ------------------------------            infra_type
-            infra_type = self._get_infra_type(path, **kwargs)
+            infra_type = self._get_infra_type(job_fields, **kwargs)
             # compute what is filtered out according to infra_type
             if infra_type is None and \
                     kwargs['infra_type'].value is not None:
@@ -446,9 +622,11 @@ class JenkinsJobBuilder(SourceExtension):
 
             storage = Storage(cinder_backend=cinder_backend)
 
+            nodes = self._get_nodes(job_fields, **kwargs)
+
             deployment = Deployment(release=release,
                                     infra_type=infra_type,
-                                    nodes=self._get_nodes(path, **kwargs),
+                                    nodes=nodes,
                                     services={},
                                     topology=topology,
                                     network=network,
@@ -13,7 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
 from cibyl.plugins.openstack import Deployment
@@ -35,16 +35,24 @@ class DeploymentGenerator:
     class Tools:
         """Tools the factory will use to do its task.
         """
-        argument_review = ArgumentReview()
+        argument_review: ArgumentReview = field(
+            default_factory=lambda *_: ArgumentReview()
+        )
         """Used to understand what the user desires."""
-        variant_summary = VariantDeploymentFactory()
+        variant_summary: VariantDeploymentFactory = field(
+            default_factory=lambda *_: VariantDeploymentFactory()
+        )
         """Used to get data on a variant's deployment."""
 
-    def __init__(self, tools: Tools = Tools()):
+    def __init__(self, tools: Optional[Tools] = None):
         """Constructor.
 
-        :param tools: The tools this will use.
+        :param tools: The tools this will use. 'None' to let this build its
+            own.
         """
+        if tools is None:
+            tools = DeploymentGenerator.Tools()
+
         self._tools = tools
 
     @property
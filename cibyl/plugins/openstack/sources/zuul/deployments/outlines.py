@@ -20,7 +20,7 @@ from cibyl.plugins.openstack.sources.zuul.tripleo import (
     QuickStartFileCreator, QuickStartPathCreator)
 from cibyl.plugins.openstack.sources.zuul.variants import (
     FeatureSetOverridesSearch, FeatureSetSearch, InfraTypeSearch, NodesSearch,
-    ReleaseNameSearch)
+    ReleaseNameSearch, VariableSearch)
 from cibyl.sources.zuul.transactions import VariantResponse as Variant
 from tripleo.insights import DeploymentOutline
 
@@ -49,6 +49,19 @@ class OverridesCollector:
         )
         """Checks whether there is an override for 'infra_type'."""
 
+        @staticmethod
+        def sharing(
+            variables: VariableSearch.Tools
+        ) -> 'OverridesCollector.Tools':
+            """
+            :param variables: Tools for all searches to share.
+            :return: Tools whose searches share what they resolve.
+            """
+            return OverridesCollector.Tools(
+                fs_overrides_search=FeatureSetOverridesSearch(tools=variables),
+                infra_type_search=InfraTypeSearch(tools=variables)
+            )
+
     def __init__(
         self,
         defaults: Defaults = Defaults(),
@@ -156,13 +169,31 @@ class FilesFetcher:
         """Factory for creating the name of files at the QuickStart repo."""
         quickstart_paths = QuickStartPathCreator()
         """Factory for creating paths relative to the QuickStart repo root."""
-        featureset_search = FeatureSetSearch()
+        featureset_search: FeatureSetSearch = field(
+            default_factory=lambda *_: FeatureSetSearch()
+        )
         """Takes care of finding the featureset of the outline."""
-        nodes_search = NodesSearch()
+        nodes_search: NodesSearch = field(
+            default_factory=lambda *_: NodesSearch()
+        )
         """Takes care of finding the nodes of the outline."""
-        release_search = ReleaseNameSearch()
+        release_search: ReleaseNameSearch = field(
+            default_factory=lambda *_: ReleaseNameSearch()
+        )
         """Takes care of finding the release of the outline."""
 
+        @staticmethod
+        def sharing(variables: VariableSearch.Tools) -> 'FilesFetcher.Tools':
+            """
+            :param variables: Tools for all searches to share.
+            :return: Tools whose searches share what they resolve.
+            """
+            return FilesFetcher.Tools(
+                featureset_search=FeatureSetSearch(tools=variables),
+                nodes_search=NodesSearch(tools=variables),
+                release_search=ReleaseNameSearch(tools=variables)
+            )
+
     def __init__(self, tools: Tools = Tools()):
         """Constructor.
 
@@ -246,8 +277,27 @@ class OutlineCreator:
     class Tools:
         """Tools the factory will use to do its task.
         """
-        files_fetcher = FilesFetcher()
-        overrides_collector = OverridesCollector()
+        files_fetcher: FilesFetcher = field(
+            default_factory=lambda *_: FilesFetcher()
+        )
+        overrides_collector: OverridesCollector = field(
+            default_factory=lambda *_: OverridesCollector()
+        )
+
+        @staticmethod
+        def sharing(variables: VariableSearch.Tools) -> 'OutlineCreator.Tools':
+            """
+            :param variables: Tools for all searches to share.
+            :return: Tools whose searches share what they resolve.
+            """
+            return OutlineCreator.Tools(
+                files_fetcher=FilesFetcher(
+                    FilesFetcher.Tools.sharing(variables)
+                ),
+                overrides_collector=OverridesCollector(
+                    tools=OverridesCollector.Tools.sharing(variables)
+                )
+            )
 
     def __init__(self, tools: Tools = Tools()):
         """Constructor.
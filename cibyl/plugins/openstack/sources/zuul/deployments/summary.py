@@ -13,7 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Iterable, Optional
 
 from cached_property import cached_property
@@ -21,7 +21,8 @@ from cached_property import cached_property
 from cibyl.plugins.openstack.node import Node
 from cibyl.plugins.openstack.sources.zuul.deployments.outlines import \
     OutlineCreator
-from cibyl.plugins.openstack.sources.zuul.variants import ReleaseSearch
+from cibyl.plugins.openstack.sources.zuul.variants import (ReleaseSearch,
+                                                           VariableSearch)
 from cibyl.sources.zuul.transactions import VariantResponse as Variant
 from tripleo.insights import DeploymentLookUp, DeploymentSummary
 
@@ -34,13 +35,34 @@ class VariantDeployment:
     class Tools:
         """The tools this uses to do its task.
         """
-        outline_creator = OutlineCreator()
+        outline_creator: OutlineCreator = field(
+            default_factory=lambda *_: OutlineCreator()
+        )
         """Tests care of creating the TripleO outline for a Zuul job."""
-        deployment_lookup = DeploymentLookUp()
+        deployment_lookup: DeploymentLookUp = field(
+            default_factory=lambda *_: DeploymentLookUp()
+        )
         """Gets additional information on the deployment from TripleO."""
-        release_search = ReleaseSearch()
+        release_search: ReleaseSearch = field(
+            default_factory=lambda *_: ReleaseSearch()
+        )
         """Takes care of finding the release of the deployment."""
 
+        @staticmethod
+        def sharing(
+            variables: VariableSearch.Tools
+        ) -> 'VariantDeployment.Tools':
+            """
+            :param variables: Tools for all searches to share.
+            :return: Tools whose searches share what they resolve.
+            """
+            return VariantDeployment.Tools(
+                outline_creator=OutlineCreator(
+                    OutlineCreator.Tools.sharing(variables)
+                ),
+                release_search=ReleaseSearch(tools=variables)
+            )
+
     def __init__(self, variant: Variant, tools: Tools = Tools()):
         """Constructor.
 
@@ -178,11 +200,32 @@ class VariantDeployment:
 
 class VariantDeploymentFactory:
     """Builds instances of :class:`VariantDeployment`.
+
+    All deployments coming from the same factory share their tools, so the
+    variables of a variant are only resolved once for all of them.
     """
 
+    def __init__(self, tools: Optional[VariantDeployment.Tools] = None):
+        """Constructor.
+
+        :param tools: Tools given to the deployments. 'None' to let this
+            build its own.
+        """
+        if tools is None:
+            tools = VariantDeployment.Tools.sharing(VariableSearch.Tools())
+
+        self._tools = tools
+
+    @property
+    def tools(self) -> VariantDeployment.Tools:
+        """
+        :return: Tools given to the deployments.
+        """
+        return self._tools
+
     def create_for(self, variant: Variant) -> VariantDeployment:
         """
         :param variant: The variant to get the deployment for.
         :return: A new instance.
         """
-        return VariantDeployment(variant)
+        return VariantDeployment(variant, self.tools)
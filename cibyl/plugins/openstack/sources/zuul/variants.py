@@ -20,8 +20,8 @@ from typing import Any, Iterable, Optional, Tuple
 from overrides import overrides
 
 from cibyl.sources.zuul.transactions import VariantResponse
-from cibyl.sources.zuul.utils.variants.hierarchy import \
-    RecursiveVariableSearchFactory
+from cibyl.sources.zuul.utils.variants.hierarchy import (
+    RecursiveVariableSearchFactory, Variables)
 
 LOG = logging.getLogger(__name__)
 
@@ -37,7 +37,9 @@ class VariableSearch:
         variables: RecursiveVariableSearchFactory = field(
             default_factory=lambda: RecursiveVariableSearchFactory()
         )
-        """Gets all the variables that affect a certain variant."""
+        """Gets all the variables that affect a certain variant. Share it
+        between searches for them to only resolve the variables of a variant
+        once."""
 
     def __init__(
         self,
@@ -86,6 +88,15 @@ class VariableSearch:
         """
         variables = self.tools.variables.from_variant(variant).search()
 
+        return self.pick(variables)
+
+    def pick(self, variables: Variables) -> Optional[Tuple[str, Any]]:
+        """Chooses the target variable among some already resolved ones.
+
+        :param variables: The variables to choose from.
+        :return: The name of the found variable next to its value. None if
+            the variable was not found.
+        """
         for search_term in self.search_terms:
             if search_term in variables:
                 return search_term, variables[search_term]
@@ -116,7 +127,11 @@ class ReleaseSearch(VariableSearch):
     def search(self, variant: VariantResponse) -> Optional[Tuple[str, str]]:
         LOG.debug("Searching for release on variant: '%s'.", variant.name)
 
-        result = super().search(variant)
+        return super().search(variant)
+
+    @overrides
+    def pick(self, variables: Variables) -> Optional[Tuple[str, str]]:
+        result = super().pick(variables)
 
         # The release was not found
         if not result:
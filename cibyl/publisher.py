@@ -17,12 +17,15 @@ import json
 import logging
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 
 from cibyl.cli.output import OutputStyle
 from cibyl.cli.query import QueryType
 from cibyl.models.ci.base.environment import Environment
+from cibyl.models.ci.base.system import System
 from cibyl.outputs.cli.ci.env.factory import CIPrinterFactory
+from cibyl.outputs.cli.history import print_test_history
+from cibyl.utils.history import TestHistory, TestStats
 from kernel.tools.fs import File
 
 LOG = logging.getLogger(__name__)
@@ -48,8 +51,15 @@ class Publisher(ABC):
         self.query = query
         self.verbosity = verbosity
         self.output_file = output_file
-        self.printer = CIPrinterFactory.from_style(self.style, self.query,
-                                                   self.verbosity)
+        self.printer = self._create_printer()
+
+    def _create_printer(self):
+        """Create the printer that will turn environments into text.
+
+        :returns: The printer for the chosen style
+        """
+        return CIPrinterFactory.from_style(self.style, self.query,
+                                           self.verbosity)
 
     @abstractmethod
     def publish(self, environment: Environment) -> None:
@@ -133,7 +143,63 @@ class JSONPublisher(Publisher):
         )
 
 
-PUBLISHER_TYPE = Union[PrintPublisher, JSONPublisher]
+class TestHistoryPublisher(Publisher):
+    """Publisher for the test history output. Instead of the environments
+    themselves, it prints a summary of how each test behaved across all the
+    builds found on them, once all queries have finished."""
+
+    def __init__(self, target: PublisherTarget = PublisherTarget.TERMINAL,
+                 style: OutputStyle = OutputStyle.TEST_HISTORY,
+                 query: QueryType = QueryType.NONE,
+                 verbosity: int = 0, output_file: Optional[File] = None,
+                 min_failure_rate: float = 0.0,
+                 last_builds: Optional[int] = None):
+        """Constructor.
+
+        :param min_failure_rate: Percentage of runs a test must have failed
+            on to be reported.
+        :param last_builds: Number of the most recent builds of each job to
+            take into account. All of them if None.
+        """
+        super().__init__(target=target, style=style, query=query,
+                         verbosity=verbosity, output_file=output_file)
+        self.min_failure_rate = min_failure_rate
+        self.history = TestHistory(last_builds=last_builds)
+        self._summarized = set()
+
+    def _create_printer(self):
+        """The test history is not printed through the environment printers.
+        """
+        return None
+
+    def add_tests_stats(self, system: System,
+                        stats: Iterable[TestStats]) -> None:
+        """Record the statistics of the tests of a system, as calculated by
+        one of its sources. The tests found on the system are not recorded
+        again once its environment is published.
+        """
+        stats = list(stats)
+        if not stats:
+            return
+        self.history.add_stats(stats)
+        self._summarized.add(id(system))
+
+    def publish(self, environment: Environment) -> None:
+        """Record the tests found on the environment for later printing.
+        """
+        for system in environment.systems.value or []:
+            if id(system) not in self._summarized:
+                self.history.add_system(system)
+
+    def finish_publishing(self) -> None:
+        """Print the summary of the tests found on all environments."""
+        self._print_output(
+            print_test_history(self.history, verbosity=self.verbosity,
+                               min_failure_rate=self.min_failure_rate / 100)
+        )
+
+
+PUBLISHER_TYPE = Union[PrintPublisher, JSONPublisher, TestHistoryPublisher]
 
 
 class PublisherFactory:
@@ -143,10 +209,18 @@ class PublisherFactory:
                          style: OutputStyle = OutputStyle.TEXT,
                          query: QueryType = QueryType.NONE,
                          verbosity: int = 0,
-                         output_file: Optional[File] = None) -> PUBLISHER_TYPE:
+                         output_file: Optional[File] = None,
+                         min_failure_rate: float = 0.0,
+                         last_builds: Optional[int] = None) -> PUBLISHER_TYPE:
         if style in (OutputStyle.JSON,):
             return JSONPublisher(target=target, style=style, query=query,
                                  verbosity=verbosity, output_file=output_file)
+        elif style in (OutputStyle.TEST_HISTORY,):
+            return TestHistoryPublisher(target=target, style=style,
+                                        query=query, verbosity=verbosity,
+                                        output_file=output_file,
+                                        min_failure_rate=min_failure_rate,
+                                        last_builds=last_builds)
         else:
             return PrintPublisher(target=target, style=style, query=query,
                                   verbosity=verbosity, output_file=output_file)
@@ -16,13 +16,11 @@
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-from typing import Callable, Dict, List, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 from urllib.parse import urlsplit
 
-from elasticsearch.helpers import scan
-from xsdata.formats.dataclass.parsers import XmlParser
-
 from cibyl.cli.argument import Argument
 from cibyl.cli.ranged_argument import RANGE_OPERATORS
 from cibyl.exceptions.elasticsearch import ElasticSearchError
@@ -31,12 +29,24 @@ from cibyl.models.ci.base.build import Build
 from cibyl.models.ci.base.job import Job
 from cibyl.models.ci.base.test import Test
 from cibyl.sources.elasticsearch.client import ElasticSearchClient
+from cibyl.sources.elasticsearch.msearch import multi_search
+from cibyl.sources.elasticsearch.query import (build_query, get_builds_clauses,
+                                               get_completed_build_clauses,
+                                               get_jobs_clauses,
+                                               job_builds_clauses,
+                                               last_build_query,
+                                               newest_build_query,
+                                               per_test_stats_query,
+                                               regex_clause)
+from cibyl.sources.elasticsearch.scan import sliced_scan
 from cibyl.sources.server import ServerSource
 from cibyl.sources.source import speed_index
-from cibyl.sources.zuul.utils.tests.tempest.parser import XMLTempestTestSuite
-from cibyl.utils.filtering import (apply_filters, matches_regex,
+from cibyl.sources.zuul.utils.tests.tempest.parser import (
+    XMLTempestTestCase, XMLTempestTestCaseReader)
+from cibyl.utils.filtering import (iter_filters, matches_regex,
                                    satisfy_case_insensitive_match,
                                    satisfy_exact_match, satisfy_regex_match)
+from cibyl.utils.history import TestStats
 from cibyl.utils.models import LastBuildEnum, has_builds_job, has_tests_job
 
 LOG = logging.getLogger(__name__)
@@ -64,7 +74,8 @@ def get_build_filters(**kwargs: Argument) -> List[Callable]:
     return checks_to_apply
 
 
-def filter_jobs(jobs_found: List[ElkJob], **kwargs) -> List[ElkJob]:
+def filter_jobs(jobs_found: Iterable[ElkJob],
+                **kwargs) -> Iterator[ElkJob]:
     """Filter the result from the Jenkins API according to user input"""
     checks_to_apply = []
 
@@ -86,11 +97,24 @@ def filter_jobs(jobs_found: List[ElkJob], **kwargs) -> List[ElkJob]:
                                        user_input=spec_jobs_name_arg,
                                        field_to_check="job_name"))
 
-    return apply_filters(jobs_found, *checks_to_apply)
+    return iter_filters(jobs_found, *checks_to_apply)
+
+
+def get_test_status(test: XMLTempestTestCase) -> str:
+    """Get the status of a test case out of its XML representation.
+
+    :param test: The test case
+    :returns: The status, as understood by the Test model
+    """
+    if test.failure:
+        return "FAILURE"
+    if test.skipped:
+        return "SKIPPED"
+    return "SUCCESS"
 
 
-def filter_builds(builds_found: List[Dict],
-                  checks_to_apply: List[Callable]) -> List[Dict]:
+def filter_builds(builds_found: Iterable[Dict],
+                  checks_to_apply: List[Callable]) -> Iterator[Dict]:
 
     """Filter the result from ElasticSearch according to user input
     :param builds_found: Collection of builds to filter
@@ -99,12 +123,14 @@ def filter_builds(builds_found: List[Dict],
     functions
     """
 
-    for build in builds_found:
+    def with_str_build_num(build: Dict) -> Dict:
         # ensure that the build number is passed as a string, Jenkins usually
         # sends it as an int
         build["build_num"] = str(build["build_num"])
+        return build
 
-    return apply_filters(builds_found, *checks_to_apply)
+    return iter_filters(map(with_str_build_num, builds_found),
+                        *checks_to_apply)
 
 
 class ElasticSearch(ServerSource):
@@ -113,10 +139,15 @@ class ElasticSearch(ServerSource):
     def __init__(self, driver: str = 'elasticsearch',
                  name: str = "elasticsearch", priority: int = 0,
                  elastic_client: object = None,
-                 enabled: bool = True, url: str = None) -> None:
+                 enabled: bool = True, url: str = None,
+                 scroll_slices: int = 1, tests_index: str = None) -> None:
         super().__init__(name=name, driver=driver, priority=priority,
                          enabled=enabled)
         self.url = url
+        self.scroll_slices = scroll_slices
+        self.tests_index = tests_index
+        # mappings do not change while cibyl runs, so they are asked once
+        self.keyword_fields = {}
         self.es_client = elastic_client
         try:
             url_parsed = urlsplit(self.url)
@@ -149,11 +180,10 @@ class ElasticSearch(ServerSource):
             :rtype: :class:`AttributeDictValue`
         """
 
-        # Empty query for all hits or elements
+        # Narrow down the hits on the server, they are filtered again on
+        # the client to cover what could not be translated
         query_body = {
-            "query": {
-                "match_all": {}
-            },
+            "query": build_query(get_jobs_clauses(**kwargs)),
             "_source": ["job_name", "job_url"]
         }
 
@@ -162,9 +192,9 @@ class ElasticSearch(ServerSource):
             index='logstash_jenkins_jobs_cibyl'
         )
 
-        # make the hits list a flat list of dicts with the job information for
+        # make the hits a flat stream of dicts with the job information for
         # easier filtering
-        hits = [hit['_source'] for hit in hits]
+        hits = (hit['_source'] for hit in hits)
         hits = filter_jobs(hits, **kwargs)
         job_objects = {}
         for hit in hits:
@@ -175,17 +205,28 @@ class ElasticSearch(ServerSource):
 
     def __query_get_hits(self,
                          query: dict,
-                         index: str = '*') -> list:
+                         index: str = '*',
+                         last_build_only: bool = False) -> Iterator[dict]:
         """Perform the search query to ElasticSearch
-        and return all the hits
+        and stream all the hits
+
+        Hits are yielded as they come from the server. If the source was
+        configured with more than one scroll slice, those are read in
+        parallel, and the hits come in no particular order.
 
         :param query: Query to perform
         :type query: dict
         :param index: Index
         :type index: str
-        :return: List of hits.
+        :param last_build_only: Whether to get only the hit for the newest
+            build of each job
+        :type last_build_only: bool
+        :return: Iterator over the hits.
         """
         try:
+            if last_build_only:
+                yield from self.__query_get_last_build_hits(query, index)
+                return
             LOG.debug("Using the following query: %s",
                       str(query).replace("'", '"'))
             # https://github.com/elastic/elasticsearch-py/issues/91
@@ -198,20 +239,136 @@ class ElasticSearch(ServerSource):
                 )
                 aggregation_key = list(results['aggregations'].keys())[0]
                 buckets = results['aggregations'][aggregation_key]['buckets']
-                return buckets
+                yield from buckets
+                return
             # For normal queries we can use the scan helper
-            hits = [item for item in scan(
+            yield from sliced_scan(
                 self.es_client.connection,
                 index=index,
                 query=query,
+                slices=self.scroll_slices,
                 size=10000
-            )]
-            return hits
+            )
         except Exception as exception:
             raise ElasticSearchError(
                 "Error getting the results."
             ) from exception
 
+    def __query_get_last_build_hits(self, query: dict,
+                                    index: str) -> Iterator[dict]:
+        """Perform the search query to ElasticSearch, letting it select the
+        hit for the newest build of each job, so that no other build is
+        transferred.
+
+        :param query: Query to perform
+        :type query: dict
+        :param index: Index
+        :type index: str
+        :return: Iterator over the hits, one per job.
+        """
+        job_field = self.__get_keyword_field('job_name', index)
+
+        def last_build_body(after: Optional[dict]) -> dict:
+            return last_build_query(
+                query=query['query'],
+                source=query['_source'],
+                job_field=job_field,
+                after=after
+            )
+
+        for bucket in self.__query_composite_buckets(last_build_body, index,
+                                                     aggregation='jobs'):
+            yield from bucket['last_build']['hits']['hits']
+
+    def __query_composite_buckets(self, body: Callable[[Optional[dict]], dict],
+                                  index: str,
+                                  aggregation: str) -> Iterator[dict]:
+        """Walk through all pages of a composite aggregation.
+
+        :param body: Generates the search body for a page, given the key to
+            it. The key is None for the first page.
+        :type body: Callable
+        :param index: Index
+        :type index: str
+        :param aggregation: Name of the composite aggregation on the body
+        :type aggregation: str
+        :return: Iterator over the buckets of the aggregation.
+        """
+        def search_page(after: Optional[dict]) -> dict:
+            page_body = body(after)
+            LOG.debug("Using the following query: %s",
+                      str(page_body).replace("'", '"'))
+            return self.es_client.connection.search(index=index,
+                                                    body=page_body)
+
+        # The next page is requested as soon as the key to it is known, so
+        # that it travels while the buckets of the current one are processed
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = executor.submit(search_page, None)
+            while page:
+                results = page.result()['aggregations'][aggregation]
+                after = results.get('after_key')
+                page = None
+                if results['buckets'] and after:
+                    page = executor.submit(search_page, after)
+                yield from results['buckets']
+
+    def __get_keyword_field(self, field: str, index: str) -> str:
+        """Find out which of a field or its keyword sub-field is the one
+        that can be used for aggregations.
+
+        :param field: Name of the field
+        :type field: str
+        :param index: Index the field belongs to
+        :type index: str
+        :return: Name of the keyword field
+        """
+        return self.__get_keyword_fields([field], index)[0]
+
+    def __get_keyword_fields(self, fields: List[str],
+                             index: str) -> List[str]:
+        """Find out, for each of many fields, which of it or its keyword
+        sub-field is the one that can be used for aggregations. All fields
+        that are not known yet are asked for on a single request.
+
+        :param fields: Name of the fields
+        :type fields: list[str]
+        :param index: Index the fields belong to
+        :type index: str
+        :return: Name of the keyword field of each field, in order
+        """
+        missing = [field for field in fields
+                   if (field, index) not in self.keyword_fields]
+        if missing:
+            found = self.__find_keyword_fields(missing, index)
+            for field in missing:
+                self.keyword_fields[(field, index)] = found[field]
+        return [self.keyword_fields[(field, index)] for field in fields]
+
+    def __find_keyword_fields(self, fields: List[str],
+                              index: str) -> Dict[str, str]:
+        """Ask Elasticsearch for the mapping of some fields to find out
+        which of each or its keyword sub-field can be used for aggregations.
+
+        :param fields: Name of the fields
+        :type fields: list[str]
+        :param index: Index the fields belong to
+        :type index: str
+        :return: Name of the keyword field of each field
+        """
+        mappings = self.es_client.connection.indices.get_field_mapping(
+            fields=[name for field in fields
+                    for name in (field, f'{field}.keyword')],
+            index=index
+        )
+        result = {field: f'{field}.keyword' for field in fields}
+        for index_mappings in mappings.values():
+            for name, mapping in index_mappings['mappings'].items():
+                field_type = mapping['mapping'][name.split('.')[-1]]['type']
+                if field_type == 'keyword' and name in result:
+                    result[name] = name
+        return result
+
     @speed_index({'base': 2})
     def get_builds(self, **kwargs: Argument) -> AttributeDictValue:
         """
@@ -220,18 +377,23 @@ class ElasticSearch(ServerSource):
             :returns: container of jobs with build information from
             elasticsearch server
         """
-        # Empty query for all hits or elements
+        clauses = get_jobs_clauses(**kwargs) + get_builds_clauses(**kwargs)
+        if 'last_completed_build' in kwargs:
+            clauses += get_completed_build_clauses()
+
+        # Narrow down the hits on the server, they are filtered again on
+        # the client to cover what could not be translated
         query_body = {
-            "query": {
-                "match_all": {}
-            },
+            "query": build_query(clauses),
             "_source": ["job_name", "job_url", "build_num", "build_result",
                         "build_duration"]
         }
 
         hits = self.__query_get_hits(
             query=query_body,
-            index='logstash_jenkins_jobs_cibyl'
+            index='logstash_jenkins_jobs_cibyl',
+            last_build_only=('last_build' in kwargs or
+                             'last_completed_build' in kwargs)
         )
 
         # keep track if there is any flag that would
@@ -241,9 +403,9 @@ class ElasticSearch(ServerSource):
         build_filters = get_build_filters(**kwargs)
         filtering_builds = bool(build_filters)
 
-        # make the hits list a flat list of dicts with the job information for
+        # make the hits a flat stream of dicts with the job information for
         # easier filtering
-        hits = [hit['_source'] for hit in hits]
+        hits = (hit['_source'] for hit in hits)
         hits = filter_jobs(hits, **kwargs)
         hits = filter_builds(hits, build_filters)
         jobs_found = {}
@@ -330,21 +492,25 @@ class ElasticSearch(ServerSource):
         """
         self.check_builds_for_test(**kwargs)
 
-        # Empty query for all hits or elements
+        # Narrow down the hits on the server, they are filtered again on
+        # the client to cover what could not be translated
         query_body = {
-            "query": {
-                "match_all": {}
-            },
+            "query": build_query(
+                get_jobs_clauses(**kwargs) + get_builds_clauses(**kwargs)
+            ),
             "_source": ["job_name", "job_url", "build_num", "build_result",
                         "build_duration", "test_results_*"]
         }
+        # with --last-build, let the server pick the build so that the test
+        # results of any other are never transferred
         hits = self.__query_get_hits(
             query=query_body,
-            index='logstash_jenkins_jobs_cibyl'
+            index='logstash_jenkins_jobs_cibyl',
+            last_build_only='last_build' in kwargs
         )
-        # make the hits list a flat list of dicts with the job information for
+        # make the hits a flat stream of dicts with the job information for
         # easier filtering
-        hits = [hit['_source'] for hit in hits]
+        hits = (hit['_source'] for hit in hits)
         build_filters = get_build_filters(**kwargs)
         hits = filter_jobs(hits, **kwargs)
         hits = filter_builds(hits, build_filters)
@@ -369,6 +535,33 @@ class ElasticSearch(ServerSource):
         if 'test_duration' in kwargs:
             test_duration_arguments = kwargs.get('test_duration').value
             tests_filtering |= bool(test_duration_arguments)
+
+        def accepts_test(test: XMLTempestTestCase) -> bool:
+            """Check, before building any model for it, whether a test case
+            satisfies the user input."""
+            # check if necessary to filter by test name or by
+            # test class name:
+            if tests_pattern:
+                matches_test_name = matches_regex(tests_pattern, test.name)
+                matches_test_class = (test.classname is not None and
+                                      matches_regex(tests_pattern,
+                                                    test.classname))
+                if not (matches_test_class or matches_test_name):
+                    return False
+            # Check if necessary filter by Test Status:
+            if test_result_argument and \
+                    get_test_status(test) not in test_result_argument:
+                return False
+
+            if test_duration_arguments and \
+               not self.match_filter_test_by_duration(
+                   test.time,
+                   test_duration_arguments):
+                return False
+            return True
+
+        # a single reader streams through the results of all builds
+        xml_reader = XMLTempestTestCaseReader()
         jobs_found = {}
         for build in hits:
             job_name = build['job_name']
@@ -388,51 +581,21 @@ class ElasticSearch(ServerSource):
                                                  build_duration))
             test_suites = [key for key in build if
                            key.startswith("test_results_")]
-            xml_parser = XmlParser()
             for test_suite in test_suites:
-                tests = xml_parser.from_string(build[test_suite],
-                                               XMLTempestTestSuite)
-
-                for test in tests.testcase:
-                    test_name = test.name
-                    test_status = "SUCCESS"
-                    if test.skipped:
-                        test_status = "SKIPPED"
-                    if test.failure:
-                        test_status = "FAILURE"
-                    class_name = test.classname
+                for test in xml_reader.read_string(build[test_suite],
+                                                   accepts_test):
+                    test_status = get_test_status(test)
                     test_duration = test.time
-                    # check if necessary to filter by test name or by
-                    # test class name:
-                    if tests_pattern:
-                        matches_test_name = matches_regex(tests_pattern,
-                                                          test_name)
-                        matches_test_class = (class_name is not None and
-                                              matches_regex(tests_pattern,
-                                                            class_name))
-                        if not (matches_test_class or matches_test_name):
-                            continue
-                    # Check if necessary filter by Test Status:
-                    if test_result_argument and \
-                            test_status not in test_result_argument:
-                        continue
-
-                    if test_duration_arguments and \
-                       not self.match_filter_test_by_duration(
-                           test_duration,
-                           test_duration_arguments):
-                        continue
-
                     # Duration comes in seconds. Convert to ms:
                     if test_duration:
                         test_duration *= 1000
 
                     jobs_found[job_name].builds[build_id].add_test(
                         Test(
-                            name=test_name,
+                            name=test.name,
                             result=test_status,
                             duration=test_duration,
-                            class_name=class_name
+                            class_name=test.classname
                         )
                     )
 
@@ -449,6 +612,161 @@ class ElasticSearch(ServerSource):
 
         return AttributeDictValue("jobs", attr_type=Job, value=final_jobs)
 
+    def get_tests_stats(self, last_builds: Optional[int] = None,
+                        percents: Iterable[float] = (50, 90, 99),
+                        **kwargs: Argument) -> List[TestStats]:
+        """
+            Summarize how each test behaved over a collection of builds.
+            The calculations are done by Elasticsearch, over an index
+            with one document per test run.
+
+            :param last_builds: Only consider this number of the most
+            recent builds of each job. All builds are considered if None.
+            :param percents: Percentiles of the test duration to calculate
+            :returns: The statistics of each test, per job
+            :raises ElasticSearchError: If the source has no index with the
+            test runs
+        """
+        if not self.tests_index:
+            raise ElasticSearchError(
+                "An index with test runs ('tests_index') is needed to "
+                "calculate test statistics."
+            )
+
+        index = self.tests_index
+        try:
+            job_field, name_field, class_field = self.__get_keyword_fields(
+                ['job_name', 'test_name', 'test_class_name'], index
+            )
+        except Exception as exception:
+            raise ElasticSearchError(
+                "Error getting the mapping of the test runs."
+            ) from exception
+
+        clauses = get_jobs_clauses(**kwargs) + get_builds_clauses(**kwargs)
+
+        def newest_build_body(after: Optional[dict]) -> dict:
+            return newest_build_query(
+                query=build_query(clauses),
+                job_field=job_field,
+                after=after
+            )
+
+        # Resolve the jobs first, so that any job filter Elasticsearch could
+        # not apply is still honored before aggregating
+        newest_builds = {}
+        try:
+            for bucket in self.__query_composite_buckets(newest_build_body,
+                                                         index,
+                                                         aggregation='jobs'):
+                newest_builds[bucket['key']['job_name']] = \
+                    bucket['newest_build']['value']
+        except Exception as exception:
+            raise ElasticSearchError(
+                "Error getting the results."
+            ) from exception
+
+        jobs = {job['job_name'] for job in filter_jobs(
+            ({'job_name': job} for job in newest_builds), **kwargs
+        )}
+
+        if not jobs:
+            return []
+
+        tests_pattern = None
+        if 'tests' in kwargs and kwargs['tests'].value:
+            patterns = kwargs['tests'].value
+            tests_pattern = re.compile("|".join(patterns))
+            name_clause = regex_clause('test_name', patterns)
+            class_clause = regex_clause('test_class_name', patterns)
+            if name_clause and class_clause:
+                clauses.append({
+                    'bool': {
+                        'should': [name_clause, class_clause],
+                        'minimum_should_match': 1
+                    }
+                })
+
+        percents = list(percents)
+        page_size = 1000
+
+        def per_test_stats_body(job: str, after: Optional[dict]) -> dict:
+            return per_test_stats_query(
+                query=build_query(
+                    clauses + job_builds_clauses(
+                        job_field, job,
+                        newest_build=int(newest_builds[job]),
+                        count=last_builds
+                    )
+                ),
+                name_field=name_field,
+                class_field=class_field,
+                percents=percents,
+                page_size=page_size,
+                after=after
+            )
+
+        # Each job gets its own search, so that its window of builds stays a
+        # couple of clauses no matter how many jobs there are. The searches
+        # of all jobs travel together, a page per job on each round.
+        result = []
+        pending = {job: None for job in sorted(jobs)}
+        try:
+            while pending:
+                responses = multi_search(
+                    self.es_client.connection,
+                    index=index,
+                    bodies=[per_test_stats_body(job, after)
+                            for job, after in pending.items()]
+                )
+
+                next_pending = {}
+                for job, response in zip(pending, responses):
+                    results = response['aggregations']['tests']
+                    buckets = results['buckets']
+                    if len(buckets) == page_size and 'after_key' in results:
+                        next_pending[job] = results['after_key']
+
+                    for bucket in buckets:
+                        name = bucket['key']['name']
+                        class_name = bucket['key']['class_name']
+
+                        if tests_pattern and not (
+                                matches_regex(tests_pattern, name) or
+                                (class_name is not None and
+                                 matches_regex(tests_pattern, class_name))):
+                            continue
+
+                        durations = {
+                            float(percent): value
+                            for percent, value in
+                            bucket['duration']['values'].items()
+                        }
+                        result.append(
+                            TestStats(
+                                job=job,
+                                name=name,
+                                class_name=class_name,
+                                runs=bucket['doc_count'],
+                                failures=bucket['failures']['doc_count'],
+                                skips=bucket['skips']['doc_count'],
+                                flips=None,
+                                durations={
+                                    percent: durations[float(percent)]
+                                    for percent in percents
+                                    if durations.get(float(percent))
+                                    is not None
+                                }
+                            )
+                        )
+                pending = next_pending
+        except Exception as exception:
+            raise ElasticSearchError(
+                "Error getting the results."
+            ) from exception
+
+        return result
+
     def match_filter_test_by_duration(self,
                                       test_duration: float,
                                       test_duration_arguments: list) -> bool:
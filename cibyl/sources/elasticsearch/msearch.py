@@ -0,0 +1,82 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+LOG = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+"""Maximum number of searches sent on a single _msearch request."""
+
+MAX_CONCURRENT_BATCHES = 4
+"""Maximum number of _msearch requests sent at the same time."""
+
+
+class MultiSearchError(Exception):
+    """Raised when one of the searches of an _msearch request failed."""
+
+
+def multi_search(client: object, index: str, bodies: Iterable[dict],
+                 batch_size: int = BATCH_SIZE,
+                 workers: int = MAX_CONCURRENT_BATCHES) -> List[dict]:
+    """Run many independent searches, packing them into as few _msearch
+    requests as possible.
+
+    Searches are split into batches, so that a single request does not get
+    too large for the server, and the batches are sent concurrently.
+
+    :param client: Connection to Elasticsearch.
+    :param index: Index to search on.
+    :param bodies: Body of each of the searches.
+    :param batch_size: Maximum number of searches per request.
+    :param workers: Maximum number of requests sent at the same time.
+    :return: The response to each search, in the order of the bodies.
+    :raises MultiSearchError: If any of the searches failed.
+    """
+    bodies = list(bodies)
+    batches = [
+        bodies[start:start + batch_size]
+        for start in range(0, len(bodies), batch_size)
+    ]
+
+    def send(batch: List[dict]) -> List[dict]:
+        lines = []
+        for body in batch:
+            lines.append({'index': index})
+            lines.append(body)
+
+        LOG.debug("Sending %d searches on a single request", len(batch))
+        responses = client.msearch(body=lines)['responses']
+
+        for response in responses:
+            if 'error' in response:
+                raise MultiSearchError(
+                    f"Search failed with: {response['error']}"
+                )
+
+        return responses
+
+    if len(batches) <= 1:
+        return [response for batch in batches for response in send(batch)]
+
+    with ThreadPoolExecutor(
+            max_workers=min(workers, len(batches))) as executor:
+        return [
+            response
+            for responses in executor.map(send, batches)
+            for response in responses
+        ]
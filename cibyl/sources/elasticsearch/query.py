@@ -0,0 +1,344 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import re
+from typing import Iterable, List, Optional
+
+from cibyl.cli.argument import Argument
+
+LUCENE_COMPATIBLE = re.compile(r"[\w\-.*+?|()\[\]{}/:, ]+")
+"""Python regex patterns made only of these characters mean the same when
+given to Elasticsearch, whose regexp queries follow Lucene's syntax."""
+
+Clause = dict
+"""A query clause, as described by Elasticsearch's query DSL."""
+
+
+def translate_regex(pattern: str) -> Optional[str]:
+    """Translate a Python regex pattern into an Elasticsearch regexp one.
+
+    Lucene patterns must match the whole term, while Python's are searched
+    for anywhere on the string, so the pattern gets surrounded by wildcards
+    unless it was anchored.
+
+    :param pattern: The Python pattern.
+    :return: The equivalent Lucene pattern. None if the pattern uses syntax
+        which cannot be safely translated.
+    """
+    prefix = suffix = '.*'
+
+    if pattern.startswith('^'):
+        pattern = pattern[1:]
+        prefix = ''
+
+    if pattern.endswith('$'):
+        pattern = pattern[:-1]
+        suffix = ''
+
+    if not LUCENE_COMPATIBLE.fullmatch(pattern):
+        return None
+
+    if '(?' in pattern:
+        # Python only group extensions
+        return None
+
+    if '|' in pattern and not (prefix and suffix):
+        # Anchors only bind to the first or last alternative
+        return None
+
+    return f'{prefix}({pattern}){suffix}'
+
+
+def on_field(field: str, query: str, value: object) -> Clause:
+    """Generate a clause that applies a query to a field, whether it is
+    mapped as a keyword or as text with a keyword sub-field.
+
+    :param field: Name of the field.
+    :param query: Type of query, for example: 'terms' or 'regexp'.
+    :param value: Value for the query.
+    :return: The clause.
+    """
+    return {
+        'bool': {
+            'should': [
+                {query: {field: value}},
+                {query: {f'{field}.keyword': value}}
+            ],
+            'minimum_should_match': 1
+        }
+    }
+
+
+def regex_clause(field: str, patterns: Iterable[str]) -> Optional[Clause]:
+    """Generate a clause that matches documents whose field matches any of
+    the given Python regex patterns.
+
+    :param field: Name of the field.
+    :param patterns: The patterns.
+    :return: The clause. None if any of the patterns cannot be translated,
+        in which case the filtering is left to the client.
+    """
+    translated = [translate_regex(pattern) for pattern in patterns]
+
+    if not translated or None in translated:
+        return None
+
+    return {
+        'bool': {
+            'should': [
+                on_field(field, 'regexp', pattern) for pattern in translated
+            ],
+            'minimum_should_match': 1
+        }
+    }
+
+
+def get_jobs_clauses(**kwargs: Argument) -> List[Clause]:
+    """Translate the arguments that filter jobs into query clauses.
+
+    The clauses are meant to reduce the amount of documents coming out of
+    Elasticsearch, but they do not replace the filtering done on the client.
+    When an argument cannot be translated exactly, its clause is either left
+    out or made more permissive.
+
+    :param kwargs: The arguments.
+    :return: The clauses, to be AND'd together.
+    """
+    clauses = []
+
+    jobs_arg = kwargs.get('jobs')
+    if jobs_arg and jobs_arg.value:
+        clause = regex_clause('job_name', jobs_arg.value)
+        if clause:
+            clauses.append(clause)
+
+    jobs_scope_arg = kwargs.get('jobs_scope')
+    if jobs_scope_arg:
+        clause = regex_clause('job_name', [jobs_scope_arg])
+        if clause:
+            clauses.append(clause)
+
+    spec_arg = kwargs.get('spec')
+    if spec_arg and spec_arg.value:
+        clauses.append(on_field('job_name', 'terms', list(spec_arg.value)))
+
+    return clauses
+
+
+def get_builds_clauses(**kwargs: Argument) -> List[Clause]:
+    """Translate the arguments that filter builds into query clauses.
+
+    Like with :func:`get_jobs_clauses`, these do not replace the filtering
+    done on the client.
+
+    :param kwargs: The arguments.
+    :return: The clauses, to be AND'd together.
+    """
+    clauses = []
+
+    builds_arg = kwargs.get('builds')
+    if builds_arg and builds_arg.value:
+        builds = [str(build) for build in builds_arg.value]
+        # Non-numeric values would make the query fail on numeric mappings
+        if all(build.isdigit() for build in builds):
+            clauses.append({'terms': {'build_num': builds}})
+
+    build_status_arg = kwargs.get('build_status')
+    if build_status_arg and build_status_arg.value:
+        # Client side filtering is case-insensitive
+        statuses = set()
+        for status in build_status_arg.value:
+            statuses.update({status, status.upper(), status.lower()})
+        clauses.append(on_field('build_result', 'terms', sorted(statuses)))
+
+    return clauses
+
+
+def build_query(clauses: List[Clause]) -> Clause:
+    """Put together a query out of a collection of clauses.
+
+    :param clauses: The clauses, which all must be satisfied.
+    :return: The query.
+    """
+    if not clauses:
+        return {'match_all': {}}
+
+    return {'bool': {'filter': clauses}}
+
+
+def last_build_query(query: Clause, source: List[str], job_field: str,
+                     page_size: int = 1000,
+                     after: Optional[dict] = None) -> dict:
+    """Generate a search body that groups the documents matching a query by
+    job and keeps only the one for the newest build on each group.
+
+    The grouping is done through a composite aggregation, so that jobs can be
+    walked through page by page.
+
+    :param query: Query documents have to match.
+    :param source: Fields to retrieve from the documents.
+    :param job_field: Keyword field holding the job name.
+    :param page_size: Number of jobs per page.
+    :param after: Key of the last job of the previous page. None to start
+        from the first page.
+    :return: The search body.
+    """
+    composite = {
+        'size': page_size,
+        'sources': [{'job_name': {'terms': {'field': job_field}}}]
+    }
+
+    if after:
+        composite['after'] = after
+
+    return {
+        'size': 0,
+        'query': query,
+        'aggs': {
+            'jobs': {
+                'composite': composite,
+                'aggs': {
+                    'last_build': {
+                        'top_hits': {
+                            'size': 1,
+                            'sort': [{'build_num': {'order': 'desc'}}],
+                            '_source': source
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+
+def get_completed_build_clauses() -> List[Clause]:
+    """Get the clauses that keep only completed builds, understood as those
+    that did not fail.
+
+    :return: The clauses, to be AND'd together.
+    """
+    return [on_field('build_result', 'terms', ['SUCCESS', 'UNSTABLE'])]
+
+
+def job_builds_clauses(job_field: str, job: str,
+                       newest_build: Optional[int] = None,
+                       count: Optional[int] = None) -> List[Clause]:
+    """Generate the clauses that match the documents of a job, optionally
+    only those of its most recent builds.
+
+    Builds are expected to be numbered consecutively, as Jenkins does.
+
+    :param job_field: Keyword field holding the job name.
+    :param job: Name of the job.
+    :param newest_build: Number of the newest build of the job.
+    :param count: Number of builds to keep. All are kept if None.
+    :return: The clauses, to be AND'd together.
+    """
+    result = [{'term': {job_field: job}}]
+
+    if count and newest_build is not None:
+        result.append({'range': {'build_num': {'gt': newest_build - count}}})
+
+    return result
+
+
+def newest_build_query(query: Clause, job_field: str,
+                       page_size: int = 1000,
+                       after: Optional[dict] = None) -> dict:
+    """Generate a search body that finds the number of the newest build of
+    each job.
+
+    :param query: Query documents have to match.
+    :param job_field: Keyword field holding the job name.
+    :param page_size: Number of jobs per page.
+    :param after: Key of the last job of the previous page. None to start
+        from the first page.
+    :return: The search body.
+    """
+    composite = {
+        'size': page_size,
+        'sources': [{'job_name': {'terms': {'field': job_field}}}]
+    }
+
+    if after:
+        composite['after'] = after
+
+    return {
+        'size': 0,
+        'query': query,
+        'aggs': {
+            'jobs': {
+                'composite': composite,
+                'aggs': {
+                    'newest_build': {'max': {'field': 'build_num'}}
+                }
+            }
+        }
+    }
+
+
+def per_test_stats_query(query: Clause, name_field: str,
+                         class_field: str, percents: List[float],
+                         page_size: int = 1000,
+                         after: Optional[dict] = None) -> dict:
+    """Generate a search body that summarizes the results of each test case
+    over the documents matching a query, one per test run.
+
+    :param query: Query documents have to match.
+    :param name_field: Keyword field holding the name of the test.
+    :param class_field: Keyword field holding the class of the test.
+    :param percents: Percentiles of the duration to calculate.
+    :param page_size: Number of tests per page.
+    :param after: Key of the last test of the previous page. None to start
+        from the first page.
+    :return: The search body.
+    """
+    composite = {
+        'size': page_size,
+        'sources': [
+            {'class_name': {'terms': {'field': class_field,
+                                      'missing_bucket': True}}},
+            {'name': {'terms': {'field': name_field}}}
+        ]
+    }
+
+    if after:
+        composite['after'] = after
+
+    return {
+        'size': 0,
+        'query': query,
+        'aggs': {
+            'tests': {
+                'composite': composite,
+                'aggs': {
+                    'failures': {
+                        'filter': on_field('test_result', 'terms',
+                                           ['FAILURE', 'failure'])
+                    },
+                    'skips': {
+                        'filter': on_field('test_result', 'terms',
+                                           ['SKIPPED', 'skipped'])
+                    },
+                    'duration': {
+                        'percentiles': {
+                            'field': 'test_duration',
+                            'percents': percents
+                        }
+                    }
+                }
+            }
+        }
+    }
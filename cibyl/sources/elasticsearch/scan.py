@@ -0,0 +1,110 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Full, Queue
+from threading import Event
+from typing import Iterator, Optional
+
+from elasticsearch.helpers import scan
+
+LOG = logging.getLogger(__name__)
+
+PUT_TIMEOUT = 0.1
+"""Seconds a slice reader waits for room on the queue before checking
+whether it was told to stop."""
+
+
+class _SliceEnd:
+    """Marks that a slice has no more hits to give."""
+
+    def __init__(self, error: Optional[Exception] = None):
+        """Constructor.
+
+        :param error: Exception that made the slice stop early, if any.
+        """
+        self.error = error
+
+
+def sliced_scan(client: object, index: str, query: dict, slices: int,
+                size: int = 10000) -> Iterator[dict]:
+    """Scroll through all documents matching a query, reading several
+    slices of the result at once.
+
+    Each slice is scrolled on its own thread, but hits are yielded as soon
+    as they arrive, so that no more than a page of them is held in memory
+    per slice.
+
+    :param client: Connection to Elasticsearch.
+    :param index: Index to search on.
+    :param query: Search body.
+    :param slices: Number of slices to split the scroll into.
+    :param size: Number of hits to fetch per request.
+    :return: The hits, in no particular order.
+    :raises Exception: Whichever error made a slice fail.
+    """
+    if slices <= 1:
+        yield from scan(client, index=index, query=query, size=size)
+        return
+
+    LOG.debug("Scrolling through index '%s' on %d slices", index, slices)
+
+    hits = Queue(maxsize=size)
+    stop = Event()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                hits.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except Full:
+                continue
+        return False
+
+    def read_slice(slice_id: int) -> None:
+        body = dict(query)
+        body['slice'] = {'id': slice_id, 'max': slices}
+        try:
+            for hit in scan(client, index=index, query=body, size=size):
+                if not put(hit):
+                    return
+        except Exception as ex:
+            put(_SliceEnd(ex))
+            return
+        put(_SliceEnd())
+
+    with ThreadPoolExecutor(max_workers=slices) as executor:
+        for slice_id in range(slices):
+            executor.submit(read_slice, slice_id)
+
+        try:
+            pending = slices
+            while pending:
+                item = hits.get()
+                if isinstance(item, _SliceEnd):
+                    if item.error:
+                        raise item.error
+                    pending -= 1
+                    continue
+                yield item
+        finally:
+            # Let any slice still running know that nobody is listening
+            stop.set()
+            while True:
+                try:
+                    hits.get_nowait()
+                except Empty:
+                    break
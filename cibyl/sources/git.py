@@ -15,7 +15,10 @@
 """
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from pathlib import Path
 from urllib.parse import urlparse
 
 from git import Repo
@@ -28,6 +31,10 @@ LOG = logging.getLogger(__name__)
 safe_request = partial(safe_request_generic,
                        custom_error=GitError)
 
+LAST_SYNC_FILE = "cibyl-last-sync"
+"""File, inside the repository's git directory, whose modification time
+records the last time the repository was synced with its remote."""
+
 
 class GitSource(Source):
     """A class representation of a Git-based source."""
@@ -35,16 +42,27 @@ class GitSource(Source):
     # pylint: disable=too-many-arguments
     def __init__(self, repos: dict = None,
                  enabled: bool = True, priority: int = 0,
-                 name: str = "git", driver: str = None):
+                 name: str = "git", driver: str = None,
+                 sync_workers: int = 1, pull_interval: int = 0):
         """Create a client to talk to a jenkins job definitions instance.
 
-        :param repos: A dictionary of repositories to clone
+        :param repos: A dictionary of repositories to clone. Besides its
+            'url', 'dest' and 'branch', each repository can define the
+            'depth' and 'filter' to clone it with.
         :type repos: dict
+        :param sync_workers: Number of repositories to clone or pull at the
+            same time.
+        :type sync_workers: int
+        :param pull_interval: Minimum number of seconds that have to pass
+            since a repository was last synced before pulling it again.
+        :type pull_interval: int
         """
         super().__init__(name, driver=driver,
                          enabled=enabled, priority=priority)
         self.repos = repos
         self.defaut_clone_dir = os.path.expanduser("~/.cibyl")
+        self.sync_workers = sync_workers
+        self.pull_interval = pull_interval
 
     def setup(self):
         """Clone the repositories specified by the 'repos' argument/field."""
@@ -77,35 +95,95 @@ class GitSource(Source):
 
     def ensure_repos_present(self):
         """Ensure that the repository with job definitions is present."""
-        for repo in self.repos:
-            if repo.get('cloned'):
-                continue
-            dest = repo.get('dest')
-            url = repo.get('url')
-            if not os.path.exists(os.path.join(dest, ".git")):
-                LOG.debug("cloning repository %s to %s", url, dest)
-                self.get_repo()
-            else:
-                LOG.debug("Repository %s found in %s, pulling latest changes",
-                          url, dest)
-                self.pull_latest_changes(dest)
-                repo['cloned'] = True
+        repos = [repo for repo in self.repos if not repo.get('cloned')]
+
+        if self.sync_workers <= 1 or len(repos) <= 1:
+            for repo in repos:
+                self._sync_repo(repo)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.sync_workers) as executor:
+            # consume the results so that errors get raised here
+            list(executor.map(self._sync_repo, repos))
+
+    def _sync_repo(self, repo):
+        """Clone a repository, or pull its latest changes if it is already
+        present and was not synced recently.
+
+        :param repo: The repository to sync.
+        :type repo: dict
+        """
+        dest = repo.get('dest')
+        url = repo.get('url')
+        if not os.path.exists(os.path.join(dest, ".git")):
+            LOG.debug("cloning repository %s to %s", url, dest)
+            self.get_repo(repo)
+        elif self._is_synced_recently(repo):
+            LOG.debug("Repository %s found in %s, synced less than %d "
+                      "seconds ago", url, dest, self.pull_interval)
+        else:
+            LOG.debug("Repository %s found in %s, pulling latest changes",
+                      url, dest)
+            self.pull_latest_changes(repo)
+        repo['cloned'] = True
+
+    def _is_synced_recently(self, repo):
+        """Check whether a repository was synced with its remote within the
+        configured pull interval.
+
+        :param repo: The repository to check.
+        :type repo: dict
+        :rtype: bool
+        """
+        if not self.pull_interval:
+            return False
+
+        path = os.path.join(repo.get('dest'), ".git", LAST_SYNC_FILE)
+
+        try:
+            last_sync = os.path.getmtime(path)
+        except OSError:
+            return False
+
+        return time.time() - last_sync < self.pull_interval
+
+    @staticmethod
+    def _record_sync(repo):
+        """Record that a repository was just synced with its remote.
+
+        :param repo: The repository to record.
+        :type repo: dict
+        """
+        path = os.path.join(repo.get('dest'), ".git", LAST_SYNC_FILE)
+
+        try:
+            Path(path).touch()
+        except OSError:
+            LOG.debug("Could not record sync of repository %s",
+                      repo.get('dest'))
 
     @safe_request
-    def pull_latest_changes(self, repo_path):
+    def pull_latest_changes(self, repo):
         """Ensure that the repo is up to date."""
-        repo = Repo(repo_path)
-        repo_remote = repo.remotes.origin
-        repo_remote.pull()
+        options = {}
+        if repo.get('depth') is not None:
+            options['depth'] = repo.get('depth')
+        repo_remote = Repo(repo.get('dest')).remotes.origin
+        repo_remote.pull(**options)
+        self._record_sync(repo)
 
     @safe_request
-    def get_repo(self):
+    def get_repo(self, repo):
         """Download git repository for job definitions."""
-        branch_options = []
-        for repo in self.repos:
-            if repo.get('branch') is not None:
-                branch_options = ["-b", repo.get('branch')]
-            LOG.info("Clonning repo: {}".format(repo.get('url')))
-            Repo.clone_from(repo.get('url'),
-                            to_path=repo.get('dest'),
-                            multi_options=branch_options)
+        clone_options = []
+        if repo.get('branch') is not None:
+            clone_options += ["-b", repo.get('branch')]
+        if repo.get('depth') is not None:
+            clone_options.append(f"--depth={repo.get('depth')}")
+        if repo.get('filter') is not None:
+            clone_options.append(f"--filter={repo.get('filter')}")
+        LOG.info("Clonning repo: {}".format(repo.get('url')))
+        Repo.clone_from(repo.get('url'),
+                        to_path=repo.get('dest'),
+                        multi_options=clone_options)
+        self._record_sync(repo)
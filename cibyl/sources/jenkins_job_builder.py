@@ -14,12 +14,17 @@
 #    under the License.
 """
 import logging
+import math
 import os
 import re
 import subprocess
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 from pathlib import Path
+from typing import Callable, List, Optional, TypeVar
+
+from git import InvalidGitRepositoryError, NoSuchPathError, Repo
 
 from cibyl.exceptions.jenkins_job_builder import JenkinsJobBuilderError
 from cibyl.models.attribute import AttributeDictValue
@@ -32,6 +37,53 @@ LOG = logging.getLogger(__name__)
 safe_request = partial(safe_request_generic,
                        custom_error=JenkinsJobBuilderError)
 
+XML_DIR = "out-xml"
+"""Directory, relative to the repository, where tox leaves the generated
+xml files."""
+XML_REVISION_FILE = ".cibyl-revision"
+"""File, inside the xml directory, where the revision the xml files were
+generated from is recorded."""
+CHUNKS_PER_WORKER = 4
+"""Number of pieces the files handed to each worker are split in, so that
+workers that finish early can pick up more work."""
+
+T = TypeVar('T')
+
+
+def get_xml_root_tag(path: Path) -> str:
+    """Get the tag of the top-level element of a xml file, reading no
+    further than its opening.
+
+    :param path: Path to the xml file.
+    :return: The tag.
+    """
+    with open(path, 'rb') as file:
+        for _, element in ET.iterparse(file, events=('start',)):
+            return element.tag
+
+    raise JenkinsJobBuilderError(f"No elements found on: '{path}'.")
+
+
+def map_files(function: Callable[[Path], T],
+              paths: List[Path], workers: int = 1) -> List[T]:
+    """Apply a function to a list of files, spreading the work across a pool
+    of processes if more than one worker is requested.
+
+    :param function: The function to apply. Must be picklable, a module-level
+        one for example.
+    :param paths: The files to apply it to.
+    :param workers: Maximum number of processes to use. 1 or less to apply
+        it on the current process.
+    :return: The result for each file, in the same order as the files.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        return [function(path) for path in paths]
+
+    chunk_size = math.ceil(len(paths) / (workers * CHUNKS_PER_WORKER))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, paths, chunksize=chunk_size))
+
 
 # pylint: disable=no-member
 class JenkinsJobBuilder(GitSource):
@@ -41,19 +93,109 @@ class JenkinsJobBuilder(GitSource):
     def __init__(self, repos: dict = None,
                  enabled: bool = True, priority: int = 0,
                  name: str = "jenkins_job_builder",
-                 driver: str = "jenkins_job_builder"):
-
+                 driver: str = "jenkins_job_builder",
+                 workers: int = 1, sync_workers: int = 1,
+                 pull_interval: int = 0):
+        """Create a client to talk to a jenkins job builder repo.
+
+        :param repos: A dictionary of repositories to clone
+        :type repos: dict
+        :param workers: Number of processes used to parse the generated xml
+            files. 1 to parse them on the current process.
+        :type workers: int
+        :param sync_workers: Number of repositories to clone or pull at the
+            same time.
+        :type sync_workers: int
+        :param pull_interval: Minimum number of seconds that have to pass
+            since a repository was last synced before pulling it again.
+        :type pull_interval: int
+        """
         super().__init__(name=name, repos=repos, driver=driver,
-                         enabled=enabled, priority=priority)
+                         enabled=enabled, priority=priority,
+                         sync_workers=sync_workers,
+                         pull_interval=pull_interval)
+        self.workers = workers
+        self._xml_generated = set()
+
+    @staticmethod
+    def _get_revision(repo: dict) -> Optional[str]:
+        """Get the revision the working tree of a repository is at.
+
+        :param repo: The repository to check.
+        :return: The sha of the commit at HEAD. None if the revision could not
+            be determined or if the working tree has local modifications, as
+            in that case the commit does not identify its contents.
+        """
+        try:
+            git_repo = Repo(repo.get('dest'))
 
-    def _generate_xml(self):
-        """Use tox to generate jenkins job xml files."""
-        for repo in self.repos:
-            subprocess.run(["tox", "-e", "jobs"],
-                           cwd=repo.get('dest'),
-                           check=True,
-                           stdout=subprocess.DEVNULL,
-                           stderr=subprocess.DEVNULL)
+            if git_repo.is_dirty():
+                return None
+
+            return git_repo.head.commit.hexsha
+        except (InvalidGitRepositoryError, NoSuchPathError, ValueError):
+            return None
+
+    @staticmethod
+    def _get_xml_revision(repo: dict) -> Optional[str]:
+        """Get the revision the xml files of a repository were generated from.
+
+        :param repo: The repository to check.
+        :return: The recorded revision. None if there is none.
+        """
+        path = os.path.join(repo.get('dest'), XML_DIR, XML_REVISION_FILE)
+
+        if not os.path.isfile(path):
+            return None
+
+        with open(path, 'r', encoding='utf-8') as file:
+            return file.read().strip()
+
+    def _generate_xml(self, repo: dict) -> None:
+        """Use tox to generate jenkins job xml files.
+
+        :param repo: The repository to generate the files for.
+        """
+        subprocess.run(["tox", "-e", "jobs"],
+                       cwd=repo.get('dest'),
+                       check=True,
+                       stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+
+    def _ensure_xml_generated(self, repo: dict) -> None:
+        """Generate the jenkins job xml files for a repository, unless they
+        were already generated from its current revision.
+
+        :param repo: The repository to generate the files for.
+        """
+        dest = repo.get('dest')
+
+        if dest in self._xml_generated:
+            return
+
+        revision = self._get_revision(repo)
+
+        if revision and revision == self._get_xml_revision(repo):
+            LOG.debug("Xml files at %s are up to date with revision %s.",
+                      dest, revision)
+            self._xml_generated.add(dest)
+            return
+
+        LOG.debug("Generating xml files at %s.", dest)
+        self._generate_xml(repo)
+
+        xml_dir = os.path.join(dest, XML_DIR)
+
+        if revision and os.path.isdir(xml_dir):
+            path = os.path.join(xml_dir, XML_REVISION_FILE)
+
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(revision)
+        elif revision:
+            LOG.debug("No xml files generated at %s, revision not recorded.",
+                      dest)
+
+        self._xml_generated.add(dest)
 
     @speed_index({'base': 1})
     def get_jobs(self, **kwargs):
@@ -76,26 +218,25 @@ class JenkinsJobBuilder(GitSource):
                       xml files
             :rtype: :class:`AttributeDictValue`
         """
-
-        # TODO: generate only if repo was updated AND time elapced
-        # TODO: add --ignore-cashe option and generate if repo was
-        #       updated
-        # TODO: get_jobs_from_repo is called per repo while  _generate_xml
-        #       does the same, potentially introducing a huge overhead if
-        #       more then one repo is specified
-        self._generate_xml()
+        self._ensure_xml_generated(repo)
 
         jobs_arg = kwargs.get('jobs')
         pattern = None
         if jobs_arg:
             pattern = re.compile("|".join(jobs_arg.value))
 
+        xml_dir = Path(os.path.join(repo['dest'], XML_DIR))
+        paths = sorted(xml_dir.rglob("*.xml"))
+        if pattern:
+            # filter jobs according to the user specified regex, before
+            # spending any time reading their files
+            paths = [path for path in paths
+                     if re.search(pattern, path.parent.name)]
+
         jobs_found = []
         self._xml_files = {}
-        for path in Path(os.path.join(repo['dest'],
-                                      "out-xml")).rglob("*.xml"):
-            file_content = ET.parse(path).getroot()
-            file_type = file_content.tag
+        file_types = map_files(get_xml_root_tag, paths, self.workers)
+        for path, file_type in zip(paths, file_types):
             if "folder" in file_type:
                 # if the xml file contains the word folder in the top-level
                 # attribute, then it's probably not a job
@@ -103,14 +244,8 @@ class JenkinsJobBuilder(GitSource):
             # for now we store the job name as the only information, later we
             # will need to see which additional information to pull from the
             # job definition
-            if pattern:
-                if re.search(pattern, path.parent.name):
-                    # filter jobs according to the user specified regex
-                    jobs_found.append(path.parent.name)
-                    self._xml_files[path.parent.name] = path
-            else:
-                jobs_found.append(path.parent.name)
-                self._xml_files[path.parent.name] = path
+            jobs_found.append(path.parent.name)
+            self._xml_files[path.parent.name] = path
 
         jobs = {}
         for job in jobs_found:
@@ -14,8 +14,8 @@
 #    under the License.
 """
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Iterable
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
 
 from deprecation import deprecated
 
@@ -168,6 +168,17 @@ class ZuulBuildAPI(Closeable, ABC):
         """
         raise NotImplementedError
 
+    @classmethod
+    def tests_of(cls, builds) -> List[Iterable[TestSuite]]:
+        """Gets the tests run by many builds at once.
+
+        :param builds: The builds to get the tests for.
+        :type builds: Iterable[:class:`ZuulBuildAPI`]
+        :return: The tests run by each build, in the same order as the
+            builds.
+        """
+        return [build.tests() for build in builds]
+
 
 class ZuulVariantAPI(Closeable, ABC):
     """Interface which defines the information that can be retrieved from
@@ -279,6 +290,23 @@ class ZuulVariantAPI(Closeable, ABC):
         return self._variant
 
 
+@dataclass
+class BuildsQuery:
+    """Conditions that builds must meet, in terms the host can check by
+    itself. Empty conditions are ignored.
+    """
+    projects: List[str] = field(default_factory=list)
+    """Exact names of the projects the builds may belong to."""
+    pipelines: List[str] = field(default_factory=list)
+    """Exact names of the pipelines the builds may come from."""
+    results: List[str] = field(default_factory=list)
+    """Exact results the builds may have ended with."""
+    uuids: List[str] = field(default_factory=list)
+    """Exact UUIDs the builds may have."""
+    limit: Optional[int] = None
+    """Maximum number of builds to retrieve. 'None' for all of them."""
+
+
 class ZuulJobAPI(Closeable, ABC):
     """Interface which defines the information that can be retrieved from
     Zuul regarding a particular job.
@@ -332,10 +360,13 @@ class ZuulJobAPI(Closeable, ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def builds(self):
+    def builds(self, query=None):
         """
-        :return: The builds of this job.
-        :rtype: list[:class:`ZuulBuildAPI`]
+        :param query: Conditions the builds must meet. 'None' for all
+            builds.
+        :type query: :class:`BuildsQuery` or None
+        :return: The builds of this job, from newest to oldest.
+        :rtype: Iterable[:class:`ZuulBuildAPI`]
         :raises ZuulAPIError: If the request failed.
         """
         raise NotImplementedError
@@ -461,6 +492,16 @@ class ZuulTenantAPI(Closeable, JobsProvider, ABC):
         """
         return self._tenant['name']
 
+    @property
+    def host(self):
+        """
+        :return: Identifies the host the tenant lives on, so that tenants
+            with the same name on different hosts can be told apart. 'None'
+            if unknown.
+        :rtype: str or None
+        """
+        return None
+
     @abstractmethod
     def projects(self):
         """A project is the representation of a source code that Zuul is
@@ -483,6 +524,25 @@ class ZuulTenantAPI(Closeable, JobsProvider, ABC):
         """
         raise NotImplementedError
 
+    def jobs_builds(self, jobs, query=None):
+        """Gets the builds of several jobs of this tenant at once.
+
+        By default, builds are asked for job by job. Implementations are
+        encouraged to do better.
+
+        :param jobs: The jobs, all of which must belong to this tenant.
+        :type jobs: Iterable[:class:`ZuulJobAPI`]
+        :param query: Conditions the builds must meet. Its limit applies to
+            the builds of each job. 'None' for all builds.
+        :type query: :class:`BuildsQuery` or None
+        :return: The builds of the jobs, from newest to oldest for each
+            job.
+        :rtype: Iterable[:class:`ZuulBuildAPI`]
+        :raises ZuulAPIError: If the request failed.
+        """
+        for job in jobs:
+            yield from job.builds(query)
+
     @abstractmethod
     @deprecated(details="Access builds through jobs instead.")
     def builds(self):
@@ -18,6 +18,9 @@ from typing import Optional
 from overrides import overrides
 
 from cibyl.sources.zuul.apis.factories.abc import ZuulAPIFactory
+from cibyl.sources.zuul.apis.http import (DEFAULT_ARTIFACTS_CACHE_SIZE,
+                                          DEFAULT_CACHE_SIZE,
+                                          DEFAULT_CACHE_TTL)
 from cibyl.sources.zuul.apis.rest import ZuulRESTClient
 from kernel.tools.urls import URL
 
@@ -26,14 +29,30 @@ class ZuulRESTClientFactory(ZuulAPIFactory[ZuulRESTClient]):
     """Factory for :class:`ZuulRESTClient`.
     """
 
-    def __init__(self, host: URL, cert: Optional[str] = None):
+    def __init__(
+        self,
+        host: URL,
+        cert: Optional[str] = None,
+        cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        cache_dir: Optional[str] = None,
+        cache_size: Optional[float] = DEFAULT_CACHE_SIZE,
+        artifacts_cache_size: Optional[float] = DEFAULT_ARTIFACTS_CACHE_SIZE
+    ):
         """Constructor.
 
         :param host: Address of the Zuul host the API will interact with.
         :param cert: See :meth:`ZuulRESTClient.from_url`
+        :param cache_ttl: See :meth:`ZuulRESTClient.from_url`
+        :param cache_dir: See :meth:`ZuulRESTClient.from_url`
+        :param cache_size: See :meth:`ZuulRESTClient.from_url`
+        :param artifacts_cache_size: See :meth:`ZuulRESTClient.from_url`
         """
         self._host = host
         self._cert = cert
+        self._cache_ttl = cache_ttl
+        self._cache_dir = cache_dir
+        self._cache_size = cache_size
+        self._artifacts_cache_size = artifacts_cache_size
 
     @staticmethod
     def from_kwargs(**kwargs) -> 'ZuulRESTClientFactory':
@@ -43,6 +62,12 @@ class ZuulRESTClientFactory(ZuulAPIFactory[ZuulRESTClient]):
         :param kwargs: Keyword arguments.
         :key url: Required. Address to the Zuul host to connect to.
         :key cert: Optional. Path to the certificate to identify the user.
+        :key cache_ttl: Optional. Seconds responses are reused for.
+        :key cache_dir: Optional. Directory where to keep responses.
+        :key cache_size: Optional. Megabytes that responses may take inside
+            the cache directory.
+        :key artifacts_cache_size: Optional. Megabytes that data taken from
+            build artifacts may take inside the cache directory.
         :return: A new instance of the factory.
         :raises ValueError:
             If keyword arguments are missing the 'url' key.
@@ -54,7 +79,13 @@ class ZuulRESTClientFactory(ZuulAPIFactory[ZuulRESTClient]):
 
         return ZuulRESTClientFactory(
             host=kwargs['url'],
-            cert=kwargs.get('cert')
+            cert=kwargs.get('cert'),
+            cache_ttl=kwargs.get('cache_ttl', DEFAULT_CACHE_TTL),
+            cache_dir=kwargs.get('cache_dir'),
+            cache_size=kwargs.get('cache_size', DEFAULT_CACHE_SIZE),
+            artifacts_cache_size=kwargs.get(
+                'artifacts_cache_size', DEFAULT_ARTIFACTS_CACHE_SIZE
+            )
         )
 
     @property
@@ -71,9 +102,43 @@ class ZuulRESTClientFactory(ZuulAPIFactory[ZuulRESTClient]):
         """
         return self._cert
 
+    @property
+    def cache_ttl(self) -> Optional[float]:
+        """
+        :return: Seconds responses from the host are reused for.
+        """
+        return self._cache_ttl
+
+    @property
+    def cache_dir(self) -> Optional[str]:
+        """
+        :return: Directory where responses from the host are kept.
+        """
+        return self._cache_dir
+
+    @property
+    def cache_size(self) -> Optional[float]:
+        """
+        :return: Megabytes that responses from the host may take inside the
+            cache directory.
+        """
+        return self._cache_size
+
+    @property
+    def artifacts_cache_size(self) -> Optional[float]:
+        """
+        :return: Megabytes that data taken from build artifacts may take
+            inside the cache directory.
+        """
+        return self._artifacts_cache_size
+
     @overrides
     def new(self) -> ZuulRESTClient:
         return ZuulRESTClient.from_url(
             host=self.host,
-            cert=self.cert
+            cert=self.cert,
+            cache_ttl=self.cache_ttl,
+            cache_dir=self.cache_dir,
+            cache_size=self.cache_size,
+            artifacts_cache_size=self.artifacts_cache_size
         )
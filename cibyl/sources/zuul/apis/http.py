@@ -13,15 +13,31 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import logging
 from abc import ABC
-from typing import Optional, Union
+from typing import MutableMapping, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 from overrides import overrides
 from requests import HTTPError, Session
 
 from cibyl.sources.zuul.apis import ZuulAPIError, ZuulBuildAPI
+from kernel.tools.cache import SFCache
 from kernel.tools.io import Closeable
+from kernel.tools.json import JSON
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL = 60
+"""Default number of seconds a response from the host is reused for."""
+
+DEFAULT_CACHE_SIZE = 1024
+"""Default number of megabytes that responses from the host may take on
+disk."""
+
+DEFAULT_ARTIFACTS_CACHE_SIZE = 512
+"""Default number of megabytes that data taken from build artifacts may
+take on disk."""
 
 
 class ZuulSession(Closeable):
@@ -34,7 +50,12 @@ class ZuulSession(Closeable):
         self,
         session: Session,
         host: str,
-        verify: Optional[Union[bool, str]]
+        verify: Optional[Union[bool, str]],
+        cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        cache_storage: Optional[
+            MutableMapping[str, Tuple[float, JSON]]
+        ] = None,
+        artifacts_storage: Optional[MutableMapping[str, JSON]] = None
     ):
         """Constructor.
 
@@ -45,6 +66,12 @@ class ZuulSession(Closeable):
             'True' activates it and leaves it up to the client's system to
             resolve it. A path to a certificate will use that file to
             identify the host.
+        :param cache_ttl: Number of seconds a response is reused for before
+            asking the host again. 'None' to reuse them forever.
+        :param cache_storage: Where responses are kept. 'None' to keep them
+            in memory.
+        :param artifacts_storage: Where data taken from the artifacts of
+            finished builds is kept. 'None' to keep it in memory.
         """
         self._session = session
         self._session.verify = verify
@@ -53,6 +80,16 @@ class ZuulSession(Closeable):
             host += '/'
 
         self._host = host
+        self._cache = SFCache(
+            loader=self._request,
+            ttl=cache_ttl,
+            storage=cache_storage
+        )
+
+        if artifacts_storage is None:
+            artifacts_storage = {}
+
+        self._artifacts = artifacts_storage
 
     @property
     def session(self):
@@ -66,6 +103,15 @@ class ZuulSession(Closeable):
     def host(self):
         return self._host
 
+    @property
+    def artifacts(self):
+        """
+        :return: Where data taken from the artifacts of finished builds is
+            kept.
+        :rtype: MutableMapping[str, JSON]
+        """
+        return self._artifacts
+
     @property
     def api(self):
         """
@@ -77,13 +123,30 @@ class ZuulSession(Closeable):
     def get(self, service):
         """Performs a GET action on one of the host's end-points.
 
+        Responses are cached, so asking for the same end-point again will
+        not reach the host until the cached response expires. Concurrent
+        requests for the same end-point share a single request to the host.
+
         :param service: Name of the end-point to be attacked.
         :type service: str
         :return: JSON-like response from host.
         :rtype: dict
         :raises ZuulAPIError: If the request failed.
         """
-        request = self._session.get(urljoin(self.api, service))
+        return self._cache.get(urljoin(self.api, service))
+
+    def _request(self, url):
+        """Performs a GET action on the host, skipping the cache.
+
+        :param url: URL to attack.
+        :type url: str
+        :return: JSON-like response from host.
+        :rtype: dict
+        :raises ZuulAPIError: If the request failed.
+        """
+        LOG.debug("Requesting: '%s'.", url)
+
+        request = self._session.get(url)
 
         self._check_request_status(request)
 
@@ -14,21 +14,102 @@
 #    under the License.
 """
 import logging
-from typing import Iterable, NamedTuple
+import os
+from typing import Iterable, List, NamedTuple
+from urllib.parse import urlencode
 
 from overrides import overrides
 from requests import Session
 
-from cibyl.sources.zuul.apis import (ZuulAPI, ZuulBuildAPI, ZuulJobAPI,
-                                     ZuulPipelineAPI, ZuulProjectAPI,
-                                     ZuulTenantAPI, ZuulVariantAPI)
-from cibyl.sources.zuul.apis.http import ZuulHTTPBuildAPI, ZuulSession
+from cibyl.sources.zuul.apis import (BuildsQuery, ZuulAPI, ZuulBuildAPI,
+                                     ZuulJobAPI, ZuulPipelineAPI,
+                                     ZuulProjectAPI, ZuulTenantAPI,
+                                     ZuulVariantAPI)
+from cibyl.sources.zuul.apis.http import (DEFAULT_ARTIFACTS_CACHE_SIZE,
+                                          DEFAULT_CACHE_SIZE,
+                                          DEFAULT_CACHE_TTL, ZuulHTTPBuildAPI,
+                                          ZuulSession)
+from cibyl.sources.zuul.utils.artifacts import (is_build_finished,
+                                                load_build_artifact,
+                                                store_build_artifact)
 from cibyl.sources.zuul.utils.tests.finder import TestFinder
+from cibyl.sources.zuul.utils.tests.serialization import TestSuiteSerializer
 from cibyl.sources.zuul.utils.tests.tempest.finder import TempestTestFinder
 from cibyl.sources.zuul.utils.tests.types import TestSuite
+from kernel.tools.cache import TieredStorage
+from kernel.tools.dicts import LRUDict
+from kernel.tools.fs import Dir
+from kernel.tools.json import JSONDirectory
 
 LOG = logging.getLogger(__name__)
 
+BUILDS_PAGE_SIZE = 100
+"""Number of builds asked to the host on each request."""
+
+TENANT_BUILDS_PAGE_SIZE = 1000
+"""Number of builds asked to the host on each request for the builds of
+many jobs of a tenant."""
+
+JOBS_PER_BUILDS_REQUEST = 50
+"""Maximum number of jobs whose builds are asked for on the same request,
+so that the URL stays short."""
+
+TESTS_ARTIFACT = 'tests'
+"""Name under which the test suites of a build are kept."""
+
+MEMORY_CACHE_ENTRIES = 1024
+"""Number of entries from the cache directory also kept in memory."""
+
+
+def builds_params(query):
+    """Translates the conditions on some builds into parameters for the
+    builds end-point.
+
+    :param query: The conditions.
+    :type query: :class:`BuildsQuery`
+    :return: The parameters, with a list of values for each.
+    :rtype: dict[str, list[str]]
+    """
+    return {
+        'project': query.projects,
+        'pipeline': query.pipelines,
+        'result': query.results,
+        'uuid': query.uuids
+    }
+
+
+def paginate(request, limit=None, page_size=BUILDS_PAGE_SIZE):
+    """Walks through all pages of a listing on the host.
+
+    Pages are only requested as the items on the previous one are consumed.
+
+    :param request: Performs the request for a page, given the 'limit'
+        and 'skip' query parameters that select it.
+    :type request: (dict) -> list
+    :param limit: Maximum number of items to retrieve. 'None' for all.
+    :type limit: int or None
+    :param page_size: Number of items to ask for on each request.
+    :type page_size: int
+    :return: The items, in the order the host gives them.
+    :rtype: Iterable
+    """
+    skip = 0
+
+    while limit is None or skip < limit:
+        size = page_size
+
+        if limit is not None:
+            size = min(size, limit - skip)
+
+        page = request({'limit': size, 'skip': skip})
+
+        yield from page
+
+        if len(page) < size:
+            return
+
+        skip += size
+
 
 class ZuulBuildRESTClient(ZuulHTTPBuildAPI):
     """Implementation of a Zuul client through the use of Zuul's REST-API.
@@ -40,6 +121,9 @@ class ZuulBuildRESTClient(ZuulHTTPBuildAPI):
         finders: Iterable[TestFinder] = (TempestTestFinder(),)
         """Collection of tools used to get the build's tests from all
         possible sources."""
+        serializer: TestSuiteSerializer = TestSuiteSerializer()
+        """Tool used to convert the build's tests into a form that can be
+        kept between runs."""
 
     def __init__(self, session, job, build, tools=Tools()):
         """Constructor. See parent for more information.
@@ -50,6 +134,7 @@ class ZuulBuildRESTClient(ZuulHTTPBuildAPI):
         super().__init__(session, job, build)
 
         self._tools = tools
+        self._tests = None
 
     def __eq__(self, other):
         if not issubclass(type(other), ZuulBuildAPI):
@@ -68,12 +153,87 @@ class ZuulBuildRESTClient(ZuulHTTPBuildAPI):
 
     @overrides
     def tests(self) -> Iterable[TestSuite]:
-        result = []
+        if self._tests is None:
+            self._tests = self._load_tests()
 
-        for finder in self.tools.finders:
-            result += finder.find(self)
+        if self._tests is None:
+            tests = []
 
-        return result
+            for finder in self.tools.finders:
+                tests += finder.find(self)
+
+            self._store_tests(tests)
+
+        return self._tests
+
+    @classmethod
+    @overrides
+    def tests_of(cls, builds) -> List[Iterable[TestSuite]]:
+        builds = list(builds)
+
+        # Builds sharing finders can have their tests looked for together
+        groups = {}
+        for build in builds:
+            if build._tests is None:
+                build._tests = build._load_tests()
+
+            if build._tests is None:
+                groups.setdefault(build.tools.finders, []).append(build)
+
+        for finders, group in groups.items():
+            tests = [[] for _ in group]
+
+            for finder in finders:
+                for suites, found in zip(tests, finder.find_all(group)):
+                    suites += found
+
+            for build, suites in zip(group, tests):
+                build._store_tests(suites)
+
+        return [build.tests() for build in builds]
+
+    def _load_tests(self):
+        """Gets the tests of this build that were kept on a previous run.
+
+        :return: The test suites. 'None' if they are not available.
+        :rtype: list[:class:`TestSuite`] or None
+        """
+        data = load_build_artifact(self, TESTS_ARTIFACT)
+
+        if data is None:
+            return None
+
+        try:
+            return self.tools.serializer.decode(data)
+        except (ValueError, TypeError) as ex:
+            LOG.debug(
+                "Ignoring kept tests of build: '%s'. Reason: '%s'.",
+                self.uuid, ex
+            )
+            return None
+
+    def _store_tests(self, tests):
+        """Makes the given tests the ones of this build and keeps them for
+        future runs.
+
+        :param tests: The test suites.
+        :type tests: list[:class:`TestSuite`]
+        """
+        self._tests = tests
+
+        if not is_build_finished(self):
+            return
+
+        try:
+            data = self.tools.serializer.encode(tests)
+        except ValueError as ex:
+            LOG.debug(
+                "Not keeping tests of build: '%s'. Reason: '%s'.",
+                self.uuid, ex
+            )
+            return
+
+        store_build_artifact(self, TESTS_ARTIFACT, data)
 
     @overrides
     def close(self):
@@ -154,14 +314,20 @@ class ZuulJobRESTClient(ZuulJobAPI):
         ]
 
     @overrides
-    def builds(self):
-        url = f'tenant/{self.tenant.name}/builds?job_name={self.name}'
-        builds = self._session.get(url)
+    def builds(self, query=None):
+        if query is None:
+            query = BuildsQuery()
 
-        return [
-            ZuulBuildRESTClient(self._session, self, build)
-            for build in builds
-        ]
+        params = {'job_name': self.name, **builds_params(query)}
+
+        for build in paginate(
+            lambda page: self._session.get(
+                f'tenant/{self.tenant.name}/builds?'
+                f'{urlencode({**params, **page}, doseq=True)}'
+            ),
+            limit=query.limit
+        ):
+            yield ZuulBuildRESTClient(self._session, self, build)
 
     @overrides
     def close(self):
@@ -291,6 +457,11 @@ class ZuulTenantRESTClient(ZuulTenantAPI):
     def session(self):
         return self._session
 
+    @property
+    @overrides
+    def host(self):
+        return self._session.host
+
     @overrides
     def projects(self):
         result = []
@@ -309,6 +480,87 @@ class ZuulTenantRESTClient(ZuulTenantAPI):
 
         return result
 
+    @overrides
+    def jobs_builds(self, jobs, query=None):
+        if query is None:
+            query = BuildsQuery()
+
+        targets = {job.name: job for job in jobs}
+        names = list(targets)
+
+        for start in range(0, len(names), JOBS_PER_BUILDS_REQUEST):
+            yield from self._jobs_builds(
+                {
+                    name: targets[name]
+                    for name in names[start:start + JOBS_PER_BUILDS_REQUEST]
+                },
+                query
+            )
+
+    def _jobs_builds(self, targets, query):
+        """Gets the builds of a group of jobs, all from the same listing.
+
+        The host is the one filtering the builds by job, so that the
+        listing ends with the history of the jobs and not with that of the
+        whole tenant. Jobs are dropped from the listing as soon as they have
+        all the builds the query asks for, so that the rest of the pages
+        only carry builds for the ones that still need some.
+
+        :param targets: The jobs, by name.
+        :type targets: dict[str, :class:`ZuulJobAPI`]
+        :param query: Filters for the builds.
+        :type query: :class:`BuildsQuery`
+        :return: The builds of the jobs.
+        :rtype: Iterable[:class:`ZuulBuildRESTClient`]
+        """
+        counts = dict.fromkeys(targets, 0)
+        pending = list(targets)
+        skip = 0
+
+        while pending:
+            params = {
+                **builds_params(query),
+                'job_name': pending,
+                'limit': TENANT_BUILDS_PAGE_SIZE,
+                'skip': skip
+            }
+
+            page = self._session.get(
+                f'tenant/{self.name}/builds?{urlencode(params, doseq=True)}'
+            )
+
+            for build in page:
+                name = build.get('job_name')
+
+                if name not in targets:
+                    continue
+
+                if query.limit is not None and counts[name] >= query.limit:
+                    continue
+
+                counts[name] += 1
+
+                yield ZuulBuildRESTClient(self._session, targets[name], build)
+
+            if len(page) < TENANT_BUILDS_PAGE_SIZE:
+                # End of the history of the jobs
+                return
+
+            done = []
+
+            if query.limit is not None:
+                done = [
+                    name for name in pending if counts[name] >= query.limit
+                ]
+
+            if done:
+                # All builds seen so far for the rest of jobs were taken, so
+                # their own listing continues right after them
+                pending = [name for name in pending if name not in done]
+                skip = sum(counts[name] for name in pending)
+            else:
+                skip += TENANT_BUILDS_PAGE_SIZE
+
     @overrides
     def builds(self):
         return self._session.get(f'tenant/{self.name}/builds')
@@ -331,7 +583,14 @@ class ZuulRESTClient(ZuulAPI):
         self._session = session
 
     @staticmethod
-    def from_url(host, cert=None):
+    def from_url(
+        host,
+        cert=None,
+        cache_ttl=DEFAULT_CACHE_TTL,
+        cache_dir=None,
+        cache_size=DEFAULT_CACHE_SIZE,
+        artifacts_cache_size=DEFAULT_ARTIFACTS_CACHE_SIZE
+    ):
         """Builds a client through the parameters that define a session.
 
         :param host: URL to the host to be targeted.
@@ -341,10 +600,55 @@ class ZuulRESTClient(ZuulAPI):
             the session would be vulnerable to man-in-the-middle attacks.
             'None' removes all need for validation.
         :type cert: str or None
+        :param cache_ttl: Number of seconds responses from the host are
+            reused for. 'None' to reuse them forever.
+        :type cache_ttl: float or None
+        :param cache_dir: Directory where to keep responses from the host
+            between runs. 'None' to keep them only in memory.
+        :type cache_dir: str or None
+        :param cache_size: Number of megabytes that responses from the host
+            may take inside 'cache_dir'. 'None' for no limit.
+        :type cache_size: float or None
+        :param artifacts_cache_size: Number of megabytes that data taken
+            from the artifacts of finished builds may take inside
+            'cache_dir'. 'None' for no limit.
+        :type artifacts_cache_size: float or None
         :return: A client instance.
         :rtype: :class:`ZuulRESTClient`
         """
-        return ZuulRESTClient(ZuulSession(Session(), host, cert))
+        storage = None
+        artifacts = None
+
+        def in_bytes(megabytes):
+            if megabytes is None:
+                return None
+
+            return int(megabytes * 1024 * 1024)
+
+        if cache_dir:
+            storage = TieredStorage(
+                back=JSONDirectory(
+                    Dir(cache_dir),
+                    max_size=in_bytes(cache_size)
+                ),
+                front=LRUDict(MEMORY_CACHE_ENTRIES)
+            )
+            artifacts = TieredStorage(
+                back=JSONDirectory(
+                    Dir(os.path.join(cache_dir, 'artifacts')),
+                    max_size=in_bytes(artifacts_cache_size)
+                ),
+                front=LRUDict(MEMORY_CACHE_ENTRIES)
+            )
+
+        return ZuulRESTClient(
+            ZuulSession(
+                Session(), host, cert,
+                cache_ttl=cache_ttl,
+                cache_storage=storage,
+                artifacts_storage=artifacts
+            )
+        )
 
     @property
     def session(self):
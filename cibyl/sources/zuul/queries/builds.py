@@ -13,7 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+from functools import partial
+
 from cibyl.models.ci.zuul.test import TestStatus
+from cibyl.sources.zuul.transactions import fan_out
+
+BULK_BUILDS_THRESHOLD = 20
+"""Number of jobs from the same tenant from which on their builds are
+fetched together, instead of job by job."""
 
 
 def perform_builds_query(job, **kwargs):
@@ -25,10 +32,61 @@ def perform_builds_query(job, **kwargs):
     :return: List of retrieved builds.
     :rtype: list[:class:`cibyl.sources.zuul.transactions.BuildResponse`]
     """
+    return _apply_builds_filters(job.builds(), **kwargs).get()
+
+
+def perform_jobs_builds_query(jobs, **kwargs):
+    """Query for the builds of a collection of jobs.
+
+    Builds for tenants with many targeted jobs are fetched together, on
+    large pages listing the builds of all of them, and then split by job,
+    which takes far fewer requests than going job by job. Queries for the
+    last build are still done job by job, as the host can send just that
+    one build for each.
+
+    :param jobs: APIs to interact with the owners of the builds.
+    :type jobs: Iterable[:class:`cibyl.sources.zuul.transactions.JobResponse`]
+    :param kwargs: Arguments coming from the CLI.
+    :return: List of retrieved builds.
+    :rtype: list[:class:`cibyl.sources.zuul.transactions.BuildResponse`]
+    """
+    tenants = {}
+    for job in jobs:
+        tenant = job.tenant
+        tenants.setdefault(tenant.name, (tenant, []))[1].append(job)
+
+    last_build = 'last_build' in kwargs or 'last_completed_build' in kwargs
+
+    tasks = []
+    for tenant, targets in tenants.values():
+        if last_build or len(targets) < BULK_BUILDS_THRESHOLD:
+            tasks += [
+                partial(perform_builds_query, job, **kwargs)
+                for job in targets
+            ]
+            continue
+
+        builds = _apply_builds_filters(tenant.builds(targets), **kwargs)
+
+        tasks.append(builds.get)
+
     result = []
 
-    builds = job.builds()
+    for builds in fan_out(lambda task: task(), tasks):
+        result += builds
+
+    return result
+
 
+def _apply_builds_filters(builds, **kwargs):
+    """Applies the builds filters coming from the CLI to a request.
+
+    :param builds: The request.
+    :type builds: :class:`cibyl.sources.zuul.transactions.BuildsRequest`
+    :param kwargs: Arguments coming from the CLI.
+    :return: The same request.
+    :rtype: :class:`cibyl.sources.zuul.transactions.BuildsRequest`
+    """
     # Apply builds filters
     if 'builds' in kwargs:
         targets = kwargs['builds'].value
@@ -61,6 +119,4 @@ def perform_builds_query(job, **kwargs):
         builds.with_status(TestStatus.SUCCESS)
         builds.with_last_build_only()
 
-    result += builds.get()
-
-    return result
+    return builds
@@ -15,14 +15,15 @@
 """
 from overrides import overrides
 
-from cibyl.sources.zuul.queries.builds import perform_builds_query
+from cibyl.sources.zuul.queries.builds import perform_jobs_builds_query
 from cibyl.sources.zuul.queries.composition import AggregatedQuery
 from cibyl.sources.zuul.queries.jobs import perform_jobs_query
 from cibyl.sources.zuul.queries.pipelines import perform_pipelines_query
 from cibyl.sources.zuul.queries.projects import perform_projects_query
 from cibyl.sources.zuul.queries.tenants import perform_tenants_query
-from cibyl.sources.zuul.queries.tests import perform_tests_query
+from cibyl.sources.zuul.queries.tests import perform_builds_tests_query
 from cibyl.sources.zuul.queries.variants import perform_variants_query
+from cibyl.sources.zuul.transactions import fan_out
 
 
 class QuickQuery(AggregatedQuery):
@@ -59,25 +60,33 @@ class QuickQuery(AggregatedQuery):
 
     @overrides
     def with_variants_query(self, **kwargs) -> 'AggregatedQuery':
-        for job in perform_jobs_query(self.api, **kwargs):
-            for variant in perform_variants_query(job, **kwargs):
+        jobs = perform_jobs_query(self.api, **kwargs)
+
+        for variants in fan_out(
+            lambda job: perform_variants_query(job, **kwargs), jobs
+        ):
+            for variant in variants:
                 self.tools.builder.with_variant(variant)
 
         return self
 
     @overrides
     def with_builds_query(self, **kwargs) -> 'AggregatedQuery':
-        for job in perform_jobs_query(self.api, **kwargs):
-            for build in perform_builds_query(job, **kwargs):
-                self.tools.builder.with_build(build)
+        jobs = perform_jobs_query(self.api, **kwargs)
+
+        for build in perform_jobs_builds_query(jobs, **kwargs):
+            self.tools.builder.with_build(build)
 
         return self
 
     @overrides
     def with_tests_query(self, **kwargs) -> 'AggregatedQuery':
-        for job in perform_jobs_query(self.api, **kwargs):
-            for build in perform_builds_query(job, **kwargs):
-                for test in perform_tests_query(build, **kwargs):
-                    self.tools.builder.with_test(test)
+        jobs = perform_jobs_query(self.api, **kwargs)
+
+        builds = perform_jobs_builds_query(jobs, **kwargs)
+
+        for tests in perform_builds_tests_query(builds, **kwargs):
+            for test in tests:
+                self.tools.builder.with_test(test)
 
         return self
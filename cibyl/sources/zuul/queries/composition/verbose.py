@@ -19,7 +19,7 @@ from cibyl.sources.zuul.queries.composition import AggregatedQuery
 from cibyl.sources.zuul.queries.composition.quick import QuickQuery
 from cibyl.sources.zuul.queries.jobs import perform_jobs_query
 from cibyl.sources.zuul.queries.pipelines import perform_pipelines_query
-from cibyl.sources.zuul.transactions import PipelineResponse as Pipeline
+from cibyl.sources.zuul.transactions import fan_out
 
 
 class VerboseQuery(QuickQuery):
@@ -28,21 +28,41 @@ class VerboseQuery(QuickQuery):
 
     @overrides
     def with_jobs_query(self, **kwargs) -> 'AggregatedQuery':
-        def is_job_in(pl: Pipeline) -> bool:
-            return job.name in [jb.name for jb in pl.jobs().get()]
-
         # Cache pipelines for later use
         pipelines = perform_pipelines_query(self.api, **kwargs)
 
+        # Index pipelines by the jobs they have
+        index = _index_pipelines_by_job(pipelines)
+
         for job in perform_jobs_query(self.api, **kwargs):
             model = self.tools.builder.with_job(job)
 
             # Include also pipelines where the job is present
-            for pipeline in pipelines:
-                if not is_job_in(pipeline):
-                    continue
-
+            for pipeline in index.get(job.name, ()):
                 # Register job as a child of the pipeline
                 self.tools.builder.with_pipeline(pipeline).add_job(model)
 
         return self
+
+
+def _index_pipelines_by_job(pipelines):
+    """Maps the name of each job to the pipelines it is present on.
+
+    Each pipeline gets its jobs asked for only once.
+
+    :param pipelines: The pipelines to index.
+    :type pipelines: Iterable[:class:`PipelineResponse`]
+    :return: The index, with pipelines kept in the order they came in.
+    :rtype: dict[str, list[:class:`PipelineResponse`]]
+    """
+    result = {}
+
+    pipelines = list(pipelines)
+
+    for pipeline, jobs in zip(
+        pipelines, fan_out(lambda pl: pl.jobs().get(), pipelines)
+    ):
+        for name in {job.name for job in jobs}:
+            result.setdefault(name, []).append(pipeline)
+
+    return result
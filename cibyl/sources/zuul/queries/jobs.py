@@ -14,6 +14,7 @@
 #    under the License.
 """
 from cibyl.sources.zuul.queries.tenants import perform_tenants_query
+from cibyl.sources.zuul.transactions import fan_out
 
 
 def perform_jobs_query(zuul, **kwargs):
@@ -25,9 +26,7 @@ def perform_jobs_query(zuul, **kwargs):
     :return: List of retrieved jobs.
     :rtype: list[:class:`cibyl.sources.zuul.transactions.JobResponse`]
     """
-    result = []
-
-    for tenant in perform_tenants_query(zuul, **kwargs):
+    def get_jobs(tenant):
         jobs = tenant.jobs()
 
         # Apply jobs filters
@@ -38,6 +37,13 @@ def perform_jobs_query(zuul, **kwargs):
             if targets:
                 jobs.with_name(*targets)
 
-        result += jobs.get()
+        return jobs.get()
+
+    result = []
+
+    tenants = perform_tenants_query(zuul, **kwargs)
+
+    for jobs in fan_out(get_jobs, tenants):
+        result += jobs
 
     return result
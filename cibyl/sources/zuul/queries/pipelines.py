@@ -14,6 +14,7 @@
 #    under the License.
 """
 from cibyl.sources.zuul.queries.projects import perform_projects_query
+from cibyl.sources.zuul.transactions import fan_out
 
 
 def perform_pipelines_query(zuul, **kwargs):
@@ -25,9 +26,7 @@ def perform_pipelines_query(zuul, **kwargs):
     :return: List of retrieved pipelines.
     :rtype: list[:class:`cibyl.sources.zuul.transactions.PipelineResponse`]
     """
-    result = []
-
-    for project in perform_projects_query(zuul, **kwargs):
+    def get_pipelines(project):
         pipelines = project.pipelines()
 
         # Apply pipelines filters
@@ -38,6 +37,13 @@ def perform_pipelines_query(zuul, **kwargs):
             if targets:
                 pipelines.with_name(*targets)
 
-        result += pipelines.get()
+        return pipelines.get()
+
+    result = []
+
+    projects = perform_projects_query(zuul, **kwargs)
+
+    for pipelines in fan_out(get_pipelines, projects):
+        result += pipelines
 
     return result
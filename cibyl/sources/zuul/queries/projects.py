@@ -14,6 +14,7 @@
 #    under the License.
 """
 from cibyl.sources.zuul.queries.tenants import perform_tenants_query
+from cibyl.sources.zuul.transactions import fan_out
 
 
 def perform_projects_query(zuul, **kwargs):
@@ -25,9 +26,7 @@ def perform_projects_query(zuul, **kwargs):
     :return: List of retrieved projects.
     :rtype: list[:class:`cibyl.sources.zuul.transactions.ProjectResponse`]
     """
-    result = []
-
-    for tenant in perform_tenants_query(zuul, **kwargs):
+    def get_projects(tenant):
         projects = tenant.projects()
 
         # Apply projects filters
@@ -38,6 +37,13 @@ def perform_projects_query(zuul, **kwargs):
             if targets:
                 projects.with_name(*targets)
 
-        result += projects.get()
+        return projects.get()
+
+    result = []
+
+    tenants = perform_tenants_query(zuul, **kwargs)
+
+    for projects in fan_out(get_projects, tenants):
+        result += projects
 
     return result
@@ -13,10 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
-from typing import Iterable
+from typing import Iterable, List
 
 from cibyl.sources.zuul.transactions import BuildResponse as Build
 from cibyl.sources.zuul.transactions import TestResponse as Test
+from cibyl.sources.zuul.transactions import load_tests
 
 
 def perform_tests_query(build: Build, **kwargs) -> Iterable[Test]:
@@ -43,3 +44,23 @@ def perform_tests_query(build: Build, **kwargs) -> Iterable[Test]:
         tests.with_duration(*kwargs['test_duration'].value)
 
     return tests.get()
+
+
+def perform_builds_tests_query(
+    builds: Iterable[Build],
+    **kwargs
+) -> List[Iterable[Test]]:
+    """Query for the tests of a collection of builds.
+
+    The tests of all builds are fetched together before being filtered.
+
+    :param builds: APIs to interact with the owners of the tests.
+    :param kwargs: Arguments coming from the CLI.
+    :return: Collection of retrieved tests for each build, in the same
+        order as the builds.
+    """
+    builds = list(builds)
+
+    load_tests(builds)
+
+    return [perform_tests_query(build, **kwargs) for build in builds]
@@ -22,17 +22,66 @@ License:
 """
 import re
 from abc import ABC
-from dataclasses import dataclass
-from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from itertools import islice
+from typing import Iterable, List, Optional
+
+from overrides import overrides
 
 from cibyl.cli.ranged_argument import RANGE_OPERATORS, Range
 from cibyl.models.ci.zuul.test import TestKind, TestStatus
-from cibyl.sources.zuul.apis import ZuulBuildAPI
+from cibyl.sources.zuul.apis import BuildsQuery, ZuulBuildAPI
 from cibyl.sources.zuul.utils.tests.tempest.types import TempestTest
 from cibyl.sources.zuul.utils.tests.types import Test, TestResult, TestSuite
-from cibyl.utils.filtering import apply_filters, matches_regex
+from cibyl.utils.filtering import apply_filters, iter_filters, matches_regex
 from kernel.tools.urls import URL
 
+MAX_CONCURRENT_REQUESTS = 8
+"""Maximum number of requests sent to the host at the same time."""
+
+
+def fan_out(function, items, max_workers=MAX_CONCURRENT_REQUESTS):
+    """Calls a function over a collection of items concurrently.
+
+    Meant for sibling requests, like the projects of many tenants, which
+    would otherwise wait on each other's round trip to the host.
+
+    :param function: The function to call. Receives one item each time.
+    :type function: (Any) -> Any
+    :param items: The items to call the function on.
+    :type items: Iterable
+    :param max_workers: Maximum number of calls running at the same time.
+    :type max_workers: int
+    :return: What the function returned for each item, in the order the
+        items came in.
+    :rtype: list
+    """
+    items = list(items)
+
+    if max_workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    workers = min(max_workers, len(items))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, items))
+
+
+def load_tests(builds):
+    """Gets the tests of many builds at once, so that later requests for
+    them are answered without going to the host again.
+
+    :param builds: The builds to get the tests for.
+    :type builds: Iterable[:class:`BuildResponse`]
+    """
+    apis = {}
+    for build in builds:
+        apis.setdefault(type(build.api), []).append(build.api)
+
+    for kind, group in apis.items():
+        kind.tests_of(group)
+
 
 class Request(ABC):
     """Base class for any kind of request.
@@ -257,6 +306,82 @@ class VariantsRequest(Request):
         return [VariantResponse(variant) for variant in variants]
 
 
+ANCHORED_LITERAL = re.compile(r'\^((?:[\w\-/ ]|\\\.)+)\$')
+"""Regex patterns that can only match one exact value. Dots have to be
+escaped, as otherwise they match any character."""
+
+UUID_LITERAL = re.compile(r'\^?([0-9a-f]{32})\$?')
+"""Regex patterns that are a whole build UUID, which can only match that
+one UUID."""
+
+ZUUL_RESULTS = (
+    'SUCCESS', 'FAILURE', 'POST_FAILURE', 'NODE_FAILURE', 'RETRY_LIMIT',
+    'RETRY', 'TIMED_OUT', 'SKIPPED', 'ABORTED', 'CANCELED', 'ERROR',
+    'CONFIG_ERROR', 'MERGE_CONFLICT', 'MERGER_FAILURE', 'DISK_FULL', 'LOST'
+)
+"""Results a build can end with on Zuul."""
+
+
+def as_exact_values(patterns: Iterable[str],
+                    literal: re.Pattern = ANCHORED_LITERAL) -> \
+        Optional[List[str]]:
+    """Translates a collection of regex patterns into the exact values they
+    stand for.
+
+    :param patterns: The patterns.
+    :param literal: Regex that identifies patterns which can only match a
+        single value, captured as its first group. Escaped dots on it are
+        taken as literal ones.
+    :return: The values. None if any of the patterns could match more than
+        one value.
+    """
+    result = []
+
+    for pattern in patterns:
+        match = literal.fullmatch(str(pattern))
+
+        if not match:
+            return None
+
+        result.append(match.group(1).replace('\\.', '.'))
+
+    return result
+
+
+def as_exact_results(patterns: Iterable[str]) -> Optional[List[str]]:
+    """Translates a collection of regex patterns into the exact build
+    results they stand for.
+
+    Besides anchored patterns, a known result is also taken as exact if no
+    other known result contains it.
+
+    :param patterns: The patterns.
+    :return: The results. None if any of the patterns could match more than
+        one result.
+    """
+    result = []
+
+    for pattern in patterns:
+        pattern = str(pattern)
+
+        values = as_exact_values([pattern])
+
+        if values:
+            result += values
+            continue
+
+        if pattern not in ZUUL_RESULTS:
+            return None
+
+        if any(pattern in other for other in ZUUL_RESULTS
+               if other != pattern):
+            return None
+
+        result.append(pattern)
+
+    return result
+
+
 class BuildsRequest(Request):
     """High-Level petition focused on retrieval of data related to builds.
     """
@@ -272,6 +397,31 @@ class BuildsRequest(Request):
         self._job = job
         self._last_build_only = False
 
+        self._query = BuildsQuery()
+        self._exact = True
+
+    def _push(self, attribute, values):
+        """Lets the host take care of a filter as well, if it can be
+        expressed in its terms.
+
+        Filters are still applied locally afterwards, so this only reduces
+        the number of builds to retrieve.
+
+        :param attribute: Field of the :class:`BuildsQuery` the filter
+            translates into.
+        :type attribute: str
+        :param values: The values the filter translates into. None if it
+            cannot be translated.
+        :type values: list[str] or None
+        """
+        if values is None or getattr(self._query, attribute):
+            # Conditions on the same field would be OR'd together by the
+            # host, while filters are AND'd
+            self._exact = False
+            return
+
+        setattr(self._query, attribute, values)
+
     def with_uuid(self, *pattern):
         """Will limit request to builds whose uuid follows a certain pattern.
 
@@ -287,6 +437,7 @@ class BuildsRequest(Request):
             )
 
         self._filters.append(test)
+        self._push('uuids', as_exact_values(pattern, UUID_LITERAL))
         return self
 
     def with_status(self, *pattern):
@@ -309,6 +460,7 @@ class BuildsRequest(Request):
             )
 
         self._filters.append(test)
+        self._push('results', as_exact_results(pattern))
         return self
 
     def with_project(self, *pattern):
@@ -327,6 +479,7 @@ class BuildsRequest(Request):
             )
 
         self._filters.append(test)
+        self._push('projects', as_exact_values(pattern))
         return self
 
     def with_pipeline(self, *pattern):
@@ -345,6 +498,7 @@ class BuildsRequest(Request):
             )
 
         self._filters.append(test)
+        self._push('pipelines', as_exact_values(pattern))
         return self
 
     def with_last_build_only(self):
@@ -363,11 +517,61 @@ class BuildsRequest(Request):
         :return: Answer from the host.
         :rtype: list[:class:`BuildsResponse`]
         """
-        builds = apply_filters(self._job.builds(), *self._filters)
+        query = replace(self._query)
+
+        if self._last_build_only and self._exact:
+            # The host already knows about all filters
+            query.limit = 1
+
+        # Builds are streamed, so no more pages are asked for than needed
+        builds = iter_filters(self._job.builds(query), *self._filters)
+
+        # Perform special filters
+        if self._last_build_only:
+            builds = islice(builds, 1)  # Just the newest build
+
+        return [BuildResponse(build) for build in builds]
+
+
+class JobsBuildsRequest(BuildsRequest):
+    """High-Level petition focused on retrieval of the builds of many jobs
+    from the same tenant at once.
+    """
+
+    def __init__(self, tenant, jobs):
+        """Constructor.
+
+        :param tenant: Low-Level API to the tenant the jobs belong to.
+        :type tenant: :class:`cibyl.sources.zuul.apis.ZuulTenantAPI`
+        :param jobs: Low-Level API to the jobs to get the builds from.
+        :type jobs: list[:class:`cibyl.sources.zuul.apis.ZuulJobAPI`]
+        """
+        super().__init__(None)
+
+        self._tenant = tenant
+        self._jobs = jobs
+
+    @overrides
+    def get(self):
+        query = replace(self._query)
+
+        if self._last_build_only and self._exact:
+            # The host already knows about all filters
+            query.limit = 1
+
+        builds = iter_filters(
+            self._tenant.jobs_builds(self._jobs, query), *self._filters
+        )
 
         # Perform special filters
         if self._last_build_only:
-            builds = builds[0:1]  # Just the newest build
+            newest = {}
+
+            for build in builds:
+                # Just the newest build of each job
+                newest.setdefault(build.job.name, build)
+
+            builds = newest.values()
 
         return [BuildResponse(build) for build in builds]
 
@@ -477,6 +681,14 @@ class TenantResponse:
         """
         return self._tenant.name
 
+    @property
+    def host(self):
+        """
+        :return: Identifies the host the tenant lives on. 'None' if unknown.
+        :rtype: str or None
+        """
+        return self._tenant.host
+
     def projects(self):
         """
         :return: A request for this tenant's projects.
@@ -491,6 +703,15 @@ class TenantResponse:
         """
         return JobsRequest(self._tenant)
 
+    def builds(self, jobs):
+        """
+        :param jobs: Jobs of this tenant to get the builds from.
+        :type jobs: Iterable[:class:`JobResponse`]
+        :return: A request for the builds of all those jobs at once.
+        :rtype: :class:`JobsBuildsRequest`
+        """
+        return JobsBuildsRequest(self._tenant, [job.api for job in jobs])
+
 
 class ProjectResponse:
     """Response for :class:`ProjectsRequest`.
@@ -591,6 +812,14 @@ class JobResponse:
         """
         self._job = job
 
+    @property
+    def api(self):
+        """
+        :return: Low-Level API to access the job's data.
+        :rtype: :class:`cibyl.sources.zuul.apis.ZuulJobAPI`
+        """
+        return self._job
+
     @property
     def tenant(self):
         """
@@ -748,6 +977,14 @@ class BuildResponse:
         """
         self._build = build
 
+    @property
+    def api(self):
+        """
+        :return: Low-Level API to access the build's data.
+        :rtype: :class:`cibyl.sources.zuul.apis.ZuulBuildAPI`
+        """
+        return self._build
+
     @property
     def job(self):
         """
@@ -14,6 +14,7 @@
 #    under the License.
 """
 from enum import Enum
+from typing import Any, Optional
 
 from cibyl.exceptions.source import SourceException
 
@@ -61,3 +62,52 @@ class Artifact:
     """URL where its contents are located."""
     kind: ArtifactKind = ArtifactKind.OTHER
     """The type of artifact."""
+
+
+def load_build_artifact(build, name: str) -> Optional[Any]:
+    """Gets data taken from the artifacts of a build on a previous run.
+
+    Artifacts of a build do not change once it finishes, so whatever was
+    taken from them can be reused. Data is kept by the session the build
+    belongs to and is indexed by the build's UUID.
+
+    :param build: The build the data belongs to.
+    :type build: :class:`cibyl.sources.zuul.apis.http.ZuulHTTPBuildAPI`
+    :param name: Name the data was stored under.
+    :return: The data. 'None' if it was never stored or if the build has
+        not finished yet.
+    """
+    if not is_build_finished(build):
+        return None
+
+    return build.session.artifacts.get(_get_key(build, name))
+
+
+def store_build_artifact(build, name: str, value: Any) -> None:
+    """Keeps data taken from the artifacts of a build so that it can be
+    reused later. Nothing is stored for builds that have not finished yet,
+    as their artifacts may still change.
+
+    :param build: The build the data belongs to.
+    :type build: :class:`cibyl.sources.zuul.apis.http.ZuulHTTPBuildAPI`
+    :param name: Name to store the data under.
+    :param value: The data, which must be JSON serializable.
+    """
+    if not is_build_finished(build):
+        return
+
+    build.session.artifacts[_get_key(build, name)] = value
+
+
+def is_build_finished(build) -> bool:
+    """
+    :param build: The build to check.
+    :type build: :class:`cibyl.sources.zuul.apis.ZuulBuildAPI`
+    :return: True if the build is done running and its artifacts will no
+        longer change, False if not.
+    """
+    return bool(build.raw.get('end_time'))
+
+
+def _get_key(build, name: str) -> str:
+    return f'{build.uuid}/{name}'
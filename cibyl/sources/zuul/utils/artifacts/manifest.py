@@ -13,14 +13,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import json
+import re
+import weakref
 from dataclasses import dataclass, field
-from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from threading import Lock
+from typing import (Dict, Iterable, List, NamedTuple, Optional, Pattern,
+                    Sequence, Tuple)
 
 from xsdata.formats.dataclass.parsers import JsonParser
 
 from cibyl.sources.zuul.apis import Artifact, ArtifactKind
 from cibyl.sources.zuul.apis.http import ZuulHTTPBuildAPI as Build
-from cibyl.sources.zuul.utils.artifacts import ArtifactError
+from cibyl.sources.zuul.utils.artifacts import (ArtifactError,
+                                                load_build_artifact,
+                                                store_build_artifact)
 from cibyl.utils.filtering import matches_regex
 from kernel.tools.net import download_into_memory
 
@@ -74,6 +81,10 @@ class Manifest:
     )
 
 
+MANIFEST_ARTIFACT = 'manifest'
+"""Name under which the manifest of a build is kept."""
+
+
 class ManifestDownloader:
     """Utility used to download the manifest published by different sources.
     """
@@ -142,12 +153,19 @@ class ManifestDownloader:
         def _download_manifest(self, manifest: Artifact) -> Manifest:
             parser = self.tools.parser
 
-            return parser.from_string(
-                download_into_memory(
-                    manifest.url, self.session
-                ),
-                Manifest
-            )
+            # Manifests of finished builds are kept, as they will not change
+            data = load_build_artifact(self.build, MANIFEST_ARTIFACT)
+
+            if data is None:
+                data = json.loads(
+                    download_into_memory(
+                        manifest.url, self.session
+                    )
+                )
+
+                store_build_artifact(self.build, MANIFEST_ARTIFACT, data)
+
+            return parser.bind_dataclass(data, Manifest)
 
     class Tools(NamedTuple):
         """Tools used by this to perform its task.
@@ -186,95 +204,170 @@ ManifestLevel = Iterable[ManifestItem]
 """Represents a directory on the manifest."""
 
 
-class ManifestDigger:
-    """Tool used to transverse the directory tree of a manifest file. The
-    purpose of this tool is to be able to safely go down a branch on the
-    manifest's directory tree to its end. It allows to either observe the
-    contents of a level or to go deeper down the line. Once the end is
-    reached, this provides mechanism to be aware of so.
+class ManifestIndex:
+    """Flat view of the directory tree of a manifest file. Every element on
+    the tree is indexed by its full path and by its name, so looking for
+    them does not require walking the tree.
+
+    Paths follow the same format as :class:`ManifestDir` and
+    :class:`ManifestFile`, with the root of the manifest being '/'.
     """
 
     def __init__(self, manifest: Manifest):
         """Constructor.
 
-        :param manifest: The manifest to dig through.
+        :param manifest: The manifest to index.
         """
-        self._manifest = manifest
-        self._current_level = manifest.tree
+        # Weak, so that the index does not keep the manifest alive
+        self._manifest = weakref.ref(manifest)
+        self._items: Dict[str, ManifestItem] = {}
+        self._names: Dict[str, List[str]] = {}
+
+        self._index_level('', manifest.tree)
 
     @property
-    def manifest(self) -> Manifest:
+    def manifest(self) -> Optional[Manifest]:
         """
-        :return: The manifest this is working with.
+        :return: The manifest this indexes. 'None' if it no longer exists.
         """
-        return self._manifest
+        return self._manifest()
 
     @property
-    def current_level(self) -> ManifestLevel:
+    def paths(self) -> Sequence[str]:
         """
-        :return: Contents of the level the digger is currently at.
+        :return: Path to all the elements on the manifest, in the same order
+            as they appear on its tree.
         """
-        return self._current_level
+        return list(self._items.keys())
 
-    def has_sublevel(self, name: str) -> bool:
-        """Checks whether there is a directory below this level with the
-        suggested name.
+    def get(self, path: str) -> Optional[ManifestItem]:
+        """Gets an element from the manifest.
 
-        :param name: The name to check.
-        :return: True if there is, False if not.
+        :param path: Full path to the element.
+        :return: The element. 'None' if there is none at that path.
         """
-        return bool(self._get_sublevel(name))
+        return self._items.get(path)
 
-    def delve_into(self, level: str) -> None:
-        """Moves the digger down another level.
-
-        .. seealso::
-            :py:meth:`has_sublevel`
-                -> For checking if the level exists beforehand.
+    def paths_named(self, name: str) -> Sequence[str]:
+        """Looks for all the elements that go by a certain name, no matter
+        the directory they are at.
 
-        :param level: Name of the directory to go down to.
-        :raises ArtifactError: If the level does not exist.
+        :param name: The name to look for.
+        :return: Full path to each of the elements with that name.
         """
-        if not self.has_sublevel(level):
-            msg = f"Manifest has no level: '{level}'."
-            raise ArtifactError(msg)
+        return self._names.get(name, [])
+
+    def glob(self, pattern: str) -> Sequence[Tuple[str, ManifestItem]]:
+        """Looks for all the elements whose path matches a glob-style
+        pattern. The following wildcards are understood:
+            - '*' -> Any number of characters within a directory's name
+            - '?' -> A single character within a directory's name
+            - '**' -> Any number of directories, including none
+
+        Examples:
+        >>> index.glob('/logs/**/tempest_results.xml*')
+        [('/logs/undercloud/var/log/tempest/tempest_results.xml', ...)]
+
+        :param pattern: The pattern, which must begin with a '/' character.
+        :return: Tuples containing the path to each element that matches
+            the pattern and the element itself, in the same order as they
+            appear on the tree.
+        """
+        name = pattern.rsplit('/', 1)[-1]
+
+        if not _has_wildcards(pattern):
+            # Not a pattern, but a path
+            candidates = [pattern] if pattern in self._items else []
+        elif not _has_wildcards(name):
+            # Narrow it down to the elements with that name
+            candidates = self.paths_named(name)
+        else:
+            candidates = self._items.keys()
+
+        regex = _compile_glob(pattern)
+
+        return [
+            (path, self._items[path])
+            for path in candidates
+            if regex.match(path)
+        ]
+
+    def _index_level(self, parent: str, level: ManifestLevel) -> None:
+        for item in level:
+            path = f'{parent}/{item.name}'
+
+            # Keep only the first element in case of duplicates
+            if path in self._items:
+                continue
 
-        self._current_level = self._get_sublevel(level)
+            self._items[path] = item
+            self._names.setdefault(item.name, []).append(path)
 
-    def _get_sublevel(self, level: str) -> Optional[ManifestLevel]:
-        """Gets the contents of a directory pending from the current level.
+            if item.children:
+                self._index_level(path, item.children)
 
-        :param level: Name of the directory to search for.
-        :return: Contents of that directory. 'None' if it does not exist or
-            the name points to a file instead.
-        """
-        # Search for the sublevel
-        for item in self.current_level:
-            # Does the sublevel exist?
-            if item.name != level:
-                continue
 
-            # Check if at the end of the branch
-            if not item.children:
-                return None
+def _has_wildcards(pattern: str) -> bool:
+    return any(char in pattern for char in '*?')
 
-            # Not yet at the end -> Return the new level then
-            return item.children
 
-        return None
+def _compile_glob(pattern: str) -> Pattern:
+    """Translates a glob-style pattern, as understood by
+    :meth:`ManifestIndex.glob`, into a regular expression.
+
+    :param pattern: The pattern.
+    :return: The equivalent regular expression.
+    """
+    result = ''
+
+    for token in re.split(r'(/\*\*(?=/|$)|\*|\?)', pattern):
+        if token == '/**':
+            result += '(/[^/]+)*'
+        elif token == '*':
+            result += '[^/]*'
+        elif token == '?':
+            result += '[^/]'
+        else:
+            result += re.escape(token)
+
+    return re.compile(f'^{result}$')
+
 
+class ManifestIndexFactory:
+    """Factory for `ManifestIndex`.
 
-class ManifestDiggerFactory:
-    """Factory for `ManifestDigger`.
+    The index of a manifest is remembered for as long as the manifest
+    exists, so that searching it many times only indexes it once.
     """
 
-    def from_manifest(self, manifest: Manifest) -> ManifestDigger:
-        """Builds a new instance from a manifest file.
+    def __init__(self):
+        """Constructor.
+        """
+        # Manifests are not hashable, so they are told apart by identity
+        self._indexes: Dict[int, ManifestIndex] = {}
+        self._lock = Lock()
+
+    def from_manifest(self, manifest: Manifest) -> ManifestIndex:
+        """Gets the index of a manifest file, building it if this is the
+        first time it is asked for.
 
-        :param manifest: The manifest that the digger will work with.
-        :return: The digger's instance.
+        :param manifest: The manifest that the index will work with.
+        :return: The index's instance.
         """
-        return ManifestDigger(manifest)
+        key = id(manifest)
+
+        with self._lock:
+            if key not in self._indexes:
+                self._indexes[key] = ManifestIndex(manifest)
+
+                # Forget about the index as soon as the manifest is gone
+                weakref.finalize(manifest, self._forget, key)
+
+            return self._indexes[key]
+
+    def _forget(self, key: int) -> None:
+        with self._lock:
+            self._indexes.pop(key, None)
 
 
 class ManifestDir(str):
@@ -346,8 +439,9 @@ class ManifestFileSearch:
     class Tools(NamedTuple):
         """Tools this uses to do its job.
         """
-        diggers: ManifestDiggerFactory = ManifestDiggerFactory()
-        """Creates the walkers that will allow this to transverse the tree."""
+        indexes: ManifestIndexFactory = ManifestIndexFactory()
+        """Creates the indexes that allow this to look for elements on the
+        tree without walking it."""
 
     def __init__(self, tools: Tools = Tools()):
         """Constructor.
@@ -377,60 +471,43 @@ class ManifestFileSearch:
             and on its second the manifest entry that represents it. 'None'
             if nothing were found.
         """
-        for path in search_terms.paths:
-            level = self._get_manifest_level(manifest, path)
-
-            if not level:
-                # The file's directory does not exist
-                continue
+        index = self.tools.indexes.from_manifest(manifest)
 
+        for path in search_terms.paths:
             for file in search_terms.files:
-                # See if the file is at this level
-                item = next(
-                    (item for item in level if item.name == file),
-                    None
-                )
+                location = self._from_dir_to_file(path, file)
+                item = index.get(location)
 
                 if not item:
                     # The file is not here
                     continue
 
-                # Generate path to the file
-                return self._from_dir_to_file(path, file), item
+                return ManifestFile(location), item
 
         return None
 
-    def _get_manifest_level(
+    def glob(
         self,
         manifest: Manifest,
-        path: ManifestDir
-    ) -> Optional[ManifestLevel]:
-        """
-        :param manifest: The manifest to go through.
-        :param path: Path to the directory to get.
-        :return: Contents of the directory indicated by them. 'None' if the
-            directory could not be reached.
-        """
-        digger = self.tools.diggers.from_manifest(manifest)
-
-        for step in self._split_path(path):
-            if not digger.has_sublevel(step):
-                return None
+        pattern: str
+    ) -> Sequence[Tuple[str, ManifestItem]]:
+        """Searches the manifest file for all elements whose path matches a
+        glob-style pattern.
 
-            digger.delve_into(step)
-
-        return digger.current_level
+        .. seealso::
+            :py:meth:`ManifestIndex.glob`
+                -> For the wildcards that the pattern may use.
 
-    def _split_path(self, path: ManifestDir) -> Iterable[str]:
-        """
-        :param path: The path to divide.
-        :return: An ordered collection containing the names of the folders
-            that need to be cd'd in order to get to the one marked by the path.
+        :param manifest: The manifest file to search in.
+        :param pattern: The pattern to match.
+        :return: Tuples containing the path to each element and the element
+            itself.
         """
-        # Remove initial '/' to avoid empty splits
-        return path[1:].split('/')
+        index = self.tools.indexes.from_manifest(manifest)
+
+        return index.glob(pattern)
 
-    def _from_dir_to_file(self, path: ManifestDir, file: str) -> ManifestFile:
+    def _from_dir_to_file(self, path: ManifestDir, file: str) -> str:
         result = path
 
         # In case it is not the manifest's root
@@ -439,4 +516,4 @@ class ManifestFileSearch:
 
         result += file
 
-        return ManifestFile(result)
+        return result
@@ -14,7 +14,7 @@
 #    under the License.
 """
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import Iterable, List
 
 from cibyl.sources.zuul.apis.http import ZuulHTTPBuildAPI as Build
 from cibyl.sources.zuul.utils.tests.types import TestSuite
@@ -33,3 +33,12 @@ class TestFinder(ABC):
         :return: The tests, grouped by suites.
         """
         raise NotImplementedError
+
+    def find_all(self, builds: Iterable[Build]) -> List[Iterable[TestSuite]]:
+        """Fetches all tests executed by a collection of builds.
+
+        :param builds: The builds to get the tests from.
+        :return: The tests of each build, grouped by suites, in the same
+            order as the builds.
+        """
+        return [self.find(build) for build in builds]
@@ -0,0 +1,101 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from typing import Any, Iterable, List
+
+from cibyl.sources.zuul.utils.tests.tempest.types import TempestTest
+from cibyl.sources.zuul.utils.tests.types import TestResult, TestSuite
+from kernel.tools.urls import URL
+
+TEMPEST_KIND = 'tempest'
+"""Tag given to suites made of tempest tests."""
+
+
+class TestSuiteSerializer:
+    """Converts test suites into a compact, JSON friendly, form and back.
+
+    Each test is stored as a row of values instead of as a map, and its URL
+    is left out if it is the same as the one of its suite, which is the
+    case for almost all of them.
+    """
+
+    def encode(self, suites: Iterable[TestSuite]) -> List[Any]:
+        """Turns test suites into their compact form.
+
+        :param suites: The suites to convert.
+        :return: The compact form.
+        :raises ValueError: If any of the tests is of an unknown kind.
+        """
+        return [self._encode_suite(suite) for suite in suites]
+
+    def decode(self, data: List[Any]) -> List[TestSuite]:
+        """Turns the compact form of some test suites back into them.
+
+        :param data: The compact form, as generated by :meth:`encode`.
+        :return: The suites.
+        :raises ValueError: If any of the suites is of an unknown kind.
+        """
+        return [self._decode_suite(suite) for suite in data]
+
+    def _encode_suite(self, suite: TestSuite) -> List[Any]:
+        rows = []
+
+        for test in suite.tests:
+            if not isinstance(test, TempestTest):
+                raise ValueError(f"Unknown test type: '{type(test)}'.")
+
+            rows.append(
+                [
+                    test.name,
+                    test.result.value,
+                    test.duration,
+                    None if test.url == suite.url else test.url,
+                    test.class_name,
+                    test.skip_reason,
+                    test.failure_reason
+                ]
+            )
+
+        return [TEMPEST_KIND, suite.name, suite.url, rows]
+
+    def _decode_suite(self, data: List[Any]) -> TestSuite:
+        kind, name, url, rows = data
+
+        if kind != TEMPEST_KIND:
+            raise ValueError(f"Unknown test suite kind: '{kind}'.")
+
+        url = _to_url(url)
+
+        return TestSuite(
+            name=name,
+            url=url,
+            tests=[
+                TempestTest(
+                    name=test_name,
+                    result=TestResult(result),
+                    duration=duration,
+                    url=url if test_url is None else _to_url(test_url),
+                    class_name=class_name,
+                    skip_reason=skip_reason,
+                    failure_reason=failure_reason
+                )
+                for test_name, result, duration, test_url,
+                class_name, skip_reason, failure_reason in rows
+            ]
+        )
+
+
+def _to_url(string):
+    return None if string is None else URL(string)
@@ -14,7 +14,10 @@
 #    under the License.
 """
 import logging
-from typing import Iterable, NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore
+from typing import Iterable, List, NamedTuple
+from urllib.parse import urlparse
 
 from overrides import overrides
 
@@ -50,6 +53,9 @@ class TempestTestFinder(TestFinder):
         search_terms: SearchTerms = DEFAULT_TEMPEST_SEARCH_TERMS
         """Location and name of all possible files that contain the test
         results."""
+        downloads_per_server: int = 4
+        """Maximum number of builds whose results are downloaded from the
+        same log server at the same time."""
 
     class Tools(NamedTuple):
         """Tools this uses to perform its task.
@@ -101,3 +107,37 @@ class TempestTestFinder(TestFinder):
         file, _ = result
 
         return self.tools.parser.parse_tests_at(build, file)
+
+    @overrides
+    def find_all(self, builds: Iterable[Build]) -> List[Iterable[TestSuite]]:
+        builds = list(builds)
+
+        if len(builds) <= 1 or self.config.downloads_per_server <= 1:
+            return super().find_all(builds)
+
+        servers = {}
+        for build in builds:
+            servers.setdefault(
+                _get_log_server(build),
+                BoundedSemaphore(self.config.downloads_per_server)
+            )
+
+        def find(build):
+            # Download and parse as many builds as the server allows
+            with servers[_get_log_server(build)]:
+                return self.find(build)
+
+        workers = min(
+            len(builds), len(servers) * self.config.downloads_per_server
+        )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(find, builds))
+
+
+def _get_log_server(build: Build) -> str:
+    """
+    :param build: The build to get the log server for.
+    :return: Host where the logs of the build are stored.
+    """
+    return urlparse(build.log_url or '').netloc
@@ -13,18 +13,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
-from typing import Iterable, List, NamedTuple, Optional
+from io import BytesIO
+from itertools import chain
+from typing import (IO, Callable, Iterable, Iterator, NamedTuple, Optional,
+                    Tuple)
 
 from requests import Session
-from xsdata.formats.dataclass.parsers import XmlParser
 
 from cibyl.sources.zuul.apis.http import ZuulHTTPBuildAPI as Build
 from cibyl.sources.zuul.utils.artifacts.manifest import ManifestFile
 from cibyl.sources.zuul.utils.builds import get_url_to_build_file
 from cibyl.sources.zuul.utils.tests.tempest.types import TempestTest
 from cibyl.sources.zuul.utils.tests.types import TestResult, TestSuite
-from kernel.tools.net import download_into_memory
+from kernel.tools.net import download_as_stream
 from kernel.tools.urls import URL
 
 
@@ -90,48 +93,127 @@ class XMLTempestTestCase:
     """Reason why the test case was skipped. If 'None', it was not."""
 
 
-@dataclass
-class XMLTempestTestSuite:
-    """Representation of a test suite as seen on the test results XML. Used
-    to unmarshall such document.
+class XMLTempestTestCaseReader:
+    """Reads the test cases out of a test results XML in a single pass.
+
+    Unlike unmarshalling the whole document, this never holds more than one
+    test case in memory and lets the caller discard cases before any other
+    representation of them is built.
     """
-    errors: int = field(
-        metadata={
-            'type': 'Attribute'
-        }
-    )
-    """Number of test cases that resulted in an error."""
-    failures: int = field(
-        metadata={
-            'type': 'Attribute'
-        }
-    )
-    """Number of test cases that resulted in a failure."""
-    name: str = field(
-        metadata={
-            'type': 'Attribute'
-        }
-    )
-    """Name of the suite."""
-    tests: int = field(
-        metadata={
-            'type': 'Attribute'
-        }
-    )
-    """Number of tests that were executed."""
-    time: float = field(
-        metadata={
-            'type': 'Attribute'
-        }
-    )
-    """Amount of seconds the suite took to complete."""
-    testcase: List[XMLTempestTestCase] = field(
-        default_factory=list,
-        metadata={
-            'type': 'Element'
-        }
-    )
-    """Collection will all the test cases that were run."""
+
+    def read(
+        self,
+        source: IO[bytes],
+        accepts: Callable[[XMLTempestTestCase], bool] = lambda _: True
+    ) -> Iterator[XMLTempestTestCase]:
+        """Reads the test cases on a document.
+
+        :param source: Stream with the XML document.
+        :param accepts: Filter for the test cases. Only those that it returns
+            True for are generated.
+        :return: Generator for the accepted test cases, in the order they
+            appear on the document.
+        """
+        yield from self._read_cases(
+            ET.iterparse(source, events=('start', 'end')), accepts
+        )
+
+    def read_suite(
+        self,
+        source: IO[bytes],
+        accepts: Callable[[XMLTempestTestCase], bool] = lambda _: True
+    ) -> Tuple[Optional[str], Iterator[XMLTempestTestCase]]:
+        """Reads the test suite on a document.
+
+        :param source: Stream with the XML document.
+        :param accepts: Filter for the test cases. Only those that it returns
+            True for are generated.
+        :return: Name of the suite, next to a generator for its accepted
+            test cases, in the order they appear on the document.
+        """
+        events = ET.iterparse(source, events=('start', 'end'))
+
+        # The suite is the root of the document
+        _, suite = next(events)
+
+        return suite.get('name'), self._read_cases(
+            chain((('start', suite),), events), accepts
+        )
+
+    def _read_cases(
+        self,
+        events: Iterator[Tuple[str, ET.Element]],
+        accepts: Callable[[XMLTempestTestCase], bool]
+    ) -> Iterator[XMLTempestTestCase]:
+        parents = []
+
+        for event, element in events:
+            if event == 'start':
+                parents.append(element)
+                continue
+
+            parents.pop()
+
+            if element.tag != 'testcase':
+                continue
+
+            case = self._to_case(element)
+
+            # The case is done, free the memory used by it
+            element.clear()
+
+            if parents:
+                parents[-1].remove(element)
+
+            if accepts(case):
+                yield case
+
+    def read_string(
+        self,
+        xml: str,
+        accepts: Callable[[XMLTempestTestCase], bool] = lambda _: True
+    ) -> Iterator[XMLTempestTestCase]:
+        """Reads the test cases on a document.
+
+        :param xml: The XML document.
+        :param accepts: Filter for the test cases. Only those that it returns
+            True for are generated.
+        :return: Generator for the accepted test cases, in the order they
+            appear on the document.
+        """
+        return self.read(BytesIO(xml.encode('utf-8')), accepts)
+
+    def _to_case(self, element: ET.Element) -> XMLTempestTestCase:
+        time = element.get('time')
+
+        return XMLTempestTestCase(
+            name=element.get('name'),
+            classname=element.get('classname'),
+            time=float(time) if time is not None else None,
+            failure=self._to_failure(element.find('failure')),
+            skipped=self._to_skipped(element.find('skipped'))
+        )
+
+    def _to_failure(
+        self,
+        element: Optional[ET.Element]
+    ) -> Optional[XMLTempestFailure]:
+        if element is None:
+            return None
+
+        return XMLTempestFailure(
+            type=element.get('type', ''),
+            value=element.text or ''
+        )
+
+    def _to_skipped(
+        self,
+        element: Optional[ET.Element]
+    ) -> Optional[XMLTempestSkipped]:
+        if element is None:
+            return None
+
+        return XMLTempestSkipped(value=element.text or '')
 
 
 class XMLToTest:
@@ -165,47 +247,6 @@ class XMLToTest:
         return TestResult.SUCCESS
 
 
-class XMLToTestSuite:
-    """Converts an XML test suite into a Cibyl test suite.
-    """
-
-    class Tools(NamedTuple):
-        """Tools this will use to do its task.
-        """
-        cases: XMLToTest = XMLToTest()
-        """Used to convert test cases within the test suite."""
-
-    def __init__(self, tools: Tools = Tools()):
-        """Constructor.
-
-        :param tools: Tools this will use to do its task.
-        """
-        self._tools = tools
-
-    @property
-    def tools(self):
-        """
-        :return: Tools this will use to do its task.
-        """
-        return self._tools
-
-    def to_suite(self, url: URL, suite: XMLTempestTestSuite) -> TestSuite:
-        """Converts the XML object into something that Cibyl can understand.
-
-        :param url: URL where the test case was read from.
-        :param suite: The XML test suite.
-        :return: Cibyl representation of that test suite.
-        """
-        return TestSuite(
-            name=suite.name,
-            url=url,
-            tests=[
-                self.tools.cases.to_test(url, case)
-                for case in suite.testcase
-            ]
-        )
-
-
 class TempestTestParser:
     """Tools used to convert the XML test results file into a collection of
     objects that Cibyl can understand.
@@ -214,12 +255,12 @@ class TempestTestParser:
     class Tools(NamedTuple):
         """Tools this will use to do its task.
         """
-        parser: XmlParser = XmlParser()
-        """Used to go from a XML string to Python representation of such
-        file."""
-        converter: XMLToTestSuite = XMLToTestSuite()
-        """Used to go from the intermediate Python representation to
-        something Cibyl may use."""
+        reader: XMLTempestTestCaseReader = XMLTempestTestCaseReader()
+        """Used to go through the test cases on the XML file one by one, as
+        it is downloaded."""
+        cases: XMLToTest = XMLToTest()
+        """Used to go from each test case on the XML file to something Cibyl
+        may use."""
 
     def __init__(self, tools: Tools = Tools()):
         """Constructor.
@@ -238,31 +279,36 @@ class TempestTestParser:
     def parse_tests_at(
         self,
         build: Build,
-        file: ManifestFile
+        file: ManifestFile,
+        accepts: Callable[[TempestTest], bool] = lambda _: True
     ) -> Iterable[TestSuite]:
         """Downloads and parses the XML file that describes the result of
         all tempest test cases.
 
+        The file is parsed while it is downloaded, so only the tests that
+        are kept are ever held in memory.
+
         :param build: The build that exported the file.
         :param file: Relative path pointing to the XML file that holds the
             test results.
+        :param accepts: Filter for the tests. Only those that it returns True
+            for are kept.
         :return: The tests within the XML file, formatted for Cibyl to use.
         """
-        return [
-            self.tools.converter.to_suite(
-                url=self._get_url_to_file(build, file),
-                suite=self.tools.parser.from_string(
-                    self._download_build_file(build, file),
-                    XMLTempestTestSuite
-                )
-            )
-        ]
-
-    def _download_build_file(self, build: Build, file: ManifestFile) -> str:
-        return download_into_memory(
-            self._get_url_to_file(build, file),
-            self._get_session_from(build)
-        )
+        url = self._get_url_to_file(build, file)
+
+        with download_as_stream(url, self._get_session_from(build)) as xml:
+            name, cases = self.tools.reader.read_suite(xml)
+
+            tests = []
+
+            for case in cases:
+                test = self.tools.cases.to_test(url, case)
+
+                if accepts(test):
+                    tests.append(test)
+
+        return [TestSuite(name=name, url=url, tests=tests)]
 
     def _get_url_to_file(self, build: Build, file: ManifestFile) -> URL:
         return get_url_to_build_file(build, file)
@@ -13,21 +13,66 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import hashlib
+import json
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, FrozenSet, Optional, Sequence, Tuple
 
 from cibyl.exceptions.source import SourceException
 from cibyl.sources.zuul.transactions import JobResponse as Job
 from cibyl.sources.zuul.transactions import TenantResponse as Tenant
 from cibyl.sources.zuul.transactions import VariantResponse as Variant
 from cibyl.utils.filtering import matches_regex
+from kernel.tools.dicts import LRUDict
 
 LOG = logging.getLogger(__name__)
 
+MAX_CACHED_VARIANTS = 4096
+"""Maximum number of variants whose hierarchy or variables are remembered
+at the same time."""
+
 Variables = Dict[str, Any]
 """Type for a variant's variables."""
 
+TenantKey = Tuple[Optional[str], str]
+"""Type for what tells a tenant apart from the rest: its host and name."""
+
+VariantKey = Tuple[Optional[str], str, str, str]
+"""Type for what tells a variant apart from the rest: its host, tenant, job
+and a digest of its data."""
+
+Hierarchies = Dict[VariantKey, Sequence[Variant]]
+"""Type for the hierarchy of jobs of many variants, by the variant each
+one starts from."""
+
+
+def tenant_key(tenant: Tenant) -> TenantKey:
+    """
+    :param tenant: The tenant to get the key for.
+    :return: Key that identifies the tenant across hosts.
+    """
+    return tenant.host, tenant.name
+
+
+def variant_key(variant: Variant) -> VariantKey:
+    """Builds a key for a variant that stays the same no matter how many
+    times the variant is fetched from the host, unlike its identity.
+
+    Variants of a job often share parent and branches, differing only on
+    their variables or on where they are defined. All of that is part of
+    the variant's data, so a digest of it is what tells them apart.
+
+    :param variant: The variant to get the key for.
+    :return: Key that identifies the variant across hosts.
+    """
+    job = variant.job
+
+    data = json.dumps(variant.data, sort_keys=True, default=str)
+    digest = hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    return (*tenant_key(job.tenant), job.name, digest)
+
 
 class SearchError(SourceException):
     """Represents any error occurring during a search on the Zuul host.
@@ -94,6 +139,98 @@ class JobFinder:
         return JobFinder.Search(job)
 
 
+class InheritanceGraph:
+    """Parent-child relations between the variants of a tenant.
+
+    Relations are looked up the first time they are needed and remembered
+    from then on, so jobs that share ancestors only fetch them once.
+    """
+
+    def __init__(self, tenant: Tenant, jobs: JobFinder):
+        """Constructor.
+
+        :param tenant: The tenant the variants belong to.
+        :param jobs: Used to search for the jobs on the tenant.
+        """
+        self._tenant = tenant
+        self._jobs = jobs
+
+        self._variants: Dict[str, Sequence[Variant]] = {}
+        self._missing: Dict[str, SearchError] = {}
+        self._parents: Dict[Tuple[str, FrozenSet[str]], Variant] = {}
+
+    @property
+    def tenant(self) -> Tenant:
+        """
+        :return: The tenant the variants belong to.
+        """
+        return self._tenant
+
+    def variants_of(self, job: str) -> Sequence[Variant]:
+        """Gets the variants of a job on the tenant.
+
+        :param job: Name of the job.
+        :return: The variants.
+        :raises SearchError: If the job is not in the tenant.
+        """
+        if job in self._missing:
+            raise self._missing[job]
+
+        if job not in self._variants:
+            try:
+                found = self._jobs.find(job).within(self.tenant)
+            except SearchError as ex:
+                self._missing[job] = ex
+                raise
+
+            self._variants[job] = found.variants().get()
+
+        return self._variants[job]
+
+    def parent_of(self, variant: Variant) -> Optional[Variant]:
+        """Searches of the parent variant of the given one.
+
+        A parent variant is the first one that:
+            - Belongs to the parent job of the variant.
+            - Spans any of the branches from the variant.
+
+        :param variant: The variant to get the parent for.
+        :return: The parent variant. None if the variant has no parent.
+        :raises SearchError:
+            If the parent job could not be found.
+            If the parent variant could not be found.
+        """
+        parent = variant.parent
+
+        if not parent:
+            return None
+
+        # Only the parent's name and the branches decide who the parent is
+        key = (parent, frozenset(variant.branches))
+
+        if key not in self._parents:
+            self._parents[key] = self._resolve(variant)
+
+        return self._parents[key]
+
+    def _resolve(self, variant: Variant) -> Variant:
+        for candidate in self.variants_of(variant.parent):
+            for condition in candidate.branches:
+                for branch in variant.branches:
+                    # See if parent pattern matches my branch
+                    if matches_regex(condition, branch):
+                        return candidate
+
+                    # See if my pattern matches my parent's branch
+                    if matches_regex(branch, condition):
+                        return candidate
+
+        raise SearchError(
+            f"Could not find parent: '{variant.parent}' "
+            f"for variant: '{variant.name}'."
+        )
+
+
 class VariantFinder:
     """Allows for easy search of a variant along the Zuul host.
     """
@@ -102,19 +239,27 @@ class VariantFinder:
         """Action waiting for conditions to given to perform the search.
         """
 
-        def __init__(self, tools: 'VariantFinder.Tools'):
+        def __init__(self,
+                     tools: 'VariantFinder.Tools',
+                     graphs: Optional[
+                         Dict[TenantKey, InheritanceGraph]
+                     ] = None):
             """Constructor.
 
             :param tools: Tools this uses to do its job.
+            :param graphs: Inheritance graph of each tenant, by the
+                tenant's host and name. 'None' to start with no graphs.
             """
+            if graphs is None:
+                graphs = {}
+
             self._tools = tools
+            self._graphs = graphs
 
         def parent_of(self, variant: Variant) -> Optional[Variant]:
             """Searches of the parent variant of the given one.
 
-            A parent variant is the first one that:
-                - Belongs to the parent job of the variant.
-                - Spans any of the branches from the variant.
+            See :meth:`InheritanceGraph.parent_of` for more information.
 
             :param variant: The variant to get the parent for.
             :return: The parent variant.
@@ -122,28 +267,19 @@ class VariantFinder:
                 If the parent job could not be found.
                 If the parent variant could not be found.
             """
-            parent = variant.parent
-
-            if not parent:
+            if not variant.parent:
                 return None
 
-            job = self.tools.jobs.find(parent).within(variant.job.tenant)
+            tenant = variant.job.tenant
+            key = tenant_key(tenant)
 
-            for candidate in job.variants().get():
-                for condition in candidate.branches:
-                    for branch in variant.branches:
-                        # See if parent pattern matches my branch
-                        if matches_regex(condition, branch):
-                            return candidate
-
-                        # See if my pattern matches my parent's branch
-                        if matches_regex(branch, condition):
-                            return candidate
+            if key not in self._graphs:
+                self._graphs[key] = InheritanceGraph(
+                    tenant=tenant,
+                    jobs=self.tools.jobs
+                )
 
-            raise SearchError(
-                f"Could not find parent: '{variant.parent}' "
-                f"for variant: '{variant.name}'."
-            )
+            return self._graphs[key].parent_of(variant)
 
         @property
         def tools(self) -> 'VariantFinder.Tools':
@@ -170,6 +306,7 @@ class VariantFinder:
             tools = VariantFinder.Tools()
 
         self._tools = tools
+        self._graphs: Dict[TenantKey, InheritanceGraph] = {}
 
     @property
     def tools(self) -> Tools:
@@ -184,7 +321,8 @@ class VariantFinder:
         :return: The action instance.
         """
         return VariantFinder.Search(
-            tools=self.tools
+            tools=self.tools,
+            graphs=self._graphs
         )
 
 
@@ -298,15 +436,36 @@ class HierarchyCrawler:
 
 class HierarchyCrawlerFactory:
     """Factory for :class:`HierarchyCrawler`.
+
+    All crawlers coming from the same factory share their tools, and with
+    them, what those tools have learned of the hierarchy so far.
     """
 
+    def __init__(self, tools: Optional[HierarchyCrawler.Tools] = None):
+        """Constructor.
+
+        :param tools: Tools given to the crawlers. 'None' to let this
+            build its own.
+        """
+        if tools is None:
+            tools = HierarchyCrawler.Tools()
+
+        self._tools = tools
+
+    @property
+    def tools(self) -> HierarchyCrawler.Tools:
+        """
+        :return: Tools given to the crawlers.
+        """
+        return self._tools
+
     def from_variant(self, variant: Variant) -> HierarchyCrawler:
         """Create a new instance from a variant.
 
         :param variant: The variant to crawl though.
         :return: A new instance.
         """
-        return HierarchyCrawler(variant)
+        return HierarchyCrawler(variant, self.tools)
 
 
 class HierarchyBuilder:
@@ -317,14 +476,23 @@ class HierarchyBuilder:
         """Gets the hierarchy of jobs on top a variant.
         """
 
-        def __init__(self, variant: Variant, tools: 'HierarchyBuilder.Tools'):
+        def __init__(self,
+                     variant: Variant,
+                     tools: 'HierarchyBuilder.Tools',
+                     chains: Optional[Hierarchies] = None):
             """Constructor.
 
             :param variant: Variant to fetch hierarchy for.
             :param tools: Tools this uses to do its job.
+            :param chains: Hierarchies already built, by the variant they
+                start from. 'None' to build it from scratch.
             """
+            if chains is None:
+                chains = {}
+
             self._variant = variant
             self._tools = tools
+            self._chains = chains
 
         def build(self) -> Sequence[Variant]:
             """Get the hierarchy for the variant targeted by this. Instead
@@ -336,9 +504,14 @@ class HierarchyBuilder:
 
             :return: The hierarchy.
             """
-            crawler = self.tools.crawlers.from_variant(self.variant)
+            key = variant_key(self.variant)
+
+            if key not in self._chains:
+                crawler = self.tools.crawlers.from_variant(self.variant)
+
+                self._chains[key] = tuple(crawler)
 
-            return [*crawler]
+            return [*self._chains[key]]
 
         @property
         def variant(self) -> Variant:
@@ -363,15 +536,20 @@ class HierarchyBuilder:
         )
         """Used to go through the hierarchy of jobs of a variant."""
 
-    def __init__(self, tools: Optional[Tools] = None):
+    def __init__(self,
+                 tools: Optional[Tools] = None,
+                 max_size: int = MAX_CACHED_VARIANTS):
         """Constructor.
 
         :param tools: Tools this uses. 'None' to let this build its own.
+        :param max_size: Maximum number of hierarchies remembered at the
+            same time.
         """
         if tools is None:
             tools = HierarchyBuilder.Tools()
 
         self._tools = tools
+        self._chains: Hierarchies = LRUDict(max_size)
 
     @property
     def tools(self) -> Tools:
@@ -388,7 +566,8 @@ class HierarchyBuilder:
         """
         return HierarchyBuilder.VariantTask(
             variant=variant,
-            tools=self.tools
+            tools=self.tools,
+            chains=self._chains
         )
 
 
@@ -406,18 +585,27 @@ class RecursiveVariableSearch:
         )
         """Used to get the hierarchy of jobs of a variant."""
 
-    def __init__(self, variant: Variant, tools: Optional[Tools] = None):
+    def __init__(self,
+                 variant: Variant,
+                 tools: Optional[Tools] = None,
+                 resolved: Optional[Dict[VariantKey, Variables]] = None):
         """Constructor.
 
         :param variant: The variant to get the variables for.
         :param tools: Tools this uses to do its job. 'None' to let this
             build its own.
+        :param resolved: Variables already figured out for other variants,
+            by variant. 'None' to figure them all out from scratch.
         """
         if tools is None:
             tools = RecursiveVariableSearch.Tools()
 
+        if resolved is None:
+            resolved = {}
+
         self._variant = variant
         self._tools = tools
+        self._resolved = resolved
 
     @property
     def variant(self) -> Variant:
@@ -438,25 +626,66 @@ class RecursiveVariableSearch:
 
         :return: Dictionary containing the variables.
         """
+        key = variant_key(self.variant)
+
+        if key in self._resolved:
+            return dict(self._resolved[key])
+
         result = {}
 
         hierarchy = self.tools.hierarchy.from_variant(self.variant).build()
-        hierarchy = reversed(hierarchy)
+        keys = [variant_key(level) for level in hierarchy]
 
-        for level in hierarchy:
-            result.update(level.variables)
+        # Start from the closest level whose variables are already known
+        for depth, level in enumerate(keys):
+            if level in self._resolved:
+                result = self._resolved[level]
+                hierarchy = hierarchy[:depth]
+                break
 
-        return result
+        for level, key in reversed(list(zip(hierarchy, keys))):
+            result = {**result, **level.variables}
+
+            self._resolved[key] = result
+
+        return dict(result)
 
 
 class RecursiveVariableSearchFactory:
     """Factory for :class:`RecursiveVariableSearch`.
+
+    All searches coming from the same factory share their tools and the
+    variables resolved so far, so the hierarchy of a job is only looked up
+    and merged once.
     """
 
+    def __init__(self,
+                 tools: Optional[RecursiveVariableSearch.Tools] = None,
+                 max_size: int = MAX_CACHED_VARIANTS):
+        """Constructor.
+
+        :param tools: Tools given to the searches. 'None' to let this
+            build its own.
+        :param max_size: Maximum number of variants whose variables are
+            remembered at the same time.
+        """
+        if tools is None:
+            tools = RecursiveVariableSearch.Tools()
+
+        self._tools = tools
+        self._resolved: Dict[VariantKey, Variables] = LRUDict(max_size)
+
+    @property
+    def tools(self) -> RecursiveVariableSearch.Tools:
+        """
+        :return: Tools given to the searches.
+        """
+        return self._tools
+
     def from_variant(self, variant: Variant) -> RecursiveVariableSearch:
         """Creates a new instance starting from a variant.
 
         :param variant: The variant to work with.
         :return: A new instance.
         """
-        return RecursiveVariableSearch(variant)
+        return RecursiveVariableSearch(variant, self.tools, self._resolved)
@@ -14,7 +14,10 @@
 #    under the License.
 """
 import logging
-from typing import Generic, Iterable
+import time
+from queue import Empty, Queue
+from threading import Thread
+from typing import Generic, Iterable, Optional
 
 from overrides import overrides
 
@@ -33,13 +36,22 @@ class AggregatedBackend(Generic[T], ZuulDBackend[T]):
     All implementation aggregated here must support the same type of spec
     as indicated by the generic argument. This means, for example, that for
     Git specs, only Git backends may be aggregated here.
+
+    Instead of going one after the other, backends can also be raced. In
+    that case, all of them are asked at the same time and the first one to
+    answer wins.
     """
 
     class Get(ZuulDBackend.Get):
         """Iterates over the aggregated backends to read data from a spec.
         """
 
-        def __init__(self, backends: Iterable[ZuulDBackend.Get]):
+        def __init__(
+            self,
+            backends: Iterable[ZuulDBackend.Get],
+            race: bool = False,
+            timeout: Optional[float] = None
+        ):
             """Constructor.
 
             :param backends:
@@ -51,8 +63,16 @@ class AggregatedBackend(Generic[T], ZuulDBackend[T]):
                 continues until one is able to satisfy the request.
                 Every time a request is made, the iteration is restarted and
                 the first element is tried again.
+            :param race:
+                Whether to ask all backends at the same time instead,
+                taking the answer from the first one to succeed.
+            :param timeout:
+                Seconds to wait for an answer while racing.
+                'None' to wait forever.
             """
             self._backends = backends
+            self._race = race
+            self._timeout = timeout
 
         @property
         @overrides
@@ -76,8 +96,26 @@ class AggregatedBackend(Generic[T], ZuulDBackend[T]):
             """
             return self._backends
 
+        @property
+        def race(self) -> bool:
+            """
+            :return: Whether all backends are asked at the same time.
+            """
+            return self._race
+
+        @property
+        def timeout(self) -> Optional[float]:
+            """
+            :return: Seconds to wait for an answer while racing. 'None' if
+                there is no limit.
+            """
+            return self._timeout
+
         @overrides
         def jobs(self, spec: T) -> Iterable[Job]:
+            if self.race:
+                return self._race_for_jobs(spec)
+
             for backend in self.backends:
                 LOG.debug("Fetching jobs through backend: '%s'.", backend.name)
                 try:
@@ -90,15 +128,96 @@ class AggregatedBackend(Generic[T], ZuulDBackend[T]):
                 "Failed to fetch jobs as all backends returned with an error."
             )
 
-    def __init__(self, get: Iterable[ZuulDBackend[T].Get]):
+        def _race_for_jobs(self, spec: T) -> Iterable[Job]:
+            """Asks all backends for the jobs on a spec at the same time.
+
+            Each backend is asked from a daemon thread. Backends that are
+            still working once an answer is picked, or once time is up, are
+            left behind: their results are discarded and they do not keep
+            the process alive once it is done.
+
+            :param spec: The spec to read.
+            :return: Jobs returned by the first backend to succeed.
+            :raises ZuulDError:
+                If all backends failed or none answered in time.
+            """
+            backends = list(self.backends)
+
+            if not backends:
+                raise ZuulDError(
+                    "Failed to fetch jobs as there are no backends."
+                )
+
+            answers = Queue()
+
+            def ask(backend: ZuulDBackend.Get) -> None:
+                try:
+                    answers.put((backend, backend.jobs(spec), None))
+                except Exception as ex:
+                    # Handed over for the caller to decide what to do with it
+                    answers.put((backend, None, ex))
+
+            for backend in backends:
+                Thread(target=ask, args=(backend,), daemon=True).start()
+
+            deadline = None
+
+            if self.timeout is not None:
+                deadline = time.monotonic() + self.timeout
+
+            for _ in backends:
+                remaining = None
+
+                if deadline is not None:
+                    remaining = max(0.0, deadline - time.monotonic())
+
+                try:
+                    backend, result, error = answers.get(timeout=remaining)
+                except Empty as ex:
+                    raise ZuulDError(
+                        "Failed to fetch jobs as no backend answered within: "
+                        f"'{self.timeout}' seconds."
+                    ) from ex
+
+                if isinstance(error, ZuulDError):
+                    LOG.debug(
+                        "Backend: '%s' failed to fetch jobs due to "
+                        "error: '%s'.",
+                        backend.name, error
+                    )
+                    continue
+
+                if error is not None:
+                    raise error
+
+                LOG.debug("Fetched jobs through backend: '%s'.", backend.name)
+                return result
+
+            raise ZuulDError(
+                "Failed to fetch jobs as all backends returned with an error."
+            )
+
+    def __init__(
+        self,
+        get: Iterable[ZuulDBackend[T].Get],
+        race: bool = False,
+        timeout: Optional[float] = None
+    ):
         """Constructor.
 
         :param get:
             Interfaces that provide reading capabilities to this backend.
             See :class:`AggregatedBackend.Get` for more information.
+        :param race:
+            Whether to ask all interfaces at the same time.
+        :param timeout:
+            Seconds to wait for an answer while racing.
+            'None' to wait forever.
         """
         super().__init__(
             get=AggregatedBackend.Get(
-                backends=get
+                backends=get,
+                race=race,
+                timeout=timeout
             )
         )
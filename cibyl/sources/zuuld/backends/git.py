@@ -14,19 +14,28 @@
 #    under the License.
 """
 import logging
-from dataclasses import dataclass, field
-from typing import Iterable, Optional
+import os
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional
 
 from overrides import overrides
 
 from cibyl.sources.zuuld.backends.abc import ZuulDBackend
 from cibyl.sources.zuuld.models.job import Job
 from cibyl.sources.zuuld.specs.git import GitSpec
-from cibyl.sources.zuuld.tools.yaml import YAMLReaderFactory, YAMLSearch
+from cibyl.sources.zuuld.tools.yaml import (YAMLReaderFactory, YAMLSearch,
+                                            ZuulDFile)
+from kernel.scm.git.apis.cli import GitError, Repository
 from kernel.scm.git.tools.cloning import RepositoryFactory
+from kernel.tools.fs import File
 
 LOG = logging.getLogger(__name__)
 
+ParsedFiles = Dict[str, List[Dict[str, Any]]]
+"""Jobs found on each Zuul.D file, indexed by the file's path relative to
+the repository's root."""
+
 
 class GitBackend(ZuulDBackend[GitSpec]):
     """Implementation of a Zuul.D backend that allows interaction with Git
@@ -40,6 +49,10 @@ class GitBackend(ZuulDBackend[GitSpec]):
     Additionally, the backend does not take care of authentication
     operations. Accessing a repository through SSH is up to the user to have
     prepared (like loading the keys...) before this is used.
+
+    Jobs read from a spec are remembered along the commit they were read
+    at. As long as the repository stays at that commit, they are reused.
+    Once it moves, only the files that changed in between are read again.
     """
 
     class Get(ZuulDBackend.Get):
@@ -62,6 +75,11 @@ class GitBackend(ZuulDBackend[GitSpec]):
                 default_factory=lambda *_: YAMLReaderFactory()
             )
             """Used to parse the Zuul.D files into Python objects."""
+            index: MutableMapping[str, Any] = field(
+                default_factory=lambda *_: {}
+            )
+            """Where the jobs read from each spec are remembered, along the
+            commit they were read at."""
 
         def __init__(self, tools: Optional[Tools] = None):
             """Constructor.
@@ -94,17 +112,132 @@ class GitBackend(ZuulDBackend[GitSpec]):
             repo = self.tools.repositories.from_remote(url=spec.remote)
             directory = repo.workspace.cd(spec.directory)
 
-            LOG.debug("Spec ready, parsing contents...")
+            key = f'{spec.remote}#{spec.directory}'
+            commit = repo.head
+            entry = self.tools.index.get(key)
+
+            if entry is None:
+                LOG.debug("Spec ready, parsing contents...")
+                files = self._read_all(repo, directory)
+            elif entry['commit'] == commit:
+                LOG.debug("Spec unchanged since last read, reusing jobs...")
+                files = entry['files']
+            else:
+                LOG.debug("Spec changed since last read, updating jobs...")
+                files = self._read_changes(repo, spec, entry)
+
+            if entry is None or entry['commit'] != commit:
+                self._remember(key, commit, files)
+
+            # Copy the jobs so that the remembered ones are never altered
+            return [
+                Job(**deepcopy(job))
+                for jobs in files.values()
+                for job in jobs
+            ]
+
+        def _read_all(self, repo: Repository, directory) -> ParsedFiles:
+            """Reads all Zuul.D files on a directory.
+
+            :param repo: The repository the directory belongs to.
+            :param directory: The directory.
+            :return: The jobs on each of the files.
+            """
+            return {
+                self._relative_path(repo, file.file): self._read(file)
+                for file in self.tools.files.search(directory)
+            }
+
+        def _read_changes(
+            self,
+            repo: Repository,
+            spec: GitSpec,
+            entry: Dict[str, Any]
+        ) -> ParsedFiles:
+            """Updates the jobs read on a previous commit with the files that
+            changed since then.
+
+            :param repo: The repository the spec points to.
+            :param spec: The spec.
+            :param entry: The jobs read before and the commit they were read
+                at.
+            :return: The jobs on each of the files at the current commit.
+            """
+            try:
+                changes = repo.changed_files(entry['commit'])
+            except GitError:
+                LOG.debug(
+                    "Unable to compare against commit: '%s'. "
+                    "Parsing all contents again...",
+                    entry['commit']
+                )
+                return self._read_all(repo, repo.workspace.cd(spec.directory))
+
+            prefix = os.path.normpath(str(spec.directory)) + os.sep
+
+            result = dict(entry['files'])
+
+            for change in changes:
+                path = os.path.normpath(change)
+
+                if not path.startswith(prefix):
+                    # Not part of the spec
+                    continue
+
+                LOG.debug("Reading changed file: '%s'...", path)
+
+                result.pop(path, None)
+
+                file = File(os.path.join(repo.workspace, path))
 
-            result = []
+                if not file.exists():
+                    # File got removed
+                    continue
 
-            for file in self.tools.files.search(directory):
-                LOG.debug("Reading: '%s'...", file.file)
-                reader = self.tools.readers.from_file(file)
-                result += reader.jobs()
+                zuuld = self.tools.files.check(file)
+
+                if zuuld is None:
+                    continue
+
+                result[path] = self._read(zuuld)
 
             return result
 
+        def _read(self, file: ZuulDFile) -> List[Dict[str, Any]]:
+            """
+            :param file: A Zuul.D file.
+            :return: The jobs on the file, as primitive data.
+            """
+            LOG.debug("Reading: '%s'...", file.file)
+
+            reader = self.tools.readers.from_file(file)
+
+            return [asdict(job) for job in reader.jobs()]
+
+        def _remember(self, key: str, commit: str, files: ParsedFiles):
+            """Stores the jobs read from a spec on the index.
+
+            :param key: Identifier of the spec.
+            :param commit: Commit the jobs were read at.
+            :param files: The jobs on each of the files of the spec.
+            """
+            try:
+                self.tools.index[key] = {'commit': commit, 'files': files}
+            except (TypeError, ValueError, OSError) as ex:
+                LOG.debug(
+                    "Unable to remember jobs of spec: '%s'. Reason: '%s'.",
+                    key, ex
+                )
+
+        @staticmethod
+        def _relative_path(repo: Repository, file: File) -> str:
+            """
+            :param repo: The repository the file belongs to.
+            :param file: Path to the file.
+            :return: Path to the file, relative to the repository's root.
+            """
+            return os.path.relpath(file, repo.workspace)
+
     def __init__(self):
         """Constructor.
         """
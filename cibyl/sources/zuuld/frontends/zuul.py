@@ -14,9 +14,11 @@
 #    under the License.
 """
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Generic, Iterable, Optional
+from typing import Dict, Generic, Iterable, List, Optional
 
 from overrides import overrides
 
@@ -24,16 +26,22 @@ from cibyl.sources.zuul.apis import (ZuulAPI, ZuulJobAPI, ZuulTenantAPI,
                                      ZuulVariantAPI)
 from cibyl.sources.zuul.apis.factories.abc import ZuulAPIFactory
 from cibyl.sources.zuuld.backends.abc import T, ZuulDBackend
+from cibyl.sources.zuuld.backends.aggr import AggregatedBackend
 from cibyl.sources.zuuld.backends.git import GitBackend
 from cibyl.sources.zuuld.errors import InvalidURL, UnsupportedError
 from cibyl.sources.zuuld.models.job import Job
 from cibyl.sources.zuuld.specs.git import GitSpec
-from kernel.tools.cache import Cache, RTCache
-from kernel.tools.json import NullValidatorFactory
+from cibyl.sources.zuuld.tools.yaml import YAMLSearch
+from kernel.tools.cache import Cache, SFCache, TieredStorage
+from kernel.tools.fs import Dir
+from kernel.tools.json import JSONDirectory, NullValidatorFactory
 from kernel.tools.urls import URL
 
 LOG = logging.getLogger(__name__)
 
+MAX_CONCURRENT_SPECS = 4
+"""Maximum number of specs read at the same time by default."""
+
 
 @dataclass
 class Session(Generic[T]):
@@ -47,6 +55,9 @@ class Session(Generic[T]):
     """Defines the location of all Zuul.D data available to the source."""
     backend: ZuulDBackend[T]
     """API that allows interaction with the specs."""
+    max_concurrent_specs: int = MAX_CONCURRENT_SPECS
+    """Maximum number of specs read at the same time. 1 to read them one
+    after the other."""
 
 
 class _Variant(Generic[T], ZuulVariantAPI):
@@ -148,7 +159,7 @@ class _Job(Generic[T], ZuulJobAPI):
         return result
 
     @overrides
-    def builds(self):
+    def builds(self, query=None):
         raise UnsupportedError
 
     @overrides
@@ -172,7 +183,8 @@ class _Tenant(Generic[T], ZuulTenantAPI):
         :param data: Raw data describing the tenant this represents.
         """
         if cache is None:
-            cache = RTCache(
+            # Specs are read from several threads at once
+            cache = SFCache(
                 loader=lambda spec: self.session.backend.get.jobs(spec)
             )
 
@@ -192,6 +204,12 @@ class _Tenant(Generic[T], ZuulTenantAPI):
     def cache(self) -> Cache[T, Iterable[Job]]:
         return self._cache
 
+    @property
+    @overrides
+    def host(self):
+        # All tenants here share a name, the specs are what sets them apart
+        return ', '.join(str(spec) for spec in self.session.specs)
+
     @overrides
     def projects(self):
         raise UnsupportedError
@@ -200,8 +218,10 @@ class _Tenant(Generic[T], ZuulTenantAPI):
     def jobs(self):
         result = []
 
-        for spec in self.session.specs:
-            for job in self.cache.get(spec):
+        specs = list(self.session.specs)
+
+        for spec, jobs in zip(specs, self._get_jobs_of(specs)):
+            for job in jobs:
                 result.append(
                     _Job(
                         session=self.session,
@@ -215,6 +235,21 @@ class _Tenant(Generic[T], ZuulTenantAPI):
 
         return result
 
+    def _get_jobs_of(self, specs: List[T]) -> List[Iterable[Job]]:
+        """Reads many specs at the same time, so that the time spent cloning
+        and parsing one of them overlaps with that of the rest.
+
+        :param specs: The specs to read.
+        :return: The jobs on each spec, in the same order as the specs.
+        """
+        workers = min(self.session.max_concurrent_specs, len(specs))
+
+        if workers <= 1:
+            return [self.cache.get(spec) for spec in specs]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.cache.get, specs))
+
     @overrides
     def builds(self):
         raise UnsupportedError
@@ -276,15 +311,19 @@ class GitFrontendFactory(ZuulAPIFactory):
     def __init__(
         self,
         specs: Iterable[GitSpec],
-        backend: ZuulDBackend[GitSpec]
+        backend: ZuulDBackend[GitSpec],
+        max_concurrent_specs: int = MAX_CONCURRENT_SPECS
     ):
         """Constructor.
 
         :param specs: Specs to create the session for.
         :param backend: Backend to support the specs with.
+        :param max_concurrent_specs: Maximum number of specs read at the
+            same time.
         """
         self._specs = specs
         self._backend = backend
+        self._max_concurrent_specs = max_concurrent_specs
 
     @staticmethod
     def from_kwargs(**kwargs) -> 'GitFrontendFactory':
@@ -293,6 +332,16 @@ class GitFrontendFactory(ZuulAPIFactory):
 
         :param kwargs: Keyword arguments.
         :key repos: Required. Repositories that hold the Zuul.D data.
+        :key unsafe: Optional. Whether to skip validation of the Zuul.D
+            files.
+        :key cache_dir: Optional. Directory where to keep the jobs read from
+            the repositories between runs.
+        :key workers: Optional. Number of processes used to parse the Zuul.D
+            files. 1 to parse them on the current process.
+        :key max_concurrent_specs: Optional. Maximum number of repositories
+            cloned and read at the same time.
+        :key read_timeout: Optional. Seconds to wait for a repository to be
+            cloned and read before giving up on it.
         :return: A new instance of the factory.
         :raise ValueError:
             If keyword arguments are missing 'repos' key.
@@ -304,7 +353,10 @@ class GitFrontendFactory(ZuulAPIFactory):
 
         return GitFrontendFactory(
             specs=GitFrontendFactory._get_specs_from(**kwargs),
-            backend=GitFrontendFactory._get_backend_from(**kwargs)
+            backend=GitFrontendFactory._get_backend_from(**kwargs),
+            max_concurrent_specs=kwargs.get(
+                'max_concurrent_specs', MAX_CONCURRENT_SPECS
+            )
         )
 
     @staticmethod
@@ -359,6 +411,32 @@ class GitFrontendFactory(ZuulAPIFactory):
             zuulds = yamls.tools.files
             zuulds.tools.validators = NullValidatorFactory()
 
+        if kwargs.get('workers', 1) > 1:
+            # Spread the parsing of the Zuul.D files across processes
+            get = backend.get
+            yamls = get.tools.files
+            get.tools.files = YAMLSearch(
+                extensions=yamls.extensions,
+                tools=yamls.tools,
+                workers=kwargs['workers']
+            )
+
+        if kwargs.get('cache_dir'):
+            # Remember the jobs read from the specs between runs
+            backend.get.tools.index = TieredStorage(
+                back=JSONDirectory(
+                    Dir(os.path.join(kwargs['cache_dir'], 'zuul.d'))
+                )
+            )
+
+        if kwargs.get('read_timeout') is not None:
+            # Racing lets the read be abandoned once time is up
+            backend = AggregatedBackend(
+                get=[backend.get],
+                race=True,
+                timeout=kwargs['read_timeout']
+            )
+
         return backend
 
     @property
@@ -375,11 +453,19 @@ class GitFrontendFactory(ZuulAPIFactory):
         """
         return self._backend
 
+    @property
+    def max_concurrent_specs(self) -> int:
+        """
+        :return: Maximum number of specs read at the same time.
+        """
+        return self._max_concurrent_specs
+
     @overrides
     def new(self) -> ZuulFrontend[GitSpec]:
         return ZuulFrontend(
             session=Session(
                 specs=self.specs,
-                backend=self.backend
+                backend=self.backend,
+                max_concurrent_specs=self.max_concurrent_specs
             )
         )
@@ -14,22 +14,90 @@
 #    under the License.
 """
 import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Iterable, Optional
+from multiprocessing import get_context
+from threading import Lock
+from typing import Iterable, List, Optional, Type
 
 from overrides import overrides
 
 from cibyl.sources.zuuld.models.job import Job
 from kernel.tools.files import FileSearchFactory
 from kernel.tools.fs import Dir, File
-from kernel.tools.json import Draft7ValidatorFactory, SchemaError
+from kernel.tools.json import Draft7ValidatorFactory
+from kernel.tools.json import SchemaError as JSONSchemaError
 from kernel.tools.net import DownloadError
 from kernel.tools.urls import URL
-from kernel.tools.yaml import (YAMLArray, YAMLError, YAMLFile, YAMLValidator,
+from kernel.tools.yaml import (YAML, SchemaError, YAMLArray, YAMLError,
+                               YAMLFile, YAMLSchema, YAMLValidator,
                                YAMLValidatorFactory)
 
 LOG = logging.getLogger(__name__)
 
+CHUNKS_PER_WORKER = 4
+"""Number of pieces the files handed to each worker are split in, so that
+workers that finish early can pick up more work."""
+
+_worker_validator: Optional[YAMLValidator] = None
+"""Validator used to check the files handed to this process, when it is
+part of a pool."""
+
+
+def _start_worker(
+    validator_type: Optional[Type[YAMLValidator]],
+    schema: Optional[YAMLSchema]
+) -> None:
+    """Prepares a process of a pool to check Zuul.D files. The validator is
+    built here, so that each process compiles the schema only once.
+
+    :param validator_type: Class of the validator to check the files with.
+        'None' to skip validation.
+    :param schema: The schema the validator is made from.
+    """
+    # pylint: disable=global-statement
+    global _worker_validator
+
+    if validator_type is None:
+        _worker_validator = None
+    else:
+        _worker_validator = validator_type(schema)
+
+
+def _read_zuuld_file(file: File) -> Optional[YAML]:
+    """Parses a file and checks it against the Zuul.D schema, on a process
+    prepared by :func:`_start_worker`.
+
+    :param file: The file to read.
+    :return: Contents of the file. 'None' if it is not a Zuul.D file.
+    """
+    try:
+        return YAMLFile(file=file, validator=_worker_validator).data
+    except (SchemaError, JSONSchemaError, YAMLError):
+        return None
+
+
+def _get_zuuld_validator(
+    validators: YAMLValidatorFactory
+) -> Optional[YAMLValidator]:
+    """
+    :param validators: Factory to build the validator with.
+    :return: Validator for the Zuul.D schema. 'None' if the schema could not
+        be downloaded.
+    """
+    url = ZuulDFile.SCHEMA
+
+    try:
+        return validators.from_remote(url)
+    except DownloadError:
+        LOG.error(
+            "Failed to download schema at: '%s'. "
+            "Ignoring data validation...",
+            url
+        )
+        return None
+
 
 class ZuulDFile(YAMLFile):
     """Representation of a YAML file that meets the Zuul.D schema.
@@ -46,7 +114,12 @@ class ZuulDFile(YAMLFile):
         )
         """Used to build the validator that will check the file's integrity."""
 
-    def __init__(self, file: File, tools: Optional[Tools] = None):
+    def __init__(
+        self,
+        file: File,
+        tools: Optional[Tools] = None,
+        data: Optional[YAML] = None
+    ):
         """Constructor.
 
         :param file:
@@ -54,29 +127,25 @@ class ZuulDFile(YAMLFile):
         :param tools:
             Tools this uses to do its task.
             'None' to let this build its own.
+        :param data:
+            Contents of the file, already parsed and checked against the
+            Zuul.D schema elsewhere.
+            'None' to have this read and check them.
         :raises YAMLError: If the file does not meet the schema.
         """
-
-        def validator() -> Optional[YAMLValidator]:
-            url = ZuulDFile.SCHEMA
-
-            try:
-                return tools.validators.from_remote(url)
-            except DownloadError:
-                LOG.error(
-                    "Failed to download schema at: '%s'. "
-                    "Ignoring data validation...",
-                    url
-                )
-                return None
-
         if tools is None:
             tools = ZuulDFile.Tools()
 
+        if data is None:
+            validator = _get_zuuld_validator(tools.validators)
+        else:
+            validator = None
+
         super().__init__(
             file=file,
-            validator=validator(),
-            tools=tools
+            validator=validator,
+            tools=tools,
+            data=data
         )
 
     @property
@@ -87,6 +156,11 @@ class ZuulDFile(YAMLFile):
 
 class ZuulDFileFactory:
     """Factory for :class:`ZuulDFile`.
+
+    Files built many at once are handled by a pool of processes. The pool
+    is started the first time it is needed and then kept for the rest of
+    the factory's life, so that all of its calls, coming from any thread,
+    share the same one.
     """
 
     @dataclass
@@ -109,6 +183,8 @@ class ZuulDFileFactory:
             tools = ZuulDFileFactory.Tools()
 
         self._tools = tools
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = Lock()
 
     @property
     def tools(self) -> Tools:
@@ -132,6 +208,69 @@ class ZuulDFileFactory:
             )
         )
 
+    def from_files(
+        self,
+        files: List[File],
+        workers: int
+    ) -> List[Optional[ZuulDFile]]:
+        """Builds many Zuul.D files at once, spreading their parsing and
+        validation across a pool of processes.
+
+        :param files: Files that will be tested to see if they are Zuul.D
+            files.
+        :param workers: Maximum number of processes to use. Only the first
+            call, the one that starts the pool, decides its size.
+        :return: The given files, cast to Zuul.D ones, in the same order.
+            'None' in place of those that do not meet the Zuul.D criteria.
+        """
+        if not files:
+            return []
+
+        chunk_size = math.ceil(len(files) / (workers * CHUNKS_PER_WORKER))
+
+        contents = list(
+            self._get_pool(workers).map(
+                _read_zuuld_file, files, chunksize=chunk_size
+            )
+        )
+
+        return [
+            None if data is None else ZuulDFile(
+                file=file,
+                tools=ZuulDFile.Tools(
+                    validators=self.tools.validators
+                ),
+                data=data
+            )
+            for file, data in zip(files, contents)
+        ]
+
+    def _get_pool(self, workers: int) -> ProcessPoolExecutor:
+        """
+        :param workers: Number of processes to start the pool with, in case
+            it does not exist yet.
+        :return: The pool of processes that check the files.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                validator = _get_zuuld_validator(self.tools.validators)
+
+                if validator is None:
+                    initargs = (None, None)
+                else:
+                    initargs = (type(validator), validator.schema)
+
+                # Specs are read from several threads at once, and forking
+                # while other threads hold locks can leave the copies stuck
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=get_context('spawn'),
+                    initializer=_start_worker,
+                    initargs=initargs
+                )
+
+            return self._pool
+
 
 class YAMLReader:
     """Parses the contents of a Zuul.D file.
@@ -248,7 +387,8 @@ class YAMLSearch:
     def __init__(
         self,
         extensions: Optional[Iterable[str]] = None,
-        tools: Optional[Tools] = None
+        tools: Optional[Tools] = None,
+        workers: int = 1
     ):
         """Constructor.
 
@@ -262,6 +402,9 @@ class YAMLSearch:
         :param tools:
             Tools used by the class to do its job.
             'None' to let this build its own.
+        :param workers:
+            Number of processes used to check the found files.
+            1 to check them on the current process.
         """
         if extensions is None:
             extensions = YAMLSearch.DEFAULT_YAML_EXTENSIONS
@@ -271,6 +414,7 @@ class YAMLSearch:
 
         self._extensions = extensions
         self._tools = tools
+        self._workers = workers
 
     @property
     def extensions(self) -> Iterable[str]:
@@ -286,36 +430,67 @@ class YAMLSearch:
         """
         return self._tools
 
+    @property
+    def workers(self) -> int:
+        """
+        :return: Number of processes used to check the found files.
+        """
+        return self._workers
+
     def search(self, path: Dir) -> Iterable[ZuulDFile]:
         """Recursively searches the directory for all Zuul.D YAML files on it.
 
         :param path: Directory to look in.
         :return: A handle to all found files.
         """
-        result = []
+        finds = self._search_for_yamls_at(path)
 
-        for find in self._search_for_yamls_at(path):
-            try:
-                zuuld = self.tools.files.from_file(file=find)
-                result.append(zuuld)
-            except SchemaError:
-                LOG.debug(
-                    "Ignoring YAML file at '%(find)s' as it does not satisfy "
-                    "the Zuul.D file schema.",
-                    {'find': find}
-                )
-                continue
-            except YAMLError:
-                LOG.debug(
-                    "Ignoring YAML file at '%(find)s' for it failed to be "
-                    "parsed.",
-                    {'find': find}
-                )
-                continue
+        if self.workers > 1 and len(finds) > 1:
+            zuulds = self.tools.files.from_files(
+                [find for find in finds if self._has_extension(find)],
+                self.workers
+            )
+        else:
+            zuulds = [self.check(find) for find in finds]
 
-        return result
+        return [zuuld for zuuld in zuulds if zuuld is not None]
+
+    def check(self, file: File) -> Optional[ZuulDFile]:
+        """Checks whether a single file is a Zuul.D YAML file.
+
+        :param file: The file to check.
+        :return: A handle to the file. 'None' if it is not a Zuul.D file,
+            be it because it has not got one of the extensions this looks for
+            or because its contents are not Zuul.D compliant.
+        """
+        if not self._has_extension(file):
+            return None
+
+        try:
+            return self.tools.files.from_file(file=file)
+        except (SchemaError, JSONSchemaError):
+            LOG.debug(
+                "Ignoring YAML file at '%(find)s' as it does not satisfy "
+                "the Zuul.D file schema.",
+                {'find': file}
+            )
+            return None
+        except YAMLError:
+            LOG.debug(
+                "Ignoring YAML file at '%(find)s' for it failed to be "
+                "parsed.",
+                {'find': file}
+            )
+            return None
+
+    def _has_extension(self, file: File) -> bool:
+        """
+        :param file: The file to check.
+        :return: Whether the file has one of the extensions this looks for.
+        """
+        return file.endswith(tuple(self.extensions))
 
-    def _search_for_yamls_at(self, path: Dir) -> Iterable[File]:
+    def _search_for_yamls_at(self, path: Dir) -> List[File]:
         """Recursively looks for all YAML files on a directory.
 
         :param path: Directory to look in.
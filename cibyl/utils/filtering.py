@@ -15,7 +15,7 @@
 """
 import re
 import sre_constants
-from typing import Callable, Dict, Iterable, List, Optional, Pattern
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Pattern
 
 from cibyl.cli.argument import Argument
 from cibyl.cli.ranged_argument import RANGE_OPERATORS
@@ -180,3 +180,19 @@ def apply_filters(iterable: Iterable, *filters: Callable) -> Iterable:
         result = list(filter(check, result))
 
     return result
+
+
+def iter_filters(iterable: Iterable, *filters: Callable) -> Iterator:
+    """Lazy version of :func:`apply_filters`. Items are checked one by one
+    as they are consumed, so the collection is never held in memory.
+
+    Examples
+    -------
+    >>> list(iter_filters(iter([1, 2, 3]), lambda x: x > 1, lambda x: x < 3))
+    [2]
+
+    :param iterable: The collection to filter.
+    :param filters: List of filters to apply.
+    :return: Iterator over the items that satisfy all filters.
+    """
+    return (item for item in iterable if all(check(item) for check in filters))
@@ -0,0 +1,475 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import math
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from cibyl.models.ci.base.environment import Environment
+from cibyl.models.ci.base.system import System
+
+PERCENTILES = (50, 90, 99)
+"""Percentiles of the duration of a test calculated by default."""
+
+
+class TestOutcome(IntEnum):
+    """Normalized result of a test run, no matter the source it came from.
+    """
+    SUCCESS = 0
+    FAILURE = 1
+    SKIPPED = 2
+    UNKNOWN = 3
+
+    @staticmethod
+    def from_result(result: Optional[str]) -> 'TestOutcome':
+        """Parses the result of a test as given by any of the sources.
+
+        Known results:
+            - 'SUCCESS', 'PASSED', 'FIXED' -> :attr:`TestOutcome.SUCCESS`
+            - 'FAILURE', 'FAILED', 'REGRESSION', 'ERROR'
+                -> :attr:`TestOutcome.FAILURE`
+            - 'SKIPPED' -> :attr:`TestOutcome.SKIPPED`
+
+        Any other result will return :attr:`TestOutcome.UNKNOWN`.
+
+        :param result: The result to parse.
+        :return: The outcome of the test.
+        """
+        return _OUTCOMES.get(str(result).upper(), TestOutcome.UNKNOWN)
+
+
+_OUTCOMES = {
+    'SUCCESS': TestOutcome.SUCCESS,
+    'PASSED': TestOutcome.SUCCESS,
+    'FIXED': TestOutcome.SUCCESS,
+    'FAILURE': TestOutcome.FAILURE,
+    'FAILED': TestOutcome.FAILURE,
+    'REGRESSION': TestOutcome.FAILURE,
+    'ERROR': TestOutcome.FAILURE,
+    'SKIPPED': TestOutcome.SKIPPED
+}
+
+
+class TestStats(NamedTuple):
+    """Aggregated results of a test across all the builds it ran on.
+
+    Statistics are either calculated by :class:`TestHistory` from the runs
+    of the test or handed over already calculated by a source.
+    """
+    job: str
+    """Name of the job the test belongs to."""
+    name: str
+    """Name of the test."""
+    runs: int
+    """Number of builds the test appeared on."""
+    failures: int
+    """Number of builds the test failed on."""
+    skips: int
+    """Number of builds the test was skipped on."""
+    flips: Optional[int]
+    """Number of times the test went from passing to failing or the other
+    way around, following the order of the builds. 'None' if unknown."""
+    durations: Dict[float, float]
+    """Duration of the test, in seconds, at each of the calculated
+    percentiles. Empty if no duration is known."""
+    class_name: Optional[str] = None
+    """Name of the class the test belongs to, if known."""
+
+    @property
+    def failure_rate(self) -> float:
+        """
+        :return: Fraction, from 0 to 1, of the builds where the test ran and
+            failed. Skipped runs do not count.
+        """
+        executed = self.runs - self.skips
+
+        if executed <= 0:
+            return 0.0
+
+        return self.failures / executed
+
+
+class TestHistory:
+    """Record of the results of many tests across many builds, meant for
+    finding those that are flaky or slow.
+
+    Runs are stored on columns: one for the test, one for the build, one for
+    the outcome and one for the duration. Names of tests and builds are
+    interned so that each of them is kept only once.
+
+    Statistics already calculated by a source, like Elasticsearch, can be
+    added as well. Those are reported as they come.
+    """
+
+    def __init__(self, last_builds: Optional[int] = None):
+        """Constructor.
+
+        :param last_builds: Only take into account this number of the most
+            recent builds of each job. 'None' to take all of them.
+        """
+        self._last_builds = last_builds
+        self._summaries: List[TestStats] = []
+
+        self._tests: List[Tuple[str, str]] = []
+        self._test_ids: Dict[Tuple[str, str], int] = {}
+        self._builds: List[Tuple[str, str]] = []
+        self._build_ids: Dict[Tuple[str, str], int] = {}
+
+        self._test_column = array('L')
+        self._build_column = array('L')
+        self._outcome_column = array('b')
+        self._duration_column = array('d')
+
+    def __len__(self):
+        return len(self._test_column)
+
+    @property
+    def builds(self) -> int:
+        """
+        :return: Number of builds the tests are summarized over, not
+            counting those behind the statistics added by sources.
+        """
+        return len(self._kept_builds())
+
+    @property
+    def summaries(self) -> List[TestStats]:
+        """
+        :return: Statistics added already calculated by sources.
+        """
+        return list(self._summaries)
+
+    def add(
+        self,
+        job: str,
+        build: str,
+        test: str,
+        outcome: TestOutcome,
+        duration: Optional[float] = None
+    ) -> None:
+        """Records the run of a test.
+
+        Builds are considered to be in the order their first test is added.
+
+        :param job: Name of the job the build belongs to.
+        :param build: Identifier of the build the test ran on.
+        :param test: Name of the test.
+        :param outcome: How the test ended.
+        :param duration: Seconds the test took to complete. 'None' if
+            unknown.
+        """
+        self._test_column.append(self._intern_test(job, test))
+        self._build_column.append(self._intern_build(job, build))
+        self._outcome_column.append(outcome)
+        self._duration_column.append(
+            math.nan if duration is None else duration
+        )
+
+    def add_stats(self, stats: Iterable[TestStats]) -> None:
+        """Records statistics of tests calculated by a source.
+
+        :param stats: The statistics.
+        """
+        self._summaries.extend(stats)
+
+    def add_environment(self, environment: Environment) -> None:
+        """Records the tests of all the builds found on an environment.
+
+        :param environment: The environment, as returned by a query.
+        """
+        for system in environment.systems.value or []:
+            self.add_system(system)
+
+    def add_system(self, system: System) -> None:
+        """Records the tests of all the builds found on a system.
+
+        :param system: The system, as returned by a query.
+        """
+        # Zuul reports durations in seconds, the rest in milliseconds
+        if hasattr(system, 'tenants'):
+            scale = 1
+        else:
+            scale = 1 / 1000
+
+        for job in _get_jobs_on(system):
+            for build in _sort_builds(job.builds.values()):
+                for test in _get_tests_on(build):
+                    duration = test.duration.value
+
+                    self.add(
+                        job=job.name.value,
+                        build=str(build.build_id.value),
+                        test=test.name.value,
+                        outcome=TestOutcome.from_result(test.result.value),
+                        duration=None if duration is None
+                        else duration * scale
+                    )
+
+    def stats(
+        self,
+        percentiles: Iterable[int] = PERCENTILES
+    ) -> List[TestStats]:
+        """Aggregates the results of each test.
+
+        :param percentiles: Percentiles of the duration of the tests to
+            calculate.
+        :return: Statistics for each test, in the order the tests were first
+            seen, followed by those added by sources.
+        """
+        percentiles = tuple(percentiles)
+        builds = self._kept_builds()
+
+        # Group the runs of each test, leaving them in the order of builds
+        rows = sorted(
+            (
+                row
+                for row in range(len(self))
+                if self._build_column[row] in builds
+            ),
+            key=lambda row: (self._test_column[row], self._build_column[row])
+        )
+
+        result = []
+
+        for test, group in _split_by(rows, self._test_column):
+            outcomes = [self._outcome_column[row] for row in group]
+            durations = sorted(
+                duration
+                for duration in (self._duration_column[row] for row in group)
+                if not math.isnan(duration)
+            )
+
+            job, name = self._tests[test]
+
+            result.append(
+                TestStats(
+                    job=job,
+                    name=name,
+                    runs=len(group),
+                    failures=outcomes.count(TestOutcome.FAILURE),
+                    skips=outcomes.count(TestOutcome.SKIPPED),
+                    flips=_count_flips(outcomes),
+                    durations={
+                        percentile: _percentile(durations, percentile)
+                        for percentile in percentiles
+                    } if durations else {}
+                )
+            )
+
+        for stats in self._summaries:
+            result.append(
+                stats._replace(
+                    durations={
+                        percentile: duration
+                        for percentile, duration in stats.durations.items()
+                        if percentile in percentiles
+                    }
+                )
+            )
+
+        return result
+
+    def flaky(
+        self,
+        min_failure_rate: float = 0.0,
+        min_flips: int = 1
+    ) -> List[TestStats]:
+        """Looks for the tests that do not always end the same way.
+
+        Tests whose flips are unknown are considered flaky if they failed
+        some times, but not always.
+
+        :param min_failure_rate: Tests that fail less often than this are
+            ignored.
+        :param min_flips: Tests that change their result fewer times than
+            this are ignored.
+        :return: Statistics of the tests, from the most to the least flaky.
+        """
+        def is_flaky(stats: TestStats) -> bool:
+            if stats.failure_rate < min_failure_rate:
+                return False
+
+            if stats.flips is None:
+                return 0 < stats.failure_rate < 1
+
+            return stats.flips >= min_flips
+
+        return sorted(
+            filter(is_flaky, self.stats()),
+            key=lambda stats: (stats.flips or 0, stats.failure_rate),
+            reverse=True
+        )
+
+    def slowest(
+        self,
+        count: int = 10,
+        percentile: int = 90
+    ) -> List[TestStats]:
+        """Looks for the tests that take the longest to run.
+
+        :param count: Maximum number of tests to return.
+        :param percentile: Percentile of the duration to compare tests by.
+        :return: Statistics of the tests, from the slowest to the fastest.
+        """
+        return sorted(
+            (
+                stats
+                for stats in self.stats(percentiles=(percentile,))
+                if percentile in stats.durations
+            ),
+            key=lambda stats: stats.durations[percentile],
+            reverse=True
+        )[:count]
+
+    def _kept_builds(self) -> Set[int]:
+        """
+        :return: Identifiers of the builds whose runs are taken into
+            account. Those are the most recent ones of each job if a limit
+            was given, or all of them otherwise.
+        """
+        if not self._last_builds:
+            return set(range(len(self._builds)))
+
+        by_job: Dict[str, List[int]] = {}
+
+        for build, (job, _) in enumerate(self._builds):
+            by_job.setdefault(job, []).append(build)
+
+        return {
+            build
+            for builds in by_job.values()
+            for build in builds[-self._last_builds:]
+        }
+
+    def _intern_test(self, job: str, test: str) -> int:
+        key = (job, test)
+
+        if key not in self._test_ids:
+            self._test_ids[key] = len(self._tests)
+            self._tests.append(key)
+
+        return self._test_ids[key]
+
+    def _intern_build(self, job: str, build: str) -> int:
+        key = (job, build)
+
+        if key not in self._build_ids:
+            self._build_ids[key] = len(self._builds)
+            self._builds.append(key)
+
+        return self._build_ids[key]
+
+
+def _get_jobs_on(system: System) -> Iterable:
+    """
+    :param system: The system to get the jobs from.
+    :return: All jobs on the system, no matter how deep on the hierarchy
+        they are. Each is returned only once.
+    """
+    jobs = []
+
+    if hasattr(system, 'jobs'):
+        jobs += system.jobs.values()
+
+    if hasattr(system, 'tenants'):
+        for tenant in system.tenants.values():
+            jobs += tenant.jobs.values()
+
+            for project in tenant.projects.values():
+                for pipeline in project.pipelines.values():
+                    jobs += pipeline.jobs.values()
+
+    # Same job may be reachable from more than one place
+    return list({id(job): job for job in jobs}.values())
+
+
+def _get_tests_on(build) -> Iterable:
+    """
+    :param build: The build to get the tests from.
+    :return: All tests on the build, no matter whether they are grouped in
+        suites or not.
+    """
+    if hasattr(build, 'suites'):
+        return [
+            test
+            for suite in build.suites.value or []
+            for test in suite.tests.value or []
+        ]
+
+    return build.tests.values()
+
+
+def _sort_builds(builds: Iterable) -> List:
+    """
+    :param builds: The builds to sort.
+    :return: The builds, from the oldest to the newest.
+    """
+    def key(build):
+        build_id = str(build.build_id.value)
+
+        return (
+            build.start_time.value or '',
+            int(build_id) if build_id.isdigit() else 0
+        )
+
+    return sorted(builds, key=key)
+
+
+def _split_by(rows: List[int], column: array) -> Iterable[Tuple[int, list]]:
+    """
+    :param rows: Rows sorted by the value they have on the column.
+    :param column: The column to split by.
+    :return: Pairs of a value on the column and the rows that have it.
+    """
+    start = 0
+
+    for end in range(1, len(rows) + 1):
+        if end == len(rows) or column[rows[end]] != column[rows[start]]:
+            yield column[rows[start]], rows[start:end]
+            start = end
+
+
+def _count_flips(outcomes: List[int]) -> int:
+    """
+    :param outcomes: Results of a test, in order.
+    :return: Number of times the test went from passing to failing or the
+        other way around. Skipped or unknown results are not taken into
+        account.
+    """
+    relevant = [
+        outcome
+        for outcome in outcomes
+        if outcome in (TestOutcome.SUCCESS, TestOutcome.FAILURE)
+    ]
+
+    return sum(
+        1 for previous, current in zip(relevant, relevant[1:])
+        if previous != current
+    )
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """
+    :param values: Sorted collection of values. Must not be empty.
+    :param percentile: The percentile to get, from 0 to 100.
+    :return: The value at that percentile, interpolating between the two
+        closest ones if needed.
+    """
+    position = (len(values) - 1) * percentile / 100
+
+    lower = math.floor(position)
+    upper = math.ceil(position)
+
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
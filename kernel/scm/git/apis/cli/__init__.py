@@ -59,6 +59,14 @@ class Repository(Closeable, ABC):
         """
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def head(self) -> str:
+        """
+        :return: SHA of the commit the repository is currently at.
+        """
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def remotes(self) -> Iterable[Remote]:
@@ -84,6 +92,18 @@ class Repository(Closeable, ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def changed_files(self, since: str) -> Iterable[str]:
+        """Lists the files that are different between a commit and the one
+        the repository is currently at.
+
+        :param since: SHA of the commit to compare against.
+        :return: Path, relative to the repository's root, to each of the
+            files that were added, modified or removed since then.
+        :raises GitError: If the commit is unknown to the repository.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def get_as_text(self, file: str, encoding: str = 'utf-8') -> str:
         """Downloads a file on the repository as text.
@@ -17,7 +17,7 @@ import logging
 import os
 from typing import Iterable
 
-from git import InvalidGitRepositoryError, NoSuchPathError
+from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError
 from git import Remote as RemoteAPI
 from git import Repo as RepoAPI
 from overrides import overrides
@@ -83,6 +83,11 @@ class Repository(IRepository):
     def branch(self) -> str:
         return self.handler.active_branch.name
 
+    @property
+    @overrides
+    def head(self) -> str:
+        return self.handler.head.commit.hexsha
+
     @property
     @overrides
     def remotes(self) -> Iterable[Remote]:
@@ -110,6 +115,18 @@ class Repository(IRepository):
 
         self.handler.git.checkout(branch)
 
+    @overrides
+    def changed_files(self, since: str) -> Iterable[str]:
+        try:
+            output = self.handler.git.diff(
+                '--name-only', '--no-renames', since, 'HEAD'
+            )
+        except GitCommandError as ex:
+            msg = f"Failed to compare against commit: '{since}'."
+            raise GitError(msg) from ex
+
+        return [line for line in output.splitlines() if line]
+
     @overrides
     def get_as_text(self, file: str, encoding: str = 'utf-8') -> str:
         abs_path = self._get_absolute_path(file)
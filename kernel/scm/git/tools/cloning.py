@@ -15,7 +15,8 @@
 """
 import logging
 from dataclasses import dataclass, field
-from typing import Optional
+from threading import Lock
+from typing import Dict, Optional
 
 from kernel.scm.git.apis.cli import Git, GitError, Repository
 from kernel.scm.git.apis.cli.gitpython import GitPython
@@ -43,6 +44,10 @@ class RepositoryFactory:
     case that the repository is meant for just reading, and no modification
     is performed over it, then it is useful to go back to a copy of the
     repository without having to download it again once more.
+
+    The factory can be shared by several threads. Requests for the same
+    remote are served one at a time, so that it is never cloned twice into
+    the same place, while different remotes are cloned in parallel.
     """
 
     @dataclass
@@ -80,6 +85,9 @@ class RepositoryFactory:
         self._memory = memory
         self._tools = tools
 
+        self._lock = Lock()
+        self._remotes: Dict[URL, Lock] = {}
+
     @property
     def memory(self) -> Cache[URL, Dir]:
         """
@@ -108,6 +116,21 @@ class RepositoryFactory:
         The intention of this is to try anything possible, within reason, to
         get a session to the repository up and running.
 
+        :param url: URL to the git remote to open session to.
+        :return: An open session to that repository.
+        :raises GitError:
+            If a session to the repository could not be established.
+        """
+        with self._lock:
+            lock = self._remotes.setdefault(url, Lock())
+
+        with lock:
+            return self._from_remote(url)
+
+    def _from_remote(self, url: URL) -> Repository:
+        """Same as :meth:`from_remote`, without guarding against concurrent
+        requests for the same remote.
+
         :param url: URL to the git remote to open session to.
         :return: An open session to that repository.
         :raises GitError:
@@ -134,4 +157,4 @@ class RepositoryFactory:
             # Forget about the workspace and try again
             self.memory.delete(url)
 
-            return self.from_remote(url)
+            return self._from_remote(url)
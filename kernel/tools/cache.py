@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import time
 from abc import ABC, abstractmethod
-from typing import Callable, Generic, MutableMapping, Optional, TypeVar
+from threading import Event, Lock
+from typing import (Callable, Dict, Generic, Iterator, MutableMapping,
+                    Optional, Tuple, TypeVar)
 
 from overrides import overrides
 
@@ -195,12 +198,13 @@ class RTCache(Cache[K, V]):
 
         return self.storage[key]
 
-    def _load(self, key: K) -> None:
+    def _load(self, key: K) -> V:
         """Retrieves a value from the datastore and stores it at the entry
         indexed by the given key. If the entry already exists, then its
         contents get overwritten by what the datastore returned.
 
         :param key: Key to the entry to get the value for.
+        :return: The value the datastore returned.
         :raises CacheError:
             If the datastore answered the request with a 'None' value.
         """
@@ -213,6 +217,8 @@ class RTCache(Cache[K, V]):
 
         self.put(key, value)
 
+        return value
+
     @overrides
     def put(self, key: K, value: V) -> None:
         self.storage[key] = value
@@ -223,3 +229,195 @@ class RTCache(Cache[K, V]):
             return
 
         del self.storage[key]
+
+
+class TieredStorage(MutableMapping[K, V]):
+    """Storage made out of two layers, a fast one in front of a slow one.
+    Entries are written to both, and read from the front one whenever
+    possible. Entries found only on the back one are brought to the front
+    once read.
+    """
+
+    def __init__(
+        self,
+        back: MutableMapping[K, V],
+        front: Optional[MutableMapping[K, V]] = None
+    ):
+        """Constructor.
+
+        :param back: The slow layer, like a directory on the filesystem.
+        :param front: The fast layer. 'None' to keep it in memory.
+        """
+        if front is None:
+            front = {}
+
+        self._back = back
+        self._front = front
+
+    @property
+    def back(self) -> MutableMapping[K, V]:
+        """
+        :return: The slow layer.
+        """
+        return self._back
+
+    @property
+    def front(self) -> MutableMapping[K, V]:
+        """
+        :return: The fast layer.
+        """
+        return self._front
+
+    def __getitem__(self, key: K) -> V:
+        if key in self.front:
+            return self.front[key]
+
+        value = self.back[key]
+        self.front[key] = value
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.front[key] = value
+        self.back[key] = value
+
+    def __delitem__(self, key: K) -> None:
+        if key not in self:
+            raise KeyError(key)
+
+        self.front.pop(key, None)
+        self.back.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.front or key in self.back
+
+    def __iter__(self) -> Iterator[K]:
+        yield from self.front
+        yield from (key for key in self.back if key not in self.front)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class SFCache(RTCache[K, V]):
+    """Read-Through cache meant to be shared by several threads.
+
+    Two features are added on top of its parent:
+        - Entries can be given a time to live, after which they are
+        loaded again.
+        - Single-flight loading: no matter how many callers ask for a missing
+        entry at the same time, the datastore is only reached once and the
+        result is shared among them.
+    """
+
+    class _Flight:
+        """Load of an entry that is currently in progress.
+        """
+
+        def __init__(self):
+            self.done = Event()
+            self.value = None
+            self.error = None
+
+    def __init__(
+        self,
+        loader: Callable[[K], V],
+        ttl: Optional[float] = None,
+        storage: Optional[MutableMapping[K, Tuple[float, V]]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """Constructor.
+
+        :param loader: See parent.
+        :param ttl: Number of seconds entries are valid for. 'None' to keep
+            them forever.
+        :param storage: Container where cached data is stored, next to the
+            time it was loaded at. 'None' to let this create its own.
+        :param clock: Function that tells the current time, in seconds.
+        """
+        super().__init__(loader, storage)
+
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._flights: Dict[K, SFCache._Flight] = {}
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """
+        :return: Number of seconds entries are valid for. 'None' if they
+            never expire.
+        """
+        return self._ttl
+
+    @overrides
+    def has(self, key: K) -> bool:
+        return self._find(key) is not None
+
+    @overrides
+    def get(self, key: K) -> V:
+        """Gets the value for an entry in the cache. If the cache is
+        missing so, or it has expired, then the datastore is reached in
+        order to load one. Callers asking for the same entry in the meantime
+        will wait for that load to finish instead.
+
+        :param key: Key to the entry to get the value from.
+        :return: Value stored at the entry.
+        :raises CacheError:
+            If the datastore answered with a 'None' value.
+        :raises Exception:
+            Whatever the datastore raised while loading the value.
+        """
+        with self._lock:
+            value = self._find(key)
+
+            if value is not None:
+                return value
+
+            flight = self._flights.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = SFCache._Flight()
+                self._flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+
+            if flight.error:
+                raise flight.error
+
+            return flight.value
+
+        try:
+            flight.value = self._load(key)
+            return flight.value
+        except Exception as ex:
+            flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+            flight.done.set()
+
+    def _find(self, key: K) -> Optional[V]:
+        """Reads an entry from the storage, checking it only once.
+
+        :param key: Key to the entry to read.
+        :return: Value stored at the entry. 'None' if it is missing or has
+            expired.
+        """
+        try:
+            stamp, value = self.storage[key]
+        except KeyError:
+            # Storage on disk is shared, so the entry may go at any moment
+            return None
+
+        if self.ttl is not None and self._clock() - stamp >= self.ttl:
+            return None
+
+        return value
+
+    @overrides
+    def put(self, key: K, value: V) -> None:
+        self.storage[key] = (self._clock(), value)
@@ -14,6 +14,7 @@
 #    under the License.
 """
 import logging
+from collections import OrderedDict
 
 from cibyl.models.attribute import AttributeDictValue
 
@@ -131,3 +132,37 @@ def intersect_models(dict1: dict, dict2: dict) -> dict:
         model.merge(dict2[key])
     return AttributeDictValue(dict1.name, attr_type=dict1.attr_type,
                               value=models)
+
+
+class LRUDict(OrderedDict):
+    """Dictionary that holds a limited number of entries. Once full, adding
+    a new entry drops the one that was least recently read or written.
+    """
+
+    def __init__(self, max_size: int):
+        """Constructor.
+
+        :param max_size: Maximum number of entries held at the same time.
+        """
+        super().__init__()
+
+        self._max_size = max_size
+
+    @property
+    def max_size(self) -> int:
+        """
+        :return: Maximum number of entries held at the same time.
+        """
+        return self._max_size
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+
+        while len(self) > self.max_size:
+            self.popitem(last=False)
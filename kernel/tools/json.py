@@ -13,17 +13,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import hashlib
 import json
+import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Union
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Union
 
 from jsonschema.exceptions import SchemaError as JSSchemaError
 from jsonschema.validators import Draft7Validator as JSDraft7Validator
 from overrides import overrides
 
 from kernel.tools.cache import CACache, Cache
-from kernel.tools.fs import File
+from kernel.tools.fs import Dir, File
 from kernel.tools.net import download_into_memory
 from kernel.tools.urls import URL
 
@@ -36,6 +40,10 @@ JSON = Union[JSONArray, JSONObj]
 JSONSchema = JSON
 """Represents a schema for a JSON file."""
 
+EVICTION_TARGET = 0.9
+"""Fraction of its maximum size a :class:`JSONDirectory` is brought down to
+once it goes over it, so that the directory is not walked on every write."""
+
 
 class JSONError(Exception):
     """Describes any error that happened while parsing a stream in JSON
@@ -48,6 +56,199 @@ class SchemaError(JSONError):
     """
 
 
+class JSONDirectory(MutableMapping[str, Any]):
+    """Map that keeps each of its values in a JSON file inside a directory,
+    so that they survive between runs.
+
+    Files are named after a hash of their key, which is stored next to the
+    value. Writes are atomic, so several threads or processes can share
+    the directory.
+
+    The directory can be given a maximum size, after which the entries that
+    have gone unused the longest are removed. The size is measured once and
+    then kept up to date in memory, the directory is only walked again when
+    it goes over the limit.
+    """
+
+    def __init__(
+        self,
+        path: Dir,
+        encoding: str = 'utf-8',
+        max_size: Optional[int] = None
+    ):
+        """Constructor.
+
+        :param path: The directory. Created if it does not exist.
+        :param encoding: Encoding of the files.
+        :param max_size: Number of bytes the files may take altogether.
+            'None' for no limit.
+        """
+        path.mkdir(recursive=True)
+
+        self._path = path
+        self._encoding = encoding
+        self._max_size = max_size
+
+        self._lock = Lock()
+        self._size: Optional[int] = None
+
+    @property
+    def path(self) -> Dir:
+        """
+        :return: The directory where values are kept.
+        """
+        return self._path
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """
+        :return: Number of bytes the files may take altogether. 'None' if
+            there is no limit.
+        """
+        return self._max_size
+
+    def _file_for(self, key: str) -> File:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return File(self.path.as_path() / f'{digest}.json')
+
+    def _read(self, file: str) -> Dict[str, Any]:
+        with open(file, 'r', encoding=self._encoding) as buffer:
+            return json.load(buffer)
+
+    def _size_of(self, file: File) -> int:
+        try:
+            return os.path.getsize(file)
+        except OSError:
+            return 0
+
+    def _measure(self) -> List[tuple]:
+        """
+        :return: Last time each file was used, its size and its path.
+        """
+        entries = []
+
+        for file in self.path.as_path().glob('*.json'):
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, file))
+
+        return entries
+
+    def _grow(self, delta: int) -> None:
+        """Keeps track of the size of the directory after a change, evicting
+        entries if it went over its maximum size.
+
+        :param delta: Bytes the directory grew by. Negative if it shrank.
+        """
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._measure())
+            else:
+                self._size += delta
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Removes the entries that have gone unused the longest until the
+        directory is comfortably within its maximum size.
+
+        The directory is measured again beforehand, as other instances may
+        share it.
+        """
+        entries = self._measure()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_size * EVICTION_TARGET
+
+        for _, size, file in sorted(entries):
+            if total <= target:
+                break
+
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+
+            total -= size
+
+        self._size = total
+
+    def __getitem__(self, key: str) -> Any:
+        file = self._file_for(key)
+
+        try:
+            entry = self._read(file)
+        except (OSError, ValueError) as ex:
+            raise KeyError(key) from ex
+
+        if entry.get('key') != key:
+            raise KeyError(key)
+
+        if self.max_size is not None:
+            try:
+                # Mark the entry as recently used
+                os.utime(file)
+            except OSError:
+                pass
+
+        return entry['value']
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        # Serialize beforehand so that no file is left behind on error
+        text = json.dumps({'key': key, 'value': value}, separators=(',', ':'))
+
+        file = self._file_for(key)
+        previous = 0
+
+        if self.max_size is not None:
+            previous = self._size_of(file)
+
+        with NamedTemporaryFile(
+            'w',
+            encoding=self._encoding,
+            dir=self.path,
+            suffix='.tmp',
+            delete=False
+        ) as buffer:
+            buffer.write(text)
+
+        os.replace(buffer.name, file)
+
+        if self.max_size is not None:
+            self._grow(len(text.encode(self._encoding)) - previous)
+
+    def __delitem__(self, key: str) -> None:
+        file = self._file_for(key)
+        previous = 0
+
+        if self.max_size is not None:
+            previous = self._size_of(file)
+
+        try:
+            os.remove(file)
+        except FileNotFoundError as ex:
+            raise KeyError(key) from ex
+
+        if self.max_size is not None:
+            self._grow(-previous)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._file_for(key).exists()
+
+    def __iter__(self) -> Iterator[str]:
+        for file in self.path.as_path().glob('*.json'):
+            try:
+                yield self._read(str(file))['key']
+            except (OSError, ValueError, KeyError):
+                continue
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
 class JSONValidator(ABC):
     """Base class for all tools that take care of facing a JSON file against a
      schema.
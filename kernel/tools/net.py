@@ -13,14 +13,20 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import gzip
+import io
 import logging
 import os
-from typing import Optional
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
 
 import requests
 
 LOG = logging.getLogger(__name__)
 
+GZIP_MAGIC = b'\x1f\x8b'
+"""Bytes every gzip file begins with."""
+
 
 class DownloadError(Exception):
     """Represents an error during the download of a file.
@@ -100,3 +106,50 @@ def download_into_memory(url: str,
         )
 
     return request.content.decode()
+
+
+@contextmanager
+def download_as_stream(url: str,
+                       session: Optional[requests.Session] = None
+                       ) -> Iterator[IO[bytes]]:
+    """Opens the contents of a URL so that they can be read as they arrive,
+    without ever holding all of them in memory.
+
+    Supported protocols are:
+        * HTTP
+        * HTTPS
+
+    Contents compressed with gzip, either by the server for the transfer or
+    on the file itself, are decompressed as they are read.
+
+    ..  doctest::
+        >>> with download_as_stream('http://localhost/file.txt') as stream:
+        ...     stream.read()
+
+    :param url: URL to download.
+    :param session: Session used to perform request. This function will not
+        close the session, that task is up to the caller.
+    :return: Stream with the contents of the page, open for as long as the
+        context is.
+    :raise DownloadError: If the download failed.
+    """
+    LOG.info("Downloading file from: '%s'", url)
+
+    get = session.get if session else requests.get
+
+    with get(url, stream=True) as request:
+        if not request.ok:
+            raise DownloadError(
+                f'Download failed with: {request.status_code}\n'
+                f'{request.text}'
+            )
+
+        # Undo the compression used by the server for the transfer
+        request.raw.decode_content = True
+
+        stream = io.BufferedReader(request.raw)
+
+        if stream.peek(len(GZIP_MAGIC)).startswith(GZIP_MAGIC):
+            stream = gzip.GzipFile(fileobj=stream)
+
+        yield stream
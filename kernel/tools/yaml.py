@@ -40,6 +40,10 @@ YAMLValidator = JSONValidator
 YAMLValidatorFactory = JSONValidatorFactory
 """Factory for :class:`YAMLValidator`."""
 
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+"""Loader used to parse YAML text. The one backed by libyaml if PyYAML was
+built with it, as it is several times faster than the pure Python one."""
+
 
 class YAMLError(Exception):
     """Describes any errors that happened while parsing a stream in YAML
@@ -74,7 +78,7 @@ class StandardYAMLParser(YAMLParser):
     @overrides
     def as_yaml(self, string: str) -> YAML:
         try:
-            return yaml.safe_load(string)
+            return yaml.load(string, Loader=SafeLoader)
         except StandardYAMLError as ex:
             msg = f"Failed to parse text: '{string}'."
             raise YAMLError(msg) from ex
@@ -97,7 +101,8 @@ class YAMLFile:
         self,
         file: File,
         validator: Optional[YAMLValidator] = None,
-        tools: Optional[Tools] = None
+        tools: Optional[Tools] = None,
+        data: Optional[YAML] = None
     ):
         """Constructor.
 
@@ -109,6 +114,9 @@ class YAMLFile:
         :param tools:
             Selection of tools this uses to do its task.
             'None' to have this build its own.
+        :param data:
+            Contents of the file, already parsed elsewhere.
+            'None' to have this read them from the file.
         :raises YAMLError:
             If the data is not in YAML format.
             If the data does not meet the schema.
@@ -120,6 +128,10 @@ class YAMLFile:
         self._validator = validator
         self._tools = tools
 
+        if data is not None:
+            # Fill the cached property so that the file is never read
+            self.__dict__['data'] = data
+
         self._validate()
 
     def _validate(self):
@@ -46,3 +46,12 @@ class TestFromKey(TestCase):
             OutputStyle.JSON,
             OutputStyle.from_key('json')
         )
+
+    def test_test_history_options(self):
+        """Checks that the keys for the TEST_HISTORY output option return that
+        option.
+        """
+        self.assertEqual(
+            OutputStyle.TEST_HISTORY,
+            OutputStyle.from_key('test-history')
+        )
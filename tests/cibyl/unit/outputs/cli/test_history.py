@@ -0,0 +1,111 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from unittest import TestCase
+
+from cibyl.outputs.cli.history import print_test_history
+from cibyl.utils.history import TestHistory, TestOutcome, TestStats
+
+
+class TestPrintTestHistory(TestCase):
+    """Tests for :func:`print_test_history`.
+    """
+
+    def setUp(self):
+        self.history = TestHistory()
+
+        for build in range(2):
+            self.history.add(
+                'job', str(build), 'stable', TestOutcome.SUCCESS, 1.0
+            )
+            self.history.add(
+                'job', str(build), 'flaky',
+                TestOutcome.FAILURE if build else TestOutcome.SUCCESS,
+                2.0
+            )
+
+    def test_prints_flaky_tests(self):
+        """Checks that only flaky tests are described by default.
+        """
+        output = print_test_history(self.history)
+
+        self.assertIn('Tests history across 2 builds', output)
+        self.assertIn('job: flaky', output)
+        self.assertIn('Failure rate: 50.00% (1 of 2 runs)', output)
+        self.assertIn('Flips: 1', output)
+        self.assertNotIn('Failure rate: 0.00%', output)
+
+    def test_prints_slowest_tests(self):
+        """Checks that the slowest tests are listed, slowest first.
+        """
+        output = print_test_history(self.history)
+
+        slowest = output[output.index('Slowest tests'):]
+
+        self.assertLess(
+            slowest.index('job: flaky'),
+            slowest.index('job: stable')
+        )
+        self.assertIn('Duration (p90): 2.00s', slowest)
+
+    def test_verbose_prints_all_tests(self):
+        """Checks that all tests are described on higher verbosity.
+        """
+        output = print_test_history(self.history, verbosity=1)
+
+        self.assertIn('Failure rate: 0.00% (0 of 2 runs)', output)
+
+    def test_min_failure_rate(self):
+        """Checks that tests failing less often than asked for are left
+        out.
+        """
+        output = print_test_history(
+            self.history, verbosity=1, min_failure_rate=0.5
+        )
+
+        self.assertIn('Failure rate: 50.00% (1 of 2 runs)', output)
+        self.assertNotIn('Failure rate: 0.00%', output)
+
+        output = print_test_history(self.history, min_failure_rate=0.6)
+
+        self.assertIn('Flaky tests: None', output)
+
+    def test_prints_summarized_tests(self):
+        """Checks that tests summarized by a source are described, with no
+        flips as those are unknown.
+        """
+        history = TestHistory()
+        history.add_stats(
+            [
+                TestStats(job='job', name='remote', runs=4, failures=1,
+                          skips=0, flips=None, durations={90: 3.0})
+            ]
+        )
+
+        output = print_test_history(history)
+
+        self.assertIn('Tests summarized by the sources: 1', output)
+        self.assertIn('job: remote', output)
+        self.assertIn('Failure rate: 25.00% (1 of 4 runs)', output)
+        self.assertNotIn('Flips', output)
+        self.assertIn('Duration (p90): 3.00s', output)
+
+    def test_empty_history(self):
+        """Checks the output when no tests were found.
+        """
+        output = print_test_history(TestHistory())
+
+        self.assertIn('Flaky tests: None', output)
+        self.assertIn('Slowest tests: None', output)
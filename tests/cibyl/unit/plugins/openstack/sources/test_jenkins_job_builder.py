@@ -14,15 +14,18 @@
 #    under the License.
 """
 # pylint: disable=no-member
+import json
 import logging
+import os
 from io import StringIO
-from unittest.mock import MagicMock, Mock
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import MagicMock, Mock, patch
 
 from cibyl.cli.argument import Argument
 from cibyl.models.ci.base.job import Job
-from cibyl.plugins.openstack.sources import jenkins_job_builder
-from cibyl.plugins.openstack.sources.jenkins_job_builder import \
-    JenkinsJobBuilder
+from cibyl.plugins.openstack.sources.jenkins_job_builder import (
+    JenkinsJobBuilder, XmlIndex, parse_xml, read_deployment_fields)
 from tests.cibyl.utils import OpenstackPluginWithJobSystem
 
 # add everything relevant manually from the results of
@@ -237,56 +240,195 @@ class TestJJBSourceOpenstackPlugin(OpenstackPluginWithJobSystem):
 
     def test_get_topology(self):
         for el in tolology_content:
-            jenkins_job_builder.parse_xml = Mock(
-                side_effect=[StringIO(el['str'])])
+            fields = read_deployment_fields(StringIO(el['str']))
             self.assertEqual(
-                self.jjb._get_topology("path.xml", **el['kwargs']),
+                self.jjb._get_topology(fields, **el['kwargs']),
                 el['res'])
 
     def test_get_ipv(self):
         for el in ipv_content:
-            jenkins_job_builder.parse_xml = Mock(
-                side_effect=[StringIO(el['str'])])
+            fields = read_deployment_fields(StringIO(el['str']))
             self.assertEqual(
-                self.jjb._get_ip_version("path.xml", **el['kwargs']),
+                self.jjb._get_ip_version(fields, **el['kwargs']),
                 el['res'])
 
     def test_get_release(self):
         for el in release_content:
-            jenkins_job_builder.parse_xml = Mock(
-                side_effect=[StringIO(el['str'])])
+            fields = read_deployment_fields(StringIO(el['str']))
             self.assertEqual(
-                self.jjb._get_release("path.xml", **el['kwargs']),
+                self.jjb._get_release(fields, **el['kwargs']),
                 el['res'])
 
     def test_get_cinder_backend(self):
         for el in cinder_backup_content:
-            jenkins_job_builder.parse_xml = Mock(
-                side_effect=[StringIO(el['str'])])
+            fields = read_deployment_fields(StringIO(el['str']))
             self.assertEqual(
-                self.jjb._get_cinder_backend("path.xml", **el['kwargs']),
+                self.jjb._get_cinder_backend(fields, **el['kwargs']),
                 el['res'])
 
     def test_get_network_backend(self):
         for el in network_backup_content:
-            jenkins_job_builder.parse_xml = Mock(
-                side_effect=[StringIO(el['str'])])
+            fields = read_deployment_fields(StringIO(el['str']))
             self.assertEqual(
-                self.jjb._get_network_backend("path.xml", **el['kwargs']),
+                self.jjb._get_network_backend(fields, **el['kwargs']),
                 el['res'])
 
     def test_get_ml2_driver(self):
         for el in ml2_driver_content:
-            jenkins_job_builder.parse_xml = Mock(
-                side_effect=[StringIO(el['str'])])
+            fields = read_deployment_fields(StringIO(el['str']))
             self.assertEqual(
-                self.jjb._get_ml2_driver("path.xml", **el['kwargs']),
+                self.jjb._get_ml2_driver(fields, **el['kwargs']),
                 el['res'])
 
     def test_get_infra_type(self):
         for el in infra_type_content:
-            jenkins_job_builder.parse_xml = Mock(
-                side_effect=[StringIO(el['str'])])
+            fields = read_deployment_fields(StringIO(el['str']))
             self.assertEqual(
-                self.jjb._get_infra_type("path.xml", **el['kwargs']),
+                self.jjb._get_infra_type(fields, **el['kwargs']),
                 el['res'])
+
+
+JOB_XML = """<?xml version="1.0" encoding="utf-8"?>
+<flow-definition plugin="workflow-job">
+  <properties>
+    <parameterDefinitions>
+      <defaultValue>--network-protocol ipv6</defaultValue>
+    </parameterDefinitions>
+  </properties>
+  <definition plugin="workflow-cps">
+    <script>TOPOLOGY = "controller:3,compute:2"</script>
+  </definition>
+</flow-definition>
+"""
+
+
+class TestParseXml(TestCase):
+    """Tests for :func:`parse_xml`."""
+
+    def test_scripts_before_default_values(self):
+        """Checks that all scripts are output before any default value, no
+        matter the order they appear in on the file.
+        """
+        result = parse_xml(StringIO(JOB_XML)).getvalue()
+
+        self.assertEqual(
+            '\nTOPOLOGY = "controller:3,compute:2"'
+            '\n--network-protocol ipv6',
+            result
+        )
+
+    def test_all_fields_in_one_pass(self):
+        """Checks that all deployment fields are read at once."""
+        fields = read_deployment_fields(parse_xml(StringIO(JOB_XML)))
+
+        self.assertEqual(['compute:2', 'controller:3'], fields['topology'])
+        self.assertEqual(['6'], fields['ip_version'])
+        self.assertEqual([], fields['release'])
+        self.assertEqual([], fields['infra_type'])
+
+
+class TestXmlIndex(TestCase):
+    """Tests for :class:`XmlIndex`."""
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.index_path = os.path.join(self.directory.name, 'index.json')
+        self.xml_path = os.path.join(self.directory.name, 'job', 'config.xml')
+
+        os.makedirs(os.path.dirname(self.xml_path))
+
+        with open(self.xml_path, 'w', encoding='utf-8') as file:
+            file.write(JOB_XML)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @patch('cibyl.plugins.openstack.sources.jenkins_job_builder.parse_xml')
+    def test_unchanged_file_not_parsed_again(self, parse_mock):
+        """Checks that a file is not parsed again once it is indexed, even
+        across instances of the index.
+        """
+        parse_mock.side_effect = parse_xml
+
+        index = XmlIndex(self.index_path)
+        fields = index.get(self.xml_path)
+        index.save()
+
+        index = XmlIndex(self.index_path)
+
+        self.assertEqual(fields, index.get(self.xml_path))
+        parse_mock.assert_called_once()
+
+    @patch('cibyl.plugins.openstack.sources.jenkins_job_builder.parse_xml')
+    def test_changed_file_parsed_again(self, parse_mock):
+        """Checks that a file is parsed again if its contents change."""
+        parse_mock.side_effect = parse_xml
+
+        index = XmlIndex(self.index_path)
+        index.get(self.xml_path)
+        index.save()
+
+        with open(self.xml_path, 'w', encoding='utf-8') as file:
+            file.write(JOB_XML.replace('ipv6', 'ipv4'))
+
+        index = XmlIndex(self.index_path)
+
+        self.assertEqual(['4'], index.get(self.xml_path)['ip_version'])
+        self.assertEqual(2, parse_mock.call_count)
+
+    @patch('cibyl.plugins.openstack.sources.jenkins_job_builder.parse_xml')
+    def test_outdated_index_is_discarded(self, parse_mock):
+        """Checks that an index built by another version of the extraction
+        logic is not used.
+        """
+        parse_mock.side_effect = parse_xml
+
+        index = XmlIndex(self.index_path)
+        index.get(self.xml_path)
+        index.save()
+
+        with open(self.index_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+
+        data['version'] = 'old'
+
+        with open(self.index_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+
+        index = XmlIndex(self.index_path)
+        index.get(self.xml_path)
+
+        self.assertEqual(2, parse_mock.call_count)
+
+    def test_get_all_with_workers(self):
+        """Checks that files are parsed on a pool of processes without
+        altering the order of the results.
+        """
+        other_path = os.path.join(self.directory.name, 'other', 'config.xml')
+
+        os.makedirs(os.path.dirname(other_path))
+
+        with open(other_path, 'w', encoding='utf-8') as file:
+            file.write(JOB_XML.replace('ipv6', 'ipv4'))
+
+        index = XmlIndex(self.index_path)
+
+        fields = index.get_all(
+            [self.xml_path, other_path, self.xml_path], workers=2
+        )
+
+        self.assertEqual(
+            [['6'], ['4'], ['6']],
+            [entry['ip_version'] for entry in fields]
+        )
+
+    def test_unreadable_index_is_discarded(self):
+        """Checks that a corrupted index does not prevent files from being
+        read.
+        """
+        with open(self.index_path, 'w', encoding='utf-8') as file:
+            file.write('{')
+
+        index = XmlIndex(self.index_path)
+
+        self.assertEqual(['6'], index.get(self.xml_path)['ip_version'])
@@ -16,8 +16,11 @@
 from unittest import TestCase
 from unittest.mock import Mock
 
-from cibyl.plugins.openstack.sources.zuul.deployments.summary import \
-    VariantDeployment
+from cibyl.plugins.openstack.sources.zuul.deployments.summary import (
+    VariantDeployment, VariantDeploymentFactory)
+from cibyl.plugins.openstack.sources.zuul.variants import VariableSearch
+from cibyl.sources.zuul.utils.variants.hierarchy import (
+    HierarchyBuilder, RecursiveVariableSearch, RecursiveVariableSearchFactory)
 
 
 class TestVariantDeployment(TestCase):
@@ -108,3 +111,96 @@ class TestVariantDeployment(TestCase):
         deployment = VariantDeployment(self.variant, tools=self.tools)
 
         self.assertEqual(value, deployment.get_topology())
+
+
+class TestVariantDeploymentFactory(TestCase):
+    """Tests for :class:`VariantDeploymentFactory`.
+    """
+
+    def test_searches_share_variables(self):
+        """Checks that all searches of a factory resolve the variables of a
+        variant on the same place, and that it is not shared with other
+        factories.
+        """
+        tools = VariantDeploymentFactory().tools
+
+        files = tools.outline_creator.tools.files_fetcher.tools
+        overrides = tools.outline_creator.tools.overrides_collector.tools
+
+        variables = tools.release_search.tools.variables
+
+        for search in (
+            files.featureset_search,
+            files.nodes_search,
+            files.release_search,
+            overrides.fs_overrides_search,
+            overrides.infra_type_search
+        ):
+            self.assertIs(variables, search.tools.variables)
+
+        self.assertIsNot(
+            variables,
+            VariantDeploymentFactory().tools.release_search.tools.variables
+        )
+
+    def test_sibling_variants_keep_their_own_data(self):
+        """Checks that two variants of a job with the same parent and
+        branches get each their own data, even though the searches of the
+        factory share what they resolve.
+        """
+
+        def new_variant(variables):
+            variant = Mock()
+            variant.name = 'job'
+            variant.job.name = 'job'
+            variant.job.tenant.host = 'host'
+            variant.job.tenant.name = 'tenant'
+            variant.parent = 'base'
+            variant.branches = ['master']
+            variant.variables = variables
+            variant.data = {
+                'name': 'job',
+                'parent': 'base',
+                'branches': ['master'],
+                'variables': variables
+            }
+
+            return variant
+
+        variant1 = new_variant({'release': '17.0', 'featureset': '001'})
+        variant2 = new_variant({'release': '16.2', 'featureset': '052'})
+
+        factory = VariantDeploymentFactory(
+            VariantDeployment.Tools.sharing(
+                VariableSearch.Tools(
+                    variables=RecursiveVariableSearchFactory(
+                        RecursiveVariableSearch.Tools(
+                            hierarchy=HierarchyBuilder(
+                                HierarchyBuilder.Tools(
+                                    crawlers=Mock(
+                                        **{
+                                            'from_variant.side_effect':
+                                                lambda v: [v]
+                                        }
+                                    )
+                                )
+                            )
+                        )
+                    )
+                )
+            )
+        )
+
+        files = factory.tools.outline_creator.tools.files_fetcher.tools
+
+        self.assertEqual('17.0', factory.create_for(variant1).get_release())
+        self.assertEqual('16.2', factory.create_for(variant2).get_release())
+
+        self.assertEqual(
+            ('featureset', '001'),
+            files.featureset_search.search(variant1)
+        )
+        self.assertEqual(
+            ('featureset', '052'),
+            files.featureset_search.search(variant2)
+        )
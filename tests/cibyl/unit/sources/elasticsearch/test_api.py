@@ -19,8 +19,10 @@ from unittest import TestCase
 from unittest.mock import Mock, patch
 
 from cibyl.cli.argument import Argument
+from cibyl.exceptions.elasticsearch import ElasticSearchError
 from cibyl.exceptions.source import MissingArgument
 from cibyl.sources.elasticsearch.api import ElasticSearch
+from cibyl.sources.elasticsearch.query import get_jobs_clauses
 
 
 class TestElasticSearch(TestCase):
@@ -163,6 +165,23 @@ class TestElasticSearch(TestCase):
         self.assertEqual(jobs['test4'].name.value, 'test4')
         self.assertEqual(jobs['test4'].url.value, "http://domain.tld/test4")
 
+    @patch.object(ElasticSearch, '_ElasticSearch__query_get_hits')
+    def test_get_jobs_query(self: object, mock_query_hits: object) -> None:
+        """Tests that :meth:`ElasticSearch.get_jobs` asks the server only for
+            the jobs matching the user input.
+        """
+        mock_query_hits.return_value = []
+
+        jobs_argument = Mock()
+        jobs_argument.value = ['4$']
+        self.es_api.get_jobs(jobs=jobs_argument)
+
+        query = mock_query_hits.call_args.kwargs['query']['query']
+        self.assertEqual(
+            {'bool': {'filter': get_jobs_clauses(jobs=jobs_argument)}},
+            query
+        )
+
     @patch.object(ElasticSearch, '_ElasticSearch__query_get_hits')
     def test_get_jobs_jobs_scope(self: object, mock_query_hits: object):
         """Tests that the internal logic from :meth:`ElasticSearch.get_jobs`
@@ -397,6 +416,259 @@ class TestElasticSearch(TestCase):
 
         self.assertEqual(len(tests), 0)
 
+    def test_get_builds_last_build_on_server(self) -> None:
+        """Tests that with --last-build the newest build of each job is
+           selected by the server, page by page.
+        """
+        connection = self.es_api.es_client.connection
+        connection.indices.get_field_mapping.return_value = {
+            'logstash_jenkins_jobs_cibyl': {
+                'mappings': {
+                    'job_name': {
+                        'full_name': 'job_name',
+                        'mapping': {'job_name': {'type': 'text'}}
+                    },
+                    'job_name.keyword': {
+                        'full_name': 'job_name.keyword',
+                        'mapping': {'keyword': {'type': 'keyword'}}
+                    }
+                }
+            }
+        }
+
+        def bucket(hit):
+            return {
+                'key': {'job_name': hit['_source']['job_name']},
+                'last_build': {'hits': {'hits': [hit]}}
+            }
+
+        connection.search.side_effect = [
+            {
+                'aggregations': {
+                    'jobs': {
+                        'after_key': {'job_name': 'test'},
+                        'buckets': [bucket(self.build_hits[0])]
+                    }
+                }
+            },
+            {
+                'aggregations': {
+                    'jobs': {
+                        'after_key': {'job_name': 'test2'},
+                        'buckets': [bucket(self.build_hits[1])]
+                    }
+                }
+            },
+            {
+                'aggregations': {
+                    'jobs': {
+                        'buckets': []
+                    }
+                }
+            }
+        ]
+
+        builds_kwargs = Mock(spec=Argument)
+        builds_kwargs.value = []
+
+        jobs = self.es_api.get_builds(last_build=builds_kwargs)
+
+        self.assertEqual(2, len(jobs))
+        self.assertEqual(3, connection.search.call_count)
+
+        bodies = [
+            call.kwargs['body'] for call in connection.search.call_args_list
+        ]
+        composite = bodies[0]['aggs']['jobs']['composite']
+        self.assertEqual(
+            'job_name.keyword',
+            composite['sources'][0]['job_name']['terms']['field']
+        )
+        self.assertNotIn('after', composite)
+        self.assertEqual(
+            {'job_name': 'test'},
+            bodies[1]['aggs']['jobs']['composite']['after']
+        )
+
+    def test_keyword_field_asked_once(self) -> None:
+        """Tests that the mapping of the job name is only asked for on the
+           first query for the last builds.
+        """
+        connection = self.es_api.es_client.connection
+        connection.indices.get_field_mapping.return_value = {}
+        connection.search.return_value = {
+            'aggregations': {
+                'jobs': {
+                    'buckets': []
+                }
+            }
+        }
+
+        builds_kwargs = Mock(spec=Argument)
+        builds_kwargs.value = []
+
+        self.es_api.get_builds(last_build=builds_kwargs)
+        self.es_api.get_tests(last_build=builds_kwargs,
+                              builds=builds_kwargs)
+
+        connection.indices.get_field_mapping.assert_called_once()
+        self.assertEqual(2, connection.search.call_count)
+
+    def test_keyword_fields_asked_together(self) -> None:
+        """Tests that the mappings of all fields needed for the test
+           statistics are asked for on a single request.
+        """
+        connection = self.es_api.es_client.connection
+        self.es_api.tests_index = 'tests'
+        connection.indices.get_field_mapping.return_value = {
+            'tests': {
+                'mappings': {
+                    'test_name': {
+                        'full_name': 'test_name',
+                        'mapping': {'test_name': {'type': 'keyword'}}
+                    }
+                }
+            }
+        }
+        connection.search.return_value = {
+            'aggregations': {
+                'jobs': {
+                    'buckets': []
+                }
+            }
+        }
+
+        self.es_api.get_tests_stats()
+
+        connection.indices.get_field_mapping.assert_called_once_with(
+            fields=['job_name', 'job_name.keyword',
+                    'test_name', 'test_name.keyword',
+                    'test_class_name', 'test_class_name.keyword'],
+            index='tests'
+        )
+        self.assertEqual(
+            {
+                ('job_name', 'tests'): 'job_name.keyword',
+                ('test_name', 'tests'): 'test_name',
+                ('test_class_name', 'tests'): 'test_class_name.keyword'
+            },
+            self.es_api.keyword_fields
+        )
+
+    @patch('cibyl.sources.elasticsearch.api.sliced_scan')
+    def test_get_jobs_scroll_slices(self, mock_scan) -> None:
+        """Tests that hits are scrolled through the configured number of
+           slices.
+        """
+        es_api = ElasticSearch(elastic_client=Mock(), scroll_slices=4)
+        mock_scan.return_value = iter(self.job_hits)
+
+        jobs = es_api.get_jobs()
+
+        self.assertEqual(len(self.job_hits), len(jobs))
+        self.assertEqual(4, mock_scan.call_args.kwargs['slices'])
+
+    @patch('cibyl.sources.elasticsearch.api.sliced_scan')
+    def test_scan_error(self, mock_scan) -> None:
+        """Tests that errors while streaming hits are reported as
+           :class:`ElasticSearchError`.
+        """
+        def failing_scan(*_, **__):
+            yield self.job_hits[0]
+            raise ValueError('failure')
+
+        mock_scan.side_effect = failing_scan
+
+        self.assertRaises(ElasticSearchError, self.es_api.get_jobs)
+
+    def test_get_tests_stats_no_index(self) -> None:
+        """Tests that test statistics require an index with the test runs.
+        """
+        self.assertRaises(ElasticSearchError, self.es_api.get_tests_stats)
+
+    def test_get_tests_stats(self) -> None:
+        """Tests that the statistics of each test are calculated by the
+           server over the last builds of each of the selected jobs.
+        """
+        es_api = ElasticSearch(elastic_client=Mock(), tests_index='tests')
+        connection = es_api.es_client.connection
+        connection.indices.get_field_mapping.return_value = {}
+        connection.search.return_value = {
+            'aggregations': {
+                'jobs': {
+                    'buckets': [
+                        {'key': {'job_name': 'job1'},
+                         'newest_build': {'value': 10.0}},
+                        {'key': {'job_name': 'job2'},
+                         'newest_build': {'value': 3.0}},
+                        {'key': {'job_name': 'other'},
+                         'newest_build': {'value': 5.0}}
+                    ]
+                }
+            }
+        }
+        connection.msearch.return_value = {
+            'responses': [
+                {
+                    'aggregations': {
+                        'tests': {
+                            'after_key': {'class_name': 'class',
+                                          'name': 'test'},
+                            'buckets': [
+                                {
+                                    'key': {'class_name': 'class',
+                                            'name': 'test'},
+                                    'doc_count': 4,
+                                    'failures': {'doc_count': 1},
+                                    'skips': {'doc_count': 0},
+                                    'duration': {
+                                        'values': {'50.0': 1.5, '90.0': 3.0}
+                                    }
+                                }
+                            ]
+                        }
+                    }
+                },
+                {
+                    'aggregations': {
+                        'tests': {
+                            'buckets': []
+                        }
+                    }
+                }
+            ]
+        }
+
+        jobs_kwargs = Mock(spec=Argument)
+        jobs_kwargs.value = ['job']
+
+        stats = es_api.get_tests_stats(last_builds=2, percents=[50, 90],
+                                       jobs=jobs_kwargs)
+
+        self.assertEqual(1, len(stats))
+        self.assertEqual('job1', stats[0].job)
+        self.assertEqual('test', stats[0].name)
+        self.assertEqual('class', stats[0].class_name)
+        self.assertEqual(4, stats[0].runs)
+        self.assertEqual(0.25, stats[0].failure_rate)
+        self.assertIsNone(stats[0].flips)
+        self.assertEqual({50: 1.5, 90: 3.0}, stats[0].durations)
+
+        # A short page means the job has no more tests
+        connection.msearch.assert_called_once()
+
+        body = connection.msearch.call_args.kwargs['body']
+        self.assertEqual(
+            [
+                [{'term': {'job_name.keyword': 'job1'}},
+                 {'range': {'build_num': {'gt': 8}}}],
+                [{'term': {'job_name.keyword': 'job2'}},
+                 {'range': {'build_num': {'gt': 1}}}]
+            ],
+            [search['query']['bool']['filter'][-2:]
+             for search in body[1::2]]
+        )
+
     @patch('cibyl.sources.elasticsearch.api.ElasticSearchClient')
     def test_setup(self, mock_client):
         """Test setup method of ElasticSearch"""
@@ -0,0 +1,90 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from threading import Barrier
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cibyl.sources.elasticsearch.msearch import MultiSearchError, multi_search
+
+
+def echo_msearch(body):
+    """Fake _msearch that answers each search with its own body."""
+    return {'responses': [{'echo': search} for search in body[1::2]]}
+
+
+class TestMultiSearch(TestCase):
+    """Tests for :func:`multi_search`.
+    """
+
+    def test_single_request(self):
+        """Checks that searches that fit on a batch are sent together."""
+        client = Mock()
+        client.msearch.side_effect = echo_msearch
+
+        bodies = [{'query': {'term': {'job_name': f'job{i}'}}}
+                  for i in range(3)]
+
+        result = multi_search(client, 'index', bodies)
+
+        client.msearch.assert_called_once_with(
+            body=[
+                {'index': 'index'}, bodies[0],
+                {'index': 'index'}, bodies[1],
+                {'index': 'index'}, bodies[2]
+            ]
+        )
+        self.assertEqual(bodies, [response['echo'] for response in result])
+
+    def test_batches_are_sent_concurrently(self):
+        """Checks that searches are split into batches which travel at the
+        same time, and that responses keep the order of the searches.
+        """
+        # Fails if not all batches are being sent at the same time
+        barrier = Barrier(3, timeout=5)
+
+        def msearch(body):
+            barrier.wait()
+            return echo_msearch(body)
+
+        client = Mock()
+        client.msearch.side_effect = msearch
+
+        bodies = [{'size': i} for i in range(5)]
+
+        result = multi_search(client, 'index', bodies, batch_size=2)
+
+        self.assertEqual(3, client.msearch.call_count)
+        self.assertEqual(bodies, [response['echo'] for response in result])
+
+    def test_no_searches(self):
+        """Checks that nothing is sent if there is nothing to search."""
+        client = Mock()
+
+        self.assertEqual([], multi_search(client, 'index', []))
+        client.msearch.assert_not_called()
+
+    def test_error_on_failed_search(self):
+        """Checks that an error is raised if any of the searches failed."""
+        client = Mock()
+        client.msearch.return_value = {
+            'responses': [
+                {'hits': {}},
+                {'error': {'type': 'too_many_clauses'}}
+            ]
+        }
+
+        with self.assertRaises(MultiSearchError):
+            multi_search(client, 'index', [{}, {}])
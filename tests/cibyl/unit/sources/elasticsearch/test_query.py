@@ -0,0 +1,161 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cibyl.sources.elasticsearch.query import (build_query, get_builds_clauses,
+                                               get_jobs_clauses,
+                                               job_builds_clauses, on_field,
+                                               per_test_stats_query,
+                                               translate_regex)
+
+
+class TestTranslateRegex(TestCase):
+    """Tests for :func:`translate_regex`.
+    """
+
+    def test_unanchored_pattern(self):
+        """Checks that patterns are made to match anywhere on the term."""
+        self.assertEqual('.*(test)', translate_regex('test$'))
+        self.assertEqual('(test).*', translate_regex('^test'))
+        self.assertEqual('.*(te.*st).*', translate_regex('te.*st'))
+        self.assertEqual('.*(a|b).*', translate_regex('a|b'))
+
+    def test_untranslatable_pattern(self):
+        """Checks that patterns using Python only syntax are rejected."""
+        self.assertIsNone(translate_regex(r'test\d'))
+        self.assertIsNone(translate_regex('(?:test)'))
+        self.assertIsNone(translate_regex('te$st'))
+        self.assertIsNone(translate_regex('^a|b'))
+        self.assertIsNone(translate_regex(''))
+
+
+class TestClauses(TestCase):
+    """Tests for the generation of query clauses out of arguments.
+    """
+
+    def test_no_arguments(self):
+        """Checks that all documents are requested if there is nothing to
+        filter by.
+        """
+        self.assertEqual({'match_all': {}}, build_query([]))
+
+    def test_jobs_clauses(self):
+        """Checks that jobs are filtered by name."""
+        jobs = Mock()
+        jobs.value = ['test', 'other$']
+
+        spec = Mock()
+        spec.value = ['test1']
+
+        self.assertEqual(
+            [
+                {
+                    'bool': {
+                        'should': [
+                            on_field('job_name', 'regexp', '.*(test).*'),
+                            on_field('job_name', 'regexp', '.*(other)')
+                        ],
+                        'minimum_should_match': 1
+                    }
+                },
+                on_field('job_name', 'terms', ['test1'])
+            ],
+            get_jobs_clauses(jobs=jobs, spec=spec)
+        )
+
+    def test_jobs_clauses_untranslatable(self):
+        """Checks that job patterns are left to the client if any of them
+        cannot be translated.
+        """
+        jobs = Mock()
+        jobs.value = ['test', r'\d']
+
+        self.assertEqual([], get_jobs_clauses(jobs=jobs))
+
+    def test_builds_clauses(self):
+        """Checks that builds are filtered by number and status."""
+        builds = Mock()
+        builds.value = ['1', '2']
+
+        build_status = Mock()
+        build_status.value = ['Success']
+
+        self.assertEqual(
+            [
+                {'terms': {'build_num': ['1', '2']}},
+                on_field(
+                    'build_result', 'terms', ['SUCCESS', 'Success', 'success']
+                )
+            ],
+            get_builds_clauses(builds=builds, build_status=build_status)
+        )
+
+    def test_non_numeric_builds(self):
+        """Checks that non-numeric builds are left to the client."""
+        builds = Mock()
+        builds.value = ['last']
+
+        self.assertEqual([], get_builds_clauses(builds=builds))
+
+
+class TestTestStatsQuery(TestCase):
+    """Tests for the queries that summarize test runs.
+    """
+
+    def test_job_builds_clauses(self):
+        """Checks that a job keeps its own window of builds."""
+        self.assertEqual(
+            [
+                {'term': {'job_name.keyword': 'job1'}},
+                {'range': {'build_num': {'gt': 8}}}
+            ],
+            job_builds_clauses('job_name.keyword', 'job1',
+                               newest_build=10, count=2)
+        )
+
+    def test_job_builds_clauses_all_builds(self):
+        """Checks that without a count all builds of the job are kept."""
+        self.assertEqual(
+            [{'term': {'job_name': 'job1'}}],
+            job_builds_clauses('job_name', 'job1', newest_build=10)
+        )
+
+    def test_per_test_stats_query(self):
+        """Checks that tests are grouped by class and name, continuing
+        from the given key.
+        """
+        after = {'class_name': 'class', 'name': 'test'}
+
+        body = per_test_stats_query(
+            query={'match_all': {}},
+            name_field='test_name.keyword',
+            class_field='test_class_name.keyword',
+            percents=[50, 90],
+            after=after
+        )
+
+        tests = body['aggs']['tests']
+
+        self.assertEqual(0, body['size'])
+        self.assertEqual(after, tests['composite']['after'])
+        self.assertEqual(
+            ['class_name', 'name'],
+            [list(source)[0] for source in tests['composite']['sources']]
+        )
+        self.assertEqual(
+            [50, 90], tests['aggs']['duration']['percentiles']['percents']
+        )
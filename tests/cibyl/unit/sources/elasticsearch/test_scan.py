@@ -0,0 +1,87 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cibyl.sources.elasticsearch.scan import sliced_scan
+
+
+def fake_scan(_, index, query, size):
+    """Scan that gives back ten hits per slice, tagged with the slice they
+    belong to.
+    """
+    slice_id = query['slice']['id'] if 'slice' in query else None
+    for number in range(10):
+        yield {'_source': {'slice': slice_id, 'number': number}}
+
+
+class TestSlicedScan(TestCase):
+    """Tests for :func:`sliced_scan`.
+    """
+
+    @patch('cibyl.sources.elasticsearch.scan.scan')
+    def test_single_slice(self, scan):
+        """Checks that with a single slice the scroll is not sliced."""
+        scan.side_effect = fake_scan
+        client = Mock()
+        query = {'query': {'match_all': {}}}
+
+        hits = list(sliced_scan(client, 'index', query, slices=1))
+
+        self.assertEqual(10, len(hits))
+        scan.assert_called_once_with(client, index='index', query=query,
+                                     size=10000)
+
+    @patch('cibyl.sources.elasticsearch.scan.scan')
+    def test_all_slices_read(self, scan):
+        """Checks that the hits of every slice are returned."""
+        scan.side_effect = fake_scan
+        query = {'query': {'match_all': {}}}
+
+        hits = list(sliced_scan(Mock(), 'index', query, slices=4, size=3))
+
+        self.assertEqual(
+            {(slice_id, number)
+             for slice_id in range(4) for number in range(10)},
+            {(hit['_source']['slice'], hit['_source']['number'])
+             for hit in hits}
+        )
+        self.assertEqual(40, len(hits))
+        self.assertNotIn('slice', query)
+
+    @patch('cibyl.sources.elasticsearch.scan.scan')
+    def test_slice_error_raised(self, scan):
+        """Checks that errors on a slice reach the consumer."""
+        def failing_scan(client, index, query, size):
+            if query['slice']['id'] == 1:
+                raise ValueError('failure')
+            yield from fake_scan(client, index, query, size)
+
+        scan.side_effect = failing_scan
+
+        with self.assertRaises(ValueError):
+            list(sliced_scan(Mock(), 'index', {}, slices=2))
+
+    @patch('cibyl.sources.elasticsearch.scan.scan')
+    def test_stop_early(self, scan):
+        """Checks that slices stop once the consumer is done with them."""
+        scan.side_effect = fake_scan
+
+        hits = sliced_scan(Mock(), 'index', {}, slices=2, size=1)
+
+        self.assertIsNotNone(next(hits))
+
+        hits.close()
@@ -0,0 +1,155 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member, protected-access
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cibyl.exceptions.git import GitError
+from cibyl.sources.git import LAST_SYNC_FILE, GitSource
+
+
+class TestGitSource(TestCase):
+    """Tests for :class:`GitSource`."""
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _present_repo(self, name):
+        """Create a directory that looks like a cloned repository.
+
+        :param name: Name of the repository.
+        :return: Its description for the source.
+        """
+        dest = os.path.join(self.directory.name, name)
+        os.makedirs(os.path.join(dest, ".git"))
+        return {'url': f'url/to/{name}.git', 'dest': dest}
+
+    @patch('cibyl.sources.git.Repo')
+    def test_clone_options(self, repo_api):
+        """Checks that the branch, depth and filter of a repository are
+        passed on to the clone.
+        """
+        dest = os.path.join(self.directory.name, 'repo')
+        repo = {
+            'url': 'url/to/repo.git',
+            'dest': dest,
+            'branch': 'main',
+            'depth': 1,
+            'filter': 'blob:none'
+        }
+
+        source = GitSource(repos=[repo])
+        source.get_repo(repo)
+
+        repo_api.clone_from.assert_called_once_with(
+            'url/to/repo.git',
+            to_path=dest,
+            multi_options=['-b', 'main', '--depth=1', '--filter=blob:none']
+        )
+
+    @patch('cibyl.sources.git.Repo')
+    def test_each_repo_cloned_once(self, repo_api):
+        """Checks that each missing repository is cloned, and just once."""
+        repos = [
+            {'url': 'url/to/repo1.git',
+             'dest': os.path.join(self.directory.name, 'repo1')},
+            {'url': 'url/to/repo2.git',
+             'dest': os.path.join(self.directory.name, 'repo2')}
+        ]
+
+        source = GitSource(repos=repos, sync_workers=2)
+        source.ensure_repos_present()
+
+        self.assertEqual(2, repo_api.clone_from.call_count)
+        self.assertEqual(
+            {'url/to/repo1.git', 'url/to/repo2.git'},
+            {call.args[0] for call in repo_api.clone_from.call_args_list}
+        )
+        self.assertTrue(all(repo['cloned'] for repo in repos))
+
+    @patch('cibyl.sources.git.Repo')
+    def test_pull_skipped_within_interval(self, repo_api):
+        """Checks that a repository synced recently is not pulled again."""
+        repo = self._present_repo('repo')
+
+        source = GitSource(repos=[repo], pull_interval=3600)
+        source.ensure_repos_present()
+
+        self.assertTrue(
+            os.path.exists(os.path.join(repo['dest'], ".git", LAST_SYNC_FILE))
+        )
+
+        source = GitSource(
+            repos=[{'url': repo['url'], 'dest': repo['dest']}],
+            pull_interval=3600
+        )
+        source.ensure_repos_present()
+
+        repo_api.return_value.remotes.origin.pull.assert_called_once()
+
+    @patch('cibyl.sources.git.Repo')
+    def test_pull_after_interval(self, repo_api):
+        """Checks that a repository is pulled again once the interval since
+        its last sync has passed.
+        """
+        repo = self._present_repo('repo')
+
+        source = GitSource(repos=[repo], pull_interval=60)
+        source.ensure_repos_present()
+
+        last_sync = os.path.join(repo['dest'], ".git", LAST_SYNC_FILE)
+        os.utime(last_sync, (0, 0))
+
+        repo['cloned'] = False
+        source.ensure_repos_present()
+
+        self.assertEqual(
+            2, repo_api.return_value.remotes.origin.pull.call_count
+        )
+
+    @patch('cibyl.sources.git.Repo')
+    def test_shallow_pull(self, repo_api):
+        """Checks that shallow repositories are kept shallow on pull."""
+        repo = self._present_repo('repo')
+        repo['depth'] = 1
+
+        source = GitSource(repos=[repo])
+        source.ensure_repos_present()
+
+        repo_api.return_value.remotes.origin.pull.assert_called_once_with(
+            depth=1
+        )
+
+    @patch('cibyl.sources.git.Repo')
+    def test_errors_raised_from_workers(self, repo_api):
+        """Checks that failures while syncing concurrently are not lost."""
+        repo_api.clone_from = Mock(side_effect=Exception('failure'))
+
+        repos = [
+            {'url': 'url/to/repo1.git',
+             'dest': os.path.join(self.directory.name, 'repo1')},
+            {'url': 'url/to/repo2.git',
+             'dest': os.path.join(self.directory.name, 'repo2')}
+        ]
+
+        source = GitSource(repos=repos, sync_workers=2)
+
+        self.assertRaises(GitError, source.ensure_repos_present)
@@ -16,12 +16,14 @@
 # pylint: disable=no-member, protected-access
 import os
 import shutil
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
 from cibyl.models.attribute import AttributeDictValue
 from cibyl.models.ci.base.job import Job
-from cibyl.sources.jenkins_job_builder import JenkinsJobBuilder
+from cibyl.sources.jenkins_job_builder import (XML_DIR, JenkinsJobBuilder,
+                                               get_xml_root_tag, map_files)
 
 
 def remove_fake_files():
@@ -129,3 +131,106 @@ class TestJenkinsJobBuilderSource(TestCase):
                                     value={"fake_job2": job})
 
         self.assertEqual(jobs, result)
+
+    def test_get_jobs_with_workers(self, _):
+        """Checks that parsing the xml files on a pool of processes gives
+        the same result as doing it on the current one.
+        """
+        repos = [{'dest': 'out_jjb_test'}]
+        jenkins = JenkinsJobBuilder(repos=repos, workers=2)
+        jenkins._generate_xml = Mock()
+
+        jobs = jenkins.get_jobs()
+        job = Job(name="fake_job2")
+        result = AttributeDictValue("jobs", attr_type=Job,
+                                    value={"fake_job2": job})
+
+        self.assertEqual(jobs, result)
+
+    def test_map_files_keeps_order(self, _):
+        """Checks that the results from a pool of processes come in the
+        same order as the files they were computed from.
+        """
+        paths = [
+            "out_jjb_test/out-xml/fake_job1/config.xml",
+            "out_jjb_test/out-xml/fake_job2/config.xml"
+        ] * 5
+
+        self.assertEqual(
+            ["com.folder.Folder", "flow-definition"] * 5,
+            map_files(get_xml_root_tag, paths, workers=3)
+        )
+
+    def test_xml_generated_once_per_repo(self, _):
+        """Checks that the xml files of a repository are generated only once
+        no matter how many times its jobs are requested.
+        """
+        repos = [{'dest': 'out_jjb_test'}]
+        jenkins = JenkinsJobBuilder(repos=repos)
+        jenkins._get_revision = Mock(return_value=None)
+        jenkins._generate_xml = Mock()
+
+        jenkins.get_jobs()
+        jenkins.get_jobs()
+
+        jenkins._generate_xml.assert_called_once_with(repos[0])
+        self.assertEqual({'dest': 'out_jjb_test'}, repos[0])
+
+    def test_revision_not_recorded_without_xml_dir(self, _):
+        """Checks that generating the xml files does not fail if they were
+        not placed where expected.
+        """
+        with TemporaryDirectory() as dest:
+            repos = [{'dest': dest}]
+            jenkins = JenkinsJobBuilder(repos=repos)
+            jenkins._get_revision = Mock(return_value='sha')
+            jenkins._generate_xml = Mock()
+
+            jenkins._ensure_xml_generated(repos[0])
+
+            jenkins._generate_xml.assert_called_once_with(repos[0])
+            self.assertFalse(os.path.exists(os.path.join(dest, XML_DIR)))
+
+    def test_xml_not_generated_on_same_revision(self, _):
+        """Checks that the xml files are not generated again if they were
+        already generated from the current revision of the repository.
+        """
+        revision = 'sha'
+
+        repos = [{'dest': 'out_jjb_test'}]
+        jenkins = JenkinsJobBuilder(repos=repos)
+        jenkins._get_revision = Mock(return_value=revision)
+        jenkins._generate_xml = Mock()
+
+        jenkins.get_jobs()
+
+        jenkins._generate_xml.assert_called_once_with(repos[0])
+
+        repos = [{'dest': 'out_jjb_test'}]
+        jenkins = JenkinsJobBuilder(repos=repos)
+        jenkins._get_revision = Mock(return_value=revision)
+        jenkins._generate_xml = Mock()
+
+        jenkins.get_jobs()
+
+        jenkins._generate_xml.assert_not_called()
+
+    def test_xml_generated_on_new_revision(self, _):
+        """Checks that the xml files are generated again if the repository
+        moved to another revision.
+        """
+        repos = [{'dest': 'out_jjb_test'}]
+        jenkins = JenkinsJobBuilder(repos=repos)
+        jenkins._get_revision = Mock(return_value='sha1')
+        jenkins._generate_xml = Mock()
+
+        jenkins.get_jobs()
+
+        repos = [{'dest': 'out_jjb_test'}]
+        jenkins = JenkinsJobBuilder(repos=repos)
+        jenkins._get_revision = Mock(return_value='sha2')
+        jenkins._generate_xml = Mock()
+
+        jenkins.get_jobs()
+
+        jenkins._generate_xml.assert_called_once_with(repos[0])
@@ -17,6 +17,7 @@ from unittest import TestCase
 from unittest.mock import Mock
 
 from cibyl.sources.zuul.apis.factories.rest import ZuulRESTClientFactory
+from cibyl.sources.zuul.apis.http import DEFAULT_CACHE_SIZE
 from cibyl.sources.zuul.apis.rest import ZuulRESTClient
 
 
@@ -50,6 +51,23 @@ class TestZuulRESTClientFactory(TestCase):
 
         self.assertIsNone(factory.cert)
 
+    def test_cache_sizes_from_kwargs(self):
+        """Checks that the sizes of the cache of responses and of artifacts
+        are taken from kwargs, with a limit by default.
+        """
+        factory = ZuulRESTClientFactory.from_kwargs(
+            url=Mock(),
+            cache_size=10,
+            artifacts_cache_size=None
+        )
+
+        self.assertEqual(10, factory.cache_size)
+        self.assertIsNone(factory.artifacts_cache_size)
+
+        factory = ZuulRESTClientFactory.from_kwargs(url=Mock())
+
+        self.assertEqual(DEFAULT_CACHE_SIZE, factory.cache_size)
+
     def test_error_if_no_url(self):
         """Checks that 'from_kwargs' raises an error if the 'url' key is
         not provided.
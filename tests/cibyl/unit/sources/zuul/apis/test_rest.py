@@ -13,16 +13,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+from cibyl.sources.zuul.apis import BuildsQuery
 from cibyl.sources.zuul.apis.rest import (ZuulBuildRESTClient,
                                           ZuulJobRESTClient,
                                           ZuulPipelineRESTClient,
                                           ZuulProjectRESTClient,
                                           ZuulRESTClient, ZuulSession,
                                           ZuulTenantRESTClient,
-                                          ZuulVariantRESTClient)
+                                          ZuulVariantRESTClient, paginate)
+from kernel.tools.dicts import LRUDict
 
 
 class TestZuulSession(TestCase):
@@ -69,6 +72,380 @@ class TestZuulSession(TestCase):
         request.raise_for_status.assert_called()
         request.json.assert_called()
 
+    def test_query_cached(self):
+        """Tests that the host is not asked again for an end-point it
+        already answered."""
+        url = 'http://localhost:8080/zuul'
+        service = 'service'
+
+        rest = Mock()
+        rest.get.return_value.json.return_value = {'param': 'val'}
+
+        session = ZuulSession(rest, url, None)
+
+        self.assertEqual(session.get(service), session.get(service))
+
+        rest.get.assert_called_once_with(f'{session.api}{service}')
+
+    def test_cache_expires(self):
+        """Tests that the host is asked again once the response has been
+        kept for longer than allowed."""
+        url = 'http://localhost:8080/zuul'
+        service = 'service'
+
+        rest = Mock()
+        rest.get.return_value.json.return_value = {'param': 'val'}
+
+        session = ZuulSession(rest, url, None, cache_ttl=0)
+
+        session.get(service)
+        session.get(service)
+
+        self.assertEqual(2, rest.get.call_count)
+
+
+class TestZuulRESTClient(TestCase):
+    """Tests for :class:`ZuulRESTClient`.
+    """
+
+    def test_memory_tier_is_bounded(self):
+        """Checks that entries of the cache directory kept in memory are
+        limited in number.
+        """
+        with TemporaryDirectory() as cache_dir:
+            client = ZuulRESTClient.from_url(
+                'http://localhost:8080/zuul',
+                cache_dir=cache_dir
+            )
+
+            self.assertIsInstance(client.session.artifacts.front, LRUDict)
+
+
+class TestPaginate(TestCase):
+    """Tests for :func:`paginate`.
+    """
+
+    def test_all_pages(self):
+        """Checks that pages are asked for until one comes incomplete."""
+        request = Mock()
+        request.side_effect = [[1, 2], [3, 4], [5]]
+
+        self.assertEqual(
+            [1, 2, 3, 4, 5],
+            list(paginate(request, page_size=2))
+        )
+
+        request.assert_any_call({'limit': 2, 'skip': 0})
+        request.assert_any_call({'limit': 2, 'skip': 2})
+        request.assert_any_call({'limit': 2, 'skip': 4})
+
+    def test_pages_on_demand(self):
+        """Checks that a page is not asked for until it is needed."""
+        request = Mock()
+        request.side_effect = [[1, 2], [3, 4]]
+
+        items = paginate(request, page_size=2)
+
+        self.assertEqual(1, next(items))
+
+        request.assert_called_once()
+
+    def test_limit(self):
+        """Checks that no more items than the limit are asked for."""
+        request = Mock()
+        request.side_effect = [[1, 2], [3]]
+
+        self.assertEqual(
+            [1, 2, 3],
+            list(paginate(request, limit=3, page_size=2))
+        )
+
+        request.assert_called_with({'limit': 1, 'skip': 2})
+
+
+class TestZuulJobRESTClientBuilds(TestCase):
+    """Tests for :meth:`ZuulJobRESTClient.builds`.
+    """
+
+    def test_query_parameters(self):
+        """Checks that the conditions on the builds are sent to the host.
+        """
+        session = Mock()
+        session.get.return_value = [{'uuid': 'uuid'}]
+
+        tenant = Mock()
+        tenant.name = 'tenant'
+
+        client = ZuulJobRESTClient(session, tenant, {'name': 'job'})
+
+        builds = client.builds(
+            BuildsQuery(
+                projects=['project'],
+                pipelines=['check', 'gate'],
+                results=['SUCCESS'],
+                limit=1
+            )
+        )
+
+        self.assertEqual(1, len(list(builds)))
+
+        session.get.assert_called_once_with(
+            'tenant/tenant/builds?job_name=job&project=project'
+            '&pipeline=check&pipeline=gate&result=SUCCESS&limit=1&skip=0'
+        )
+
+
+class TestZuulTenantRESTClientJobsBuilds(TestCase):
+    """Tests for :meth:`ZuulTenantRESTClient.jobs_builds`.
+    """
+
+    def test_splits_builds_by_job(self):
+        """Checks that builds are assigned to their jobs and that the ones
+        for other jobs are left out.
+        """
+        job1 = Mock()
+        job1.name = 'job1'
+
+        job2 = Mock()
+        job2.name = 'job2'
+
+        builds = [
+            {'uuid': '1', 'job_name': 'job1'},
+            {'uuid': '2', 'job_name': 'other'},
+            {'uuid': '3', 'job_name': 'job2'}
+        ]
+
+        session = Mock()
+        session.get.return_value = builds
+
+        client = ZuulTenantRESTClient(session, {'name': 'tenant'})
+
+        result = list(client.jobs_builds([job1, job2]))
+
+        self.assertEqual(2, len(result))
+
+        self.assertEqual(job1, result[0].job)
+        self.assertEqual(builds[0], result[0].raw)
+        self.assertEqual(job2, result[1].job)
+        self.assertEqual(builds[2], result[1].raw)
+
+        session.get.assert_called_once_with(
+            'tenant/tenant/builds?'
+            'job_name=job1&job_name=job2&limit=1000&skip=0'
+        )
+
+    def test_limit_is_per_job(self):
+        """Checks that the limit applies to each job and that no more pages
+        are requested once all jobs reached it.
+        """
+        job1 = Mock()
+        job1.name = 'job1'
+
+        job2 = Mock()
+        job2.name = 'job2'
+
+        session = Mock()
+        session.get.return_value = [
+            {'uuid': '1', 'job_name': 'job1'},
+            {'uuid': '2', 'job_name': 'job1'},
+            {'uuid': '3', 'job_name': 'job2'}
+        ]
+
+        client = ZuulTenantRESTClient(session, {'name': 'tenant'})
+
+        result = list(client.jobs_builds([job1, job2], BuildsQuery(limit=1)))
+
+        self.assertEqual(['1', '3'], [build.raw['uuid'] for build in result])
+
+    @patch('cibyl.sources.zuul.apis.rest.TENANT_BUILDS_PAGE_SIZE', 2)
+    def test_jobs_leave_listing_once_done(self):
+        """Checks that jobs which got all their builds are no longer asked
+        for, and that the listing of the rest continues where it was.
+        """
+        job1 = Mock()
+        job1.name = 'job1'
+
+        job2 = Mock()
+        job2.name = 'job2'
+
+        session = Mock()
+        session.get.side_effect = [
+            [
+                {'uuid': '1', 'job_name': 'job1'},
+                {'uuid': '2', 'job_name': 'job1'}
+            ],
+            [
+                {'uuid': '3', 'job_name': 'job2'}
+            ]
+        ]
+
+        client = ZuulTenantRESTClient(session, {'name': 'tenant'})
+
+        result = list(client.jobs_builds([job1, job2], BuildsQuery(limit=2)))
+
+        self.assertEqual(
+            ['1', '2', '3'], [build.raw['uuid'] for build in result]
+        )
+        self.assertEqual(
+            [
+                'tenant/tenant/builds?'
+                'job_name=job1&job_name=job2&limit=2&skip=0',
+                'tenant/tenant/builds?job_name=job2&limit=2&skip=0'
+            ],
+            [call.args[0] for call in session.get.call_args_list]
+        )
+
+    @patch('cibyl.sources.zuul.apis.rest.JOBS_PER_BUILDS_REQUEST', 1)
+    def test_jobs_are_split_across_requests(self):
+        """Checks that no more than a certain number of jobs are asked for
+        on the same request.
+        """
+        job1 = Mock()
+        job1.name = 'job1'
+
+        job2 = Mock()
+        job2.name = 'job2'
+
+        session = Mock()
+        session.get.return_value = []
+
+        client = ZuulTenantRESTClient(session, {'name': 'tenant'})
+
+        self.assertEqual([], list(client.jobs_builds([job1, job2])))
+
+        self.assertEqual(
+            [
+                'tenant/tenant/builds?job_name=job1&limit=1000&skip=0',
+                'tenant/tenant/builds?job_name=job2&limit=1000&skip=0'
+            ],
+            [call.args[0] for call in session.get.call_args_list]
+        )
+
+
+class TestZuulBuildRESTClientTests(TestCase):
+    """Tests for the tests of :class:`ZuulBuildRESTClient`.
+    """
+
+    def test_tests_are_kept(self):
+        """Checks that the tests of a build are only looked for once.
+        """
+        finder = Mock()
+        finder.find.return_value = ['suite']
+
+        tools = ZuulBuildRESTClient.Tools(finders=(finder,))
+
+        build = ZuulBuildRESTClient(Mock(), Mock(), {}, tools)
+
+        self.assertEqual(['suite'], build.tests())
+        self.assertEqual(['suite'], build.tests())
+
+        finder.find.assert_called_once_with(build)
+
+    def test_tests_of_many_builds(self):
+        """Checks that the tests of many builds are looked for together.
+        """
+        finder = Mock()
+        finder.find_all.return_value = [['suite1'], ['suite2']]
+
+        tools = ZuulBuildRESTClient.Tools(finders=(finder,))
+
+        build1 = ZuulBuildRESTClient(Mock(), Mock(), {}, tools)
+        build2 = ZuulBuildRESTClient(Mock(), Mock(), {}, tools)
+
+        self.assertEqual(
+            [['suite1'], ['suite2']],
+            ZuulBuildRESTClient.tests_of([build1, build2])
+        )
+
+        finder.find_all.assert_called_once_with([build1, build2])
+        finder.find.assert_not_called()
+
+    def test_tests_of_finished_build_are_stored(self):
+        """Checks that the tests of a finished build are kept on its session
+        under the build's UUID.
+        """
+        finder = Mock()
+        finder.find.return_value = ['suite']
+
+        serializer = Mock()
+        serializer.encode.return_value = ['data']
+
+        tools = ZuulBuildRESTClient.Tools(
+            finders=(finder,),
+            serializer=serializer
+        )
+
+        session = Mock()
+        session.artifacts = {}
+
+        build = ZuulBuildRESTClient(
+            session, Mock(), {'uuid': 'uuid', 'end_time': 'time'}, tools
+        )
+
+        self.assertEqual(['suite'], build.tests())
+        self.assertEqual({'uuid/tests': ['data']}, session.artifacts)
+
+        serializer.encode.assert_called_once_with(['suite'])
+
+    def test_stored_tests_are_reused(self):
+        """Checks that the tests of a finished build are not looked for
+        again if they were stored before.
+        """
+        finder = Mock()
+
+        serializer = Mock()
+        serializer.decode.return_value = ['suite']
+
+        tools = ZuulBuildRESTClient.Tools(
+            finders=(finder,),
+            serializer=serializer
+        )
+
+        session = Mock()
+        session.artifacts = {'uuid/tests': ['data']}
+
+        build1 = ZuulBuildRESTClient(
+            session, Mock(), {'uuid': 'uuid', 'end_time': 'time'}, tools
+        )
+        build2 = ZuulBuildRESTClient(
+            session, Mock(), {'uuid': 'uuid', 'end_time': 'time'}, tools
+        )
+
+        self.assertEqual(['suite'], build1.tests())
+        self.assertEqual(
+            [['suite']],
+            ZuulBuildRESTClient.tests_of([build2])
+        )
+
+        finder.find.assert_not_called()
+        finder.find_all.assert_not_called()
+        serializer.decode.assert_called_with(['data'])
+
+    def test_corrupt_stored_tests_are_ignored(self):
+        """Checks that tests that cannot be read back are looked for again.
+        """
+        finder = Mock()
+        finder.find.return_value = ['suite']
+
+        serializer = Mock()
+        serializer.decode.side_effect = ValueError
+        serializer.encode.return_value = ['data']
+
+        tools = ZuulBuildRESTClient.Tools(
+            finders=(finder,),
+            serializer=serializer
+        )
+
+        session = Mock()
+        session.artifacts = {'uuid/tests': ['corrupt']}
+
+        build = ZuulBuildRESTClient(
+            session, Mock(), {'uuid': 'uuid', 'end_time': 'time'}, tools
+        )
+
+        self.assertEqual(['suite'], build.tests())
+        self.assertEqual({'uuid/tests': ['data']}, session.artifacts)
+
 
 class TestZuulVariantRESTClient(TestCase):
     """Tests for :class:`ZuulVariantRESTClient`.
@@ -233,11 +610,12 @@ class TestZuulVariantRESTClient(TestCase):
                     ZuulBuildRESTClient(session, client, builds[0]),
                     ZuulBuildRESTClient(session, client, builds[1])
                 ],
-                client.builds()
+                list(client.builds())
             )
 
             session.get.assert_called_once_with(
                 f"tenant/{tenant.name}/builds?job_name={job['name']}"
+                f"&limit=100&skip=0"
             )
 
     class TestZuulPipelineRESTClient(TestCase):
@@ -155,7 +155,7 @@ class TestQuickQuery(TestCase):
 
         builder.with_variant.assert_called_once_with(variant)
 
-    @patch(f'{pkg}.perform_builds_query')
+    @patch(f'{pkg}.perform_jobs_builds_query')
     @patch(f'{pkg}.perform_jobs_query')
     def test_gets_builds(self, jobs: Mock, builds: Mock):
         """Checks that the simple queries are made in order to aggregate
@@ -181,12 +181,12 @@ class TestQuickQuery(TestCase):
         self.assertEqual(query, query.with_builds_query(**kwargs))
 
         jobs.assert_called_once_with(api, **kwargs)
-        builds.assert_called_once_with(job, **kwargs)
+        builds.assert_called_once_with([job], **kwargs)
 
         builder.with_build.assert_called_once_with(build)
 
-    @patch(f'{pkg}.perform_tests_query')
-    @patch(f'{pkg}.perform_builds_query')
+    @patch(f'{pkg}.perform_builds_tests_query')
+    @patch(f'{pkg}.perform_jobs_builds_query')
     @patch(f'{pkg}.perform_jobs_query')
     def test_gets_tests(self, jobs: Mock, builds: Mock, tests: Mock):
         """Checks that the simple queries are made in order to aggregate
@@ -207,14 +207,14 @@ class TestQuickQuery(TestCase):
 
         jobs.return_value = [job]
         builds.return_value = [build]
-        tests.return_value = [test]
+        tests.return_value = [[test]]
 
         query = QuickQuery(api=api, tools=tools)
 
         self.assertEqual(query, query.with_tests_query(**kwargs))
 
         jobs.assert_called_once_with(api, **kwargs)
-        builds.assert_called_once_with(job, **kwargs)
-        tests.assert_called_once_with(build, **kwargs)
+        builds.assert_called_once_with([job], **kwargs)
+        tests.assert_called_once_with([build], **kwargs)
 
         builder.with_test.assert_called_once_with(test)
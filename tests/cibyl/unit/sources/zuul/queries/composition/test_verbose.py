@@ -178,7 +178,7 @@ class TestVerboseQuery(TestCase):
 
         builder.with_variant.assert_called_once_with(variant)
 
-    @patch(f'{pkg}.quick.perform_builds_query')
+    @patch(f'{pkg}.quick.perform_jobs_builds_query')
     @patch(f'{pkg}.quick.perform_jobs_query')
     def test_gets_builds(self, jobs: Mock, builds: Mock):
         """Checks that the simple queries are made in order to aggregate
@@ -204,12 +204,12 @@ class TestVerboseQuery(TestCase):
         self.assertEqual(query, query.with_builds_query(**kwargs))
 
         jobs.assert_called_once_with(api, **kwargs)
-        builds.assert_called_once_with(job, **kwargs)
+        builds.assert_called_once_with([job], **kwargs)
 
         builder.with_build.assert_called_once_with(build)
 
-    @patch(f'{pkg}.quick.perform_tests_query')
-    @patch(f'{pkg}.quick.perform_builds_query')
+    @patch(f'{pkg}.quick.perform_builds_tests_query')
+    @patch(f'{pkg}.quick.perform_jobs_builds_query')
     @patch(f'{pkg}.quick.perform_jobs_query')
     def test_gets_tests(self, jobs: Mock, builds: Mock, tests: Mock):
         """Checks that the simple queries are made in order to aggregate
@@ -230,14 +230,52 @@ class TestVerboseQuery(TestCase):
 
         jobs.return_value = [job]
         builds.return_value = [build]
-        tests.return_value = [test]
+        tests.return_value = [[test]]
 
         query = VerboseQuery(api=api, tools=tools)
 
         self.assertEqual(query, query.with_tests_query(**kwargs))
 
         jobs.assert_called_once_with(api, **kwargs)
-        builds.assert_called_once_with(job, **kwargs)
-        tests.assert_called_once_with(build, **kwargs)
+        builds.assert_called_once_with([job], **kwargs)
+        tests.assert_called_once_with([build], **kwargs)
 
         builder.with_test.assert_called_once_with(test)
+
+    @patch(f'{pkg}.verbose.perform_jobs_query')
+    @patch(f'{pkg}.verbose.perform_pipelines_query')
+    def test_pipeline_jobs_are_fetched_once(self, pipelines: Mock,
+                                            jobs: Mock):
+        """Checks that each pipeline is asked for its jobs only once, no
+        matter how many jobs are being queried.
+        """
+        job1 = Mock()
+        job1.name = 'job1'
+
+        job2 = Mock()
+        job2.name = 'job2'
+
+        pipeline1 = Mock()
+        pipeline1.jobs.return_value.get.return_value = [job1, job2]
+
+        pipeline2 = Mock()
+        pipeline2.jobs.return_value.get.return_value = [job2]
+
+        builder = Mock()
+
+        tools = Mock()
+        tools.builder = builder
+
+        pipelines.return_value = [pipeline1, pipeline2]
+        jobs.return_value = [job1, job2]
+
+        query = VerboseQuery(api=Mock(), tools=tools)
+        query.with_jobs_query()
+
+        pipeline1.jobs.assert_called_once()
+        pipeline2.jobs.assert_called_once()
+
+        self.assertEqual(
+            [pipeline1, pipeline1, pipeline2],
+            [call.args[0] for call in builder.with_pipeline.call_args_list]
+        )
@@ -0,0 +1,95 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cibyl.sources.zuul.queries.builds import (BULK_BUILDS_THRESHOLD,
+                                               perform_jobs_builds_query)
+
+pkg = 'cibyl.sources.zuul.queries.builds'
+
+
+class TestPerformJobsBuildsQuery(TestCase):
+    """Tests for :func:`perform_jobs_builds_query`.
+    """
+
+    def _jobs(self, tenant, count):
+        jobs = []
+
+        for _ in range(count):
+            job = Mock()
+            job.tenant = tenant
+
+            jobs.append(job)
+
+        return jobs
+
+    @patch(f'{pkg}.perform_builds_query')
+    def test_few_jobs_go_one_by_one(self, builds: Mock):
+        """Checks that builds are fetched job by job when there are only a
+        few jobs on the tenant.
+        """
+        tenant = Mock()
+        tenant.name = 'tenant'
+
+        jobs = self._jobs(tenant, BULK_BUILDS_THRESHOLD - 1)
+
+        builds.return_value = [Mock()]
+
+        result = perform_jobs_builds_query(jobs)
+
+        self.assertEqual(len(jobs), len(result))
+        self.assertEqual(len(jobs), builds.call_count)
+
+        tenant.builds.assert_not_called()
+
+    @patch(f'{pkg}.perform_builds_query')
+    def test_many_jobs_go_through_tenant(self, builds: Mock):
+        """Checks that builds are fetched from the tenant when there are
+        many jobs on it.
+        """
+        build = Mock()
+
+        tenant = Mock()
+        tenant.name = 'tenant'
+        tenant.builds.return_value.get.return_value = [build]
+
+        jobs = self._jobs(tenant, BULK_BUILDS_THRESHOLD)
+
+        result = perform_jobs_builds_query(jobs)
+
+        self.assertEqual([build], result)
+
+        tenant.builds.assert_called_once_with(jobs)
+        builds.assert_not_called()
+
+    @patch(f'{pkg}.perform_builds_query')
+    def test_last_build_goes_one_by_one(self, builds: Mock):
+        """Checks that the last build of each job is fetched job by job no
+        matter how many jobs there are.
+        """
+        tenant = Mock()
+        tenant.name = 'tenant'
+
+        jobs = self._jobs(tenant, BULK_BUILDS_THRESHOLD)
+
+        builds.return_value = []
+
+        perform_jobs_builds_query(jobs, last_build=Mock())
+
+        self.assertEqual(len(jobs), builds.call_count)
+
+        tenant.builds.assert_not_called()
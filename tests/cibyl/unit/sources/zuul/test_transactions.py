@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+from threading import Barrier
 from unittest import TestCase
 from unittest.mock import Mock
 
@@ -20,12 +21,135 @@ from parameterized import parameterized
 
 from cibyl.cli.ranged_argument import Range
 from cibyl.models.ci.zuul.test import TestKind, TestStatus
-from cibyl.sources.zuul.transactions import (TestResponse, TestsRequest,
-                                             VariantResponse)
+from cibyl.sources.zuul.transactions import (BuildsRequest, TestResponse,
+                                             TestsRequest, VariantResponse,
+                                             as_exact_results, as_exact_values,
+                                             fan_out)
 from cibyl.sources.zuul.utils.tests.tempest.types import TempestTest
 from cibyl.sources.zuul.utils.tests.types import Test, TestResult
 
 
+class TestFanOut(TestCase):
+    """Tests for :func:`fan_out`.
+    """
+
+    def test_keeps_order(self):
+        """Checks that results come in the same order as the items.
+        """
+        self.assertEqual(
+            [0, 1, 4, 9], fan_out(lambda item: item ** 2, range(4))
+        )
+
+    def test_calls_are_concurrent(self):
+        """Checks that calls are performed at the same time.
+        """
+        # Would hang if the calls were made one after the other
+        barrier = Barrier(3, timeout=5)
+
+        def call(item):
+            barrier.wait()
+            return item
+
+        self.assertEqual([0, 1, 2], fan_out(call, range(3)))
+
+    def test_errors_are_raised(self):
+        """Checks that errors on any of the calls reach the caller.
+        """
+
+        def call(item):
+            if item == 2:
+                raise ValueError(item)
+
+            return item
+
+        with self.assertRaises(ValueError):
+            fan_out(call, range(4))
+
+
+class TestBuildsRequest(TestCase):
+    """Tests for :class:`BuildsRequest`.
+    """
+
+    @staticmethod
+    def _build(**kwargs):
+        build = Mock()
+        build.uuid = kwargs.get('uuid', 'uuid')
+        build.project = kwargs.get('project', 'project')
+        build.pipeline = kwargs.get('pipeline', 'check')
+        build.result = kwargs.get('result', 'SUCCESS')
+        return build
+
+    def test_exact_filters_pushed(self):
+        """Checks that filters that can only match exact values are given
+        to the host, which then only needs to send the last build.
+        """
+        job = Mock()
+        job.builds = Mock()
+        job.builds.return_value = [self._build()]
+
+        request = BuildsRequest(job)
+        request.with_project('^project$')
+        request.with_status(TestStatus.SUCCESS)
+        request.with_last_build_only()
+
+        result = request.get()
+
+        self.assertEqual(1, len(result))
+
+        query = job.builds.call_args.args[0]
+
+        self.assertEqual(['project'], query.projects)
+        self.assertEqual(['SUCCESS'], query.results)
+        self.assertEqual(1, query.limit)
+
+    def test_regex_filters_kept_local(self):
+        """Checks that filters that could match more than one value are left
+        out of the host's query, and so is the limit on the last build.
+        """
+        builds = [
+            self._build(pipeline='gate'),
+            self._build(pipeline='check-arm64'),
+            self._build(pipeline='check')
+        ]
+
+        job = Mock()
+        job.builds = Mock()
+        job.builds.return_value = iter(builds)
+
+        request = BuildsRequest(job)
+        request.with_pipeline('check')
+        request.with_last_build_only()
+
+        result = request.get()
+
+        self.assertEqual(1, len(result))
+        self.assertEqual(builds[1].raw, result[0].data)
+
+        query = job.builds.call_args.args[0]
+
+        self.assertEqual([], query.pipelines)
+        self.assertIsNone(query.limit)
+
+    def test_exact_values(self):
+        """Checks that only anchored patterns with escaped dots are
+        considered exact.
+        """
+        self.assertEqual(
+            ['org/project', 'stable/1.0'],
+            as_exact_values(['^org/project$', r'^stable/1\.0$'])
+        )
+        self.assertIsNone(as_exact_values(['^stable/1.0$']))
+        self.assertIsNone(as_exact_values(['project']))
+
+    def test_exact_results(self):
+        """Checks which results are considered exact.
+        """
+        self.assertEqual(['SUCCESS'], as_exact_results(['SUCCESS']))
+        self.assertEqual(['FAILURE'], as_exact_results(['^FAILURE$']))
+        self.assertIsNone(as_exact_results(['FAILURE']))
+        self.assertIsNone(as_exact_results(['SUCC.*']))
+
+
 class TestTestsRequest(TestCase):
     """Tests for :class:`TestsRequest`.
     """
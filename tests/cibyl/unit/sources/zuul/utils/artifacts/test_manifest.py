@@ -13,18 +13,20 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import gc
 from unittest import TestCase
 from unittest.mock import Mock
 
 import cibyl
 from cibyl.sources.zuul.apis import ArtifactKind
 from cibyl.sources.zuul.utils.artifacts import ArtifactError
-from cibyl.sources.zuul.utils.artifacts.manifest import (Manifest,
-                                                         ManifestDigger,
-                                                         ManifestDir,
+from cibyl.sources.zuul.utils.artifacts.manifest import (Manifest, ManifestDir,
                                                          ManifestDownloader,
                                                          ManifestFile,
-                                                         ManifestFileSearch)
+                                                         ManifestFileSearch,
+                                                         ManifestIndex,
+                                                         ManifestIndexFactory,
+                                                         ManifestItem)
 
 
 class TestManifestDownloader(TestCase):
@@ -72,7 +74,7 @@ class TestManifestDownloader(TestCase):
         returned.
         """
         url = 'some-url'
-        json = 'some-json'
+        json = '{"tree": []}'
 
         session = Mock()
         manifest = Mock()
@@ -82,8 +84,11 @@ class TestManifestDownloader(TestCase):
         artifact.url = url
 
         build = Mock()
+        build.uuid = 'uuid'
+        build.raw = {'end_time': 'some-time'}
         build.artifacts = [artifact]
         build.session.session = session
+        build.session.artifacts = {}
 
         module = cibyl.sources.zuul.utils.artifacts.manifest
         download = module.download_into_memory = Mock()
@@ -91,61 +96,71 @@ class TestManifestDownloader(TestCase):
 
         tools = Mock()
         tools.parser = Mock()
-        tools.parser.from_string = Mock()
-        tools.parser.from_string.return_value = manifest
+        tools.parser.bind_dataclass = Mock()
+        tools.parser.bind_dataclass.return_value = manifest
 
         downloader = ManifestDownloader(tools=tools)
 
         result = downloader.download_from(build)
 
         self.assertEqual(manifest, result)
+        self.assertEqual(
+            {'uuid/manifest': {'tree': []}},
+            build.session.artifacts
+        )
 
         download.assert_called_once_with(url, session)
-        tools.parser.from_string.assert_called_once_with(json, Manifest)
+        tools.parser.bind_dataclass.assert_called_once_with(
+            {'tree': []}, Manifest
+        )
 
-
-class TestManifestDigger(TestCase):
-    """Tests for :class:`ManifestDigger`.
-    """
-
-    def test_error_on_invalid_level(self):
-        """Checks that an error is thrown in case the user tries to delve
-        into a level that does not exist.
+    def test_reuses_manifest_of_finished_build(self):
+        """Checks that the manifest of a finished build is not downloaded
+        again if it was already kept.
         """
-        level = 'some-level'
-
-        manifest = Mock()
-        manifest.tree = []
-
-        digger = ManifestDigger(manifest)
+        artifact = Mock()
+        artifact.kind = ArtifactKind.ZUUL_MANIFEST
 
-        self.assertFalse(digger.has_sublevel(level))
+        build = Mock()
+        build.uuid = 'uuid'
+        build.raw = {'end_time': 'some-time'}
+        build.artifacts = [artifact]
+        build.session.artifacts = {'uuid/manifest': {'tree': []}}
 
-        with self.assertRaises(ArtifactError):
-            digger.delve_into(level)
+        module = cibyl.sources.zuul.utils.artifacts.manifest
+        download = module.download_into_memory = Mock()
 
-    def test_delves_into_level(self):
-        """Checks that it is capable to switch the current level if it does
-        exist.
-        """
-        level = 'some-level'
+        tools = Mock()
 
-        other = Mock()
+        downloader = ManifestDownloader(tools=tools)
+        downloader.download_from(build)
 
-        item = Mock()
-        item.name = level
-        item.children = [other]
+        download.assert_not_called()
+        tools.parser.bind_dataclass.assert_called_once_with(
+            {'tree': []}, Manifest
+        )
 
-        manifest = Mock()
-        manifest.tree = [item]
+    def test_does_not_keep_manifest_of_running_build(self):
+        """Checks that the manifest of a build that has not finished is not
+        kept, as it may still change.
+        """
+        artifact = Mock()
+        artifact.kind = ArtifactKind.ZUUL_MANIFEST
 
-        digger = ManifestDigger(manifest)
+        build = Mock()
+        build.uuid = 'uuid'
+        build.raw = {'end_time': None}
+        build.artifacts = [artifact]
+        build.session.artifacts = {}
 
-        self.assertTrue(digger.has_sublevel(level))
+        module = cibyl.sources.zuul.utils.artifacts.manifest
+        download = module.download_into_memory = Mock()
+        download.return_value = '{}'
 
-        digger.delve_into(level)
+        downloader = ManifestDownloader(tools=Mock())
+        downloader.download_from(build)
 
-        self.assertEqual([other], digger.current_level)
+        self.assertEqual({}, build.session.artifacts)
 
 
 class TestManifestDir(TestCase):
@@ -196,6 +211,116 @@ class TestManifestFile(TestCase):
             ManifestFile('/var/logs/file')
 
 
+def _item(name, children=None):
+    return ManifestItem(name=name, mimetype='text/plain', children=children)
+
+
+def _manifest():
+    return Manifest(
+        tree=[
+            _item(
+                'logs', [
+                    _item(
+                        'undercloud', [
+                            _item(
+                                'tempest', [
+                                    _item('tempest_results.xml'),
+                                    _item('stestr_results.html')
+                                ]
+                            )
+                        ]
+                    ),
+                    _item('job-output.txt'),
+                    _item('tempest_results.xml.gz')
+                ]
+            ),
+            _item('zuul-info', [_item('inventory.yaml')])
+        ]
+    )
+
+
+class TestManifestIndex(TestCase):
+    """Tests for :class:`ManifestIndex`.
+    """
+
+    def test_gets_items_by_path(self):
+        """Checks that all elements on the tree can be reached by their full
+        path.
+        """
+        index = ManifestIndex(_manifest())
+
+        self.assertEqual(
+            'tempest_results.xml',
+            index.get('/logs/undercloud/tempest/tempest_results.xml').name
+        )
+        self.assertEqual('logs', index.get('/logs').name)
+        self.assertIsNone(index.get('/logs/tempest_results.xml'))
+        self.assertIsNone(index.get('/'))
+
+    def test_gets_paths_by_name(self):
+        """Checks that elements can be looked for by their name.
+        """
+        index = ManifestIndex(_manifest())
+
+        self.assertEqual(
+            ['/zuul-info/inventory.yaml'],
+            index.paths_named('inventory.yaml')
+        )
+        self.assertEqual([], index.paths_named('unknown'))
+
+    def test_glob(self):
+        """Checks that elements can be looked for through glob-style
+        patterns.
+        """
+        index = ManifestIndex(_manifest())
+
+        def glob(pattern):
+            return [path for path, _ in index.glob(pattern)]
+
+        self.assertEqual(
+            [
+                '/logs/undercloud/tempest/tempest_results.xml',
+                '/logs/tempest_results.xml.gz'
+            ],
+            glob('/logs/**/tempest_results.xml*')
+        )
+        self.assertEqual(
+            ['/logs/undercloud', '/logs/job-output.txt'],
+            glob('/logs/*o*')
+        )
+        self.assertEqual(
+            ['/logs/undercloud/tempest/stestr_results.html'],
+            glob('/**/*.html')
+        )
+        self.assertEqual(['/zuul-info'], glob('/zuul-inf?'))
+        self.assertEqual(['/zuul-info'], glob('/zuul-info'))
+        self.assertEqual([], glob('/tempest_results.xml'))
+        self.assertEqual([], glob('/logs/tempest_results.xml'))
+        self.assertEqual(len(index.paths), len(glob('/**')))
+
+
+class TestManifestIndexFactory(TestCase):
+    """Tests for :class:`ManifestIndexFactory`.
+    """
+
+    def test_indexes_manifest_once(self):
+        """Checks that the index of a manifest is reused while the manifest
+        lives and forgotten once it is gone.
+        """
+        factory = ManifestIndexFactory()
+
+        manifest = _manifest()
+        index = factory.from_manifest(manifest)
+
+        self.assertIs(index, factory.from_manifest(manifest))
+
+        del manifest
+        gc.collect()
+
+        self.assertIsNone(index.manifest)
+        self.assertIsNot(index, factory.from_manifest(_manifest()))
+
+
 class TestManifestFileSearch(TestCase):
     """Tests for :class:`ManifestFileSearch`.
     """
@@ -204,64 +329,58 @@ class TestManifestFileSearch(TestCase):
         """Checks that it is capable of finding the results file in a
         manifest that has it somewhere on its tree.
         """
-        path = '/'
+        manifest = _manifest()
 
-        item = Mock()
-        item.name = 'item.txt'
+        search_terms = ManifestFileSearch.SearchTerms(
+            paths=(
+                ManifestDir('/logs/overcloud'),
+                ManifestDir('/logs/undercloud/tempest')
+            ),
+            files=('tempest_results.xml', 'tempest_results.xml.gz')
+        )
 
-        manifest = Mock()
-        manifest.tree = [item]
+        finder = ManifestFileSearch()
 
-        digger = Mock()
-        digger.delve_into = Mock()
-        digger.has_sublevel = Mock()
-        digger.has_sublevel.return_value = True
-        digger.current_level = manifest.tree
+        result = finder.find_in(manifest, search_terms)
 
-        search_terms = Mock()
-        search_terms.paths = (path,)
-        search_terms.files = (item.name,)
+        self.assertIsNotNone(result)
+        self.assertEqual(
+            '/logs/undercloud/tempest/tempest_results.xml',
+            result[0]
+        )
+        self.assertEqual(
+            manifest.tree[0].children[0].children[0].children[0],
+            result[1]
+        )
+
+    def test_finds_results_on_root(self):
+        """Checks that files at the root of the manifest can be found.
+        """
+        manifest = Manifest(tree=[_item('item.txt')])
 
-        tools = Mock()
-        tools.diggers = Mock()
-        tools.diggers.from_manifest = Mock()
-        tools.diggers.from_manifest.return_value = digger
+        search_terms = ManifestFileSearch.SearchTerms(
+            paths=(ManifestDir('/'),),
+            files=('item.txt',)
+        )
 
-        finder = ManifestFileSearch(tools=tools)
+        finder = ManifestFileSearch()
 
         result = finder.find_in(manifest, search_terms)
 
-        self.assertIsNotNone(result)
-        self.assertEqual((f'{path}{item.name}', item), result)
+        self.assertEqual(('/item.txt', manifest.tree[0]), result)
 
     def test_no_results_if_not_on_path(self):
         """Checks returned value if the requested file is not at the
         indicated level.
         """
-        item = Mock()
-        item.name = 'item.txt'
+        search_terms = ManifestFileSearch.SearchTerms(
+            paths=(ManifestDir('/'),),
+            files=('other.txt',)
+        )
 
-        manifest = Mock()
-        manifest.tree = [item]
+        finder = ManifestFileSearch()
 
-        digger = Mock()
-        digger.delve_into = Mock()
-        digger.has_sublevel = Mock()
-        digger.has_sublevel.return_value = True
-        digger.current_level = manifest.tree
-
-        search_terms = Mock()
-        search_terms.paths = ('/',)
-        search_terms.files = ('other.txt',)
-
-        tools = Mock()
-        tools.diggers = Mock()
-        tools.diggers.from_manifest = Mock()
-        tools.diggers.from_manifest.return_value = digger
-
-        finder = ManifestFileSearch(tools=tools)
-
-        result = finder.find_in(manifest, search_terms)
+        result = finder.find_in(_manifest(), search_terms)
 
         self.assertIsNone(result)
 
@@ -269,26 +388,33 @@ class TestManifestFileSearch(TestCase):
         """Checks returned value if the indicated path does not exist on the
         manifest.
         """
-        manifest = Mock()
-        manifest.tree = []
+        search_terms = ManifestFileSearch.SearchTerms(
+            paths=(ManifestDir('/some/path'),),
+            files=('job-output.txt',)
+        )
 
-        digger = Mock()
-        digger.delve_into = Mock()
-        digger.has_sublevel = Mock()
-        digger.has_sublevel.return_value = True
-        digger.current_level = manifest.tree
+        finder = ManifestFileSearch()
 
-        search_terms = Mock()
-        search_terms.paths = ('/some/path',)
-        search_terms.files = ('other.txt',)
+        result = finder.find_in(_manifest(), search_terms)
+
+        self.assertIsNone(result)
+
+    def test_index_is_built_once(self):
+        """Checks that the manifest is indexed only once per search, no
+        matter how many places the file may be at.
+        """
+        manifest = _manifest()
+
+        search_terms = ManifestFileSearch.SearchTerms(
+            paths=(ManifestDir('/a'), ManifestDir('/b'), ManifestDir('/c')),
+            files=('file1.txt', 'file2.txt')
+        )
 
         tools = Mock()
-        tools.diggers = Mock()
-        tools.diggers.from_manifest = Mock()
-        tools.diggers.from_manifest.return_value = digger
+        tools.indexes.from_manifest.return_value = ManifestIndex(manifest)
 
         finder = ManifestFileSearch(tools=tools)
 
-        result = finder.find_in(manifest, search_terms)
+        self.assertIsNone(finder.find_in(manifest, search_terms))
 
-        self.assertIsNone(result)
+        tools.indexes.from_manifest.assert_called_once_with(manifest)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+from threading import Lock
+from time import sleep
 from unittest import TestCase
 from unittest.mock import Mock
 
@@ -95,3 +97,46 @@ class TestTempestTestFinder(TestCase):
         downloader.download_from.assert_called_once_with(build)
         search.find_in.assert_called_once_with(manifest, config.search_terms)
         parser.parse_tests_at.assert_called_once_with(build, file)
+
+    def test_find_all(self):
+        """Checks that the tests of many builds are found at once, without
+        going over the downloads allowed per log server.
+        """
+        lock = Lock()
+        active = {}
+        peaks = {}
+
+        def parse(build, _):
+            server = build.log_url
+
+            with lock:
+                active[server] = active.get(server, 0) + 1
+                peaks[server] = max(peaks.get(server, 0), active[server])
+
+            sleep(0.01)
+
+            with lock:
+                active[server] -= 1
+
+            return [build.uuid]
+
+        builds = []
+        for index in range(12):
+            build = Mock()
+            build.uuid = index
+            build.log_url = f'https://logs{index % 2}.example.com/{index}/'
+
+            builds.append(build)
+
+        config = TempestTestFinder.Config(downloads_per_server=2)
+
+        tools = Mock()
+        tools.search.find_in.return_value = ('file', None)
+        tools.parser.parse_tests_at.side_effect = parse
+
+        finder = TempestTestFinder(config=config, tools=tools)
+
+        result = finder.find_all(builds)
+
+        self.assertEqual([[build.uuid] for build in builds], result)
+        self.assertTrue(all(peak <= 2 for peak in peaks.values()))
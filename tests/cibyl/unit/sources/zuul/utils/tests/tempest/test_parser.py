@@ -13,48 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+from io import BytesIO
 from unittest import TestCase
-from unittest.mock import Mock, call, patch
+from unittest.mock import MagicMock, Mock, patch
 
-from cibyl.sources.zuul.utils.tests.tempest.parser import (TempestTestParser,
-                                                           XMLTempestTestSuite,
-                                                           XMLToTest,
-                                                           XMLToTestSuite)
-from cibyl.sources.zuul.utils.tests.types import TestResult
-
-
-class TestXMLToTestSuite(TestCase):
-    """Tests for :class:`XMLToTestSuite`.
-    """
-
-    def test_xml_to_suite(self):
-        """Checks that the class is capable of transforming the xml data in
-        to a cibyl test suite.
-        """
-        test = Mock()
-        case = Mock()
-
-        url = Mock()
-        suite = Mock()
-        suite.name = 'suite'
-        suite.testcase = [case]
-
-        cases = Mock()
-        cases.to_test = Mock()
-        cases.to_test.return_value = test
-
-        tools = Mock()
-        tools.cases = cases
-
-        converter = XMLToTestSuite(tools=tools)
-
-        result = converter.to_suite(url, suite)
-
-        self.assertEqual(suite.name, result.name)
-        self.assertEqual(url, result.url)
-        self.assertEqual([test], result.tests)
-
-        cases.to_test.assert_called_with(url, case)
+from cibyl.sources.zuul.utils.tests.tempest.parser import (
+    TempestTestParser, XMLTempestTestCaseReader, XMLToTest)
+from cibyl.sources.zuul.utils.tests.types import TestResult, TestSuite
 
 
 class TestXMLToTest(TestCase):
@@ -155,7 +120,7 @@ class TestTempestTestParser(TestCase):
     """
 
     @patch(
-        'cibyl.sources.zuul.utils.tests.tempest.parser.download_into_memory'
+        'cibyl.sources.zuul.utils.tests.tempest.parser.download_as_stream'
     )
     @patch(
         'cibyl.sources.zuul.utils.tests.tempest.parser.get_url_to_build_file'
@@ -164,10 +129,8 @@ class TestTempestTestParser(TestCase):
         """Checks that the class is capable of downloading and parsing the
         test results file.
         """
-        expected = Mock()
-
         url = 'url'
-        contents = Mock()
+        stream = Mock()
 
         file = Mock()
         session = Mock()
@@ -175,30 +138,145 @@ class TestTempestTestParser(TestCase):
         build = Mock()
         build.session.session = session
 
-        suite = Mock()
+        case = Mock()
+        test = Mock()
 
-        xml = Mock()
-        xml.from_string = Mock()
-        xml.from_string.return_value = suite
+        reader = Mock()
+        reader.read_suite.return_value = ('suite', iter([case]))
 
-        converter = Mock()
-        converter.to_suite = Mock()
-        converter.to_suite.return_value = expected
+        cases = Mock()
+        cases.to_test.return_value = test
 
         tools = Mock()
-        tools.parser = xml
-        tools.converter = converter
+        tools.reader = reader
+        tools.cases = cases
 
         urls.return_value = url
-        download.return_value = contents
+        download.return_value.__enter__ = Mock(return_value=stream)
+        download.return_value.__exit__ = Mock(return_value=None)
 
         parser = TempestTestParser(tools=tools)
 
         result = parser.parse_tests_at(build, file)
 
-        self.assertEqual([expected], result)
+        self.assertEqual(
+            [TestSuite(name='suite', url=url, tests=[test])],
+            result
+        )
 
-        urls.assert_has_calls([call(build, file), call(build, file)])
+        urls.assert_called_once_with(build, file)
         download.assert_called_once_with(url, session)
-        xml.from_string.assert_called_once_with(contents, XMLTempestTestSuite)
-        converter.to_suite.assert_called_once_with(url=url, suite=suite)
+        reader.read_suite.assert_called_once_with(stream)
+        cases.to_test.assert_called_once_with(url, case)
+
+    @patch(
+        'cibyl.sources.zuul.utils.tests.tempest.parser.get_url_to_build_file'
+    )
+    def test_filters_while_parsing(self, urls):
+        """Checks that only the accepted tests are kept from a results file
+        read as it is downloaded.
+        """
+        xml = (
+            b'<testsuite name="tempest" tests="2">'
+            b'<testcase name="test1" classname="a" time="1.0"/>'
+            b'<testcase name="test2" classname="a" time="2.0">'
+            b'<failure type="error">boom</failure>'
+            b'</testcase>'
+            b'</testsuite>'
+        )
+
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.ok = True
+        response.raw = BytesIO(xml)
+
+        build = Mock()
+        build.session.session.get.return_value = response
+
+        urls.return_value = 'url'
+
+        parser = TempestTestParser()
+
+        result = parser.parse_tests_at(
+            build, Mock(),
+            accepts=lambda test: test.result == TestResult.FAILURE
+        )
+
+        self.assertEqual(1, len(result))
+        self.assertEqual('tempest', result[0].name)
+        self.assertEqual(['test2'], [test.name for test in result[0].tests])
+        self.assertEqual('boom', result[0].tests[0].failure_reason)
+
+
+class TestXMLTempestTestCaseReader(TestCase):
+    """Tests for :class:`XMLTempestTestCaseReader`.
+    """
+
+    def test_reads_cases(self):
+        """Checks that the reader gets all the information from each test
+        case on the suite.
+        """
+        xml = (
+            '<testsuite name="suite" tests="3">'
+            '<testcase classname="class1" name="test1" time="1.5"/>'
+            '<testcase classname="class2" name="test2" time="2">'
+            '<failure type="Exception">trace</failure>'
+            '</testcase>'
+            '<testcase classname="class3" name="test3">'
+            '<skipped>reason</skipped>'
+            '</testcase>'
+            '</testsuite>'
+        )
+
+        reader = XMLTempestTestCaseReader()
+
+        result = list(reader.read_string(xml))
+
+        self.assertEqual(3, len(result))
+
+        self.assertEqual('test1', result[0].name)
+        self.assertEqual('class1', result[0].classname)
+        self.assertEqual(1.5, result[0].time)
+        self.assertIsNone(result[0].failure)
+        self.assertIsNone(result[0].skipped)
+
+        self.assertEqual('Exception', result[1].failure.type)
+        self.assertEqual('trace', result[1].failure.value)
+
+        self.assertIsNone(result[2].time)
+        self.assertEqual('reason', result[2].skipped.value)
+
+    def test_filters_cases(self):
+        """Checks that only the cases accepted by the filter are returned.
+        """
+        cases = ''.join(
+            f'<testcase classname="class" name="test{index}" time="1"/>'
+            for index in range(100)
+        )
+        xml = f'<testsuite name="suite">{cases}</testsuite>'
+
+        reader = XMLTempestTestCaseReader()
+
+        result = list(
+            reader.read_string(xml, lambda case: case.name.endswith('7'))
+        )
+
+        self.assertEqual(10, len(result))
+        self.assertTrue(all(case.name.endswith('7') for case in result))
+
+    def test_reads_suite(self):
+        """Checks that the name of the suite is read next to its cases.
+        """
+        xml = (
+            b'<testsuite name="tempest">'
+            b'<testcase name="test1" classname="a" time="1.0"/>'
+            b'<testcase name="test2" classname="a" time="2.0"/>'
+            b'</testsuite>'
+        )
+
+        reader = XMLTempestTestCaseReader()
+
+        name, cases = reader.read_suite(BytesIO(xml))
+
+        self.assertEqual('tempest', name)
+        self.assertEqual(['test1', 'test2'], [case.name for case in cases])
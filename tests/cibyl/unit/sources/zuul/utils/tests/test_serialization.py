@@ -0,0 +1,105 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+from unittest import TestCase
+
+from cibyl.sources.zuul.utils.tests.serialization import TestSuiteSerializer
+from cibyl.sources.zuul.utils.tests.tempest.types import TempestTest
+from cibyl.sources.zuul.utils.tests.types import Test, TestResult, TestSuite
+from kernel.tools.urls import URL
+
+
+class TestTestSuiteSerializer(TestCase):
+    """Tests for :class:`TestSuiteSerializer`.
+    """
+
+    def test_round_trip(self):
+        """Checks that suites come back the same after being converted into
+        JSON and back.
+        """
+        url = URL('http://localhost/tempest.xml')
+        other = URL('http://localhost/other.xml')
+
+        suites = [
+            TestSuite(
+                name='tempest',
+                url=url,
+                tests=[
+                    TempestTest(
+                        name='test_1',
+                        result=TestResult.SUCCESS,
+                        duration=1.5,
+                        url=url,
+                        class_name='tempest.Class'
+                    ),
+                    TempestTest(
+                        name='test_2',
+                        result=TestResult.FAILURE,
+                        duration=0.0,
+                        url=other,
+                        class_name='tempest.Class',
+                        failure_reason='reason'
+                    )
+                ]
+            )
+        ]
+
+        serializer = TestSuiteSerializer()
+
+        data = json.loads(json.dumps(serializer.encode(suites)))
+
+        self.assertEqual(suites, serializer.decode(data))
+
+    def test_url_of_suite_is_not_repeated(self):
+        """Checks that tests sharing the URL of their suite do not store it.
+        """
+        url = URL('http://localhost/tempest.xml')
+
+        suite = TestSuite(
+            name='tempest',
+            url=url,
+            tests=[
+                TempestTest(
+                    name='test',
+                    result=TestResult.SKIPPED,
+                    duration=0.0,
+                    url=url,
+                    class_name='tempest.Class',
+                    skip_reason='reason'
+                )
+            ]
+        )
+
+        data = TestSuiteSerializer().encode([suite])
+
+        self.assertNotIn(url, data[0][3][0])
+
+    def test_error_on_unknown_test(self):
+        """Checks that tests of unknown types cannot be converted.
+        """
+        suite = TestSuite(
+            name='suite',
+            tests=[Test('test', TestResult.SUCCESS, 0.0, 'url')]
+        )
+
+        with self.assertRaises(ValueError):
+            TestSuiteSerializer().encode([suite])
+
+    def test_error_on_unknown_suite(self):
+        """Checks that suites of unknown kinds cannot be read back.
+        """
+        with self.assertRaises(ValueError):
+            TestSuiteSerializer().decode([['unknown', 'suite', None, []]])
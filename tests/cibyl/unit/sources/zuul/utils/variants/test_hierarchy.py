@@ -17,8 +17,40 @@ from unittest import TestCase
 from unittest.mock import Mock
 
 from cibyl.sources.zuul.utils.variants.hierarchy import (
-    HierarchyBuilder, HierarchyCrawler, HierarchyCrawlerFactory, JobFinder,
-    RecursiveVariableSearch, SearchError, VariantFinder)
+    HierarchyBuilder, HierarchyCrawler, HierarchyCrawlerFactory,
+    InheritanceGraph, JobFinder, RecursiveVariableSearch,
+    RecursiveVariableSearchFactory, SearchError, VariantFinder, variant_key)
+
+
+def new_variant(job='job', parent=None, branches=('master',), host='host',
+                variables=None):
+    """Creates the mock of a variant.
+
+    :param job: Name of the job the variant belongs to.
+    :param parent: Name of the parent job of the variant.
+    :param branches: Branches the variant spans.
+    :param host: Host of the tenant the variant belongs to.
+    :param variables: Variables of the variant.
+    :return: The mock.
+    """
+    if variables is None:
+        variables = {}
+
+    variant = Mock()
+    variant.job.name = job
+    variant.job.tenant.host = host
+    variant.job.tenant.name = 'tenant'
+    variant.parent = parent
+    variant.branches = list(branches)
+    variant.variables = variables
+    variant.data = {
+        'name': job,
+        'parent': parent,
+        'branches': list(branches),
+        'variables': variables
+    }
+
+    return variant
 
 
 class TestJobFinder(TestCase):
@@ -84,6 +116,73 @@ class TestJobFinder(TestCase):
             finder.find(job.name).within(tenant)
 
 
+class TestInheritanceGraph(TestCase):
+    """Tests for :class:`InheritanceGraph`.
+    """
+
+    def test_parent_is_resolved_once(self):
+        """Checks that variants sharing a parent only make it be searched
+        for once.
+        """
+        tenant = Mock()
+
+        parent = Mock()
+        parent.branches = ['master']
+
+        job = Mock()
+        job.variants.return_value.get.return_value = [parent]
+
+        jobs = Mock()
+        jobs.find.return_value.within.return_value = job
+
+        variant1 = Mock()
+        variant1.parent = 'parent'
+        variant1.branches = ['master']
+
+        variant2 = Mock()
+        variant2.parent = 'parent'
+        variant2.branches = ['master']
+
+        graph = InheritanceGraph(tenant, jobs)
+
+        self.assertEqual(parent, graph.parent_of(variant1))
+        self.assertEqual(parent, graph.parent_of(variant2))
+
+        jobs.find.assert_called_once_with('parent')
+        job.variants.assert_called_once()
+
+    def test_missing_job_is_searched_once(self):
+        """Checks that a job which is not on the tenant is not searched for
+        again.
+        """
+        tenant = Mock()
+
+        jobs = Mock()
+        jobs.find.return_value.within.side_effect = SearchError
+
+        variant = Mock()
+        variant.parent = 'parent'
+        variant.branches = ['master']
+
+        graph = InheritanceGraph(tenant, jobs)
+
+        for _ in range(2):
+            with self.assertRaises(SearchError):
+                graph.parent_of(variant)
+
+        jobs.find.assert_called_once_with('parent')
+
+    def test_no_parent(self):
+        """Checks that base variants have no parent.
+        """
+        variant = Mock()
+        variant.parent = None
+
+        graph = InheritanceGraph(Mock(), Mock())
+
+        self.assertIsNone(graph.parent_of(variant))
+
+
 class TestVariantFinder(TestCase):
     """Tests for :class:`VariantFinder`.
     """
@@ -162,6 +261,28 @@ class TestVariantFinder(TestCase):
         with self.assertRaises(SearchError):
             finder.find().parent_of(variant)
 
+    def test_tenants_are_told_apart_by_host(self):
+        """Checks that tenants with the same name on different hosts do not
+        share their inheritance graph.
+        """
+        variant1 = new_variant(parent='parent', host='host1')
+        variant2 = new_variant(parent='parent', host='host2')
+
+        parent1 = new_variant(job='parent', host='host1')
+        parent2 = new_variant(job='parent', host='host2')
+
+        tools = Mock()
+        tools.jobs.find.return_value.within.side_effect = \
+            lambda tenant: Mock(**{
+                'variants.return_value.get.return_value':
+                    [parent1 if tenant.host == 'host1' else parent2]
+            })
+
+        finder = VariantFinder(tools=tools)
+
+        self.assertEqual(parent1, finder.find().parent_of(variant1))
+        self.assertEqual(parent2, finder.find().parent_of(variant2))
+
 
 class TestHierarchyCrawler(TestCase):
     """Tests for :class:`HierarchyCrawler`.
@@ -263,6 +384,17 @@ class TestHierarchyCrawlerFactory(TestCase):
 
         self.assertEqual(variant, result.variant)
 
+    def test_crawlers_share_tools(self):
+        """Checks that all crawlers from the factory share the same tools.
+        """
+        factory = HierarchyCrawlerFactory()
+
+        crawler1 = factory.from_variant(Mock())
+        crawler2 = factory.from_variant(Mock())
+
+        self.assertIs(factory.tools, crawler1.tools)
+        self.assertIs(factory.tools, crawler2.tools)
+
 
 class TestHierarchyBuilder(TestCase):
     """Tests for :class:`HierarchyBuilder`.
@@ -274,7 +406,7 @@ class TestHierarchyBuilder(TestCase):
         """
         grandparent = Mock()
         parent = Mock()
-        variant = Mock()
+        variant = new_variant()
 
         crawler = Mock()
         crawler.__iter__ = Mock()
@@ -300,6 +432,27 @@ class TestHierarchyBuilder(TestCase):
 
         tools.crawlers.from_variant.assert_called_once_with(variant)
 
+    def test_hierarchy_is_built_once(self):
+        """Checks that the hierarchy of a variant is remembered for later
+        requests.
+        """
+        parent = Mock()
+        variant = new_variant(parent='parent')
+
+        tools = Mock()
+        tools.crawlers.from_variant.return_value = [variant, parent]
+
+        builder = HierarchyBuilder(tools=tools)
+
+        # Same variant, fetched again from the host
+        for target in (variant, new_variant(parent='parent')):
+            self.assertEqual(
+                [variant, parent],
+                builder.from_variant(target).build()
+            )
+
+        tools.crawlers.from_variant.assert_called_once_with(variant)
+
 
 class TestRecursiveVariableSearch(TestCase):
     """Tests for :class:`RecursiveVariableSearch`.
@@ -310,20 +463,21 @@ class TestRecursiveVariableSearch(TestCase):
         variant's hierarchy.
         """
 
-        grandparent = Mock()
-        grandparent.variables = {
-            'var1': 'val1'
-        }
+        grandparent = new_variant(
+            job='grandparent',
+            variables={'var1': 'val1'}
+        )
 
-        parent = Mock()
-        parent.variables = {
-            'var2': 'val2'
-        }
+        parent = new_variant(
+            job='parent',
+            parent='grandparent',
+            variables={'var2': 'val2'}
+        )
 
-        variant = Mock()
-        variant.variables = {
-            'var2': 'val3'
-        }
+        variant = new_variant(
+            parent='parent',
+            variables={'var2': 'val3'}
+        )
 
         sequence = [variant, parent, grandparent]
 
@@ -350,3 +504,82 @@ class TestRecursiveVariableSearch(TestCase):
         )
 
         hierarchy.from_variant.assert_called_once_with(variant)
+
+    def test_resolves_from_known_parent(self):
+        """Checks that the variables of a variant are built on top of the
+        already known ones of its parent.
+        """
+        parent = new_variant(job='parent')
+        variant = new_variant(parent='parent', variables={'var2': 'val2'})
+
+        hierarchy = Mock()
+        hierarchy.from_variant.return_value.build.return_value = [
+            variant, parent
+        ]
+
+        tools = Mock()
+        tools.hierarchy = hierarchy
+
+        search = RecursiveVariableSearch(
+            variant=variant,
+            tools=tools,
+            resolved={
+                variant_key(parent): {'var1': 'val1', 'var2': 'val0'}
+            }
+        )
+
+        self.assertEqual({'var1': 'val1', 'var2': 'val2'}, search.search())
+
+
+class TestRecursiveVariableSearchFactory(TestCase):
+    """Tests for :class:`RecursiveVariableSearchFactory`.
+    """
+
+    def test_variables_are_resolved_once(self):
+        """Checks that searches from the factory share the variables they
+        resolve.
+        """
+        variant = new_variant(variables={'var1': 'val1'})
+
+        tools = Mock()
+        tools.hierarchy.from_variant.return_value.build.return_value = [
+            variant
+        ]
+
+        factory = RecursiveVariableSearchFactory(tools)
+
+        for _ in range(2):
+            self.assertEqual(
+                {'var1': 'val1'},
+                factory.from_variant(variant).search()
+            )
+
+        tools.hierarchy.from_variant.assert_called_once_with(variant)
+
+    def test_sibling_variants_are_told_apart(self):
+        """Checks that variants of a job with the same parent and branches,
+        but different variables, do not share what is resolved for them.
+        """
+        variant1 = new_variant(parent='base', variables={'release': '17.0'})
+        variant2 = new_variant(parent='base', variables={'release': '16.2'})
+
+        factory = RecursiveVariableSearchFactory(
+            RecursiveVariableSearch.Tools(
+                hierarchy=HierarchyBuilder(
+                    HierarchyBuilder.Tools(
+                        crawlers=Mock(
+                            **{'from_variant.side_effect': lambda v: [v]}
+                        )
+                    )
+                )
+            )
+        )
+
+        self.assertEqual(
+            {'release': '17.0'},
+            factory.from_variant(variant1).search()
+        )
+        self.assertEqual(
+            {'release': '16.2'},
+            factory.from_variant(variant2).search()
+        )
@@ -13,8 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+from threading import Event, Thread
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
 from cibyl.sources.zuuld.backends.aggr import AggregatedBackend
 from cibyl.sources.zuuld.errors import ZuulDError
@@ -108,3 +109,153 @@ class TestGet(TestCase):
 
         backend1.jobs.assert_called_once_with(spec)
         backend2.jobs.assert_called_once_with(spec)
+
+
+class TestGetRace(TestCase):
+    """Tests for :class:`AggregatedBackend.Get` when racing its backends.
+    """
+
+    def setUp(self):
+        self.release = Event()
+
+    def tearDown(self):
+        # Let the backends that are still waiting finish
+        self.release.set()
+
+    def _slow(self, result):
+        def jobs(*_):
+            self.release.wait(timeout=5)
+            return result
+
+        return jobs
+
+    def test_gets_from_fastest_backend_on_jobs(self):
+        """Checks that the result from the first backend to answer is
+        returned, no matter its position.
+        """
+        spec = Mock()
+
+        backend1 = Mock()
+        backend1.jobs.side_effect = self._slow(['job1'])
+        backend2 = Mock()
+        backend2.jobs.return_value = ['job2']
+
+        get = AggregatedBackend.Get(
+            backends=[
+                backend1,
+                backend2
+            ],
+            race=True
+        )
+
+        self.assertEqual(['job2'], get.jobs(spec))
+
+        backend1.jobs.assert_called_once_with(spec)
+        backend2.jobs.assert_called_once_with(spec)
+
+    def test_skips_failed_backend_on_jobs(self):
+        """Checks that a backend that fails first does not stop the others
+        from answering.
+        """
+        spec = Mock()
+
+        backend1 = Mock()
+        backend1.jobs.side_effect = ZuulDError
+        backend2 = Mock()
+        backend2.jobs.return_value = ['job2']
+
+        get = AggregatedBackend.Get(
+            backends=[
+                backend1,
+                backend2
+            ],
+            race=True
+        )
+
+        self.assertEqual(['job2'], get.jobs(spec))
+
+    def test_error_if_all_fail_on_jobs(self):
+        """Checks that if all backends fail while getting the jobs, an error
+        is raised.
+        """
+        spec = Mock()
+
+        backend1 = Mock()
+        backend1.jobs.side_effect = ZuulDError
+        backend2 = Mock()
+        backend2.jobs.side_effect = ZuulDError
+
+        get = AggregatedBackend.Get(
+            backends=[
+                backend1,
+                backend2
+            ],
+            race=True
+        )
+
+        with self.assertRaises(ZuulDError):
+            get.jobs(spec)
+
+    def test_error_on_timeout(self):
+        """Checks that an error is raised if no backend answers in time.
+        """
+        spec = Mock()
+
+        backend = Mock()
+        backend.jobs.side_effect = self._slow(['job'])
+
+        get = AggregatedBackend.Get(
+            backends=[
+                backend
+            ],
+            race=True,
+            timeout=0.05
+        )
+
+        with self.assertRaises(ZuulDError):
+            get.jobs(spec)
+
+    def test_backends_are_left_behind(self):
+        """Checks that backends are asked from daemon threads, so that those
+        still working once time is up do not keep the process alive.
+        """
+        spec = Mock()
+
+        backend = Mock()
+        backend.jobs.side_effect = self._slow(['job'])
+
+        get = AggregatedBackend.Get(
+            backends=[
+                backend
+            ],
+            race=True,
+            timeout=0.05
+        )
+
+        with patch(
+            'cibyl.sources.zuuld.backends.aggr.Thread',
+            wraps=Thread
+        ) as threads:
+            with self.assertRaises(ZuulDError):
+                get.jobs(spec)
+
+        self.assertTrue(threads.call_args.kwargs['daemon'])
+
+    def test_unexpected_errors_are_raised(self):
+        """Checks that errors other than those of the backends reach the
+        caller.
+        """
+        spec = Mock()
+
+        backend = Mock()
+        backend.jobs.side_effect = KeyError
+
+        get = AggregatedBackend.Get(
+            backends=[
+                backend
+            ],
+            race=True
+        )
+
+        with self.assertRaises(KeyError):
+            get.jobs(spec)
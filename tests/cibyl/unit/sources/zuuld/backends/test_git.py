@@ -13,10 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 from cibyl.sources.zuuld.backends.git import GitBackend
+from cibyl.sources.zuuld.models.job import Job
+from kernel.scm.git.apis.cli import GitError
+from kernel.tools.fs import Dir, File
 
 
 class TestGitBackend(TestCase):
@@ -29,10 +34,12 @@ class TestGitBackend(TestCase):
         spec.directory = Mock()
 
         directory = Mock()
-        expected = [Mock(), Mock()]
+        expected = [Job('job1'), Job('job2', parent='job1')]
 
         repo = Mock()
-        repo.workspace = Mock()
+        repo.head = 'sha'
+        repo.workspace = MagicMock()
+        repo.workspace.__fspath__.return_value = '/repo'
         repo.workspace.cd = Mock()
         repo.workspace.cd.return_value = directory
 
@@ -43,6 +50,7 @@ class TestGitBackend(TestCase):
         files = Mock()
         files.search = Mock()
         files.search.return_value = [Mock()]
+        files.search.return_value[0].file = '/repo/zuul.d/jobs.yaml'
 
         reader = Mock()
         reader.jobs = Mock()
@@ -56,6 +64,7 @@ class TestGitBackend(TestCase):
         tools.repositories = repositories
         tools.files = files
         tools.readers = readers
+        tools.index = {}
 
         git = GitBackend.Get(
             tools=tools
@@ -72,3 +81,145 @@ class TestGitBackend(TestCase):
         readers.from_file.assert_called_with(files.search.return_value[0])
 
         reader.jobs.assert_called()
+
+
+class TestGitBackendIndex(TestCase):
+    """Tests for the index of jobs of :class:`GitBackend`.
+    """
+
+    def setUp(self):
+        self.workspace = TemporaryDirectory()
+
+        os.mkdir(os.path.join(self.workspace.name, 'zuul.d'))
+
+        self.spec = Mock()
+        self.spec.remote = 'remote'
+        self.spec.directory = 'zuul.d/'
+
+        self.repo = Mock()
+        self.repo.head = 'sha1'
+        self.repo.workspace = Dir(self.workspace.name)
+
+        self.tools = GitBackend.Get.Tools(
+            repositories=Mock(),
+            files=Mock(),
+            readers=Mock()
+        )
+        self.tools.repositories.from_remote.return_value = self.repo
+        self.tools.files.check.side_effect = self._as_zuuld
+        self.tools.readers.from_file.side_effect = self._reader
+
+        self.contents = {}
+
+    def tearDown(self):
+        self.workspace.cleanup()
+
+    def _write(self, name, jobs):
+        path = os.path.join(self.workspace.name, 'zuul.d', name)
+
+        with open(path, 'w', encoding='utf-8') as buffer:
+            buffer.write('')
+
+        self.contents[path] = jobs
+
+        return path
+
+    def _as_zuuld(self, file):
+        zuuld = Mock()
+        zuuld.file = file
+        return zuuld
+
+    def _reader(self, file):
+        reader = Mock()
+        reader.jobs.return_value = [
+            Job(name) for name in self.contents[file.file]
+        ]
+        return reader
+
+    def test_jobs_are_reused_on_same_commit(self):
+        """Checks that files are not read again if the repository is at the
+        same commit as last time.
+        """
+        path = self._write('jobs.yaml', ['job'])
+
+        self.tools.files.search.return_value = [self._as_zuuld(path)]
+
+        git = GitBackend.Get(tools=self.tools)
+
+        self.assertEqual([Job('job')], git.jobs(self.spec))
+        self.assertEqual([Job('job')], git.jobs(self.spec))
+
+        self.tools.files.search.assert_called_once()
+        self.tools.readers.from_file.assert_called_once()
+        self.repo.changed_files.assert_not_called()
+
+    def test_only_changed_files_are_read(self):
+        """Checks that on a new commit, only the files that changed are read
+        again.
+        """
+        unchanged = self._write('unchanged.yaml', ['job1'])
+        changed = self._write('changed.yaml', ['job2'])
+        removed = self._write('removed.yaml', ['job3'])
+
+        self.tools.files.search.return_value = [
+            self._as_zuuld(path) for path in (unchanged, changed, removed)
+        ]
+
+        git = GitBackend.Get(tools=self.tools)
+        git.jobs(self.spec)
+
+        self.tools.readers.from_file.reset_mock()
+
+        File(removed).as_path().unlink()
+        self._write('changed.yaml', ['job4'])
+        self._write('added.yaml', ['job5'])
+
+        self.repo.head = 'sha2'
+        self.repo.changed_files.return_value = [
+            'zuul.d/changed.yaml',
+            'zuul.d/removed.yaml',
+            'zuul.d/added.yaml',
+            'README.md'
+        ]
+
+        self.assertEqual(
+            [Job('job1'), Job('job4'), Job('job5')],
+            git.jobs(self.spec)
+        )
+
+        self.tools.files.search.assert_called_once()
+        self.repo.changed_files.assert_called_once_with('sha1')
+        self.assertEqual(2, self.tools.readers.from_file.call_count)
+        self.assertEqual('sha2', self.tools.index['remote#zuul.d/']['commit'])
+
+    def test_everything_is_read_if_commit_is_unknown(self):
+        """Checks that all files are read again if the new commit cannot be
+        compared against the old one.
+        """
+        path = self._write('jobs.yaml', ['job'])
+
+        self.tools.files.search.return_value = [self._as_zuuld(path)]
+
+        git = GitBackend.Get(tools=self.tools)
+        git.jobs(self.spec)
+
+        self.repo.head = 'sha2'
+        self.repo.changed_files.side_effect = GitError
+
+        self.assertEqual([Job('job')], git.jobs(self.spec))
+
+        self.assertEqual(2, self.tools.files.search.call_count)
+
+    def test_returned_jobs_do_not_alter_index(self):
+        """Checks that changes on the returned jobs are not seen on later
+        queries.
+        """
+        path = self._write('jobs.yaml', ['job'])
+
+        self.tools.files.search.return_value = [self._as_zuuld(path)]
+
+        git = GitBackend.Get(tools=self.tools)
+
+        git.jobs(self.spec)[0].vars['var'] = 'value'
+
+        self.assertEqual({}, git.jobs(self.spec)[0].vars)
@@ -13,9 +13,84 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+from threading import Barrier
 from unittest import TestCase
+from unittest.mock import Mock
 
-from cibyl.sources.zuuld.frontends.zuul import GitFrontendFactory
+from cibyl.sources.zuuld.backends.aggr import AggregatedBackend
+from cibyl.sources.zuuld.backends.git import GitBackend
+from cibyl.sources.zuuld.frontends.zuul import (GitFrontendFactory, Session,
+                                                _Tenant)
+from cibyl.sources.zuuld.models.job import Job
+
+
+class TestTenant(TestCase):
+    """Tests for :class:`_Tenant`.
+    """
+
+    def test_specs_are_read_concurrently(self):
+        """Checks that the jobs of all specs are fetched at the same time and
+        returned in the order of the specs.
+        """
+        specs = ['spec1', 'spec2', 'spec3']
+
+        # Fails if not all specs are being read at the same time
+        barrier = Barrier(len(specs), timeout=5)
+
+        def jobs(spec):
+            barrier.wait()
+            return [Job(f'{spec}-job1'), Job(f'{spec}-job2')]
+
+        backend = Mock()
+        backend.get.jobs.side_effect = jobs
+
+        tenant = _Tenant(
+            session=Session(
+                specs=specs,
+                backend=backend,
+                max_concurrent_specs=len(specs)
+            ),
+            data={
+                'name': 'tenant'
+            }
+        )
+
+        result = tenant.jobs()
+
+        self.assertEqual(
+            [
+                'spec1-job1', 'spec1-job2',
+                'spec2-job1', 'spec2-job2',
+                'spec3-job1', 'spec3-job2'
+            ],
+            [job.name for job in result]
+        )
+        self.assertEqual(
+            ['spec1', 'spec1', 'spec2', 'spec2', 'spec3', 'spec3'],
+            [job.spec for job in result]
+        )
+
+    def test_specs_are_read_once(self):
+        """Checks that a spec is not read again when its jobs are needed
+        once more.
+        """
+        backend = Mock()
+        backend.get.jobs.return_value = [Job('job')]
+
+        tenant = _Tenant(
+            session=Session(
+                specs=['spec'],
+                backend=backend
+            ),
+            data={
+                'name': 'tenant'
+            }
+        )
+
+        job = tenant.jobs()[0]
+        job.variants()
+
+        backend.get.jobs.assert_called_once_with('spec')
 
 
 class TestGitFrontendFactory(TestCase):
@@ -28,3 +103,37 @@ class TestGitFrontendFactory(TestCase):
         """
         with self.assertRaises(ValueError):
             GitFrontendFactory.from_kwargs()
+
+    def test_max_concurrent_specs_from_kwargs(self):
+        """Checks that the number of specs read at the same time is taken
+        from kwargs.
+        """
+        factory = GitFrontendFactory.from_kwargs(
+            repos=[],
+            max_concurrent_specs=2
+        )
+
+        self.assertEqual(2, factory.new().session.max_concurrent_specs)
+
+    def test_read_timeout_from_kwargs(self):
+        """Checks that a timeout on kwargs has the backend give up on specs
+        that take too long to read.
+        """
+        factory = GitFrontendFactory.from_kwargs(
+            repos=[],
+            read_timeout=30
+        )
+
+        backend = factory.backend
+
+        self.assertIsInstance(backend, AggregatedBackend)
+        self.assertTrue(backend.get.race)
+        self.assertEqual(30, backend.get.timeout)
+
+    def test_no_read_timeout_by_default(self):
+        """Checks that specs are read with no time limit if no timeout is
+        given.
+        """
+        factory = GitFrontendFactory.from_kwargs(repos=[])
+
+        self.assertIsInstance(factory.backend, GitBackend)
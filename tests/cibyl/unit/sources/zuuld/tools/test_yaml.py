@@ -13,11 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock, call
+from unittest.mock import MagicMock, Mock, call, patch
 
 from cibyl.sources.zuuld.models.job import Job
-from cibyl.sources.zuuld.tools.yaml import YAMLReader, YAMLSearch, ZuulDFile
+from cibyl.sources.zuuld.tools.yaml import (YAMLReader, YAMLSearch, ZuulDFile,
+                                            ZuulDFileFactory)
+from kernel.tools.fs import File
+from kernel.tools.json import Draft7Validator, SchemaError
 from kernel.tools.net import DownloadError
 
 
@@ -74,6 +80,140 @@ class TestZuulDFile(TestCase):
 
         validators.from_remote.assert_called_once_with(ZuulDFile.SCHEMA)
 
+    def test_given_data_is_trusted(self):
+        """Checks that if the contents of the file are given, no schema is
+        downloaded to check them.
+        """
+        data = [{'job': {'name': 'job'}}]
+
+        file = Mock()
+
+        tools = Mock()
+
+        zuuld = ZuulDFile(
+            file=file,
+            tools=tools,
+            data=data
+        )
+
+        self.assertEqual(data, zuuld.data)
+        self.assertIsNone(zuuld.validator)
+
+        tools.validators.from_remote.assert_not_called()
+        file.read.assert_not_called()
+
+
+class TestZuulDFileFactory(TestCase):
+    """Tests for :class:`ZuulDFileFactory`.
+    """
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+
+        with open(path, 'w', encoding='utf-8') as buffer:
+            buffer.write(text)
+
+        return File(path)
+
+    def test_from_files_on_pool(self):
+        """Checks that files are parsed and checked on a pool of processes,
+        keeping their order and leaving out those that are not valid.
+        """
+        files = [
+            self._write('file1.yaml', '- job:\n    name: job1\n'),
+            self._write('file2.yaml', 'key: value\n'),
+            self._write('file3.yaml', 'key: [value\n'),
+            self._write('file4.yaml', '- job:\n    name: job2\n')
+        ]
+
+        validators = Mock()
+        validators.from_remote.return_value = Draft7Validator(
+            {'type': 'array'}
+        )
+
+        factory = ZuulDFileFactory(
+            tools=ZuulDFileFactory.Tools(
+                validators=validators
+            )
+        )
+
+        result = factory.from_files(files, workers=2)
+
+        self.assertEqual(4, len(result))
+        self.assertIsNone(result[1])
+        self.assertIsNone(result[2])
+
+        self.assertEqual(files[0], result[0].file)
+        self.assertEqual([{'job': {'name': 'job1'}}], result[0].data)
+        self.assertEqual(files[3], result[3].file)
+        self.assertEqual([{'job': {'name': 'job2'}}], result[3].data)
+
+        validators.from_remote.assert_called_once_with(ZuulDFile.SCHEMA)
+
+    def test_from_files_without_schema(self):
+        """Checks that files are not validated on the pool if the schema
+        could not be downloaded.
+        """
+        files = [
+            self._write('file1.yaml', 'key: value\n'),
+            self._write('file2.yaml', 'key: [value\n')
+        ]
+
+        validators = Mock()
+        validators.from_remote.side_effect = DownloadError
+
+        factory = ZuulDFileFactory(
+            tools=ZuulDFileFactory.Tools(
+                validators=validators
+            )
+        )
+
+        result = factory.from_files(files, workers=2)
+
+        self.assertEqual({'key': 'value'}, result[0].data)
+        self.assertIsNone(result[1])
+
+    def test_pool_is_reused(self):
+        """Checks that the pool of processes, and the validator it is
+        prepared with, are reused from one call to the next.
+        """
+        files = [
+            self._write('file1.yaml', '- job:\n    name: job1\n'),
+            self._write('file2.yaml', '- job:\n    name: job2\n')
+        ]
+
+        validators = Mock()
+        validators.from_remote.return_value = Draft7Validator(
+            {'type': 'array'}
+        )
+
+        factory = ZuulDFileFactory(
+            tools=ZuulDFileFactory.Tools(
+                validators=validators
+            )
+        )
+
+        with patch(
+            'cibyl.sources.zuuld.tools.yaml.ProcessPoolExecutor',
+            wraps=ProcessPoolExecutor
+        ) as pools:
+            for _ in range(2):
+                result = factory.from_files(files, workers=2)
+
+                self.assertEqual(
+                    [{'job': {'name': 'job2'}}],
+                    result[1].data
+                )
+
+        pools.assert_called_once()
+        validators.from_remote.assert_called_once_with(ZuulDFile.SCHEMA)
+
 
 class TestYAMLReader(TestCase):
     """Tests for :class:`YAMLReader`.
@@ -246,3 +386,69 @@ class TestYAMLSearch(TestCase):
         result = yaml.search(path=root)
 
         self.assertEqual([file1, file2], result)
+
+    def test_check_ignores_other_extensions(self):
+        """Checks that files without a known extension are not read when
+        checked on their own.
+        """
+        tools = Mock()
+
+        yaml = YAMLSearch(
+            tools=tools
+        )
+
+        self.assertIsNone(yaml.check('file.txt'))
+
+        tools.files.from_file.assert_not_called()
+
+    def test_check_ignores_invalid_files(self):
+        """Checks that files that do not follow the Zuul.D schema are
+        ignored when checked on their own.
+        """
+        tools = Mock()
+        tools.files.from_file.side_effect = SchemaError('error')
+
+        yaml = YAMLSearch(
+            tools=tools
+        )
+
+        self.assertIsNone(yaml.check('file.yaml'))
+
+    def test_check_returns_file(self):
+        """Checks that a valid file is returned when checked on its own.
+        """
+        file = 'file.yaml'
+
+        tools = Mock()
+        tools.files.from_file.side_effect = lambda file, **_: file
+
+        yaml = YAMLSearch(
+            tools=tools
+        )
+
+        self.assertEqual(file, yaml.check(file))
+
+    def test_search_on_pool(self):
+        """Checks that the found files are handed to a pool of processes if
+        more than one worker is requested.
+        """
+        root = Mock()
+
+        search = Mock()
+        search.get.return_value = ['file1.yml', 'file2.txt', 'file3.yaml']
+
+        tools = Mock()
+        tools.searches.from_root.return_value = search
+        tools.files.from_files.return_value = ['file1.yml', None]
+
+        yaml = YAMLSearch(
+            tools=tools,
+            workers=4
+        )
+
+        self.assertEqual(['file1.yml'], yaml.search(path=root))
+
+        tools.files.from_files.assert_called_once_with(
+            ['file1.yml', 'file3.yaml'], 4
+        )
+        tools.files.from_file.assert_not_called()
@@ -256,6 +256,30 @@ class TestOrchestrator(TestOrchestratorSetup):
         for source in sources:
             self.assertFalse(source.enabled)
 
+    def test_run_tests_stats(self):
+        """Test that tests are summarized by the first enabled source with
+        an index of test runs, over the builds asked for."""
+        plain = Mock(spec=['enabled', 'name'])
+        plain.enabled = True
+        disabled = Mock(enabled=False, tests_index='tests')
+        summarizing = Mock(enabled=True, tests_index='tests')
+        summarizing.get_tests_stats.return_value = ['stats']
+
+        system = Mock()
+        system.is_enabled.return_value = True
+        system.sources = [plain, disabled, summarizing]
+
+        self.orchestrator.parser.app_args = {'history_builds': 5}
+        self.orchestrator.parser.ci_args = {'jobs': 'jobs-arg'}
+
+        self.assertEqual(['stats'],
+                         self.orchestrator.run_tests_stats(system))
+        disabled.get_tests_stats.assert_not_called()
+        summarizing.ensure_source_setup.assert_called_once()
+        summarizing.get_tests_stats.assert_called_once_with(
+            last_builds=5, jobs='jobs-arg'
+        )
+
 
 class TestOrchestratorArgumentsFiltering(TestOrchestratorSetup):
     """Test the sort_and_filter_args method of the orchestrator."""
@@ -20,8 +20,11 @@ from unittest.mock import Mock, patch
 from cibyl.cli.output import OutputStyle
 from cibyl.cli.query import QueryType
 from cibyl.models.ci.base.environment import Environment
+from cibyl.models.ci.base.job import Job
+from cibyl.models.ci.base.system import JobsSystem
 from cibyl.publisher import (JSONPublisher, PrintPublisher, PublisherFactory,
-                             PublisherTarget)
+                             PublisherTarget, TestHistoryPublisher)
+from cibyl.utils.history import TestStats
 
 
 class TestPrintPublisher(TestCase):
@@ -101,6 +104,69 @@ class TestJSONPublisher(TestCase):
         mock_print.assert_called_once_with(expected)
 
 
+@patch('builtins.print')
+class TestTestHistoryPublisher(TestCase):
+    """Testing test history publisher component"""
+
+    def test_publish_multiple_environments_print(self, mock_print):
+        """Testing that the history of all environments is printed once all
+        of them are published"""
+        publisher = TestHistoryPublisher(min_failure_rate=10)
+        publisher.history = Mock()
+
+        system1 = JobsSystem('system1', 'jenkins')
+        system2 = JobsSystem('system2', 'jenkins')
+        environment1 = Environment('env1')
+        environment1.systems.append(system1)
+        environment2 = Environment('env2')
+        environment2.systems.append(system2)
+
+        with patch('cibyl.publisher.print_test_history') as print_history:
+            print_history.return_value = 'output-text'
+
+            publisher.publish(environment=environment1)
+            publisher.publish(environment=environment2)
+
+            mock_print.assert_not_called()
+
+            publisher.finish_publishing()
+
+        self.assertEqual(
+            [system1, system2],
+            [
+                call.args[0]
+                for call in publisher.history.add_system.call_args_list
+            ]
+        )
+        print_history.assert_called_once_with(publisher.history, verbosity=0,
+                                              min_failure_rate=0.1)
+        mock_print.assert_called_once_with('output-text')
+
+    def test_summarized_systems_are_not_added_again(self, _):
+        """Testing that the tests of a system summarized by its source are
+        not recorded a second time when its environment is published"""
+        publisher = TestHistoryPublisher(last_builds=3)
+
+        summarized = JobsSystem('summarized', 'elasticsearch')
+        summarized.add_job(Job('job'))
+        other = JobsSystem('other', 'jenkins')
+        environment = Environment('env')
+        environment.systems.append(summarized)
+        environment.systems.append(other)
+
+        stats = TestStats(job='job', name='test', runs=1, failures=0,
+                          skips=0, flips=None, durations={})
+
+        publisher.add_tests_stats(summarized, [stats])
+        publisher.add_tests_stats(other, [])
+
+        with patch.object(publisher.history, 'add_system') as add_system:
+            publisher.publish(environment=environment)
+
+        add_system.assert_called_once_with(other)
+        self.assertEqual([stats], publisher.history.summaries)
+
+
 class TestPublisherFactory(TestCase):
     """Testing PublisherFactory component"""
 
@@ -138,3 +204,12 @@ class TestPublisherFactory(TestCase):
         self.assertEqual(publisher.query, QueryType.NONE)
         self.assertEqual(publisher.verbosity, 0)
         self.assertIsNone(publisher.output_file)
+
+    def test_test_history_style(self):
+        """Test the creation of a Publisher for the test history output."""
+
+        publisher = PublisherFactory.create_publisher(
+                style=OutputStyle.TEST_HISTORY)
+        self.assertIsInstance(publisher, TestHistoryPublisher)
+        self.assertEqual(publisher.style, OutputStyle.TEST_HISTORY)
+        self.assertIsNone(publisher.printer)
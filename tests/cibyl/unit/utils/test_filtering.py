@@ -17,7 +17,7 @@ import re
 from unittest import TestCase
 
 from cibyl.utils.filtering import (TOPOLOGY_PATTERN, apply_filters,
-                                   matches_regex)
+                                   iter_filters, matches_regex)
 
 
 def match_topology_pattern(string):
@@ -65,6 +65,28 @@ class TestApplyFilters(TestCase):
         self.assertEqual([5], apply_filters(data, *filters))
 
 
+class TestIterFilters(TestCase):
+    """Tests for :func:`iter_filters`.
+    """
+
+    def test_filters_are_applied_lazily(self):
+        """Checks that the input filters are applied to the data only as it
+        is consumed.
+        """
+        consumed = []
+
+        def data():
+            for number in range(10):
+                consumed.append(number)
+                yield number
+
+        result = iter_filters(data(), lambda number: number % 2 == 1)
+
+        self.assertEqual(1, next(result))
+        self.assertEqual([0, 1], consumed)
+        self.assertEqual([3, 5, 7, 9], list(result))
+
+
 class TestRegexPatterns(TestCase):
     """Test some regex patterns defined in filtering.py"""
 
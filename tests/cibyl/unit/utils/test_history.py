@@ -0,0 +1,300 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from unittest import TestCase
+
+from cibyl.models.ci.base.build import Build
+from cibyl.models.ci.base.environment import Environment
+from cibyl.models.ci.base.job import Job
+from cibyl.models.ci.base.system import JobsSystem
+from cibyl.models.ci.base.test import Test
+from cibyl.models.ci.zuul.build import Build as ZuulBuild
+from cibyl.models.ci.zuul.job import Job as ZuulJob
+from cibyl.models.ci.zuul.system import ZuulSystem
+from cibyl.models.ci.zuul.tenant import Tenant
+from cibyl.models.ci.zuul.test import Test as ZuulTest
+from cibyl.models.ci.zuul.test import TestStatus
+from cibyl.models.ci.zuul.test_suite import TestSuite
+from cibyl.utils.history import TestHistory, TestOutcome, TestStats
+
+
+class TestTestOutcome(TestCase):
+    """Tests for :class:`TestOutcome`.
+    """
+
+    def test_from_result(self):
+        """Checks that the results of all sources are understood.
+        """
+        self.assertEqual(
+            TestOutcome.SUCCESS, TestOutcome.from_result('PASSED')
+        )
+        self.assertEqual(TestOutcome.SUCCESS, TestOutcome.from_result('fixed'))
+        self.assertEqual(
+            TestOutcome.FAILURE, TestOutcome.from_result('REGRESSION')
+        )
+        self.assertEqual(
+            TestOutcome.SKIPPED, TestOutcome.from_result('SKIPPED')
+        )
+        self.assertEqual(TestOutcome.UNKNOWN, TestOutcome.from_result(None))
+
+
+class TestTestHistory(TestCase):
+    """Tests for :class:`TestHistory`.
+    """
+
+    def test_stats(self):
+        """Checks the statistics calculated for each test.
+        """
+        history = TestHistory()
+
+        outcomes = [
+            TestOutcome.SUCCESS,
+            TestOutcome.FAILURE,
+            TestOutcome.SKIPPED,
+            TestOutcome.SUCCESS,
+            TestOutcome.SUCCESS
+        ]
+
+        for build, outcome in enumerate(outcomes):
+            history.add('job', str(build), 'test1', outcome, float(build + 1))
+            history.add('job', str(build), 'test2', TestOutcome.SUCCESS)
+
+        self.assertEqual(10, len(history))
+        self.assertEqual(5, history.builds)
+
+        test1, test2 = history.stats(percentiles=(0, 50, 90, 100))
+
+        self.assertEqual(('job', 'test1'), (test1.job, test1.name))
+        self.assertEqual(5, test1.runs)
+        self.assertEqual(1, test1.failures)
+        self.assertEqual(1, test1.skips)
+        self.assertEqual(2, test1.flips)
+        self.assertEqual(0.25, test1.failure_rate)
+        self.assertEqual(
+            {0: 1.0, 50: 3.0, 90: 4.6, 100: 5.0},
+            {key: round(value, 6) for key, value in test1.durations.items()}
+        )
+
+        self.assertEqual(('job', 'test2'), (test2.job, test2.name))
+        self.assertEqual(0, test2.flips)
+        self.assertEqual(0.0, test2.failure_rate)
+        self.assertEqual({}, test2.durations)
+
+    def test_flips_follow_order_of_builds(self):
+        """Checks that runs are ordered by build, no matter the order in
+        which they were added.
+        """
+        history = TestHistory()
+
+        history.add('job', '1', 'other', TestOutcome.SUCCESS)
+        history.add('job', '2', 'other', TestOutcome.SUCCESS)
+        history.add('job', '2', 'test', TestOutcome.SUCCESS)
+        history.add('job', '1', 'test', TestOutcome.FAILURE)
+        history.add('job', '3', 'test', TestOutcome.FAILURE)
+
+        stats = {stats.name: stats for stats in history.stats()}
+
+        self.assertEqual(2, stats['test'].flips)
+
+    def test_tests_are_separated_by_job(self):
+        """Checks that tests with the same name on different jobs are not
+        mixed up.
+        """
+        history = TestHistory()
+
+        history.add('job1', '1', 'test', TestOutcome.FAILURE)
+        history.add('job2', '1', 'test', TestOutcome.SUCCESS)
+
+        self.assertEqual(
+            [('job1', 1.0), ('job2', 0.0)],
+            [(stats.job, stats.failure_rate) for stats in history.stats()]
+        )
+        self.assertEqual(2, history.builds)
+
+    def test_flaky_and_slowest(self):
+        """Checks the queries for flaky and slow tests.
+        """
+        history = TestHistory()
+
+        for build in range(4):
+            history.add(
+                'job', str(build), 'stable', TestOutcome.SUCCESS, 10.0
+            )
+            history.add(
+                'job', str(build), 'flaky',
+                TestOutcome.FAILURE if build % 2 else TestOutcome.SUCCESS,
+                1.0
+            )
+            history.add(
+                'job', str(build), 'broken', TestOutcome.FAILURE, 5.0
+            )
+
+        self.assertEqual(
+            ['flaky'],
+            [stats.name for stats in history.flaky()]
+        )
+        self.assertEqual(
+            ['broken', 'flaky'],
+            sorted(
+                stats.name
+                for stats in history.flaky(min_failure_rate=0.5, min_flips=0)
+            )
+        )
+        self.assertEqual(
+            ['stable', 'broken'],
+            [stats.name for stats in history.slowest(count=2)]
+        )
+
+    def test_last_builds(self):
+        """Checks that only the most recent builds of each job are taken
+        into account when asked to.
+        """
+        history = TestHistory(last_builds=2)
+
+        for build, outcome in enumerate(
+                [TestOutcome.FAILURE, TestOutcome.SUCCESS,
+                 TestOutcome.SUCCESS]):
+            history.add('job1', str(build), 'test', outcome)
+
+        history.add('job2', '1', 'test', TestOutcome.FAILURE)
+
+        job1, job2 = history.stats()
+
+        self.assertEqual(3, history.builds)
+        self.assertEqual(2, job1.runs)
+        self.assertEqual(0, job1.failures)
+        self.assertEqual(1, job2.runs)
+
+    def test_add_stats(self):
+        """Checks that statistics calculated by a source are reported along
+        the rest, and that those with unknown flips are flaky when they
+        only fail some times.
+        """
+        history = TestHistory()
+        history.add('job', '1', 'local', TestOutcome.SUCCESS, 1.0)
+        history.add_stats(
+            [
+                TestStats(job='job', name='remote', runs=4, failures=1,
+                          skips=0, flips=None, durations={50: 2.0, 90: 5.0},
+                          class_name='class'),
+                TestStats(job='job', name='broken', runs=2, failures=2,
+                          skips=0, flips=None, durations={})
+            ]
+        )
+
+        self.assertEqual(
+            ['local', 'remote', 'broken'],
+            [stats.name for stats in history.stats()]
+        )
+        self.assertEqual(['remote'],
+                         [stats.name for stats in history.flaky()])
+        self.assertEqual(
+            {90: 5.0}, history.stats(percentiles=(90,))[1].durations
+        )
+        self.assertEqual(['remote', 'local'],
+                         [stats.name for stats in history.slowest()])
+
+    def test_failure_rate_ignores_skips(self):
+        """Checks that skipped runs do not count towards the failure rate.
+        """
+        stats = TestStats(job='job', name='test', runs=4, failures=1,
+                          skips=2, flips=None, durations={})
+
+        self.assertEqual(0.5, stats.failure_rate)
+
+    def test_add_jobs_system(self):
+        """Checks that the tests on a system with jobs are recorded, with
+        their durations in seconds.
+        """
+        job = Job('job')
+        job.add_build(
+            Build(
+                '2', tests={'test': Test('test', 'FAILED', duration=2000)}
+            )
+        )
+        job.add_build(
+            Build(
+                '10', tests={'test': Test('test', 'PASSED', duration=4000)}
+            )
+        )
+        job.add_build(
+            Build(
+                '1', tests={'test': Test('test', 'PASSED', duration=1000)}
+            )
+        )
+
+        system = JobsSystem('system', 'jenkins')
+        system.add_job(job)
+
+        environment = Environment('env')
+        environment.systems.append(system)
+
+        history = TestHistory()
+        history.add_environment(environment)
+
+        stats, = history.stats(percentiles=(100,))
+
+        self.assertEqual(3, stats.runs)
+        self.assertEqual(2, stats.flips)
+        self.assertEqual({100: 4.0}, stats.durations)
+
+    def test_add_zuul_system(self):
+        """Checks that the tests on the suites of a Zuul system are recorded.
+        """
+        def build(uuid, start_time, status):
+            result = ZuulBuild(
+                ZuulBuild.Data(
+                    uuid, 'project', 'pipeline', 'SUCCESS',
+                    1.0, start_time, start_time
+                )
+            )
+
+            result.add_suite(
+                TestSuite(
+                    TestSuite.Data(
+                        name='suite',
+                        tests=[
+                            ZuulTest(
+                                data=ZuulTest.Data(
+                                    name='test', status=status, duration=3.0
+                                )
+                            )
+                        ]
+                    )
+                )
+            )
+
+            return result
+
+        job = ZuulJob('job', 'url')
+        job.add_build(build('b', '2022-01-02', TestStatus.FAILURE))
+        job.add_build(build('a', '2022-01-01', TestStatus.SUCCESS))
+
+        tenant = Tenant('tenant')
+        tenant.add_job(job)
+
+        system = ZuulSystem('system')
+        system.add_toplevel_model(tenant)
+
+        history = TestHistory()
+        history.add_system(system)
+
+        stats, = history.stats(percentiles=(50,))
+
+        self.assertEqual(('job', 'test'), (stats.job, stats.name))
+        self.assertEqual(2, stats.runs)
+        self.assertEqual(1, stats.failures)
+        self.assertEqual(1, stats.flips)
+        self.assertEqual({50: 3.0}, stats.durations)
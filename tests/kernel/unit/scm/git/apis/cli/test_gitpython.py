@@ -16,6 +16,9 @@
 from unittest import TestCase
 from unittest.mock import Mock
 
+from git import GitCommandError
+
+from kernel.scm.git.apis.cli import GitError
 from kernel.scm.git.apis.cli.gitpython import Repository
 
 
@@ -45,3 +48,40 @@ class TestRepository(TestCase):
         repo.close()
 
         handler.close.assert_called_once()
+
+    def test_head(self):
+        """Checks that the SHA of the current commit is returned.
+        """
+        handler = Mock()
+        handler.head.commit.hexsha = 'sha'
+
+        self.assertEqual('sha', Repository(handler).head)
+
+    def test_changed_files(self):
+        """Checks that the files changed since a commit are listed.
+        """
+        handler = Mock()
+        handler.git.diff.return_value = 'zuul.d/jobs.yaml\nREADME.md\n'
+
+        repo = Repository(handler)
+
+        self.assertEqual(
+            ['zuul.d/jobs.yaml', 'README.md'],
+            repo.changed_files('sha')
+        )
+
+        handler.git.diff.assert_called_once_with(
+            '--name-only', '--no-renames', 'sha', 'HEAD'
+        )
+
+    def test_changed_files_on_unknown_commit(self):
+        """Checks that an error is raised if the commit cannot be compared
+        against.
+        """
+        handler = Mock()
+        handler.git.diff.side_effect = GitCommandError('diff', 128)
+
+        repo = Repository(handler)
+
+        with self.assertRaises(GitError):
+            repo.changed_files('sha')
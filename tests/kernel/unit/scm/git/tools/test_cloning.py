@@ -0,0 +1,88 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest import TestCase
+from unittest.mock import Mock
+
+from kernel.scm.git.tools.cloning import RepositoryFactory
+
+
+class TestRepositoryFactory(TestCase):
+    """Tests for :class:`RepositoryFactory`.
+    """
+
+    def test_same_remote_is_cloned_once(self):
+        """Checks that concurrent requests for the same remote do not clone
+        it more than once.
+        """
+        url = 'remote'
+        repo = Mock()
+
+        workspace = Mock()
+        workspace.is_empty.return_value = True
+
+        def clone(*_):
+            workspace.is_empty.return_value = False
+            return repo
+
+        tools = Mock()
+        tools.workspaces.new_workspace.return_value = workspace
+        tools.git.clone.side_effect = clone
+        tools.git.open.return_value = repo
+
+        repositories = RepositoryFactory(tools=tools)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(repositories.from_remote, [url] * 4)
+            )
+
+        self.assertEqual([repo] * 4, results)
+
+        tools.workspaces.new_workspace.assert_called_once()
+        tools.git.clone.assert_called_once_with(url, workspace)
+        self.assertEqual(3, tools.git.open.call_count)
+
+    def test_different_remotes_are_cloned_in_parallel(self):
+        """Checks that a remote being cloned does not hold back the rest.
+        """
+        release = Event()
+
+        def clone(url, _):
+            if url == 'slow':
+                # Only gets through if the other remote got cloned meanwhile
+                self.assertTrue(release.wait(timeout=5))
+            else:
+                release.set()
+
+            return url
+
+        workspace = Mock()
+        workspace.is_empty.return_value = True
+
+        tools = Mock()
+        tools.workspaces.new_workspace.return_value = workspace
+        tools.git.clone.side_effect = clone
+
+        repositories = RepositoryFactory(tools=tools)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(
+                executor.map(repositories.from_remote, ['slow', 'fast'])
+            )
+
+        self.assertEqual(['slow', 'fast'], results)
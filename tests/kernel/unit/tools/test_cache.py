@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import time
+from threading import Event, Thread
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
-from kernel.tools.cache import CACache, CacheError, RTCache
+from kernel.tools.cache import (CACache, CacheError, RTCache, SFCache,
+                                TieredStorage)
 
 
 class TestCACache(TestCase):
@@ -180,3 +183,152 @@ class TestRTCache(TestCase):
         cache.delete(key)
 
         self.assertFalse(cache.has(key))
+
+
+class TestSFCache(TestCase):
+    """Tests for :class:`SFCache`.
+    """
+
+    def test_loads_once(self):
+        """Checks that the datastore is only reached on the first request
+        for an entry.
+        """
+        key = 0
+        value = 'test'
+
+        loader = Mock()
+        loader.return_value = value
+
+        cache = SFCache[int, str](loader=loader)
+
+        self.assertEqual(value, cache.get(key))
+        self.assertEqual(value, cache.get(key))
+
+        loader.assert_called_once_with(key)
+
+    def test_reloads_expired_entry(self):
+        """Checks that entries are loaded again once their time to live is
+        over.
+        """
+        key = 0
+
+        now = [0]
+
+        loader = Mock()
+        loader.side_effect = ['old', 'new']
+
+        cache = SFCache[int, str](
+            loader=loader,
+            ttl=10,
+            clock=lambda: now[0]
+        )
+
+        self.assertEqual('old', cache.get(key))
+
+        now[0] = 9
+
+        self.assertEqual('old', cache.get(key))
+
+        now[0] = 10
+
+        self.assertFalse(cache.has(key))
+        self.assertEqual('new', cache.get(key))
+
+    def test_single_flight(self):
+        """Checks that concurrent requests for the same entry share a
+        single load.
+        """
+        key = 0
+        value = 'test'
+
+        release = Event()
+
+        def load(_):
+            release.wait()
+            return value
+
+        loader = Mock()
+        loader.side_effect = load
+
+        cache = SFCache[int, str](loader=loader)
+
+        results = []
+
+        callers = [
+            Thread(target=lambda: results.append(cache.get(key)))
+            for _ in range(4)
+        ]
+
+        for caller in callers:
+            caller.start()
+
+        # Give all callers the time to ask for the entry
+        time.sleep(0.1)
+        release.set()
+
+        for caller in callers:
+            caller.join()
+
+        self.assertEqual([value] * 4, results)
+        loader.assert_called_once_with(key)
+
+    def test_error_shared(self):
+        """Checks that an error loading an entry reaches the caller and that
+        nothing is stored.
+        """
+        key = 0
+
+        loader = Mock()
+        loader.side_effect = IOError
+
+        cache = SFCache[int, str](loader=loader)
+
+        self.assertRaises(IOError, cache.get, key)
+        self.assertFalse(cache.has(key))
+
+    def test_evicted_entry_is_a_miss(self):
+        """Checks that an entry which goes away while being read is loaded
+        again instead of failing.
+        """
+        key = 0
+        value = 'test'
+
+        loader = Mock()
+        loader.return_value = value
+
+        storage = MagicMock()
+        storage.__contains__.return_value = True
+        storage.__getitem__.side_effect = KeyError(key)
+
+        cache = SFCache[int, str](loader=loader, storage=storage)
+
+        self.assertFalse(cache.has(key))
+        self.assertEqual(value, cache.get(key))
+
+        loader.assert_called_once_with(key)
+
+
+class TestTieredStorage(TestCase):
+    """Tests for :class:`TieredStorage`.
+    """
+
+    def test_writes_both_layers(self):
+        """Checks that entries are written to both layers.
+        """
+        storage = TieredStorage[int, str](back={})
+
+        storage[0] = 'test'
+
+        self.assertEqual('test', storage.front[0])
+        self.assertEqual('test', storage.back[0])
+
+    def test_promotes_from_back(self):
+        """Checks that entries found only on the back layer are brought to
+        the front one.
+        """
+        storage = TieredStorage[int, str](back={0: 'test'})
+
+        self.assertNotIn(0, storage.front)
+        self.assertEqual('test', storage[0])
+        self.assertEqual('test', storage.front[0])
+        self.assertEqual([0], list(storage))
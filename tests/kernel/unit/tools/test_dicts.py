@@ -20,8 +20,8 @@ from cibyl.models.ci.base.build import Build
 from cibyl.models.ci.base.job import Job
 from cibyl.models.ci.zuul.project import Project
 from cibyl.models.ci.zuul.tenant import Tenant
-from kernel.tools.dicts import (chunk_dictionary_into_lists, intersect_models,
-                                merge, nsubset, subset)
+from kernel.tools.dicts import (LRUDict, chunk_dictionary_into_lists,
+                                intersect_models, merge, nsubset, subset)
 
 
 class TestSubset(TestCase):
@@ -250,3 +250,23 @@ class TestIntersectModels(TestCase):
         build = builds_found["1"]
         self.assertEqual(build.build_id.value, "1")
         self.assertEqual(build.status.value, "SUCCESS")
+
+
+class TestLRUDict(TestCase):
+    """Tests for :class:`LRUDict`.
+    """
+
+    def test_drops_least_recently_used(self):
+        """Checks that once full, the entry used the longest time ago is the
+        one dropped.
+        """
+        dictionary = LRUDict(max_size=2)
+
+        dictionary['a'] = 1
+        dictionary['b'] = 2
+
+        self.assertEqual(1, dictionary['a'])
+
+        dictionary['c'] = 3
+
+        self.assertEqual({'a': 1, 'c': 3}, dict(dictionary))
@@ -13,10 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
-from kernel.tools.json import Draft7Validator, NullValidator, SchemaError
+from kernel.tools.fs import Dir
+from kernel.tools.json import (Draft7Validator, JSONDirectory, NullValidator,
+                               SchemaError)
 
 
 class TestNullValidator(TestCase):
@@ -97,3 +101,86 @@ class TestDraft7Validator(TestCase):
         validator = Draft7Validator(schema)
 
         self.assertTrue(validator.is_valid(data))
+
+
+class TestJSONDirectory(TestCase):
+    """Tests for :class:`JSONDirectory`.
+    """
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_values_persist(self):
+        """Checks that values can be read back by another instance on the
+        same directory.
+        """
+        key = 'https://localhost/api/tenants'
+        value = [{'name': 'tenant'}]
+
+        JSONDirectory(Dir(self.directory.name))[key] = value
+
+        storage = JSONDirectory(Dir(self.directory.name))
+
+        self.assertIn(key, storage)
+        self.assertEqual(value, storage[key])
+        self.assertEqual([key], list(storage))
+
+    def test_missing_key(self):
+        """Checks that missing keys are reported as such.
+        """
+        storage = JSONDirectory(Dir(self.directory.name))
+
+        self.assertNotIn('key', storage)
+        self.assertRaises(KeyError, storage.__getitem__, 'key')
+        self.assertRaises(KeyError, storage.__delitem__, 'key')
+
+    def test_evicts_least_recently_used(self):
+        """Checks that once the directory goes over its maximum size, the
+        entries that have gone unused the longest are removed until it is
+        back under it with some room to spare.
+        """
+        path = Dir(self.directory.name)
+
+        storage = JSONDirectory(path)
+        storage['a'] = 'value'
+
+        files = {key: storage._file_for(key) for key in ('a', 'b', 'c')}
+        size = os.path.getsize(files['a'])
+
+        storage = JSONDirectory(path, max_size=3 * size)
+        storage['b'] = 'value'
+        storage['c'] = 'value'
+
+        os.utime(files['a'], (100, 100))
+        os.utime(files['b'], (200, 200))
+        os.utime(files['c'], (300, 300))
+
+        self.assertEqual('value', storage['a'])
+
+        storage['d'] = 'value'
+
+        self.assertIn('a', storage)
+        self.assertNotIn('b', storage)
+        self.assertNotIn('c', storage)
+        self.assertIn('d', storage)
+
+    def test_size_is_tracked_in_memory(self):
+        """Checks that the directory is only measured once while it stays
+        under its maximum size.
+        """
+        storage = JSONDirectory(
+            Dir(self.directory.name), max_size=1024 * 1024
+        )
+
+        with patch.object(
+            storage, '_measure', wraps=storage._measure
+        ) as measure:
+            for key in ('a', 'b', 'c', 'a'):
+                storage[key] = 'value'
+
+            del storage['b']
+
+        measure.assert_called_once()
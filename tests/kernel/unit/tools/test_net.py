@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import gzip
+from io import BytesIO
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
-from kernel.tools.net import DownloadError, download_into_memory, requests
+from kernel.tools.net import (DownloadError, download_as_stream,
+                              download_into_memory, requests)
 
 
 class TestDownloadIntoMemory(TestCase):
@@ -72,3 +75,58 @@ class TestDownloadIntoMemory(TestCase):
         self.assertEqual(string, download_into_memory(url, session))
 
         session.get.assert_called_once_with(url)
+
+
+class TestDownloadAsStream(TestCase):
+    """Tests for :func:`download_as_stream`.
+    """
+
+    @staticmethod
+    def _session(response):
+        response.__enter__.return_value = response
+
+        session = Mock()
+        session.get.return_value = response
+
+        return session
+
+    def test_raises_error_for_bad_errorcode(self):
+        """Checks that an error is raised if the request returned an error
+        code.
+        """
+        response = MagicMock()
+        response.ok = False
+
+        session = self._session(response)
+
+        with self.assertRaises(DownloadError):
+            with download_as_stream('https://localhost:8080', session):
+                pass
+
+    def test_streams_url_contents(self):
+        """Checks that the contents of the page can be read.
+        """
+        url = 'https://localhost:8080'
+
+        response = MagicMock()
+        response.ok = True
+        response.raw = BytesIO(b'HELLO')
+
+        session = self._session(response)
+
+        with download_as_stream(url, session) as stream:
+            self.assertEqual(b'HELLO', stream.read())
+
+        session.get.assert_called_once_with(url, stream=True)
+
+    def test_decompresses_gzip_files(self):
+        """Checks that compressed files are decompressed as they are read.
+        """
+        response = MagicMock()
+        response.ok = True
+        response.raw = BytesIO(gzip.compress(b'HELLO'))
+
+        session = self._session(response)
+
+        with download_as_stream('https://localhost:8080', session) as stream:
+            self.assertEqual(b'HELLO', stream.read())
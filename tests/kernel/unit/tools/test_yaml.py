@@ -16,7 +16,8 @@
 from unittest import TestCase
 from unittest.mock import Mock
 
-from kernel.tools.yaml import SchemaError, YAMLFile
+from kernel.tools.yaml import (SchemaError, StandardYAMLParser, YAMLError,
+                               YAMLFile)
 
 
 class TestYAMLFile(TestCase):
@@ -108,3 +109,54 @@ class TestYAMLFile(TestCase):
         parser.as_yaml.assert_called_with(raw)
 
         validator.is_valid.assert_called_with(yaml)
+
+    def test_given_data_is_not_read_again(self):
+        """Checks that if the contents of the file are given, the file is
+        not read.
+        """
+        yaml = {'hello': 'world'}
+
+        file = Mock()
+
+        validator = Mock()
+        validator.is_valid = Mock()
+        validator.is_valid.return_value = True
+
+        tools = Mock()
+
+        result = YAMLFile(
+            file=file,
+            validator=validator,
+            tools=tools,
+            data=yaml
+        )
+
+        self.assertEqual(yaml, result.data)
+
+        file.read.assert_not_called()
+        tools.parser.as_yaml.assert_not_called()
+
+        validator.is_valid.assert_called_with(yaml)
+
+
+class TestStandardYAMLParser(TestCase):
+    """Tests for :class:`StandardYAMLParser`.
+    """
+
+    def test_parses_yaml(self):
+        """Checks that text is turned into the Python objects it describes.
+        """
+        parser = StandardYAMLParser()
+
+        self.assertEqual(
+            [{'job': {'name': 'job', 'vars': {'var': 1}}}],
+            parser.as_yaml('- job:\n    name: job\n    vars:\n      var: 1\n')
+        )
+
+    def test_error_on_invalid_yaml(self):
+        """Checks that an error is raised if the text is not YAML.
+        """
+        parser = StandardYAMLParser()
+
+        with self.assertRaises(YAMLError):
+            parser.as_yaml('key: [value')